@@ -0,0 +1,41 @@
+"""Add clip_note_blocks for packed per-clip note storage.
+
+Revision ID: 015_clip_note_blocks
+Revises: 014_chord_hit_mode_and_offset
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "015_clip_note_blocks"
+down_revision: Union[str, None] = "014_chord_hit_mode_and_offset"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per clip holding all of its notes as packed arrays
+    op.create_table(
+        "clip_note_blocks",
+        sa.Column("clip_id", sa.UUID(), nullable=False),
+        sa.Column("format_version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("note_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["clip_id"],
+            ["clips.id"],
+            name=op.f("fk_clip_note_blocks_clip_id_clips"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("clip_id", name=op.f("pk_clip_note_blocks")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("clip_note_blocks")
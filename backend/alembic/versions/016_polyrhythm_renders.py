@@ -0,0 +1,44 @@
+"""Add polyrhythm_renders for the persistent lane render cache.
+
+Revision ID: 016_polyrhythm_renders
+Revises: 015_clip_note_blocks
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "016_polyrhythm_renders"
+down_revision: Union[str, None] = "015_clip_note_blocks"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Content-addressed renders of a clip's polyrhythm lanes
+    op.create_table(
+        "polyrhythm_renders",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("clip_id", sa.UUID(), nullable=False),
+        sa.Column("note_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["clip_id"],
+            ["clips.id"],
+            name=op.f("fk_polyrhythm_renders_clip_id_clips"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk_polyrhythm_renders")),
+    )
+    op.create_index(
+        op.f("ix_polyrhythm_renders_clip_id"), "polyrhythm_renders", ["clip_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_polyrhythm_renders_clip_id"), table_name="polyrhythm_renders")
+    op.drop_table("polyrhythm_renders")
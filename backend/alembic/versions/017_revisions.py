@@ -0,0 +1,33 @@
+"""Add revision counters to projects and clips.
+
+Revision ID: 017_revisions
+Revises: 016_polyrhythm_renders
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "017_revisions"
+down_revision: Union[str, None] = "016_polyrhythm_renders"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "projects", sa.Column("revision", sa.BigInteger(), nullable=False, server_default="0")
+    )
+    op.add_column(
+        "clips", sa.Column("revision", sa.BigInteger(), nullable=False, server_default="0")
+    )
+    op.create_index("ix_clips_track_revision", "clips", ["track_id", "revision"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clips_track_revision", table_name="clips")
+    op.drop_column("clips", "revision")
+    op.drop_column("projects", "revision")
@@ -0,0 +1,25 @@
+"""Add per-part timings to generation runs.
+
+Revision ID: 018_generation_timings
+Revises: 017_revisions
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "018_generation_timings"
+down_revision: Union[str, None] = "017_revisions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("generation_runs", sa.Column("timings", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("generation_runs", "timings")
@@ -0,0 +1,29 @@
+"""Add seed derivation scheme to projects.
+
+Revision ID: 019_seed_scheme
+Revises: 018_generation_timings
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "019_seed_scheme"
+down_revision: Union[str, None] = "018_generation_timings"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing projects keep the legacy derivation so they regenerate identically
+    op.add_column(
+        "projects",
+        sa.Column("seed_scheme", sa.String(length=16), nullable=False, server_default="legacy"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "seed_scheme")
@@ -0,0 +1,55 @@
+"""Add jobs for background generation, export and suggestion runs.
+
+Revision ID: 020_jobs
+Revises: 019_seed_scheme
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "020_jobs"
+down_revision: Union[str, None] = "019_seed_scheme"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="queued"),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("project_revision", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("dedupe_key", sa.String(length=64), nullable=False),
+        sa.Column("progress", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("result_data", sa.LargeBinary(), nullable=True),
+        sa.Column("result_media_type", sa.String(length=64), nullable=True),
+        sa.Column("result_filename", sa.String(length=255), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["project_id"],
+            ["projects.id"],
+            name=op.f("fk_jobs_project_id_projects"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_jobs")),
+    )
+    op.create_index("ix_jobs_project", "jobs", ["project_id", "created_at"], unique=False)
+    # Lookup of in-flight jobs with the same request
+    op.create_index("ix_jobs_dedupe_key", "jobs", ["dedupe_key", "status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_dedupe_key", table_name="jobs")
+    op.drop_index("ix_jobs_project", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,43 @@
+"""Add clip_analyses for per-clip analysis summaries.
+
+Revision ID: 021_clip_analyses
+Revises: 020_jobs
+Create Date: 2024-01-XX XX:XX:XX.XXXXXX
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "021_clip_analyses"
+down_revision: Union[str, None] = "020_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One summary per clip, valid while clips.revision == clip_revision
+    op.create_table(
+        "clip_analyses",
+        sa.Column("clip_id", sa.UUID(), nullable=False),
+        sa.Column("clip_revision", sa.BigInteger(), nullable=False),
+        sa.Column("summary_version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("note_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("onset_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pitch_class_histogram", sa.JSON(), nullable=False),
+        sa.Column("chord_functions", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["clip_id"],
+            ["clips.id"],
+            name=op.f("fk_clip_analyses_clip_id_clips"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("clip_id", name=op.f("pk_clip_analyses")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("clip_analyses")
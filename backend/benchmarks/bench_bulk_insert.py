@@ -0,0 +1,146 @@
+"""Benchmark: ORM unit-of-work vs bulk persistence for generated notes.
+
+Generates a 128-bar project with all four kinds (drums, chords, bass, melody)
+and measures note insert throughput with one ORM object per row ("before")
+and with db/bulk.py ("after"), then times GenerationService.generate_full end
+to end.
+
+Requires a migrated database at DATABASE_URL. All rows are written inside a
+transaction that is rolled back.
+
+    uv run python benchmarks/bench_bulk_insert.py [--bars 128] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func, select
+
+import midinecromancer.models  # noqa: F401  (register mappers)
+import midinecromancer.models.chord_gen_run  # noqa: F401
+import midinecromancer.models.chord_projection_profile  # noqa: F401
+import midinecromancer.models.clip_chord_settings  # noqa: F401
+import midinecromancer.models.drum_map_profile  # noqa: F401
+from midinecromancer.db.base import AsyncSessionLocal
+from midinecromancer.db.bulk import bulk_insert_notes, note_rows
+from midinecromancer.models.clip import Clip
+from midinecromancer.models.note import Note
+from midinecromancer.models.project import Project
+from midinecromancer.models.track import Track
+from midinecromancer.music import generate_bassline, generate_chord_progression, generate_melody
+from midinecromancer.music.drums import DrumMap, generate_drum_pattern_v2
+
+
+def generate_events(bars: int, seed: int) -> list[dict]:
+    """Note events for drums, bass and melody plus one block chord per bar."""
+    progression = generate_chord_progression(tonic="C", mode="ionian", bars=bars, seed=seed)
+    events = generate_drum_pattern_v2(
+        bars=bars, time_signature_num=4, time_signature_den=4, seed=seed, drum_map=DrumMap()
+    )
+    events += generate_bassline(
+        tonic="C",
+        mode="ionian",
+        bars=bars,
+        time_signature_num=4,
+        time_signature_den=4,
+        chord_progression=progression,
+        seed=seed,
+    )
+    events += generate_melody(
+        tonic="C", mode="ionian", bars=bars, time_signature_num=4, time_signature_den=4, seed=seed
+    )
+    for chord in progression:
+        for pitch in (60, 64, 67):
+            events.append(
+                {
+                    "pitch": pitch,
+                    "velocity": 90,
+                    "start_tick": chord["start_bar"] * 1920,
+                    "duration_tick": chord["length_bars"] * 1920,
+                }
+            )
+    return events
+
+
+async def make_clip(session, bars: int) -> Clip:
+    project = Project(name="bench", bars=bars, seed=1)
+    session.add(project)
+    await session.flush()
+    track = Track(project_id=project.id, name="bench", role="melody", midi_channel=0)
+    session.add(track)
+    await session.flush()
+    clip = Clip(track_id=track.id, start_bar=0, length_bars=bars)
+    session.add(clip)
+    await session.flush()
+    return clip
+
+
+async def insert_orm(session, clip: Clip, events: list[dict]) -> None:
+    for event in events:
+        session.add(
+            Note(
+                clip_id=clip.id,
+                pitch=event["pitch"],
+                velocity=event["velocity"],
+                start_tick=event["start_tick"],
+                duration_tick=event["duration_tick"],
+                probability=1.0,
+            )
+        )
+    await session.flush()
+
+
+async def insert_bulk(session, clip: Clip, events: list[dict]) -> None:
+    await bulk_insert_notes(session, note_rows(clip.id, events))
+
+
+async def time_insert(label: str, insert, events: list[dict], bars: int, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            clip = await make_clip(session, bars)
+            start = time.perf_counter()
+            await insert(session, clip, events)
+            best = min(best, time.perf_counter() - start)
+            count = await session.scalar(
+                select(func.count()).select_from(Note).where(Note.clip_id == clip.id)
+            )
+            assert count == len(events), (label, count, len(events))
+            await session.rollback()
+    rate = len(events) / best
+    print(f"{label:>8}: {len(events)} rows in {best * 1000:8.1f} ms  {rate:10.0f} rows/s")
+
+
+async def time_generate_full(bars: int, repeat: int) -> None:
+    from midinecromancer.services.generation import GenerationService
+
+    best = float("inf")
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            project = Project(name="bench", bars=bars, seed=1)
+            session.add(project)
+            await session.flush()
+            start = time.perf_counter()
+            # generate_full commits, so clean up explicitly afterwards
+            await GenerationService(session).generate_full(project.id)
+            best = min(best, time.perf_counter() - start)
+            await session.delete(project)
+            await session.commit()
+    print(f"generate_full({bars} bars): {best * 1000:.1f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    events = generate_events(args.bars, seed=42)
+    await time_insert("orm", insert_orm, events, args.bars, args.repeat)
+    await time_insert("bulk", insert_bulk, events, args.bars, args.repeat)
+    await time_generate_full(args.bars, args.repeat)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""Benchmark: per-event vs batch chord event rendering.
+
+Builds a clip of chord events cycling through a few roman numerals and
+pattern settings (block, strum, comp, with and without humanize and velocity
+jitter) and renders it with each renderer's per-event function in a loop and
+with its batch function (music/chord_patterns.render_clip_chord_events for
+audition, services/chord_render.render_chord_events_to_notes for generated
+clips). Prints the best time per renderer and checks the notes match. No
+database is needed.
+
+    uv run python benchmarks/bench_chord_render.py [--chords 512] [--repeat 9]
+"""
+
+import argparse
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+
+from midinecromancer.music import chord_patterns
+from midinecromancer.services import chord_render
+
+ROMANS = ["i", "VI", "III", "VII", "iv", "V7"]
+PATTERNS = [
+    {"pattern_type": "block"},
+    {"pattern_type": "strum", "strum_beats": Decimal("0.25"), "humanize_beats": Decimal("0.05")},
+    {"pattern_type": "comp", "retrigger": True, "velocity_jitter": 8},
+    {"pattern_type": "strum", "strum_direction": "up", "strum_beats": Decimal("0.125")},
+]
+CONTEXT = {
+    "tonic": "A",
+    "mode": "aeolian",
+    "bpm": 90,
+    "time_signature_num": 4,
+    "time_signature_den": 4,
+}
+SEED = 1234
+
+RENDERERS = {
+    "patterns": (
+        chord_patterns.render_chord_event_to_notes,
+        chord_patterns.render_clip_chord_events,
+    ),
+    "service": (
+        chord_render.render_chord_event_to_notes,
+        chord_render.render_chord_events_to_notes,
+    ),
+}
+
+
+def make_events(count: int) -> list[SimpleNamespace]:
+    events = []
+    for i in range(count):
+        event = {
+            "id": UUID(int=i + 1),
+            "start_tick": i * 1920,
+            "duration_tick": 1920,
+            "roman_numeral": ROMANS[i % len(ROMANS)],
+            "intensity": Decimal("0.85"),
+            "voicing": "root",
+            "inversion": 0,
+            "strum_ms": 0,
+            "humanize_ms": 0,
+            "strum_beats": Decimal("0.0"),
+            "humanize_beats": Decimal("0.0"),
+            "pattern_type": "block",
+            "duration_gate": Decimal("0.85"),
+            "velocity_curve": "flat",
+            "velocity_jitter": 0,
+            "comp_pattern": None,
+            "strum_direction": "down",
+            "strum_spread": Decimal("1.0"),
+            "retrigger": False,
+        }
+        event.update(PATTERNS[i // 4 % len(PATTERNS)])
+        events.append(SimpleNamespace(**event))
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chords", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+
+    events = make_events(args.chords)
+    print(f"{args.chords} chord events, best of {args.repeat} (ms)")
+    print(f"{'renderer':>10}{'seed':>8}{'per-event':>12}{'batch':>10}{'speedup':>10}")
+    for seed_scheme in ("legacy", "tree"):
+        context = {**CONTEXT, "seed_scheme": seed_scheme}
+        for name, (render_event, render_batch) in RENDERERS.items():
+            per_event = batch = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                expected = [note for e in events for note in render_event(e, context, SEED)]
+                per_event = min(per_event, (time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                notes = render_batch(events, context, SEED)
+                batch = min(batch, (time.perf_counter() - start) * 1000)
+            assert notes == expected, f"{name} batch render differs"
+            print(
+                f"{name:>10}{seed_scheme:>8}{per_event:12.2f}{batch:10.2f}{per_event / batch:9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
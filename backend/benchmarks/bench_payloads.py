@@ -0,0 +1,120 @@
+"""Benchmark: arrangement note payloads, JSON objects vs column layouts.
+
+Builds one clip per kind (drums, chords, bass, melody) for a 128-bar project
+and serializes the notes three ways:
+
+- json: the current path, one NoteInArrangement per note inside
+  ClipInArrangement, dumped and encoded as FastAPI does for response models
+- columns: services/payloads.py parallel arrays encoded as JSON
+- msgpack: the same arrays encoded with msgpack (skipped if not installed)
+
+Prints payload size and best encode time for each. No database is needed.
+
+    uv run python benchmarks/bench_payloads.py [--bars 128] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+from bench_bulk_insert import generate_events
+
+from midinecromancer.schemas.arrangement import ClipInArrangement, NoteInArrangement
+from midinecromancer.services import payloads
+from midinecromancer.services.note_store import PackedNoteRow
+
+
+def make_clips(bars: int, seed: int) -> list[tuple[uuid.UUID, list[PackedNoteRow]]]:
+    """Note rows grouped into four clips, sorted by start tick."""
+    events = sorted(generate_events(bars, seed), key=lambda e: e["start_tick"])
+    clips = []
+    for kind in range(4):
+        clip_id = uuid.uuid4()
+        notes = [
+            PackedNoteRow(
+                uuid.uuid4(),
+                clip_id,
+                event["pitch"],
+                event["velocity"],
+                event["start_tick"],
+                event["duration_tick"],
+                1.0,
+            )
+            for event in events[kind::4]
+        ]
+        clips.append((clip_id, notes))
+    return clips
+
+
+def _clip(clip_id: uuid.UUID, bars: int, notes: list) -> ClipInArrangement:
+    return ClipInArrangement(
+        id=clip_id,
+        start_bar=0,
+        length_bars=bars,
+        is_muted=False,
+        is_soloed=False,
+        start_offset_ticks=0,
+        notes=notes,
+        chord_events=[],
+    )
+
+
+def encode_json(clips, bars: int) -> bytes:
+    documents = [
+        _clip(clip_id, bars, [NoteInArrangement.model_validate(note) for note in notes])
+        for clip_id, notes in clips
+    ]
+    return json.dumps(
+        [document.model_dump(mode="json") for document in documents],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def columns_document(clips, bars: int) -> list[dict]:
+    documents = []
+    for clip_id, notes in clips:
+        document = _clip(clip_id, bars, []).model_dump(mode="json")
+        document["notes"] = payloads.note_columns(notes)
+        documents.append(document)
+    return documents
+
+
+def encode_columns(clips, bars: int) -> bytes:
+    return payloads.encode(columns_document(clips, bars), payloads.COLUMNS_JSON)
+
+
+def encode_msgpack(clips, bars: int) -> bytes:
+    return payloads.encode(columns_document(clips, bars), payloads.MSGPACK)
+
+
+def time_encode(label: str, encode, clips, bars: int, repeat: int, baseline: int | None) -> int:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = encode(clips, bars)
+        best = min(best, time.perf_counter() - start)
+    ratio = f"  {len(data) / baseline:5.0%} of json" if baseline else ""
+    print(f"{label:>8}: {len(data):9d} bytes  {best * 1000:8.1f} ms{ratio}")
+    return len(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    clips = make_clips(args.bars, seed=42)
+    print(f"{sum(len(notes) for _, notes in clips)} notes in {len(clips)} clips")
+    baseline = time_encode("json", encode_json, clips, args.bars, args.repeat, None)
+    time_encode("columns", encode_columns, clips, args.bars, args.repeat, baseline)
+    if payloads.msgpack_available():
+        time_encode("msgpack", encode_msgpack, clips, args.bars, args.repeat, baseline)
+    else:
+        print(" msgpack: not installed (pip install 'midinecromancer[msgpack]')")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark: seed derivation in a full generation, legacy vs tree seed scheme.
+
+Runs the part generators with the arguments GenerationService.generate_full
+gives them (compat drums, chords, bass over the progression, melody) for a
+project with each seed scheme, and prints the best time per part plus the
+share of a cProfile run spent deriving seeds and setting up random streams
+(music/seeds.py, Mersenne Twister seeding and blake2b; for "tree" this
+includes converting each stream's hashed first draws). Then times a single
+child stream by number of draws. No database is needed.
+
+    uv run python benchmarks/bench_seeds.py [--bars 256] [--repeat 9]
+"""
+
+import argparse
+import cProfile
+import pstats
+import time
+import timeit
+from types import SimpleNamespace
+
+from midinecromancer.music import generate_bassline, generate_chord_progression, generate_melody
+from midinecromancer.music.drums import DrumMap, generate_drum_pattern_v2
+from midinecromancer.music.seeds import SEED_SCHEMES, child_rng
+from midinecromancer.services.generation import (
+    _bass_args,
+    _bass_progression,
+    _chord_args,
+    _drum_args,
+    _melody_args,
+)
+
+SEED = 1234
+PARAMS: dict = {"fill_probability": 0.5}
+STREAM_DRAWS = (1, 4, 16, 32)
+
+
+def generate_drums(project: SimpleNamespace) -> list[dict]:
+    return generate_drum_pattern_v2(**_drum_args(project, SEED, PARAMS, DrumMap()))
+
+
+def generate_chords(project: SimpleNamespace) -> list[dict]:
+    return generate_chord_progression(**_chord_args(project, SEED, PARAMS))
+
+
+def generate_bass(project: SimpleNamespace) -> list[dict]:
+    progression = _bass_progression(generate_chords(project))
+    return generate_bassline(**_bass_args(project, SEED, PARAMS, progression))
+
+
+def generate_lead(project: SimpleNamespace) -> list[dict]:
+    return generate_melody(**_melody_args(project, SEED, PARAMS))
+
+
+# The parts generate_full computes (bass includes its chord progression)
+PARTS = {
+    "drums": generate_drums,
+    "chords": generate_chords,
+    "bass": generate_bass,
+    "melody": generate_lead,
+}
+
+
+def generate_full_parts(project: SimpleNamespace) -> None:
+    for generate in PARTS.values():
+        generate(project)
+
+
+def is_seeding(filename: str, function: str) -> bool:
+    return (
+        filename.endswith("seeds.py")
+        or (filename.endswith("random.py") and function in ("__init__", "seed"))
+        or "Random.seed" in function
+        or "blake2b" in function
+    )
+
+
+def seeding_share(project: SimpleNamespace) -> float:
+    """Fraction of a profiled run spent deriving seeds and setting up streams."""
+    profiler = cProfile.Profile()
+    profiler.runcall(generate_full_parts, project)
+    stats = pstats.Stats(profiler)
+    seeding = sum(
+        tottime
+        for (filename, _, function), (_, _, tottime, _, _) in stats.stats.items()
+        if is_seeding(filename, function)
+    )
+    return seeding / stats.total_tt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+
+    projects = {
+        scheme: SimpleNamespace(
+            bars=args.bars,
+            time_signature_num=4,
+            time_signature_den=4,
+            key_tonic="C",
+            mode="aeolian",
+            seed_scheme=scheme,
+        )
+        for scheme in SEED_SCHEMES
+    }
+    # Schemes alternate within each repeat so drift affects both alike
+    best = {(scheme, part): float("inf") for scheme in SEED_SCHEMES for part in PARTS}
+    for _ in range(args.repeat):
+        for scheme, project in projects.items():
+            for part, generate in PARTS.items():
+                start = time.perf_counter()
+                generate(project)
+                elapsed = (time.perf_counter() - start) * 1000
+                best[scheme, part] = min(best[scheme, part], elapsed)
+
+    print(f"{args.bars} bars, seed {SEED}, best of {args.repeat} (ms)")
+    print(f"{'part':>8}" + "".join(f"{scheme:>10}" for scheme in SEED_SCHEMES))
+    for part in PARTS:
+        print(f"{part:>8}" + "".join(f"{best[scheme, part]:10.2f}" for scheme in SEED_SCHEMES))
+    totals = [sum(best[scheme, part] for part in PARTS) for scheme in SEED_SCHEMES]
+    print(f"{'total':>8}" + "".join(f"{total:10.2f}" for total in totals))
+    print(
+        f"{'seeding':>8}"
+        + "".join(f"{seeding_share(projects[scheme]):10.0%}" for scheme in SEED_SCHEMES)
+        + "  (share of a cProfile run)"
+    )
+
+    print("\nOne child stream (us)")
+    print(f"{'draws':>8}" + "".join(f"{scheme:>10}" for scheme in SEED_SCHEMES))
+    for draws in STREAM_DRAWS:
+        timings = [
+            min(
+                timeit.repeat(
+                    f"r = child_rng({scheme!r}, {SEED}, 7, 'kick', 'pattern')\n"
+                    f"for _ in range({draws}): r.random()",
+                    globals={"child_rng": child_rng},
+                    number=20000,
+                    repeat=5,
+                )
+            )
+            / 20000
+            * 1e6
+            for scheme in SEED_SCHEMES
+        ]
+        print(f"{draws:>8}" + "".join(f"{timing:10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark: theory lookups from TheoryTables vs computing them per call.
+
+Prints the time to build the tables (paid once at import) and, for each
+public function in music/theory.py, the cost per call of the table lookup
+next to the reference computation it replaced. No database is needed.
+
+    uv run python benchmarks/bench_theory.py [--number 200000]
+"""
+
+import argparse
+import timeit
+from functools import partial
+
+from midinecromancer.music import theory
+
+
+def old_get_chord_notes(tonic, mode, degree, quality="triad", octave=4):
+    scale = theory._scale_degrees(theory._parse_tonic(tonic), mode, octave)
+    return theory._chord_notes(scale, degree, quality)
+
+
+def old_get_scale_degrees(tonic, mode, octave=4):
+    return theory._scale_degrees(theory._parse_tonic(tonic), mode, octave)
+
+
+CASES = [
+    ("parse_tonic", theory._parse_tonic, theory.parse_tonic, ("F#",)),
+    ("roman_to_degree", theory._roman_to_degree, theory.roman_to_degree, ("V7",)),
+    ("get_scale_degrees", old_get_scale_degrees, theory.get_scale_degrees, ("Eb", "dorian")),
+    (
+        "get_chord_notes",
+        old_get_chord_notes,
+        theory.get_chord_notes,
+        ("Bb", "aeolian", 5, "7th", 3),
+    ),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"tables built at import in {theory.TABLES.build_ms:.1f} ms")
+    rebuild = min(timeit.repeat(theory.TheoryTables.build, number=1, repeat=5))
+    print(f"rebuild (best of 5): {rebuild * 1000:.1f} ms")
+
+    for name, old, new, call_args in CASES:
+        assert old(*call_args) == new(*call_args), name
+        old_ns = min(timeit.repeat(partial(old, *call_args), number=args.number, repeat=3))
+        new_ns = min(timeit.repeat(partial(new, *call_args), number=args.number, repeat=3))
+        old_ns, new_ns = old_ns / args.number * 1e9, new_ns / args.number * 1e9
+        print(
+            f"{name:>18}: {old_ns:6.0f} ns computed  {new_ns:6.0f} ns table  {old_ns / new_ns:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: greedy vs progression-level (Viterbi) chord voicing.
+
+Renders a random diatonic progression (triads and sevenths) with
+render_chord_progression_to_notes using inversion_policy "smooth" (greedy,
+one chord at a time) and "optimal" (music/voice_leading.py), and prints the
+best render time plus the voicings' total movement in semitones. The first
+"optimal" run fills the voicing caches and is reported separately. No
+database is needed.
+
+    uv run python benchmarks/bench_voice_leading.py [--chords 256] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+
+from midinecromancer.music.chords_render import render_chord_progression_to_notes, voice_chord
+from midinecromancer.music.theory import get_chord_notes, roman_to_degree
+from midinecromancer.music.voice_leading import voice_progression
+
+ROMANS = ["I", "ii", "iii", "IV", "V", "vi", "vii", "ii7", "V7"]
+CONTEXT = {"tonic": "C", "mode": "ionian", "bpm": 100}
+LOW, HIGH = 48, 72
+
+
+def make_progression(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "start_tick": i * 1920,
+            "duration_tick": 1920,
+            "roman_numeral": rng.choice(ROMANS),
+            "chord_name": "",
+        }
+        for i in range(count)
+    ]
+
+
+def movement(voicings: list[list[int]]) -> int:
+    return sum(
+        sum(min(abs(p - q) for q in prev) for p in cur)
+        for prev, cur in zip(voicings, voicings[1:], strict=False)
+        if prev and cur
+    )
+
+
+def time_render(chords: list[dict], policy: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render_chord_progression_to_notes(chords, {"inversion_policy": policy}, 1, CONTEXT)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chords", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    chords = make_progression(args.chords, seed=42)
+    tones = [
+        get_chord_notes(
+            "C",
+            "ionian",
+            roman_to_degree(chord["roman_numeral"]),
+            "7th" if "7" in chord["roman_numeral"] else "triad",
+        )
+        for chord in chords
+    ]
+
+    greedy = []
+    for chord_tones in tones:
+        greedy.append(voice_chord(chord_tones, LOW, HIGH, greedy[-1] if greedy else None))
+
+    start = time.perf_counter()
+    optimal = voice_progression(tones, LOW, HIGH)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.chords} chords, range {LOW}-{HIGH}")
+    for label, voicings in (("smooth", greedy), ("optimal", optimal)):
+        notes = sum(len(voicing) for voicing in voicings)
+        render_ms = time_render(chords, label, args.repeat)
+        print(
+            f"{label:>8}: {render_ms:7.1f} ms render  {movement(voicings):5d} semitones moved  "
+            f"{notes / len(voicings):.2f} notes/chord"
+        )
+    print(f"optimal voicing with cold caches: {cold_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
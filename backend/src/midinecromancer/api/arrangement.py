@@ -2,23 +2,33 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
-from midinecromancer.services.arrangement import ArrangementService
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.services.arrangement import ArrangementService, WindowError
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/projects/{project_id}/arrangement/panel")
 async def get_arrangement_panel(
     project_id: UUID,
+    from_bar: int | None = Query(default=None, ge=0),
+    to_bar: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    """Get arrangement panel view model (lightweight, optimized for UI)."""
+    """Get arrangement panel view model (lightweight, optimized for UI).
+
+    Pass from_bar/to_bar (or a next_cursor from a previous page) to page a
+    long project: all segments are listed, summaries only for the window.
+    """
     service = ArrangementService(session)
     try:
-        return await service.get_project_arrangement(project_id)
+        return await service.get_project_arrangement(project_id, from_bar, to_bar, cursor)
+    except WindowError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
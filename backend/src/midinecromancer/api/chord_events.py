@@ -9,13 +9,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.project import Project
 from midinecromancer.models.track import Track
 from midinecromancer.schemas.arrangement import ChordEventInArrangement
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 class ChordEventCreate(BaseModel):
@@ -8,15 +8,16 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.chord_gen_run import ChordGenRun, ChordGenSuggestion
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.project import Project
 from midinecromancer.music.chords_generate import generate_progression_candidates
-from midinecromancer.music.chord_patterns import render_chord_event_to_notes
+from midinecromancer.music.chord_patterns import render_clip_chord_events
 from midinecromancer.music.theory import PPQ
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 class ChordGenRequest(BaseModel):
@@ -29,6 +30,8 @@ class ChordGenRequest(BaseModel):
     seed: int = Field(default=0)
     params: dict = Field(default_factory=dict)
     locks: dict | None = None
+    num_candidates: int = Field(default=5, ge=1, le=50)
+    time_budget_ms: int = Field(default=250, ge=1, le=10000)
 
 
 class ChordGenResponse(BaseModel):
@@ -98,7 +101,8 @@ async def create_chord_gen_run(
         locks=request.locks,
         seed=request.seed,
         run_id=run.id,
-        num_candidates=5,
+        num_candidates=request.num_candidates,
+        time_budget_ms=request.time_budget_ms,
     )
 
     # Create suggestions
@@ -194,20 +198,20 @@ async def preview_chord_suggestion(
     ticks_per_bar = int(quarter_notes_per_bar * PPQ)
 
     # Render progression to notes
-    all_notes = []
     project_context = {
         "tonic": project.key_tonic,
         "mode": project.mode,
         "bpm": request.bpm,
         "time_signature_num": request.time_signature_num,
         "time_signature_den": request.time_signature_den,
+        "seed_scheme": project.seed_scheme,
     }
 
-    for chord_data in suggestion.progression:
-        # Create a temporary chord event for rendering
-        from midinecromancer.models.chord_event import ChordEvent
+    # Temporary chord events for rendering
+    from midinecromancer.models.chord_event import ChordEvent
 
-        temp_chord = ChordEvent(
+    temp_chords = [
+        ChordEvent(
             id=UUID("00000000-0000-0000-0000-000000000000"),  # Dummy ID
             clip_id=run.clip_id or UUID("00000000-0000-0000-0000-000000000000"),
             start_tick=int(chord_data["start_bar"] * ticks_per_bar),
@@ -230,14 +234,9 @@ async def preview_chord_suggestion(
             is_enabled=True,
             is_locked=False,
         )
-
-        rendered_notes = render_chord_event_to_notes(
-            temp_chord,
-            project_context,
-            run.seed,
-        )
-
-        all_notes.extend(rendered_notes)
+        for chord_data in suggestion.progression
+    ]
+    all_notes = render_clip_chord_events(temp_chords, project_context, run.seed)
 
     return {
         "suggestion_id": str(suggestion_id),
@@ -8,6 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.project import Project
@@ -15,7 +16,7 @@ from midinecromancer.models.track import Track
 from midinecromancer.music.theory import PPQ
 from midinecromancer.schemas.arrangement import ChordEventInArrangement
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 class ChordInsertRequest(BaseModel):
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.chord_projection_profile import ChordProjectionProfile
 from midinecromancer.schemas.chord_projections import (
     ChordProjectionProfileCreate,
@@ -14,7 +15,7 @@ from midinecromancer.schemas.chord_projections import (
     ChordProjectionProfileUpdate,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("", response_model=list[ChordProjectionProfileResponse])
@@ -7,10 +7,11 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.project import Project
 from midinecromancer.music.chords_generate import generate_progression_candidates
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 class ChordSuggestRequest(BaseModel):
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.clip_chord_settings import ClipChordSettings
 from midinecromancer.models.project import Project
@@ -23,7 +24,7 @@ from midinecromancer.schemas.chord_projections import (
 )
 from midinecromancer.services.chords import ChordService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/clips/{clip_id}/settings", response_model=ClipChordSettingsResponse)
@@ -96,9 +97,27 @@ async def preview_chords(
     request: ChordPreviewRequest,
     session: AsyncSession = Depends(get_session),
 ) -> ChordPreviewResponse:
-    """Preview chord rendering without committing."""
-    service = ChordService(session)
-    return await service.preview_chords(request)
+    """Preview chord rendering without committing.
+
+    Identical previews of the same project revision share one computation
+    (services/preview_cache.py).
+    """
+    from midinecromancer.services.preview_cache import (
+        preview_cache,
+        preview_key,
+        project_revision,
+    )
+
+    key = preview_key(
+        "chords",
+        await project_revision(session, request.project_id),
+        request.model_dump(mode="json"),
+    )
+    return await preview_cache.get_or_compute(
+        "chords",
+        key,
+        lambda preview_session: ChordService(preview_session).preview_chords(request),
+    )
 
 
 @router.post("/commit", response_model=ChordCommitResponse)
@@ -2,15 +2,20 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.clip import Clip
 from midinecromancer.schemas.clip import ClipResponse
+from midinecromancer.services import payloads
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Note lists in regenerate results
+_REGENERATE_EVENT_KEYS = ("events", "note_events")
 
 
 class ClipUpdate(BaseModel):
@@ -51,6 +56,15 @@ class ClipRegenerate(BaseModel):
     preview: bool = False
 
 
+class ClipRegenerateBatch(BaseModel):
+    """Preview several regenerations of a clip (every seed x variation)."""
+
+    kind: str  # "beats"|"chords"|"bass"|"melody"
+    seeds: list[int | None] = Field(default=[None], min_length=1, max_length=64)
+    variations: list[float] = Field(default=[0.3], min_length=1, max_length=16)
+    params: dict = {}  # Type-specific parameters
+
+
 @router.patch("/{clip_id}/mute", response_model=ClipResponse)
 async def toggle_clip_mute(
     clip_id: UUID,
@@ -117,7 +131,11 @@ async def duplicate_clip(
     session: AsyncSession = Depends(get_session),
 ) -> ClipResponse:
     """Duplicate a clip with optional new start bar."""
-    clip = await session.get(Clip, clip_id)
+    from sqlalchemy.orm import selectinload
+
+    clip = await session.get(
+        Clip, clip_id, options=[selectinload(Clip.notes), selectinload(Clip.chord_events)]
+    )
     if not clip:
         raise HTTPException(status_code=404, detail="Clip not found")
 
@@ -137,19 +155,19 @@ async def duplicate_clip(
     session.add(new_clip)
     await session.flush()
 
-    # Copy notes
-    from midinecromancer.models.note import Note
+    # Copy notes (a packed block is copied as-is: one row instead of one per note)
+    from midinecromancer.models.clip_note_block import ClipNoteBlock
+    from midinecromancer.services.note_store import write_clip_notes
 
-    for note in clip.notes:
-        new_note = Note(
+    if clip.note_block is not None:
+        new_clip.note_block = ClipNoteBlock(
             clip_id=new_clip.id,
-            pitch=note.pitch,
-            velocity=note.velocity,
-            start_tick=note.start_tick,
-            duration_tick=note.duration_tick,
-            probability=note.probability,
+            format_version=clip.note_block.format_version,
+            note_count=clip.note_block.note_count,
+            data=clip.note_block.data,
         )
-        session.add(new_note)
+    else:
+        await write_clip_notes(session, new_clip, clip.notes, packed=False)
 
     # Copy chord events
     from midinecromancer.models.chord_event import ChordEvent
@@ -236,9 +254,14 @@ async def offset_clip(
 async def regenerate_clip(
     clip_id: UUID,
     data: ClipRegenerate,
+    accept: str | None = Header(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    """Regenerate clip content with preview support."""
+    """Regenerate clip content with preview support.
+
+    Clients accepting a compact media type (see services/payloads.py) get the
+    note events as parallel arrays.
+    """
     from midinecromancer.services.regenerate import RegenerateService
 
     service = RegenerateService(session)
@@ -253,6 +276,11 @@ async def regenerate_clip(
         )
         if not data.preview:
             await session.commit()
+        media_type = payloads.negotiate(accept)
+        if media_type != payloads.JSON:
+            return payloads.payload_response(
+                payloads.with_event_columns(result, _REGENERATE_EVENT_KEYS), media_type
+            )
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -265,21 +293,100 @@ async def regenerate_clip(
 async def preview_regenerate_clip(
     clip_id: UUID,
     data: ClipRegenerate,
+    accept: str | None = Header(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    """Preview regenerate clip content without DB writes."""
+    """Preview regenerate clip content without DB writes.
+
+    Supports the same compact media types as regenerate. Identical previews
+    of the same project revision share one computation (services/preview_cache.py).
+    """
+    from midinecromancer.services.preview_cache import (
+        clip_project_revision,
+        preview_cache,
+        preview_key,
+    )
     from midinecromancer.services.regenerate import RegenerateService
 
-    service = RegenerateService(session)
     try:
-        result = await service.regenerate_clip(
-            clip_id=clip_id,
-            kind=data.kind,
-            seed=data.seed,
-            variation=data.variation,
-            params=data.params,
-            preview=True,
+        key = preview_key(
+            "regenerate",
+            await clip_project_revision(session, clip_id),
+            {"clip_id": clip_id, **data.model_dump(mode="json", exclude={"preview"})},
+        )
+        result = await preview_cache.get_or_compute(
+            "regenerate",
+            key,
+            lambda preview_session: RegenerateService(preview_session).regenerate_clip(
+                clip_id=clip_id,
+                kind=data.kind,
+                seed=data.seed,
+                variation=data.variation,
+                params=data.params,
+                preview=True,
+            ),
+        )
+        media_type = payloads.negotiate(accept)
+        if media_type != payloads.JSON:
+            return payloads.payload_response(
+                payloads.with_event_columns(result, _REGENERATE_EVENT_KEYS), media_type
+            )
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
+
+
+@router.post("/{clip_id}/preview-regenerate/batch")
+async def preview_regenerate_clip_batch(
+    clip_id: UUID,
+    data: ClipRegenerateBatch,
+    accept: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """Preview regenerating a clip for several seeds/variations without DB writes.
+
+    Variants reference their event lists by index into event_lists, where
+    identical lists appear once. Compact media types encode each list as
+    parallel arrays. Identical batches of the same project revision share one
+    computation.
+    """
+    from midinecromancer.services.preview_cache import (
+        clip_project_revision,
+        preview_cache,
+        preview_key,
+    )
+    from midinecromancer.services.regenerate import RegenerateService
+
+    if len(data.seeds) * len(data.variations) > 64:
+        raise HTTPException(status_code=422, detail="At most 64 variants per batch")
+
+    try:
+        key = preview_key(
+            "regenerate-batch",
+            await clip_project_revision(session, clip_id),
+            {"clip_id": clip_id, **data.model_dump(mode="json")},
+        )
+        result = await preview_cache.get_or_compute(
+            "regenerate-batch",
+            key,
+            lambda preview_session: RegenerateService(preview_session).preview_variants(
+                clip_id=clip_id,
+                kind=data.kind,
+                seeds=data.seeds,
+                variations=data.variations,
+                params=data.params,
+            ),
         )
+        media_type = payloads.negotiate(accept)
+        if media_type != payloads.JSON:
+            # The result may be cached: encode a copy
+            result = {
+                **result,
+                "event_lists": [payloads.event_columns(events) for events in result["event_lists"]],
+            }
+            return payloads.payload_response(result, media_type)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -7,10 +7,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.drum_map_profile import DrumMapProfile
 from midinecromancer.schemas.drum_map import DrumMapProfileCreate, DrumMapProfileResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("", response_model=list[DrumMapProfileResponse])
@@ -3,28 +3,26 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from midinecromancer.db.base import get_session
-from midinecromancer.midi.export import export_project_to_midi
-from midinecromancer.midi.export_zip import export_project_to_zip, generate_zip_filename
-from midinecromancer.models.clip import Clip
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.midi.export import iter_project_midi_chunks
+from midinecromancer.midi.export_zip import generate_zip_filename, iter_project_zip_chunks
 from midinecromancer.models.project import Project
-from midinecromancer.models.track import Track
 from midinecromancer.schemas.arrangement import ArrangementResponse
-from midinecromancer.services.polyrhythm import render_clip_lanes_to_notes
+from midinecromancer.services.export import load_export_tracks
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/{project_id}/export/midi")
 async def export_midi(
     project_id: UUID,
     session: AsyncSession = Depends(get_session),
-) -> Response:
+) -> StreamingResponse:
     """Export project as Standard MIDI File."""
     # Get project
     result = await session.execute(select(Project).where(Project.id == project_id))
@@ -32,33 +30,11 @@ async def export_midi(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get tracks with all data
-    result = await session.execute(
-        select(Track)
-        .where(Track.project_id == project_id)
-        .options(
-            selectinload(Track.clips).selectinload(Clip.notes),
-            selectinload(Track.clips).selectinload(Clip.chord_events),
-            selectinload(Track.clips).selectinload(Clip.polyrhythm_lanes),
-        )
-        .order_by(Track.created_at)
-    )
-    tracks = list(result.scalars().all())
-
-    # Render polyrhythm lanes to notes for clips that use lanes
-    for track in tracks:
-        for clip in track.clips:
-            if clip.grid_mode in ("polyrhythm", "polyrhythm_multi"):
-                # Render lanes to notes (temporary, for export only)
-                lane_notes = await render_clip_lanes_to_notes(clip, project, session)
-                # Add to clip's notes list for export
-                clip.notes.extend(lane_notes)
-
-    # Export to MIDI
-    midi_bytes = export_project_to_midi(project, tracks)
-
-    return Response(
-        content=midi_bytes,
+    tracks = await load_export_tracks(session, project)
+
+    # Stream the MIDI file one track chunk at a time
+    return StreamingResponse(
+        iter_project_midi_chunks(project, tracks),
         media_type="audio/midi",
         headers={"Content-Disposition": f'attachment; filename="{project.name}.mid"'},
     )
@@ -69,9 +45,12 @@ async def export_zip(
     project_id: UUID,
     split_by: str = Query(default="track", pattern="^(track|clip)$"),
     session: AsyncSession = Depends(get_session),
-) -> Response:
+) -> StreamingResponse:
     """Export project as ZIP containing per-part MIDI files.
 
+    Parts are encoded in the worker pool and the archive is streamed entry by
+    entry as they finish, so only a few parts are held in memory.
+
     Args:
         project_id: Project ID
         split_by: How to split parts ("track" or "clip")
@@ -86,34 +65,13 @@ async def export_zip(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get tracks with all data
-    result = await session.execute(
-        select(Track)
-        .where(Track.project_id == project_id)
-        .options(
-            selectinload(Track.clips).selectinload(Clip.notes),
-            selectinload(Track.clips).selectinload(Clip.chord_events),
-            selectinload(Track.clips).selectinload(Clip.polyrhythm_lanes),
-        )
-        .order_by(Track.created_at)
-    )
-    tracks = list(result.scalars().all())
-
-    # Render polyrhythm lanes to notes for clips that use lanes
-    for track in tracks:
-        for clip in track.clips:
-            if clip.grid_mode in ("polyrhythm", "polyrhythm_multi"):
-                # Render lanes to notes (temporary, for export only)
-                lane_notes = await render_clip_lanes_to_notes(clip, project, session)
-                # Add to clip's notes list for export
-                clip.notes.extend(lane_notes)
-
-    # Export to ZIP
-    zip_bytes = export_project_to_zip(project, tracks, split_by=split_by)  # type: ignore
+    tracks = await load_export_tracks(session, project)
+
+    # Stream the ZIP one part at a time
     zip_filename = generate_zip_filename(project.name)
 
-    return Response(
-        content=zip_bytes,
+    return StreamingResponse(
+        iter_project_zip_chunks(project, tracks, split_by=split_by),  # type: ignore
         media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{zip_filename}"'},
     )
@@ -125,6 +83,9 @@ async def export_json(
     session: AsyncSession = Depends(get_session),
 ) -> ArrangementResponse:
     """Export project as JSON arrangement."""
-    from midinecromancer.api.projects import get_arrangement
+    from midinecromancer.api.projects import build_arrangement
 
-    return await get_arrangement(project_id, session)
+    project = await session.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return await build_arrangement(session, project)
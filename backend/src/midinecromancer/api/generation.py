@@ -6,10 +6,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.schemas.generation import GenerationRequest, GenerationResponse
 from midinecromancer.services.generation import GenerationService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/{project_id}/generate/full", response_model=GenerationResponse)
@@ -31,6 +32,7 @@ async def generate_full(
             success=True,
             message="Full arrangement generated successfully",
             generation_run_id=str(run.id),
+            timings=run.timings,
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -55,6 +57,7 @@ async def generate_drums(
             success=True,
             message="Drum pattern generated successfully",
             generation_run_id=str(run.id),
+            timings=run.timings,
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -79,6 +82,7 @@ async def generate_chords(
             success=True,
             message="Chord progression generated successfully",
             generation_run_id=str(run.id),
+            timings=run.timings,
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -103,6 +107,7 @@ async def generate_bass(
             success=True,
             message="Bassline generated successfully",
             generation_run_id=str(run.id),
+            timings=run.timings,
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -127,6 +132,7 @@ async def generate_melody(
             success=True,
             message="Melody generated successfully",
             generation_run_id=str(run.id),
+            timings=run.timings,
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,88 @@
+"""Background job endpoints."""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.models.job import Job
+from midinecromancer.models.project import Project
+from midinecromancer.schemas.job import JOB_PARAMS, JobCreate, JobResponse
+from midinecromancer.services.jobs import job_runner
+
+router = APIRouter(route_class=TimedRoute)
+
+
+def _job_response(job: Job) -> JobResponse:
+    response = JobResponse.model_validate(job)
+    progress = job_runner.progress(job.id)
+    if progress is not None:
+        response.progress = progress
+    return response
+
+
+@router.post("/projects/{project_id}/jobs", response_model=JobResponse, status_code=202)
+async def create_job(
+    project_id: UUID,
+    data: JobCreate,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+) -> JobResponse:
+    """Run generate_full, export_zip or suggestions in the background.
+
+    Returns the job at once; poll GET /jobs/{id} and fetch
+    GET /jobs/{id}/result when it has succeeded. An identical request (same
+    kind, params and project revision) while a job is still queued or running
+    returns that job.
+    """
+    project = await session.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        params = JOB_PARAMS[data.kind].model_validate(data.params).model_dump(mode="json")
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+    job, _ = await job_runner.submit(session, project, data.kind, params)
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    session: AsyncSession = Depends(get_session),
+) -> JobResponse:
+    """Get a job's status and progress."""
+    job = await session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: UUID,
+    session: AsyncSession = Depends(get_session),
+):
+    """Download a finished job's file, or get its JSON result.
+
+    Responds 409 while the job is queued or running, or if it failed.
+    """
+    job = await session.get(Job, job_id, options=[undefer(Job.result_data)])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.result_data is None:
+        return job.result
+    return Response(
+        content=job.result_data,
+        media_type=job.result_media_type,
+        headers={"Content-Disposition": f'attachment; filename="{job.result_filename}"'},
+    )
@@ -11,8 +11,10 @@ from .chords import router as chords_router
 from .clips import router as clips_router
 from .export import router as export_router
 from .generation import router as generation_router
+from .jobs import router as jobs_router
 from .polyrhythm_lanes import router as polyrhythm_lanes_router
 from .polyrhythms import router as polyrhythms_router
+from .previews import router as previews_router
 from .projects import router as projects_router
 from .segments import router as segments_router
 from .suggestions import router as suggestions_router
@@ -29,6 +31,8 @@ router.include_router(tracks_router, prefix="/tracks", tags=["tracks"])
 router.include_router(clips_router, prefix="/clips", tags=["clips"])
 router.include_router(generation_router, prefix="/projects", tags=["generation"])
 router.include_router(export_router, prefix="/projects", tags=["export"])
+router.include_router(jobs_router, prefix="", tags=["jobs"])
+router.include_router(previews_router, prefix="", tags=["previews"])
 router.include_router(polyrhythms_router, prefix="/polyrhythms", tags=["polyrhythms"])
 router.include_router(polyrhythm_lanes_router, prefix="/api/v1", tags=["polyrhythm-lanes"])
 router.include_router(suggestions_router, prefix="", tags=["suggestions"])
@@ -8,14 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from midinecromancer.db.base import get_session
-from midinecromancer.music.polyrhythm import (
-    CycleSpec,
-    GridSpec,
-    LaneSpec,
-    calculate_ratio,
-    lcm_grid_for_lanes,
-    render_lanes_to_events,
-)
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.music.polyrhythm import calculate_ratio, lane_render_key, lcm_grid_for_lanes
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.clip_polyrhythm_lane import ClipPolyrhythmLane
 from midinecromancer.models.polyrhythm_profile import PolyrhythmProfile
@@ -28,8 +22,16 @@ from midinecromancer.schemas.polyrhythm_lane import (
     PolyrhythmLaneUpdate,
     PolyrhythmLanesPreviewResponse,
 )
+from midinecromancer.services.polyrhythm import (
+    invalidate_clip_renders,
+    lane_spec_from_lane,
+    legacy_lane_id,
+    render_clip_lane_events,
+)
+from midinecromancer.services.preview_cache import preview_cache, preview_key
+from midinecromancer.services.snapshot import ClipSnapshot, Needs, ProjectSnapshot
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/clips/{clip_id}/polyrhythm-lanes", response_model=list[PolyrhythmLaneResponse])
@@ -91,6 +93,7 @@ async def create_clip_lane(
         seed_offset=data.seed_offset,
     )
     session.add(lane)
+    await invalidate_clip_renders(session, [clip_id])
     await session.commit()
     await session.refresh(lane)
     return PolyrhythmLaneResponse.model_validate(lane)
@@ -111,6 +114,7 @@ async def update_lane(
     for key, value in update_data.items():
         setattr(lane, key, value)
 
+    await invalidate_clip_renders(session, [lane.clip_id])
     await session.commit()
     await session.refresh(lane)
     return PolyrhythmLaneResponse.model_validate(lane)
@@ -126,6 +130,7 @@ async def delete_lane(
     if not lane:
         raise HTTPException(status_code=404, detail="Lane not found")
 
+    await invalidate_clip_renders(session, [lane.clip_id])
     await session.delete(lane)
     await session.commit()
 
@@ -163,10 +168,8 @@ async def preview_polyrhythm_lanes(
         profile = await session.get(PolyrhythmProfile, clip.polyrhythm_profile_id)
         if profile:
             # Create a temporary lane object for rendering
-            import uuid
-
             virtual_lane = ClipPolyrhythmLane(
-                id=uuid.uuid4(),  # Generate a temporary ID
+                id=legacy_lane_id(clip.id),  # Stable so renders can be cached
                 clip_id=clip.id,
                 polyrhythm_profile_id=profile.id,
                 lane_name="Legacy Lane",
@@ -187,30 +190,10 @@ async def preview_polyrhythm_lanes(
     lane_specs = []
     lane_infos = []
     for lane in lanes_data:
-        profile = lane.polyrhythm_profile
-        cycle = CycleSpec(
-            steps=profile.steps,
-            pulses=profile.pulses,
-            cycle_beats=float(profile.cycle_beats),
-            rotation=profile.rotation,
-            swing=float(profile.swing) if profile.swing is not None else None,
-        )
-
-        lane_spec = LaneSpec(
-            cycle=cycle,
-            lane_id=lane.id,
-            clip_id=clip.id,
-            pitch=lane.pitch,
-            velocity=lane.velocity,
-            mute=lane.mute,
-            solo=lane.solo,
-            order_index=lane.order_index,
-            seed_offset=lane.seed_offset,
-            humanize_ms=profile.humanize_ms,
-        )
+        lane_spec = lane_spec_from_lane(lane, clip.id)
         lane_specs.append(lane_spec)
 
-        ratio = calculate_ratio(cycle)
+        ratio = calculate_ratio(lane_spec.cycle)
         lane_infos.append(
             LanePreviewInfo(
                 lane_id=lane.id,
@@ -223,15 +206,25 @@ async def preview_polyrhythm_lanes(
             )
         )
 
-    # Render events
-    events = render_lanes_to_events(
-        lanes=lane_specs,
-        clip_start_bar=clip.start_bar,
-        clip_length_bars=clip.length_bars,
-        project_bpm=project.bpm,
-        time_signature_num=project.time_signature_num,
-        time_signature_den=project.time_signature_den,
-        base_seed=project.seed,
+    # Render events (cached); the render key covers lanes and profiles, which
+    # the project revision does not, so it stands in for it. The shared render
+    # gets copies of the clip and project rows, not this session's objects
+    render_key = lane_render_key(
+        lane_specs,
+        clip.length_bars,
+        project.bpm,
+        project.time_signature_num,
+        project.time_signature_den,
+        project.seed,
+    )
+    clip_row = ClipSnapshot.from_row(clip)
+    project_row = ProjectSnapshot.from_row(project, needs=Needs.NONE, tracks=())
+    events = await preview_cache.get_or_compute(
+        "polyrhythm-lanes",
+        preview_key("polyrhythm-lanes", None, {"render": render_key, "start_bar": clip.start_bar}),
+        lambda preview_session: render_clip_lane_events(
+            clip_row, project_row, preview_session, lane_specs
+        ),
     )
 
     # Calculate grid spec
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.music.polyrhythm import CycleSpec, render_to_events
 from midinecromancer.music.theory import PPQ
 from midinecromancer.models.polyrhythm_profile import PolyrhythmProfile
@@ -17,8 +18,9 @@ from midinecromancer.schemas.polyrhythm import (
     PolyrhythmProfileUpdate,
     PolyrhythmPreviewRequest,
 )
+from midinecromancer.services.polyrhythm import invalidate_profile_renders, render_cache_stats
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("", response_model=PolyrhythmProfileResponse, status_code=201)
@@ -46,6 +48,12 @@ async def list_polyrhythm_profiles(
     return [PolyrhythmProfileResponse.model_validate(p) for p in profiles]
 
 
+@router.get("/render-cache/stats")
+async def get_render_cache_stats() -> dict:
+    """Hit/miss counters of the lane render cache."""
+    return render_cache_stats()
+
+
 @router.get("/{profile_id}", response_model=PolyrhythmProfileResponse)
 async def get_polyrhythm_profile(
     profile_id: UUID,
@@ -73,6 +81,7 @@ async def update_polyrhythm_profile(
     for key, value in update_data.items():
         setattr(profile, key, value)
 
+    await invalidate_profile_renders(session, profile_id)
     await session.commit()
     await session.refresh(profile)
     return PolyrhythmProfileResponse.model_validate(profile)
@@ -88,6 +97,7 @@ async def delete_polyrhythm_profile(
     if not profile:
         raise HTTPException(status_code=404, detail="Polyrhythm profile not found")
 
+    await invalidate_profile_renders(session, profile_id)
     await session.delete(profile)
     await session.commit()
 
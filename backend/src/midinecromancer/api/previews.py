@@ -0,0 +1,14 @@
+"""Preview cache endpoints."""
+
+from fastapi import APIRouter
+
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.services.preview_cache import preview_cache
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/preview-cache/stats")
+async def get_preview_cache_stats() -> dict:
+    """Hit, coalescing and computation counters of the preview cache."""
+    return preview_cache.stats()
@@ -2,15 +2,17 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
-from midinecromancer.schemas.arrangement import ArrangementResponse
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.schemas.arrangement import ArrangementResponse, EventsWindowResponse
 from midinecromancer.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from midinecromancer.services import payloads
 from midinecromancer.services.project import ProjectService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("", response_model=ProjectResponse, status_code=201)
@@ -61,40 +63,229 @@ async def update_project(
     return ProjectResponse.model_validate(project)
 
 
+_ETAG_VARIANTS = {payloads.COLUMNS_JSON: "columns", payloads.MSGPACK: "msgpack"}
+
+
+def arrangement_etag(
+    project, media_type: str = payloads.JSON, window: tuple[int, int] | None = None
+) -> str:
+    """ETag of a project's arrangement: changes whenever the revision does.
+
+    Compact encodings get their own tag so caches never mix representations,
+    and so does each (from_bar, to_bar) window of the events endpoint.
+    """
+    suffix = "" if media_type == payloads.JSON else f".{_ETAG_VARIANTS[media_type]}"
+    if window is not None:
+        suffix = f".{window[0]}-{window[1]}{suffix}"
+    return f'"{project.id}.{project.revision}{suffix}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/{project_id}/arrangement", response_model=ArrangementResponse)
 async def get_arrangement(
     project_id: UUID,
+    response: Response,
+    since_revision: int | None = Query(default=None, ge=0),
+    from_bar: int | None = Query(default=None, ge=0),
+    to_bar: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> ArrangementResponse:
-    """Get full arrangement (project + tracks + clips + notes + chords)."""
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
+    """Get full arrangement (project + tracks + clips + notes + chords).
 
-    from midinecromancer.models.clip import Clip
-    from midinecromancer.models.chord_event import ChordEvent
-    from midinecromancer.models.note import Note
-    from midinecromancer.models.project import Project
-    from midinecromancer.models.track import Track
+    Responses carry an ETag derived from the project revision; a matching
+    If-None-Match gets 304 without loading any tracks or notes. With
+    since_revision, only clips changed after that revision are included (each
+    track also lists all current clip_ids, so clients can drop deleted clips).
+
+    Long projects can be paged with from_bar/to_bar, then next_cursor: every
+    clip is listed, but only clips overlapping the window carry their notes
+    and chord events (the others have in_window false and empty bodies).
 
-    # Get project
-    result = await session.execute(
-        select(Project).where(Project.id == project_id).options(selectinload(Project.tracks))
+    Clients accepting application/x-msgpack or
+    application/vnd.midinecromancer.columns+json get each clip's notes as
+    parallel arrays instead of a list of objects.
+    """
+    from midinecromancer.models.project import Project
+    from midinecromancer.services.arrangement import (
+        WindowError,
+        project_end_bar,
+        resolve_window,
     )
-    project = result.scalar_one_or_none()
+
+    project = await session.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Get tracks with clips
-    result = await session.execute(
-        select(Track)
-        .where(Track.project_id == project_id)
-        .options(
-            selectinload(Track.clips).selectinload(Clip.notes),
-            selectinload(Track.clips).selectinload(Clip.chord_events),
+    window = None
+    if from_bar is not None or to_bar is not None or cursor is not None:
+        try:
+            window = resolve_window(
+                from_bar, to_bar, cursor, await project_end_bar(session, project)
+            )
+        except WindowError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    media_type = payloads.negotiate(accept)
+    etag = arrangement_etag(project, media_type, window)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+    if media_type != payloads.JSON:
+        document = await build_arrangement_document(session, project, since_revision, window)
+        return payloads.payload_response(document, media_type, {"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Accept"
+    return await build_arrangement(session, project, since_revision, window)
+
+
+@router.get("/{project_id}/events", response_model=EventsWindowResponse)
+async def get_window_events(
+    project_id: UUID,
+    response: Response,
+    from_bar: int = Query(default=0, ge=0),
+    to_bar: int | None = Query(default=None, ge=1),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+) -> EventsWindowResponse:
+    """Get the notes sounding in the bars [from_bar, to_bar) (default: to the end).
+
+    Notes that start before the window but are still held when it opens are
+    included. Only the window's notes are read: row-stored notes are filtered
+    in SQL, packed clips through a cached interval index (see
+    services/event_index.py). ETags and compact media types work as for the
+    arrangement.
+    """
+    from midinecromancer.models.project import Project
+    from midinecromancer.music.ticks import ticks_per_bar
+    from midinecromancer.schemas.arrangement import ClipEventsInWindow, NoteInArrangement
+    from midinecromancer.services.event_index import window_notes
+
+    project = await session.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if to_bar is None:
+        to_bar = max(project.bars, from_bar + 1)
+    if to_bar <= from_bar:
+        raise HTTPException(status_code=422, detail="to_bar must be greater than from_bar")
+
+    media_type = payloads.negotiate(accept)
+    etag = arrangement_etag(project, media_type, (from_bar, to_bar))
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+
+    bar_ticks = ticks_per_bar(project.time_signature_num, project.time_signature_den)
+    compact = media_type != payloads.JSON
+    clips = []
+    for clip, base_tick, notes in await window_notes(session, project, from_bar, to_bar):
+        clip_events = ClipEventsInWindow(
+            id=clip.id,
+            track_id=clip.track_id,
+            start_bar=clip.start_bar,
+            length_bars=clip.length_bars,
+            is_muted=clip.is_muted,
+            is_soloed=clip.is_soloed,
+            start_offset_ticks=clip.start_offset_ticks,
+            revision=clip.revision,
+            base_tick=base_tick,
+            notes=[] if compact else [NoteInArrangement.model_validate(note) for note in notes],
         )
-        .order_by(Track.created_at)
+        if compact:
+            clip_events = clip_events.model_dump(mode="json")
+            clip_events["notes"] = payloads.note_columns(notes)
+        clips.append(clip_events)
+
+    window = EventsWindowResponse(
+        project_id=project.id,
+        revision=project.revision,
+        from_bar=from_bar,
+        to_bar=to_bar,
+        from_tick=from_bar * bar_ticks,
+        to_tick=to_bar * bar_ticks,
+        clips=[] if compact else clips,
+    )
+    if compact:
+        document = window.model_dump(mode="json")
+        document["clips"] = clips
+        return payloads.payload_response(document, media_type, {"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Accept"
+    return window
+
+
+async def _load_arrangement(
+    session: AsyncSession,
+    project,
+    since_revision: int | None,
+    window: tuple[int, int] | None = None,
+):
+    """Load tracks and clips (with notes and chord events) of a project.
+
+    With a bar window, only clips overlapping it get their notes and chord
+    events loaded; the rest are loaded without bodies.
+
+    Returns:
+        (tracks, clips by track id, all clip ids by track id for delta
+        responses, ids of clips with bodies or None when not windowed)
+    """
+    from midinecromancer.services.snapshot import Needs, load_project_snapshot
+
+    snapshot = await load_project_snapshot(
+        session,
+        project,
+        Needs.NOTES | Needs.CHORD_EVENTS,
+        window=window,
+        since_revision=since_revision,
     )
-    tracks = list(result.scalars().all())
+    tracks = list(snapshot.tracks)
+    clip_ids_by_track: dict[UUID, list[UUID]] = {}
+    clips_by_track = {}
+    for track in tracks:
+        clips = track.clips
+        if since_revision is not None:
+            clip_ids_by_track[track.id] = [clip.id for clip in clips]
+            clips = [clip for clip in clips if clip.revision > since_revision]
+        clips_by_track[track.id] = list(clips)
+    body_clip_ids = None
+    if window is not None:
+        body_clip_ids = {clip.id for clip in snapshot.iter_clips() if clip.has_body}
+    return tracks, clips_by_track, clip_ids_by_track, body_clip_ids
+
+
+async def build_arrangement(
+    session: AsyncSession,
+    project,
+    since_revision: int | None = None,
+    window: tuple[int, int] | None = None,
+) -> ArrangementResponse:
+    """Build the arrangement of a loaded project.
+
+    Args:
+        session: Database session
+        project: Project to build
+        since_revision: If set, include only clips with a higher revision
+        window: If set, (from_bar, to_bar); only clips overlapping it get bodies
+
+    Returns:
+        Arrangement response
+    """
+    from midinecromancer.services.arrangement import next_cursor, project_end_bar
+    from midinecromancer.services.note_store import get_clip_notes
+
+    tracks, clips_by_track, clip_ids_by_track, body_clip_ids = await _load_arrangement(
+        session, project, since_revision, window
+    )
+    page_cursor = None
+    if window is not None:
+        page_cursor = next_cursor(window, await project_end_bar(session, project))
 
     # Build response
     from midinecromancer.schemas.arrangement import (
@@ -107,15 +298,19 @@ async def get_arrangement(
     track_responses = []
     for track in tracks:
         clip_responses = []
-        for clip in track.clips:
-            note_responses = [
-                NoteInArrangement.model_validate(note)
-                for note in sorted(clip.notes, key=lambda n: n.start_tick)
-            ]
-            chord_responses = [
-                ChordEventInArrangement.model_validate(ce)
-                for ce in sorted(clip.chord_events, key=lambda ce: ce.start_tick)
-            ]
+        for clip in clips_by_track.get(track.id, []):
+            in_window = body_clip_ids is None or clip.id in body_clip_ids
+            note_responses = []
+            chord_responses = []
+            if in_window:
+                note_responses = [
+                    NoteInArrangement.model_validate(note)
+                    for note in sorted(get_clip_notes(clip), key=lambda n: n.start_tick)
+                ]
+                chord_responses = [
+                    ChordEventInArrangement.model_validate(ce)
+                    for ce in sorted(clip.chord_events, key=lambda ce: ce.start_tick)
+                ]
             clip_responses.append(
                 ClipInArrangement(
                     id=clip.id,
@@ -124,6 +319,8 @@ async def get_arrangement(
                     is_muted=clip.is_muted,
                     is_soloed=clip.is_soloed,
                     start_offset_ticks=clip.start_offset_ticks,
+                    revision=clip.revision,
+                    in_window=in_window,
                     notes=note_responses,
                     chord_events=chord_responses,
                 )
@@ -139,6 +336,9 @@ async def get_arrangement(
                 is_soloed=track.is_soloed,
                 start_offset_ticks=track.start_offset_ticks,
                 clips=clip_responses,
+                clip_ids=(
+                    clip_ids_by_track.get(track.id, []) if since_revision is not None else None
+                ),
             )
         )
 
@@ -152,5 +352,107 @@ async def get_arrangement(
         key_tonic=project.key_tonic,
         mode=project.mode,
         seed=project.seed,
+        revision=project.revision,
+        since_revision=since_revision,
+        from_bar=window[0] if window else None,
+        to_bar=window[1] if window else None,
+        next_cursor=page_cursor,
         tracks=track_responses,
     )
+
+
+async def build_arrangement_document(
+    session: AsyncSession,
+    project,
+    since_revision: int | None = None,
+    window: tuple[int, int] | None = None,
+) -> dict:
+    """Build the arrangement as a plain dict with column-wise notes.
+
+    Same fields as build_arrangement(), except each clip's "notes" holds
+    payloads.note_columns(). Notes are never turned into Pydantic models.
+
+    Args:
+        session: Database session
+        project: Project to build
+        since_revision: If set, include only clips with a higher revision
+        window: If set, (from_bar, to_bar); only clips overlapping it get bodies
+
+    Returns:
+        JSON-compatible arrangement document
+    """
+    from midinecromancer.schemas.arrangement import (
+        ChordEventInArrangement,
+        ClipInArrangement,
+        TrackInArrangement,
+    )
+    from midinecromancer.services.arrangement import next_cursor, project_end_bar
+    from midinecromancer.services.note_store import get_clip_notes
+
+    tracks, clips_by_track, clip_ids_by_track, body_clip_ids = await _load_arrangement(
+        session, project, since_revision, window
+    )
+    page_cursor = None
+    if window is not None:
+        page_cursor = next_cursor(window, await project_end_bar(session, project))
+
+    track_documents = []
+    for track in tracks:
+        clip_documents = []
+        for clip in clips_by_track.get(track.id, []):
+            in_window = body_clip_ids is None or clip.id in body_clip_ids
+            clip_document = ClipInArrangement(
+                id=clip.id,
+                start_bar=clip.start_bar,
+                length_bars=clip.length_bars,
+                is_muted=clip.is_muted,
+                is_soloed=clip.is_soloed,
+                start_offset_ticks=clip.start_offset_ticks,
+                revision=clip.revision,
+                in_window=in_window,
+                notes=[],
+                chord_events=[
+                    ChordEventInArrangement.model_validate(ce)
+                    for ce in sorted(clip.chord_events, key=lambda ce: ce.start_tick)
+                ]
+                if in_window
+                else [],
+            ).model_dump(mode="json")
+            clip_document["notes"] = payloads.note_columns(
+                sorted(get_clip_notes(clip), key=lambda n: n.start_tick) if in_window else []
+            )
+            clip_documents.append(clip_document)
+        track_document = TrackInArrangement(
+            id=track.id,
+            name=track.name,
+            role=track.role,
+            midi_channel=track.midi_channel,
+            midi_program=track.midi_program,
+            is_muted=track.is_muted,
+            is_soloed=track.is_soloed,
+            start_offset_ticks=track.start_offset_ticks,
+            clips=[],
+            clip_ids=clip_ids_by_track.get(track.id, []) if since_revision is not None else None,
+        ).model_dump(mode="json")
+        track_document["clips"] = clip_documents
+        track_documents.append(track_document)
+
+    document = ArrangementResponse(
+        project_id=project.id,
+        project_name=project.name,
+        bpm=project.bpm,
+        time_signature_num=project.time_signature_num,
+        time_signature_den=project.time_signature_den,
+        bars=project.bars,
+        key_tonic=project.key_tonic,
+        mode=project.mode,
+        seed=project.seed,
+        revision=project.revision,
+        since_revision=since_revision,
+        from_bar=window[0] if window else None,
+        to_bar=window[1] if window else None,
+        next_cursor=page_cursor,
+        tracks=[],
+    ).model_dump(mode="json")
+    document["tracks"] = track_documents
+    return document
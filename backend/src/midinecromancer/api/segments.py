@@ -1,33 +1,114 @@
 """Segment generation endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
-from midinecromancer.schemas.segment import SegmentCreateRequest, SegmentGenerateResponse
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.schemas.segment import (
+    SegmentCreateRequest,
+    SegmentGenerateResponse,
+    SegmentPreviewBatchRequest,
+    SegmentPreviewBatchResponse,
+)
+from midinecromancer.services import payloads
 from midinecromancer.services.segments import SegmentService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/segments/generate", response_model=SegmentGenerateResponse)
 async def generate_segments(
     request: SegmentCreateRequest,
+    accept: str | None = Header(default=None),
     session: AsyncSession = Depends(get_session),
 ) -> SegmentGenerateResponse:
     """Generate segments (clips with content).
 
-    If preview=true, returns preview data without DB writes.
+    If preview=true, returns preview data without DB writes; identical
+    previews of the same project revision share one computation
+    (services/preview_cache.py).
     If preview=false, creates clips and persists to DB.
+
+    Clients accepting a compact media type (see services/payloads.py) get
+    events_by_clip as parallel arrays per clip.
     """
-    service = SegmentService(session)
+    from midinecromancer.services.preview_cache import (
+        preview_cache,
+        preview_key,
+        project_revision,
+    )
+
     try:
-        result = await service.generate_segments(request)
-        if not request.preview:
+        if request.preview:
+            key = preview_key(
+                "segments-preview",
+                await project_revision(session, request.project_id),
+                request.model_dump(mode="json"),
+            )
+            result = await preview_cache.get_or_compute(
+                "segments-preview",
+                key,
+                lambda preview_session: SegmentService(preview_session).generate_segments(request),
+            )
+        else:
+            result = await SegmentService(session).generate_segments(request)
             await session.commit()
+        media_type = payloads.negotiate(accept)
+        if media_type != payloads.JSON:
+            document = result.model_dump(mode="json", exclude={"events_by_clip"})
+            document["events_by_clip"] = {
+                clip_id: payloads.event_columns(events)
+                for clip_id, events in result.events_by_clip.items()
+            }
+            return payloads.payload_response(document, media_type)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         await session.rollback()
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
+
+
+@router.post("/segments/preview-batch", response_model=SegmentPreviewBatchResponse)
+async def preview_segments_batch(
+    request: SegmentPreviewBatchRequest,
+    accept: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+) -> SegmentPreviewBatchResponse:
+    """Preview segments for several seeds at once, without writing clips.
+
+    Each variant references its event lists by index into event_lists, where
+    identical lists appear once. Compact media types encode each list as
+    parallel arrays. Identical batches of the same project revision share one
+    computation (services/preview_cache.py).
+    """
+    from midinecromancer.services.preview_cache import (
+        preview_cache,
+        preview_key,
+        project_revision,
+    )
+
+    try:
+        key = preview_key(
+            "segments",
+            await project_revision(session, request.project_id),
+            request.model_dump(mode="json"),
+        )
+        result = await preview_cache.get_or_compute(
+            "segments",
+            key,
+            lambda preview_session: SegmentService(preview_session).preview_variants(request),
+        )
+        media_type = payloads.negotiate(accept)
+        if media_type != payloads.JSON:
+            document = result.model_dump(mode="json", exclude={"event_lists"})
+            document["event_lists"] = [
+                payloads.event_columns(events) for events in result.event_lists
+            ]
+            return payloads.payload_response(document, media_type)
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
@@ -2,18 +2,16 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from midinecromancer.db.base import get_session
-from midinecromancer.music.analysis import analyze_project
-from midinecromancer.music.suggest import generate_all_suggestions
-from midinecromancer.models.project import Project
+from midinecromancer.metrics import TimedRoute
+from midinecromancer.music.suggest import SuggestionContext, suggestion_at
 from midinecromancer.models.suggestion import Suggestion
 from midinecromancer.models.suggestion_run import SuggestionRun
-from midinecromancer.models.track import Track
 from midinecromancer.schemas.suggestion import (
     PreviewRequest,
     PreviewResponse,
@@ -23,9 +21,11 @@ from midinecromancer.schemas.suggestion import (
     SuggestionRunResponse,
     SuggestionResponse,
 )
+from midinecromancer.services.clip_analysis import analyze_project_snapshot
+from midinecromancer.services.snapshot import Needs, load_project_snapshot
 from midinecromancer.services.suggestions import SuggestionService
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/suggestions/run", response_model=SuggestionRunResponse, status_code=201)
@@ -40,6 +40,8 @@ async def create_suggestion_run(
             project_id=data.project_id,
             seed=data.seed,
             params=data.params,
+            kinds=data.kinds,
+            limit=data.limit,
         )
         # Reload with suggestions
         result = await session.execute(
@@ -70,6 +72,22 @@ async def get_suggestion_run(
     return SuggestionRunResponse.model_validate(run)
 
 
+@router.get("/suggestions/runs/{run_id}/suggestions", response_model=list[SuggestionResponse])
+async def list_run_suggestions(
+    run_id: UUID,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    session: AsyncSession = Depends(get_session),
+) -> list[SuggestionResponse]:
+    """Page through a run's suggestions, best first."""
+    service = SuggestionService(session)
+    try:
+        suggestions = await service.list_suggestions(run_id, offset, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return [SuggestionResponse.model_validate(suggestion) for suggestion in suggestions]
+
+
 @router.post("/suggestions/{suggestion_id}/commit", response_model=SuggestionCommitResponse)
 async def commit_suggestion(
     suggestion_id: UUID,
@@ -89,34 +107,20 @@ async def preview_suggestion(
     request: PreviewRequest,
     session: AsyncSession = Depends(get_session),
 ) -> PreviewResponse:
-    """Preview a suggestion without persisting."""
-    # Get project
-    result = await session.execute(
-        select(Project)
-        .where(Project.id == request.project_id)
-        .options(selectinload(Project.tracks).selectinload(Track.clips))
-    )
-    project = result.scalar_one_or_none()
-    if not project:
+    """Preview one suggestion without persisting.
+
+    Only the requested suggestion (request.index of request.kind) is built,
+    and only chord events are loaded (the analysis comes from the stored clip
+    summaries).
+    """
+    snapshot = await load_project_snapshot(session, request.project_id, Needs.CHORD_EVENTS)
+    if snapshot is None:
         raise HTTPException(status_code=404, detail="Project not found")
+    project = snapshot
+    tracks = list(snapshot.tracks)
 
-    # Get tracks with clips
-    from midinecromancer.models.clip import Clip
-
-    result = await session.execute(
-        select(Track)
-        .where(Track.project_id == request.project_id)
-        .options(
-            selectinload(Track.clips).selectinload(Clip.chord_events),
-            selectinload(Track.clips).selectinload(Clip.notes),
-        )
-    )
-    tracks = list(result.scalars().all())
-
-    # Analyze
-    from midinecromancer.music.analysis import analyze_project
-
-    analysis = analyze_project(project, tracks)
+    # Analyze (rhythmic density is not part of previews)
+    analysis = await analyze_project_snapshot(session, snapshot, density=False)
 
     # Collect data
     chord_events = []
@@ -125,60 +129,22 @@ async def preview_suggestion(
             for clip in track.clips:
                 chord_events.extend(clip.chord_events)
 
-    # Generate single suggestion of requested kind
     seed = request.seed if request.seed is not None else project.seed
-
-    if request.kind == "harmony":
-        from midinecromancer.music.suggest import generate_harmony_suggestions
-
-        suggestions = generate_harmony_suggestions(
-            analysis,
-            request.project_id,
-            seed,
-            project.bars,
-            project.time_signature_num,
-            project.time_signature_den,
-            project.bpm,
-            chord_events,
-            request.params.get("complexity", 0.5),
-            request.params.get("tension", 0.5),
-        )
-    elif request.kind == "rhythm":
-        from midinecromancer.music.suggest import generate_rhythm_suggestions
-
-        suggestions = generate_rhythm_suggestions(
-            analysis,
-            request.project_id,
-            seed,
-            project.bars,
-            project.time_signature_num,
-            project.time_signature_den,
-            project.bpm,
-            None,
-            request.params.get("density", 0.5),
-        )
-    elif request.kind == "melody":
-        from midinecromancer.music.suggest import generate_melody_suggestions
-
-        suggestions = generate_melody_suggestions(
-            analysis,
-            request.project_id,
-            seed,
-            project.bars,
-            project.time_signature_num,
-            project.time_signature_den,
-            project.bpm,
-            chord_events,
-            request.params.get("complexity", 0.5),
-        )
-    else:
-        raise HTTPException(status_code=400, detail=f"Invalid kind: {request.kind}")
-
-    if not suggestions:
+    context = SuggestionContext.from_params(
+        request.params,
+        analysis=analysis,
+        project_id=request.project_id,
+        project_seed=seed,
+        bars=project.bars,
+        time_signature_num=project.time_signature_num,
+        time_signature_den=project.time_signature_den,
+        bpm=project.bpm,
+        chord_events=chord_events,
+    )
+    sug = suggestion_at(context, request.kind, request.index)
+    if sug is None:
         raise HTTPException(status_code=404, detail="No suggestions generated")
 
-    # Return first suggestion
-    sug = suggestions[0]
     return PreviewResponse(
         explanation=sug.explanation,
         preview_events=[
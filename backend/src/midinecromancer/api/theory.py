@@ -7,10 +7,11 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from midinecromancer.db.base import get_session
+from midinecromancer.metrics import TimedRoute
 from midinecromancer.models.project import Project
-from midinecromancer.music.theory import Mode, roman_to_degree
+from midinecromancer.music.theory import Mode, roman_to_chord_name
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 class DiatonicChord(BaseModel):
@@ -25,56 +26,7 @@ class DiatonicChord(BaseModel):
 
 def _roman_to_chord_name(roman: str, tonic: str, mode: Mode) -> str:
     """Convert roman numeral to chord name."""
-    degree = roman_to_degree(roman)
-    tonic_pc_map = {
-        "C": 0,
-        "C#": 1,
-        "D": 2,
-        "D#": 3,
-        "E": 4,
-        "F": 5,
-        "F#": 6,
-        "G": 7,
-        "G#": 8,
-        "A": 9,
-        "A#": 10,
-        "B": 11,
-        "Bb": 10,
-        "Eb": 3,
-        "Ab": 8,
-        "Db": 1,
-        "Gb": 6,
-    }
-    tonic_pc = tonic_pc_map.get(tonic, 0)
-    intervals = {
-        "ionian": [0, 2, 4, 5, 7, 9, 11],
-        "dorian": [0, 2, 3, 5, 7, 9, 10],
-        "phrygian": [0, 1, 3, 5, 7, 8, 10],
-        "lydian": [0, 2, 4, 6, 7, 9, 11],
-        "mixolydian": [0, 2, 4, 5, 7, 9, 10],
-        "aeolian": [0, 2, 3, 5, 7, 8, 10],
-        "locrian": [0, 1, 3, 5, 6, 8, 10],
-    }
-    mode_intervals = intervals.get(mode, intervals["ionian"])
-    root_pc = (tonic_pc + mode_intervals[degree - 1]) % 12
-
-    pc_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-    root_name = pc_names[root_pc]
-
-    # Determine quality based on mode
-    if mode == "ionian":
-        qualities = {1: "", 2: "m", 3: "m", 4: "", 5: "", 6: "m", 7: "dim"}
-    elif mode == "aeolian":
-        qualities = {1: "m", 2: "dim", 3: "", 4: "m", 5: "m", 6: "", 7: ""}
-    else:
-        # Default for other modes
-        qualities = {1: "", 2: "m", 3: "m", 4: "", 5: "", 6: "m", 7: "dim"}
-
-    quality = qualities.get(degree, "")
-    if "7" in roman:
-        quality += "7"
-
-    return root_name + quality
+    return roman_to_chord_name(roman, tonic, mode)
 
 
 @router.get("/theory/chords", response_model=list[DiatonicChord])
@@ -1,6 +1,8 @@
 """Application configuration."""
 
 import os
+from typing import Literal
+
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -13,6 +15,45 @@ class Settings(BaseSettings):
     )
     environment: str = "development"
     debug: bool = True
+    # Connection pool: "queue" keeps connections open between requests, "null"
+    # opens one per session (for pgbouncer in transaction pooling mode).
+    # Sizes are per process, so gunicorn holds workers * (size + overflow).
+    db_pool: Literal["queue", "null"] = "queue"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds, -1 to never recycle
+    db_pool_pre_ping: bool = True
+    # Prepared statements cached per asyncpg connection (0 disables, as
+    # pgbouncer in transaction mode requires)
+    db_statement_cache_size: int = 500
+    # Pool connections opened at startup (capped at db_pool_size)
+    db_warmup_connections: int = 2
+    # How newly generated clip notes are stored: "rows" (one Note row per note)
+    # or "packed" (one ClipNoteBlock per clip)
+    note_storage: Literal["rows", "packed"] = "rows"
+    # Polyrhythm lane renders kept in memory (LRU entries), and whether renders
+    # are also persisted to the polyrhythm_renders table
+    polyrhythm_render_cache_size: int = 256
+    polyrhythm_render_cache_persist: bool = False
+    # Interval indexes of packed clips kept in memory for windowed note queries
+    event_index_cache_size: int = 256
+    # Preview results kept in memory (LRU entries) and for how long (seconds);
+    # identical concurrent previews share one computation either way
+    preview_cache_size: int = 256
+    preview_cache_ttl: float = 30.0
+    # Worker processes for part generation (generate_full, segments); 0 runs
+    # the generators inline in the request process
+    generation_workers: int = 0
+    # Background jobs (services/jobs.py) run at once per process; more wait
+    # queued, so heavy work never holds more than this many DB connections
+    job_workers: int = 2
+    # Queued/running jobs older than this (seconds) are no longer joined by
+    # identical requests, e.g. ones left behind by a crashed process
+    job_stale_seconds: int = 3600
+    # Add a Server-Timing header (db, gen, ser, total) to every response; on
+    # whenever debug is
+    server_timing: bool = False
     # Don't read CORS_ORIGINS from env directly - parse it manually
     _cors_origins_env: str | None = None
 
@@ -1,16 +1,79 @@
 """Database base configuration."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+import uuid
+from contextlib import AsyncExitStack
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 
-from midinecromancer.config import settings
+from midinecromancer.config import Settings, settings
+from midinecromancer.metrics import record_query
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    poolclass=NullPool,
-)
+
+def engine_options(config: Settings) -> dict:
+    """Keyword arguments for create_async_engine from settings.
+
+    Args:
+        config: Application settings
+
+    Returns:
+        Pool and driver options for config.database_url
+    """
+    options: dict = {"echo": config.debug}
+    if config.db_pool == "null":
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
+            pool_pre_ping=config.db_pool_pre_ping,
+        )
+
+    if make_url(config.database_url).get_driver_name() == "asyncpg":
+        connect_args: dict = {"prepared_statement_cache_size": config.db_statement_cache_size}
+        if config.db_statement_cache_size == 0:
+            # pgbouncer may hand each statement a different server connection,
+            # so nothing can be cached and statement names must not collide
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        options["connect_args"] = connect_args
+    return options
+
+
+def instrument_engine(db_engine: AsyncEngine) -> None:
+    """Report every statement's duration and returned rows to the request metrics.
+
+    Statements run outside a request (startup, background jobs) are not counted.
+
+    Args:
+        db_engine: Engine whose cursor executions are timed
+    """
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(db_engine.sync_engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info.pop("query_start")) * 1000
+        # rowcount is the number of rows a SELECT (or RETURNING) produced
+        rows = max(cursor.rowcount, 0) if cursor.description is not None else 0
+        record_query(elapsed_ms, rows)
+
+
+engine = create_async_engine(settings.database_url, **engine_options(settings))
+instrument_engine(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -29,7 +92,39 @@ async def get_session():
         yield session
 
 
+async def warm_up_pool(db_engine: AsyncEngine = engine, connections: int | None = None) -> int:
+    """Open pooled connections before the first request needs them.
+
+    Connections are held at the same time so the pool really grows to the
+    requested size, then returned. With NullPool one connection is opened to
+    check the database is reachable.
+
+    Args:
+        db_engine: Engine to warm up
+        connections: Connections to open (default: settings.db_warmup_connections,
+            capped at the pool size)
+
+    Returns:
+        Number of connections opened
+    """
+    if connections is None:
+        connections = settings.db_warmup_connections
+    if isinstance(db_engine.pool, NullPool):
+        connections = min(connections, 1)
+    else:
+        connections = min(connections, db_engine.pool.size())
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(db_engine.connect())
+            await conn.execute(text("SELECT 1"))
+    return connections
+
+
 async def init_db() -> None:
     """Initialize database (create tables)."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+# Revision listeners need Base, so they are registered after it is defined
+from midinecromancer.db import revisions  # noqa: E402, F401
@@ -0,0 +1,141 @@
+"""Bulk persistence for generated notes and chord events.
+
+Generated content is written with Core inserts instead of one ORM object per
+row, skipping unit-of-work bookkeeping. Large note batches on asyncpg use
+COPY (copy_records_to_table); everything else goes through a multi-row
+INSERT, which SQLAlchemy pages into batched VALUES statements.
+
+Rows inserted here are not attached to the session: relationship collections
+already loaded in the session (e.g. clip.notes) are not updated. Owning clips
+are reported to db/revisions.py, since these inserts bypass the ORM.
+"""
+
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from midinecromancer.db.revisions import mark_clips_changed
+from midinecromancer.models.chord_event import ChordEvent
+from midinecromancer.models.note import Note
+
+# Below this many rows a plain INSERT is as fast as COPY
+COPY_THRESHOLD = 2000
+
+_NOTE_COLUMNS = (
+    "id",
+    "clip_id",
+    "pitch",
+    "velocity",
+    "start_tick",
+    "duration_tick",
+    "probability",
+    "created_at",
+)
+
+
+def note_rows(
+    clip_id: uuid.UUID, events: Iterable[Any], tick_offset: int = 0
+) -> list[dict[str, Any]]:
+    """Build insert rows for notes.
+
+    Args:
+        clip_id: Owning clip
+        events: Dicts with pitch/velocity/start_tick/duration_tick (and optional
+            probability) keys, or objects with those attributes
+        tick_offset: Added to every start_tick
+
+    Returns:
+        Row dicts with every notes column populated
+    """
+    now = datetime.utcnow()
+    rows = []
+    for event in events:
+        if isinstance(event, dict):
+            pitch = event["pitch"]
+            velocity = event["velocity"]
+            start_tick = event["start_tick"]
+            duration_tick = event["duration_tick"]
+            probability = event.get("probability", 1.0)
+        else:
+            pitch = event.pitch
+            velocity = event.velocity
+            start_tick = event.start_tick
+            duration_tick = event.duration_tick
+            probability = getattr(event, "probability", 1.0)
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "clip_id": clip_id,
+                "pitch": pitch,
+                "velocity": velocity,
+                "start_tick": start_tick + tick_offset,
+                "duration_tick": duration_tick,
+                "probability": 1.0 if probability is None else probability,
+                "created_at": now,
+            }
+        )
+    return rows
+
+
+async def _copy_records(
+    session: AsyncSession, table: str, columns: Sequence[str], rows: list[dict[str, Any]]
+) -> bool:
+    """COPY rows through the session's asyncpg connection.
+
+    Returns:
+        False if the session is not backed by asyncpg (nothing was written)
+    """
+    connection = await session.connection()
+    if connection.dialect.driver != "asyncpg":
+        return False
+    raw = await connection.get_raw_connection()
+    records = [tuple(row[column] for column in columns) for row in rows]
+    await raw.driver_connection.copy_records_to_table(table, records=records, columns=columns)
+    return True
+
+
+async def bulk_insert_notes(session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+    """Insert note rows built by note_rows().
+
+    Owning clips must already be flushed.
+
+    Args:
+        session: Database session
+        rows: Note row dicts
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    mark_clips_changed(session, {row["clip_id"] for row in rows})
+    if len(rows) >= COPY_THRESHOLD and await _copy_records(
+        session, Note.__tablename__, _NOTE_COLUMNS, rows
+    ):
+        return len(rows)
+    await session.execute(insert(Note), rows)
+    return len(rows)
+
+
+async def bulk_insert_chord_events(session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+    """Insert chord event rows.
+
+    Columns left out of a row get the model's Python-side defaults. Chord
+    batches are one row per chord, so they always use INSERT rather than COPY.
+
+    Args:
+        session: Database session
+        rows: Dicts of ChordEvent column values; each needs clip_id
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    mark_clips_changed(session, {row["clip_id"] for row in rows})
+    await session.execute(insert(ChordEvent), rows)
+    return len(rows)
@@ -0,0 +1,169 @@
+"""Project and clip revision counters.
+
+Every commit that changes a project's arrangement bumps projects.revision by
+one and stamps each changed clip with the new value (clips.revision), so
+clients can ask for "clips changed since revision N" and use the project
+revision as an ETag.
+
+Changes are picked up automatically from ORM objects flushed in the session.
+Core statements (bulk inserts, bulk deletes) bypass the ORM and must report
+what they touched with mark_clips_changed() / mark_tracks_changed().
+"""
+
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from midinecromancer.db.base import Base
+
+_PENDING_KEY = "revision_changes"
+
+# Tables whose rows belong to one clip (via clip_id)
+_CLIP_CHILD_TABLES = {"notes", "chord_events", "clip_note_blocks"}
+
+
+class _Changes:
+    """Changes collected since the last commit of a session."""
+
+    __slots__ = ("project_ids", "track_ids", "clip_ids")
+
+    def __init__(self):
+        self.project_ids: set[UUID] = set()
+        self.track_ids: set[UUID] = set()
+        self.clip_ids: set[UUID] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.project_ids or self.track_ids or self.clip_ids)
+
+
+def _changes(session: Session) -> _Changes:
+    changes = session.info.get(_PENDING_KEY)
+    if changes is None:
+        changes = session.info[_PENDING_KEY] = _Changes()
+    return changes
+
+
+def _sync_session(session: AsyncSession | Session) -> Session:
+    return session.sync_session if isinstance(session, AsyncSession) else session
+
+
+def mark_clips_changed(session: AsyncSession | Session, clip_ids: Iterable[UUID]) -> None:
+    """Record clips changed by a Core statement.
+
+    Args:
+        session: Session the statement ran in
+        clip_ids: Changed clips (existing, new or just deleted)
+    """
+    _changes(_sync_session(session)).clip_ids.update(clip_ids)
+
+
+def mark_tracks_changed(session: AsyncSession | Session, track_ids: Iterable[UUID]) -> None:
+    """Record tracks whose clips were changed by a Core statement.
+
+    Args:
+        session: Session the statement ran in
+        track_ids: Tracks (which must still exist at commit)
+    """
+    _changes(_sync_session(session)).track_ids.update(track_ids)
+
+
+def has_pending_changes(session: AsyncSession | Session) -> bool:
+    """Whether the session holds changes not committed yet (flushed or not)."""
+    sync_session = _sync_session(session)
+    return bool(
+        sync_session.info.get(_PENDING_KEY)
+        or sync_session.new
+        or sync_session.dirty
+        or sync_session.deleted
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, flush_context) -> None:
+    changes = None
+    for kind, objects in (
+        ("new", session.new),
+        ("dirty", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table is None:
+                continue
+            if kind == "dirty" and not session.is_modified(obj, include_collections=False):
+                continue
+            if changes is None:
+                changes = _changes(session)
+            if table == "projects":
+                # A new project starts at revision 0
+                if kind != "new":
+                    changes.project_ids.add(obj.id)
+            elif table == "tracks":
+                changes.project_ids.add(obj.project_id)
+            elif table == "clips":
+                changes.clip_ids.add(obj.id)
+                # Resolves the project of a deleted clip
+                changes.track_ids.add(obj.track_id)
+            elif table in _CLIP_CHILD_TABLES:
+                changes.clip_ids.add(obj.clip_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_revisions(session: Session) -> None:
+    # Collect whatever the commit is about to flush
+    session.flush()
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+
+    projects = Base.metadata.tables["projects"]
+    tracks = Base.metadata.tables["tracks"]
+    clips = Base.metadata.tables["clips"]
+
+    clip_projects: dict[UUID, UUID] = {}
+    if changes.clip_ids:
+        rows = session.execute(
+            select(clips.c.id, tracks.c.project_id)
+            .join(tracks, tracks.c.id == clips.c.track_id)
+            .where(clips.c.id.in_(changes.clip_ids))
+        )
+        clip_projects = dict(rows.all())
+    project_ids = set(changes.project_ids) | set(clip_projects.values())
+    if changes.track_ids:
+        rows = session.execute(
+            select(tracks.c.project_id).where(tracks.c.id.in_(changes.track_ids))
+        )
+        project_ids.update(rows.scalars())
+    if not project_ids:
+        return
+
+    rows = session.execute(
+        update(projects)
+        .where(projects.c.id.in_(project_ids))
+        .values(revision=projects.c.revision + 1)
+        .returning(projects.c.id, projects.c.revision)
+    )
+    revisions = dict(rows.all())
+
+    clips_by_revision: dict[int, list[UUID]] = {}
+    for clip_id, project_id in clip_projects.items():
+        clips_by_revision.setdefault(revisions[project_id], []).append(clip_id)
+    for revision, clip_ids in clips_by_revision.items():
+        session.execute(update(clips).where(clips.c.id.in_(clip_ids)).values(revision=revision))
+
+    # Keep loaded objects in step without expiring them
+    for obj in session.identity_map.values():
+        table = getattr(obj, "__tablename__", None)
+        if table == "projects" and obj.id in revisions:
+            set_committed_value(obj, "revision", revisions[obj.id])
+        elif table == "clips" and obj.id in clip_projects:
+            set_committed_value(obj, "revision", revisions[clip_projects[obj.id]])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
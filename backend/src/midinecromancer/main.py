@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -7,14 +8,32 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from midinecromancer.api.main import router
 from midinecromancer.config import settings
+from midinecromancer.db.base import engine, warm_up_pool
+from midinecromancer.metrics import MetricsMiddleware, render_metrics
+from midinecromancer.services.generation_pool import (
+    shutdown_generation_executor,
+    start_generation_executor,
+)
+from midinecromancer.services.jobs import job_runner
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup
+    # Startup: open pool connections so early requests skip the connect handshake
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        # The database may still be starting; connections are opened on demand
+        logger.warning("Database pool warm-up failed: %s", e)
+    await start_generation_executor()
     yield
-    # Shutdown
+    # Shutdown: background jobs still running are marked failed
+    await job_runner.shutdown()
+    shutdown_generation_executor()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -33,6 +52,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL, generator and serialization metrics (added last, so it also
+# times the CORS middleware)
+app.add_middleware(
+    MetricsMiddleware,
+    server_timing=settings.server_timing or settings.debug,
+    exclude=("/metrics",),
+)
+
 # Include routers
 app.include_router(router, prefix="/api/v1")
 
@@ -47,3 +74,9 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Request metrics per endpoint in the Prometheus text format."""
+    return render_metrics()
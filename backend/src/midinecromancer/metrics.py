@@ -0,0 +1,339 @@
+"""Per-request instrumentation and the Prometheus /metrics surface.
+
+MetricsMiddleware gives every HTTP request a RequestMetrics record (held in a
+context variable, so tasks started by the request add to it as well):
+
+- queries, db_ms and rows come from the engine's cursor events (db/base.py);
+  rows counts rows returned by SELECTs (and RETURNING clauses)
+- gen_ms is time spent in the part generators (services/generation_pool.py)
+- serialize_ms is time spent encoding the response: Pydantic serialization of
+  endpoint results (TimedRoute) and compact payload encoding
+  (services/payloads.py)
+
+At the end of the request the record is added to per-endpoint totals and
+histograms, keyed by method and endpoint function (e.g.
+"projects.get_arrangement", never the raw path), which render_metrics()
+exposes in the Prometheus text format. With settings.server_timing the
+response also carries a Server-Timing header with the same phases.
+"""
+
+import inspect
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Endpoint label of requests that matched no route, so 404 scans add one series
+UNMATCHED = "<unmatched>"
+
+
+def endpoint_label(endpoint: Callable[..., Any]) -> str:
+    """Metrics label of an endpoint function: API module and function name."""
+    module = getattr(endpoint, "__module__", "") or ""
+    return f"{module.rsplit('.', 1)[-1]}.{getattr(endpoint, '__name__', 'endpoint')}"
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    """What one request spent, by phase."""
+
+    start: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_ms: float = 0.0
+    rows: int = 0
+    gen_ms: float = 0.0
+    serialize_ms: float = 0.0
+    # endpoint_label() of the route that handled the request (see TimedRoute)
+    endpoint: str | None = None
+    # perf_counter() when the endpoint function returned
+    endpoint_done: float | None = None
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)."""
+        total_ms = (time.perf_counter() - self.start) * 1000
+        return ", ".join(
+            [
+                f'db;dur={self.db_ms:.1f};desc="{self.queries} queries, {self.rows} rows"',
+                f"gen;dur={self.gen_ms:.1f}",
+                f"ser;dur={self.serialize_ms:.1f}",
+                f"total;dur={total_ms:.1f}",
+            ]
+        )
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def current_metrics() -> RequestMetrics | None:
+    """Metrics of the request being handled, None outside requests."""
+    return _current.get()
+
+
+def record_query(elapsed_ms: float, rows: int) -> None:
+    """Count one executed statement for the current request."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.db_ms += elapsed_ms
+        metrics.rows += rows
+
+
+def record_generator(elapsed_ms: float) -> None:
+    """Add part generator time to the current request."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.gen_ms += elapsed_ms
+
+
+@contextmanager
+def serializing() -> Iterator[None]:
+    """Count the time spent in the block as serialization."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.serialize_ms += (time.perf_counter() - start) * 1000
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus layout."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Totals of every request to one endpoint."""
+
+    requests: dict[str, int] = field(default_factory=dict)  # by status code
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERY_BUCKETS))
+    db_seconds: float = 0.0
+    rows: int = 0
+    gen_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+
+class MetricsRegistry:
+    """Per-endpoint request metrics, safe to update from any thread."""
+
+    def __init__(self):
+        self._endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, method: str, label: str, status: int, seconds: float, metrics: RequestMetrics
+    ) -> None:
+        """Add a finished request to its endpoint's totals."""
+        with self._lock:
+            endpoint = self._endpoints.get((method, label))
+            if endpoint is None:
+                endpoint = self._endpoints[(method, label)] = EndpointMetrics()
+            code = str(status)
+            endpoint.requests[code] = endpoint.requests.get(code, 0) + 1
+            endpoint.latency.observe(seconds)
+            endpoint.queries.observe(metrics.queries)
+            endpoint.db_seconds += metrics.db_ms / 1000
+            endpoint.rows += metrics.rows
+            endpoint.gen_seconds += metrics.gen_ms / 1000
+            endpoint.serialize_seconds += metrics.serialize_ms / 1000
+
+    def clear(self) -> None:
+        """Forget every endpoint's totals."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines: list[str] = []
+
+        def header(name: str, kind: str, text: str) -> None:
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, labels: str, values: Histogram) -> None:
+            for bound, count in zip(values.buckets, values.counts, strict=True):
+                lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {values.count}')
+            lines.append(f"{name}_sum{{{labels}}} {values.sum:g}")
+            lines.append(f"{name}_count{{{labels}}} {values.count}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            labelled = [
+                (f'method="{method}",endpoint="{_escape(label)}"', endpoint)
+                for (method, label), endpoint in endpoints
+            ]
+
+            header("http_requests_total", "counter", "Requests by endpoint and status.")
+            for labels, endpoint in labelled:
+                for code, count in sorted(endpoint.requests.items()):
+                    lines.append(f'http_requests_total{{{labels},status="{code}"}} {count}')
+
+            header("http_request_duration_seconds", "histogram", "Request latency.")
+            for labels, endpoint in labelled:
+                histogram("http_request_duration_seconds", labels, endpoint.latency)
+
+            header("db_queries_per_request", "histogram", "SQL statements per request.")
+            for labels, endpoint in labelled:
+                histogram("db_queries_per_request", labels, endpoint.queries)
+
+            totals = (
+                ("db_seconds_total", "Time spent executing SQL.", "db_seconds"),
+                ("db_rows_total", "Rows returned by SQL statements.", "rows"),
+                ("generator_seconds_total", "Time spent in part generators.", "gen_seconds"),
+                ("serialize_seconds_total", "Time spent encoding responses.", "serialize_seconds"),
+            )
+            for name, text, attribute in totals:
+                header(name, "counter", text)
+                for labels, endpoint in labelled:
+                    lines.append(f"{name}{{{labels}}} {getattr(endpoint, attribute):g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+def render_metrics() -> Response:
+    """GET /metrics response."""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording RequestMetrics for every HTTP request.
+
+    Args:
+        app: Wrapped application
+        server_timing: Add a Server-Timing header to responses
+        exclude: Paths not recorded (e.g. /metrics itself)
+    """
+
+    def __init__(
+        self, app: ASGIApp, server_timing: bool = True, exclude: tuple[str, ...] = ()
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.exclude = exclude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", metrics.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            label = metrics.endpoint
+            if label is None:
+                route = scope.get("route")
+                label = endpoint_label(route.endpoint) if route is not None else UNMATCHED
+            registry.observe(
+                scope["method"], label, status, time.perf_counter() - metrics.start, metrics
+            )
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that counts response serialization into the request metrics.
+
+    The endpoint function is wrapped to note when it returns; everything the
+    route handler does after that (validating and dumping the result through
+    the response model, building the response) is serialization. The route
+    also labels the request with its endpoint.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not getattr(endpoint, "_marks_endpoint_done", False):
+            endpoint = _mark_endpoint_done(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+        label = endpoint_label(self.endpoint)
+
+        async def timed_handler(request: Request) -> Response:
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.endpoint = label
+            response = await handler(request)
+            if metrics is not None and metrics.endpoint_done is not None:
+                metrics.serialize_ms += (time.perf_counter() - metrics.endpoint_done) * 1000
+                metrics.endpoint_done = None
+            return response
+
+        return timed_handler
+
+
+def _mark_endpoint_done(call: Callable[..., Any]) -> Callable[..., Any]:
+    def done() -> None:
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.endpoint_done = time.perf_counter()
+
+    if _is_async(call):
+
+        @wraps(call)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await call(*args, **kwargs)
+            done()
+            return result
+
+    else:
+
+        @wraps(call)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = call(*args, **kwargs)
+            done()
+            return result
+
+    wrapper._marks_endpoint_done = True
+    return wrapper
+
+
+def _is_async(call: Callable[..., Any]) -> bool:
+    return inspect.iscoroutinefunction(inspect.unwrap(call))
@@ -1,17 +1,20 @@
-"""MIDI file export using mido.
+"""MIDI file export.
 
 This module handles export of projects to Standard MIDI Files, including support
 for polyrhythms with fractional beat positions. All fractional beat times are
 rounded to the nearest tick using standard rounding (round half to even).
+
+Encoding is done by midinecromancer.midi.smf, which writes bytes identical to
+the former mido-based exporter.
 """
 
-import io
+from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
-import mido
-
+from midinecromancer.midi.smf import SmfTrack, encode_header, encode_track, pack_note_events
 from midinecromancer.music.offsets import apply_offsets_to_tick
 from midinecromancer.music.theory import PPQ
+from midinecromancer.services.note_store import iter_clip_note_tuples
 from midinecromancer.services.playback_filter import (
     filter_tracks_for_playback,
     filter_clips_for_playback,
@@ -22,127 +25,93 @@ if TYPE_CHECKING:
     from midinecromancer.models.track import Track
 
 
-def export_project_to_midi(project: "Project", tracks: list["Track"]) -> bytes:
-    """Export project to Standard MIDI File format.
+def iter_track_note_tuples(
+    track_model: "Track", ticks_per_bar: int
+) -> Iterator[tuple[int, int, int, int]]:
+    """A track's audible notes as absolute (start, duration, pitch, velocity) ticks.
+
+    Note: start_tick and duration_tick are already in integer ticks.
+    For polyrhythms, fractional beats are converted to ticks during generation
+    using deterministic rounding (nearest tick, round half to even).
 
     Args:
-        project: Project model
-        tracks: List of tracks with clips, notes, and chord events
+        track_model: Track model with clips and notes loaded
+        ticks_per_bar: Pre-calculated ticks per bar
+
+    Yields:
+        Note tuples in clip order, ready for pack_note_events()
+    """
+    track_offset = track_model.start_offset_ticks
+    # Filter clips based on mute/solo
+    for clip in filter_clips_for_playback(track_model.clips):
+        # Apply offsets once per clip; notes are relative to the clip start
+        clip_base = apply_offsets_to_tick(
+            clip.start_bar * ticks_per_bar, clip.start_offset_ticks, track_offset
+        )
+        for start_tick, duration_tick, pitch, velocity in iter_clip_note_tuples(clip):
+            yield (
+                int(round(clip_base + start_tick)),
+                int(round(duration_tick)),
+                pitch,
+                velocity,
+            )
+
+
+def build_smf_track(track_model: "Track", ticks_per_bar: int) -> SmfTrack:
+    """Collect a track's audible notes into an SMF track.
+
+    Args:
+        track_model: Track model with clips and notes loaded
+        ticks_per_bar: Pre-calculated ticks per bar
 
     Returns:
-        MIDI file as bytes
+        SmfTrack with packed, sorted note events
     """
-    mid = mido.MidiFile(ticks_per_beat=PPQ)
+    return SmfTrack(
+        name=track_model.name,
+        channel=track_model.midi_channel,
+        program=track_model.midi_program,
+        events=pack_note_events(
+            iter_track_note_tuples(track_model, ticks_per_bar), track_model.midi_channel
+        ),
+    )
+
 
-    # Calculate total length in ticks
+def _project_ticks_per_bar(project: "Project") -> int:
     quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
-    ticks_per_bar = int(quarter_notes_per_bar * PPQ)
-    total_ticks = project.bars * ticks_per_bar
+    return int(quarter_notes_per_bar * PPQ)
+
+
+def iter_project_midi_chunks(project: "Project", tracks: list["Track"]) -> Iterator[bytes]:
+    """Stream a project as Standard MIDI File chunks.
 
+    Tracks are packed and encoded one at a time, so this can feed a
+    StreamingResponse without materializing the whole file.
+
+    Args:
+        project: Project model
+        tracks: List of tracks with clips and notes loaded
+
+    Yields:
+        MThd header, then one MTrk chunk per audible track
+    """
+    ticks_per_bar = _project_ticks_per_bar(project)
     # Filter tracks based on mute/solo
     filtered_tracks = filter_tracks_for_playback(tracks)
 
-    # Create a track for each track in the project
+    yield encode_header(len(filtered_tracks), PPQ)
     for track_model in filtered_tracks:
-        midi_track = mido.MidiTrack()
-        midi_track.name = track_model.name
-
-        # Set program change
-        midi_track.append(
-            mido.Message(
-                "program_change",
-                channel=track_model.midi_channel,
-                program=track_model.midi_program,
-                time=0,
-            )
-        )
+        yield encode_track(build_smf_track(track_model, ticks_per_bar))
 
-        # Filter clips based on mute/solo
-        filtered_clips = filter_clips_for_playback(track_model.clips)
-
-        # Collect all note events from clips
-        # Note: start_tick and duration_tick are already in integer ticks.
-        # For polyrhythms, fractional beats are converted to ticks during generation
-        # using deterministic rounding (nearest tick, round half to even).
-        note_events = []
-        for clip in filtered_clips:
-            clip_start_tick = clip.start_bar * ticks_per_bar
-            # Apply offsets
-            clip_offset = clip.start_offset_ticks
-            track_offset = track_model.start_offset_ticks
-            for note in clip.notes:
-                # Calculate base tick position
-                base_tick = clip_start_tick + note.start_tick
-                # Apply offsets
-                start_tick = int(round(apply_offsets_to_tick(base_tick, clip_offset, track_offset)))
-                duration_tick = int(round(note.duration_tick))
-                note_events.append(
-                    {
-                        "tick": start_tick,
-                        "pitch": note.pitch,
-                        "velocity": note.velocity,
-                        "duration": max(duration_tick, 1),  # Minimum 1 tick
-                    }
-                )
-
-        # Sort by tick
-        note_events.sort(key=lambda x: x["tick"])
-
-        # Convert to MIDI messages - create note on/off events
-        all_events = []
-        for event in note_events:
-            all_events.append(
-                {
-                    "tick": event["tick"],
-                    "type": "on",
-                    "pitch": event["pitch"],
-                    "velocity": event["velocity"],
-                }
-            )
-            all_events.append(
-                {
-                    "tick": event["tick"] + event["duration"],
-                    "type": "off",
-                    "pitch": event["pitch"],
-                    "velocity": 0,
-                }
-            )
 
-        # Sort all events by tick
-        all_events.sort(key=lambda x: x["tick"])
-
-        # Convert to MIDI messages with delta times
-        current_tick = 0
-        for event in all_events:
-            tick_delta = event["tick"] - current_tick
-            if tick_delta < 0:
-                tick_delta = 0
-
-            if event["type"] == "on":
-                midi_track.append(
-                    mido.Message(
-                        "note_on",
-                        channel=track_model.midi_channel,
-                        note=event["pitch"],
-                        velocity=event["velocity"],
-                        time=tick_delta,
-                    )
-                )
-            else:
-                midi_track.append(
-                    mido.Message(
-                        "note_off",
-                        channel=track_model.midi_channel,
-                        note=event["pitch"],
-                        velocity=0,
-                        time=tick_delta,
-                    )
-                )
-            current_tick = event["tick"]
-
-        mid.tracks.append(midi_track)
-
-    # Export to bytes
-    buffer = io.BytesIO()
-    mid.save(file=buffer)
-    return buffer.getvalue()
+def export_project_to_midi(project: "Project", tracks: list["Track"]) -> bytes:
+    """Export project to Standard MIDI File format.
+
+    Args:
+        project: Project model
+        tracks: List of tracks with clips, notes, and chord events
+
+    Returns:
+        MIDI file as bytes
+    """
+    return b"".join(iter_project_midi_chunks(project, tracks))
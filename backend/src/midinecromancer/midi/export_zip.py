@@ -1,14 +1,24 @@
-"""ZIP export with per-part MIDI files."""
+"""ZIP export with per-part MIDI files.
 
+export_project_to_zip() builds the archive in memory. iter_project_zip_chunks()
+streams the same entries: each part's notes are collected from the snapshot,
+then packed and encoded in the worker pool (services/generation_pool.py), a
+few parts ahead of the one being written, and every finished entry is handed
+out as soon as it is compressed. Only the parts in flight are held in memory.
+"""
+
+import asyncio
 import io
 import re
 import zipfile
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
-from typing import TYPE_CHECKING, Literal
-
-import mido
+from typing import TYPE_CHECKING, Any, Literal
 
-from midinecromancer.music.offsets import apply_offsets_to_tick
+from midinecromancer.config import settings
+from midinecromancer.midi.export import iter_track_note_tuples
+from midinecromancer.midi.smf import SmfTrack, encode_midi_file, pack_note_events
 from midinecromancer.music.theory import PPQ
 from midinecromancer.services.playback_filter import (
     filter_clips_for_playback,
@@ -43,114 +53,76 @@ def export_track_to_midi(project: "Project", track: "Track", ticks_per_bar: int)
     Returns:
         MIDI file as bytes
     """
-    mid = mido.MidiFile(ticks_per_beat=PPQ)
-
-    # Create MIDI track
-    midi_track = mido.MidiTrack()
-    midi_track.name = track.name
-
-    # Set program change
-    midi_track.append(
-        mido.Message(
-            "program_change",
-            channel=track.midi_channel,
-            program=track.midi_program,
-            time=0,
-        )
+    return encode_part(*_part_args(track, ticks_per_bar))
+
+
+def encode_part(
+    name: str, channel: int, program: int, notes: list[tuple[int, int, int, int]]
+) -> bytes:
+    """Encode one part as a single-track MIDI file.
+
+    Takes plain data only, so it can run in a worker process.
+
+    Args:
+        name: Track name
+        channel: MIDI channel
+        program: MIDI program
+        notes: Absolute (start, duration, pitch, velocity) note tuples
+
+    Returns:
+        MIDI file as bytes
+    """
+    return encode_midi_file(
+        [SmfTrack(name, channel, program, pack_note_events(notes, channel))], PPQ
     )
 
-    # Filter clips based on mute/solo
-    filtered_clips = filter_clips_for_playback(track.clips)
-
-    # Collect all note events from clips
-    note_events = []
-    for clip in filtered_clips:
-        clip_start_tick = clip.start_bar * ticks_per_bar
-        # Apply offsets
-        clip_offset = clip.start_offset_ticks
-        track_offset = track.start_offset_ticks
-        for note in clip.notes:
-            # Calculate base tick position
-            base_tick = clip_start_tick + note.start_tick
-            # Apply offsets
-            start_tick = int(round(apply_offsets_to_tick(base_tick, clip_offset, track_offset)))
-            duration_tick = int(round(note.duration_tick))
-            note_events.append(
-                {
-                    "tick": start_tick,
-                    "pitch": note.pitch,
-                    "velocity": note.velocity,
-                    "duration": max(duration_tick, 1),
-                }
-            )
-
-    # Sort by tick
-    note_events.sort(key=lambda x: x["tick"])
-
-    # Convert to MIDI messages
-    all_events = []
-    for event in note_events:
-        all_events.append(
-            {
-                "tick": event["tick"],
-                "type": "on",
-                "pitch": event["pitch"],
-                "velocity": event["velocity"],
-            }
-        )
-        all_events.append(
-            {
-                "tick": event["tick"] + event["duration"],
-                "type": "off",
-                "pitch": event["pitch"],
-                "velocity": 0,
-            }
-        )
-
-    # Sort all events by tick
-    all_events.sort(key=lambda x: x["tick"])
-
-    # Convert to MIDI messages with delta times
-    current_tick = 0
-    for event in all_events:
-        tick_delta = event["tick"] - current_tick
-        if tick_delta < 0:
-            tick_delta = 0
-
-        if event["type"] == "on":
-            midi_track.append(
-                mido.Message(
-                    "note_on",
-                    channel=track.midi_channel,
-                    note=event["pitch"],
-                    velocity=event["velocity"],
-                    time=tick_delta,
-                )
-            )
-        else:
-            midi_track.append(
-                mido.Message(
-                    "note_off",
-                    channel=track.midi_channel,
-                    note=event["pitch"],
-                    velocity=0,
-                    time=tick_delta,
-                )
-            )
-        current_tick = event["tick"]
 
-    mid.tracks.append(midi_track)
+def _part_args(track: "Track", ticks_per_bar: int) -> tuple[Any, ...]:
+    notes = list(iter_track_note_tuples(track, ticks_per_bar))
+    return track.name, track.midi_channel, track.midi_program, notes
 
-    # Export to bytes
-    buffer = io.BytesIO()
-    mid.save(file=buffer)
-    return buffer.getvalue()
+
+def _zip_parts(
+    project: "Project", tracks: list["Track"], split_by: Literal["track", "clip"]
+) -> list[tuple[str, "Track", int]]:
+    """(filename, track to encode, bars covered) of every part, in archive order."""
+    # Filter tracks based on mute/solo
+    filtered_tracks = filter_tracks_for_playback(tracks)
+
+    parts = []
+    if split_by == "track":
+        # One MIDI file per track
+        for track in filtered_tracks:
+            safe_name = sanitize_filename(track.name)
+            filename = f"part_{len(parts) + 1:02d}_{safe_name}.mid"
+            parts.append((filename, track, project.bars))
+
+    elif split_by == "clip":
+        # One MIDI file per clip
+        from midinecromancer.services.snapshot import TrackSnapshot
+
+        for track in filtered_tracks:
+            for clip in filter_clips_for_playback(track.clips):
+                # A copy of the track with just this clip (the clip stays on its track)
+                temp_track = TrackSnapshot.from_row(track, clips=(clip,))
+
+                safe_track_name = sanitize_filename(track.name)
+                safe_clip_name = sanitize_filename(f"bar_{clip.start_bar}")
+                filename = f"part_{len(parts) + 1:02d}_{safe_track_name}_{safe_clip_name}.mid"
+                parts.append((filename, temp_track, clip.length_bars))
+    return parts
+
+
+def _ticks_per_bar(project: "Project") -> int:
+    quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
+    return int(quarter_notes_per_bar * PPQ)
 
 
 def export_project_to_zip(
     project: "Project",
     tracks: list["Track"],
     split_by: Literal["track", "clip"] = "track",
+    progress: Callable[..., None] | None = None,
 ) -> bytes:
     """Export project as ZIP containing per-part MIDI files.
 
@@ -158,61 +130,126 @@ def export_project_to_zip(
         project: Project model
         tracks: List of tracks with clips, notes, and chord events loaded
         split_by: How to split parts ("track" or "clip")
+        progress: Called after each part with tracks_done, tracks_total (parts),
+            bars_done and bars_total (bars of the finished parts) keywords
 
     Returns:
         ZIP file as bytes
     """
-    # Calculate ticks per bar
-    quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
-    ticks_per_bar = int(quarter_notes_per_bar * PPQ)
-
-    # Filter tracks based on mute/solo
-    filtered_tracks = filter_tracks_for_playback(tracks)
+    ticks_per_bar = _ticks_per_bar(project)
+    parts = _zip_parts(project, tracks, split_by)
 
     # Create ZIP in memory
+    bars_total = sum(bars for _, _, bars in parts)
+    bars_done = 0
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        part_index = 0
-
-        if split_by == "track":
-            # One MIDI file per track
-            for track in filtered_tracks:
-                part_index += 1
-                midi_bytes = export_track_to_midi(project, track, ticks_per_bar)
-                safe_name = sanitize_filename(track.name)
-                filename = f"part_{part_index:02d}_{safe_name}.mid"
-                zip_file.writestr(filename, midi_bytes)
-
-        elif split_by == "clip":
-            # One MIDI file per clip
-            for track in filtered_tracks:
-                for clip in filter_clips_for_playback(track.clips):
-                    part_index += 1
-                    # Create a temporary track with just this clip
-                    from midinecromancer.models.track import Track
-
-                    temp_track = Track(
-                        id=track.id,
-                        project_id=track.project_id,
-                        name=track.name,
-                        role=track.role,
-                        midi_channel=track.midi_channel,
-                        midi_program=track.midi_program,
-                        is_muted=track.is_muted,
-                        start_offset_ticks=track.start_offset_ticks,
-                    )
-                    temp_track.clips = [clip]
-
-                    midi_bytes = export_track_to_midi(project, temp_track, ticks_per_bar)
-                    safe_track_name = sanitize_filename(track.name)
-                    safe_clip_name = sanitize_filename(f"bar_{clip.start_bar}")
-                    filename = f"part_{part_index:02d}_{safe_track_name}_{safe_clip_name}.mid"
-                    zip_file.writestr(filename, midi_bytes)
+        for part_index, (filename, track, bars) in enumerate(parts, start=1):
+            zip_file.writestr(filename, export_track_to_midi(project, track, ticks_per_bar))
+            bars_done += bars
+            if progress is not None:
+                progress(
+                    tracks_done=part_index,
+                    tracks_total=len(parts),
+                    bars_done=bars_done,
+                    bars_total=bars_total,
+                )
 
     zip_buffer.seek(0)
     return zip_buffer.getvalue()
 
 
+class _ChunkSink(io.RawIOBase):
+    """Unseekable file collecting what ZipFile writes until it is taken."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def iter_project_zip_chunks(
+    project: "Project",
+    tracks: list["Track"],
+    split_by: Literal["track", "clip"] = "track",
+    progress: Callable[..., None] | None = None,
+) -> AsyncIterator[bytes]:
+    """Stream the export_project_to_zip() archive, one entry at a time.
+
+    Entries have the same names and contents. As the output cannot seek back,
+    each entry's CRC and sizes follow its data (a data descriptor) instead of
+    being patched into its header.
+
+    Parts are encoded in the worker pool, twice as many in flight as there
+    are workers (two at a time without a pool, inline), and written in
+    archive order.
+
+    Args:
+        project: Project model
+        tracks: List of tracks with clips and notes loaded
+        split_by: How to split parts ("track" or "clip")
+        progress: As for export_project_to_zip()
+
+    Yields:
+        One chunk per entry (local header, compressed data, data descriptor),
+        then the central directory
+    """
+    from midinecromancer.services.generation_pool import run_pooled
+
+    ticks_per_bar = _ticks_per_bar(project)
+    parts = _zip_parts(project, tracks, split_by)
+    ahead = 2 * max(1, settings.generation_workers)
+
+    bars_total = sum(bars for _, _, bars in parts)
+    bars_done = 0
+    queued = iter(parts)
+    pending: deque[tuple[str, int, asyncio.Future]] = deque()
+
+    def submit() -> None:
+        part = next(queued, None)
+        if part is not None:
+            filename, track, bars = part
+            args = _part_args(track, ticks_per_bar)
+            pending.append((filename, bars, asyncio.ensure_future(run_pooled(encode_part, *args))))
+
+    sink = _ChunkSink()
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for _ in range(ahead):
+                submit()
+            part_index = 0
+            while pending:
+                filename, bars, encoded = pending.popleft()
+                data = await encoded
+                submit()
+                zip_file.writestr(filename, data)
+                part_index += 1
+                bars_done += bars
+                if progress is not None:
+                    progress(
+                        tracks_done=part_index,
+                        tracks_total=len(parts),
+                        bars_done=bars_done,
+                        bars_total=bars_total,
+                    )
+                yield sink.take()
+        yield sink.take()
+    finally:
+        # Client gone or encoding failed: drop the parts still in flight
+        for _, _, encoded in pending:
+            encoded.cancel()
+
+
 def generate_zip_filename(project_name: str) -> str:
     """Generate ZIP filename with timestamp.
 
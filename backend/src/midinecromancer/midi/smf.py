@@ -0,0 +1,205 @@
+"""Streaming Standard MIDI File writer.
+
+Encodes note data straight into bytes without building per-event dicts or
+mido.Message objects. Each note-on/note-off is packed into a single integer
+that carries both its sort key and its (status, data1, data2) payload, so a
+track needs exactly one sort before its events are written as VLQ deltas into
+a bytearray.
+
+The output is byte-identical to saving the equivalent mido.MidiFile (format 1,
+running status, track_name meta first, end_of_track appended), which is what
+the exporters used previously.
+"""
+
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+from midinecromancer.music.theory import PPQ
+
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+PROGRAM_CHANGE = 0xC0
+
+# Tick fields are biased so negative ticks (from negative offsets) still sort
+# correctly as unsigned bit fields.
+_TICK_BIAS = 1 << 39
+_TICK_BITS = 40
+_SEQ_BITS = 32
+_PAYLOAD_BITS = 24
+_PAYLOAD_MASK = (1 << _PAYLOAD_BITS) - 1
+_TICK_SHIFT = _PAYLOAD_BITS + _SEQ_BITS + _TICK_BITS + 1
+_ON_SHIFT = _PAYLOAD_BITS + _SEQ_BITS + _TICK_BITS
+_START_SHIFT = _PAYLOAD_BITS + _SEQ_BITS
+
+_END_OF_TRACK = b"\x00\xff\x2f\x00"
+
+
+@dataclass
+class SmfTrack:
+    """A single MTrk chunk to encode.
+
+    Attributes:
+        name: Track name written as the leading track_name meta event
+        channel: MIDI channel (0-15)
+        program: Program number sent at time 0 (0-127)
+        events: Packed, sorted events from pack_note_events()
+    """
+
+    name: str
+    channel: int
+    program: int
+    events: list[int] = field(default_factory=list)
+
+
+def encode_vlq(value: int, out: bytearray) -> None:
+    """Append a MIDI variable-length quantity to a bytearray.
+
+    Args:
+        value: Non-negative integer to encode
+        out: Buffer to append to
+    """
+    if value < 0x80:
+        out.append(value)
+        return
+    stack = [value & 0x7F]
+    value >>= 7
+    while value:
+        stack.append((value & 0x7F) | 0x80)
+        value >>= 7
+    stack.reverse()
+    out.extend(stack)
+
+
+def pack_note_events(notes: Iterable[tuple[int, int, int, int]], channel: int) -> list[int]:
+    """Pack notes into sorted note-on/note-off events.
+
+    Ordering matches the previous exporter, which stable-sorted notes by start
+    tick, emitted an (on, off) pair per note and stable-sorted the pairs by
+    tick. Because every note lasts at least one tick, that is equivalent to a
+    single sort on (tick, is_on, start_tick, input_index): at a shared tick
+    note-offs come first, offs are ordered by their note's start, and ons keep
+    input order.
+
+    Args:
+        notes: (start_tick, duration_tick, pitch, velocity) tuples in clip order;
+            durations below one tick are clamped to one
+        channel: MIDI channel (0-15)
+
+    Returns:
+        Sorted packed events for SmfTrack.events
+
+    Raises:
+        ValueError: If a pitch, velocity or the channel is out of range
+    """
+    if not 0 <= channel <= 15:
+        raise ValueError(f"MIDI channel must be in range 0..15, got {channel}")
+    on_status = (NOTE_ON | channel) << 16
+    off_status = (NOTE_OFF | channel) << 16
+    on_bit = 1 << _ON_SHIFT
+    events: list[int] = []
+    append = events.append
+    for seq, (start, duration, pitch, velocity) in enumerate(notes):
+        if (pitch | velocity) & ~0x7F:
+            raise ValueError(
+                f"Note pitch and velocity must be in range 0..127, got {pitch}, {velocity}"
+            )
+        if duration < 1:
+            duration = 1
+        biased_start = start + _TICK_BIAS
+        key = (biased_start << _START_SHIFT) | (seq << _PAYLOAD_BITS) | (pitch << 8)
+        append((biased_start << _TICK_SHIFT) | on_bit | key | on_status | velocity)
+        append(((biased_start + duration) << _TICK_SHIFT) | key | off_status)
+    events.sort()
+    return events
+
+
+def encode_header(num_tracks: int, ticks_per_beat: int = PPQ) -> bytes:
+    """Encode the MThd chunk for a format 1 file.
+
+    Args:
+        num_tracks: Number of MTrk chunks that follow
+        ticks_per_beat: Timing resolution
+
+    Returns:
+        Header chunk bytes
+    """
+    return b"MThd" + struct.pack(">Lhhh", 6, 1, num_tracks, ticks_per_beat)
+
+
+def encode_track(track: SmfTrack) -> bytes:
+    """Encode one MTrk chunk.
+
+    Args:
+        track: Track to encode
+
+    Returns:
+        Track chunk bytes, including the chunk header
+
+    Raises:
+        ValueError: If the channel or program is out of range
+    """
+    if not 0 <= track.channel <= 15:
+        raise ValueError(f"MIDI channel must be in range 0..15, got {track.channel}")
+    if not 0 <= track.program <= 127:
+        raise ValueError(f"MIDI program must be in range 0..127, got {track.program}")
+
+    data = bytearray(b"\x00\xff\x03")
+    name = track.name.encode("latin1")
+    encode_vlq(len(name), data)
+    data += name
+    program_status = PROGRAM_CHANGE | track.channel
+    data += bytes((0, program_status, track.program))
+
+    running_status = program_status
+    current_tick = 0
+    for event in track.events:
+        tick = (event >> _TICK_SHIFT) - _TICK_BIAS
+        delta = tick - current_tick
+        if delta < 0x80:
+            data.append(delta if delta > 0 else 0)
+        else:
+            encode_vlq(delta, data)
+        current_tick = tick
+
+        payload = event & _PAYLOAD_MASK
+        status = payload >> 16
+        if status != running_status:
+            data.append(status)
+            running_status = status
+        data.append((payload >> 8) & 0x7F)
+        data.append(payload & 0x7F)
+
+    data += _END_OF_TRACK
+    return b"MTrk" + struct.pack(">L", len(data)) + bytes(data)
+
+
+def iter_midi_file(tracks: Sequence[SmfTrack], ticks_per_beat: int = PPQ) -> Iterator[bytes]:
+    """Yield a Standard MIDI File chunk by chunk.
+
+    Only one encoded track is held in memory at a time, so the result can be
+    passed directly to a StreamingResponse.
+
+    Args:
+        tracks: Tracks to encode, in file order
+        ticks_per_beat: Timing resolution
+
+    Yields:
+        The header chunk, then one chunk per track
+    """
+    yield encode_header(len(tracks), ticks_per_beat)
+    for track in tracks:
+        yield encode_track(track)
+
+
+def encode_midi_file(tracks: Sequence[SmfTrack], ticks_per_beat: int = PPQ) -> bytes:
+    """Encode a complete Standard MIDI File.
+
+    Args:
+        tracks: Tracks to encode, in file order
+        ticks_per_beat: Timing resolution
+
+    Returns:
+        MIDI file as bytes
+    """
+    return b"".join(iter_midi_file(tracks, ticks_per_beat))
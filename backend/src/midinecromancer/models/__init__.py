@@ -4,24 +4,32 @@ from .project import Project
 from .track import Track
 from .clip import Clip
 from .note import Note
+from .clip_note_block import ClipNoteBlock
+from .clip_analysis import ClipAnalysis
 from .chord_event import ChordEvent
 from .generation_run import GenerationRun
 from .polyrhythm_profile import PolyrhythmProfile
 from .clip_polyrhythm_lane import ClipPolyrhythmLane
+from .polyrhythm_render import PolyrhythmRender
 from .suggestion_run import SuggestionRun
 from .suggestion import Suggestion
 from .suggestion_commit import SuggestionCommit
+from .job import Job
 
 __all__ = [
     "Project",
     "Track",
     "Clip",
     "Note",
+    "ClipNoteBlock",
+    "ClipAnalysis",
     "ChordEvent",
     "GenerationRun",
     "PolyrhythmProfile",
     "ClipPolyrhythmLane",
+    "PolyrhythmRender",
     "SuggestionRun",
     "Suggestion",
     "SuggestionCommit",
+    "Job",
 ]
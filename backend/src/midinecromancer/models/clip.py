@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -37,6 +37,8 @@ class Clip(Base):
         Float, nullable=False, default=1.0, server_default="1.0"
     )
     params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict, server_default="{}")
+    # Project revision at which the clip (or its notes/chords) last changed
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     # Relationships
@@ -64,3 +66,13 @@ class Clip(Base):
     drum_map_profile: Mapped["DrumMapProfile | None"] = relationship(
         "DrumMapProfile", back_populates="clips"
     )
+    # Packed note storage; loaded with the clip so readers never lazy-load it
+    note_block: Mapped["ClipNoteBlock | None"] = relationship(
+        "ClipNoteBlock",
+        back_populates="clip",
+        uselist=False,
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+    __table_args__ = (Index("ix_clips_track_revision", "track_id", "revision"),)
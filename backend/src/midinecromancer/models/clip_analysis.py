@@ -0,0 +1,33 @@
+"""Persisted per-clip analysis summary model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from midinecromancer.db.base import Base
+
+
+class ClipAnalysis(Base):
+    """music.analysis.ClipSummary of a clip at one clip revision.
+
+    The row is stale once the clip's revision moves past clip_revision (any
+    change to the clip, its notes or its chord events) or the summary format
+    changes (summary_version); services/clip_analysis.py then recomputes it.
+    """
+
+    __tablename__ = "clip_analyses"
+
+    clip_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("clips.id", ondelete="CASCADE"), primary_key=True
+    )
+    clip_revision: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    summary_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    note_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    onset_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Note counts by pitch class (12 entries, C first)
+    pitch_class_histogram: Mapped[list] = mapped_column(JSON, nullable=False)
+    # [{"roman_numeral", "chord_name", "start_tick"}] by start tick
+    chord_functions: Mapped[list] = mapped_column(JSON, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,33 @@
+"""Clip note block model (packed columnar note storage)."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from midinecromancer.db.base import Base
+
+
+class ClipNoteBlock(Base):
+    """All notes of a clip packed into one row.
+
+    Alternative to one Note row per note: pitch, velocity, start, duration and
+    probability are stored as contiguous little-endian arrays in a single blob
+    (see services/note_store.py for the layout). A clip with a block ignores
+    any Note rows.
+    """
+
+    __tablename__ = "clip_note_blocks"
+
+    clip_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("clips.id", ondelete="CASCADE"), primary_key=True
+    )
+    format_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    note_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    clip: Mapped["Clip"] = relationship("Clip", back_populates="note_block")
@@ -21,6 +21,8 @@ class GenerationRun(Base):
     kind: Mapped[str] = mapped_column(String(20), nullable=False)  # drums/chords/bass/melody/full
     seed_used: Mapped[int] = mapped_column(BigInteger, nullable=False)
     params: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Milliseconds spent computing and writing each part
+    timings: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     # Relationships
@@ -0,0 +1,49 @@
+"""Background job model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, ForeignKey, Index, LargeBinary, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from midinecromancer.db.base import Base
+
+
+class Job(Base):
+    """A heavy operation (full generation, ZIP export, suggestion run) run in the background.
+
+    Jobs are run by services/jobs.py. dedupe_key hashes the kind, params and
+    the project revision at submission, so identical requests while a job is
+    queued or running share it. Downloadable results (ZIP files) are kept in
+    result_data; other results are described by result.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)  # generate_full/export_zip/...
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default="queued"
+    )  # queued/running/succeeded/failed
+    params: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    project_revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    dedupe_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    # tracks_done/tracks_total, bars_done/bars_total (see services/jobs.py)
+    progress: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Deferred: only the result download reads it
+    result_data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    result_media_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    result_filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_project", "project_id", "created_at"),
+        Index("ix_jobs_dedupe_key", "dedupe_key", "status"),
+    )
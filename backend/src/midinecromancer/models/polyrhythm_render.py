@@ -0,0 +1,29 @@
+"""Persisted polyrhythm lane render model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from midinecromancer.db.base import Base
+
+
+class PolyrhythmRender(Base):
+    """Cached clip-relative render of a clip's polyrhythm lanes.
+
+    Keyed by music.polyrhythm.lane_render_key(); notes are stored in the packed
+    format of services/note_store.py. Rows are only written when
+    POLYRHYTHM_RENDER_CACHE_PERSIST is enabled, and are deleted when the clip's
+    lanes or their profiles change.
+    """
+
+    __tablename__ = "polyrhythm_renders"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    clip_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("clips.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    note_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
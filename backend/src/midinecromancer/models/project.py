@@ -27,6 +27,12 @@ class Project(Base):
         default="ionian",
     )  # ionian/dorian/phrygian/lydian/mixolydian/aeolian/locrian
     seed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # How child seeds are derived from seed (see music/seeds.py)
+    seed_scheme: Mapped[str] = mapped_column(
+        String(16), nullable=False, default="legacy", server_default="legacy"
+    )  # legacy/tree
+    # Bumped on every commit that changes the arrangement (see db/revisions.py)
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,7 +1,17 @@
-"""Musical analysis utilities for project state."""
+"""Musical analysis utilities for project state.
 
+A project is analyzed from one ClipSummary per clip (summarize_clip()),
+merged by merge_clip_summaries() in a single pass over the clips, so
+summaries of unchanged clips can be kept and reused (see
+services/clip_analysis.py).
+"""
+
+import heapq
 from collections import Counter
-from typing import TYPE_CHECKING
+from collections.abc import Iterable
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
 
 from midinecromancer.music.theory import MODE_INTERVALS, parse_tonic
 
@@ -20,6 +30,8 @@ class ProjectAnalysis:
         harmonic_rhythm: float = 1.0,  # Chords per bar
         rhythmic_density: dict[str, float] | None = None,
         chord_functions: list[dict] | None = None,
+        onset_density: dict[str, float] | None = None,  # Distinct onsets per bar, by role
+        pitch_class_histogram: list[int] | None = None,  # Pitched (non-drum) notes
     ):
         """Initialize analysis results."""
         self.detected_key = detected_key
@@ -27,57 +39,119 @@ class ProjectAnalysis:
         self.harmonic_rhythm = harmonic_rhythm
         self.rhythmic_density = rhythmic_density or {}
         self.chord_functions = chord_functions or []
+        self.onset_density = onset_density or {}
+        self.pitch_class_histogram = pitch_class_histogram or [0] * 12
 
 
-def analyze_project(project: "Project", tracks: list["Track"]) -> ProjectAnalysis:
-    """Analyze project state to infer musical context.
+@dataclass(frozen=True)
+class ClipSummary:
+    """What project analysis reads from one clip.
 
-    Args:
-        project: Project model
-        tracks: List of tracks with clips, notes, chord events
-
-    Returns:
-        ProjectAnalysis with detected key/mode, harmonic rhythm, etc.
+    chord_functions are sorted by start tick.
     """
-    # Start with project's explicit key/mode
-    detected_key = project.key_tonic
-    detected_mode = project.mode
 
-    # Analyze chord events to infer key if not set or verify
-    chord_events = []
-    for track in tracks:
-        if track.role == "chords":
-            for clip in track.clips:
-                chord_events.extend(clip.chord_events)
+    note_count: int = 0
+    onset_count: int = 0  # Distinct note start ticks
+    pitch_class_histogram: tuple[int, ...] = (0,) * 12
+    chord_functions: tuple[dict, ...] = ()
 
-    if chord_events:
-        # Try to infer key from chord progression
-        inferred = infer_key_from_chords(chord_events, project.key_tonic, project.mode)
-        if inferred:
-            detected_key, detected_mode = inferred
 
-    # Calculate harmonic rhythm (chords per bar)
-    harmonic_rhythm = calculate_harmonic_rhythm(chord_events, project.bars)
+def summarize_clip(clip: Any, *, notes: bool = True, chords: bool = True) -> ClipSummary:
+    """Summarize a clip's notes and chord events.
 
-    # Analyze rhythmic density per lane/track
-    rhythmic_density = {}
-    for track in tracks:
-        if track.role == "drums":
-            note_count = sum(len(clip.notes) for clip in track.clips)
-            total_bars = sum(clip.length_bars for clip in track.clips)
-            if total_bars > 0:
-                rhythmic_density[track.role] = note_count / total_bars
-
-    # Extract chord functions
-    chord_functions = []
-    for ce in sorted(chord_events, key=lambda x: x.start_tick):
-        chord_functions.append(
+    Args:
+        clip: Clip with the bodies read loaded
+        notes: Read the clip's notes (note fields stay zero otherwise)
+        chords: Read the clip's chord events
+
+    Returns:
+        ClipSummary
+    """
+    chord_functions = ()
+    if chords:
+        chord_functions = tuple(
             {
                 "roman_numeral": ce.roman_numeral,
                 "chord_name": ce.chord_name,
                 "start_tick": ce.start_tick,
             }
+            for ce in sorted(clip.chord_events, key=lambda x: x.start_tick)
         )
+    if not notes:
+        return ClipSummary(chord_functions=chord_functions)
+
+    from midinecromancer.services.note_store import get_clip_notes
+
+    histogram = [0] * 12
+    onsets = set()
+    note_count = 0
+    for note in get_clip_notes(clip):
+        histogram[note.pitch % 12] += 1
+        onsets.add(note.start_tick)
+        note_count += 1
+    return ClipSummary(note_count, len(onsets), tuple(histogram), chord_functions)
+
+
+def merge_clip_summaries(
+    project: "Project",
+    clips: Iterable[tuple[str, int, ClipSummary]],
+    *,
+    density: bool = True,
+) -> ProjectAnalysis:
+    """Combine clip summaries into a project analysis.
+
+    One pass over the clips; chord functions of chord tracks are merged by
+    start tick (ties in clip order) and the key is inferred from the first
+    chord of the first chord clip.
+
+    Args:
+        project: Project (key, mode and bars are read)
+        clips: (track role, clip length in bars, summary) of every clip, in
+            track and clip order
+        density: Fill in rhythmic density, onset density and the pitch-class
+            histogram
+
+    Returns:
+        ProjectAnalysis
+    """
+    chord_lists = []
+    note_counts: dict[str, int] = {}
+    onset_counts: dict[str, int] = {}
+    bars_by_role: dict[str, int] = {}
+    histogram = [0] * 12
+    for role, length_bars, summary in clips:
+        if role == "chords" and summary.chord_functions:
+            chord_lists.append(summary.chord_functions)
+        if density:
+            note_counts[role] = note_counts.get(role, 0) + summary.note_count
+            onset_counts[role] = onset_counts.get(role, 0) + summary.onset_count
+            bars_by_role[role] = bars_by_role.get(role, 0) + length_bars
+            if role != "drums":
+                for pitch_class, count in enumerate(summary.pitch_class_histogram):
+                    histogram[pitch_class] += count
+
+    # Start with project's explicit key/mode, then try to infer it from the chords
+    detected_key = project.key_tonic
+    detected_mode = project.mode
+    if chord_lists:
+        inferred = _infer_key(chord_lists[0][0]["roman_numeral"], project.key_tonic, project.mode)
+        if inferred:
+            detected_key, detected_mode = inferred
+
+    chord_functions = [
+        dict(function) for function in heapq.merge(*chord_lists, key=itemgetter("start_tick"))
+    ]
+    harmonic_rhythm = 1.0
+    if chord_functions and project.bars:
+        positions = len({function["start_tick"] for function in chord_functions})
+        harmonic_rhythm = positions / project.bars
+
+    rhythmic_density = {}
+    if bars_by_role.get("drums"):
+        rhythmic_density["drums"] = note_counts["drums"] / bars_by_role["drums"]
+    onset_density = {
+        role: onset_counts[role] / bars for role, bars in bars_by_role.items() if bars > 0
+    }
 
     return ProjectAnalysis(
         detected_key=detected_key,
@@ -85,6 +159,38 @@ def analyze_project(project: "Project", tracks: list["Track"]) -> ProjectAnalysi
         harmonic_rhythm=harmonic_rhythm,
         rhythmic_density=rhythmic_density,
         chord_functions=chord_functions,
+        onset_density=onset_density,
+        pitch_class_histogram=histogram if density else None,
+    )
+
+
+def analyze_project(
+    project: "Project", tracks: list["Track"], *, density: bool = True
+) -> ProjectAnalysis:
+    """Analyze project state to infer musical context.
+
+    Args:
+        project: Project model
+        tracks: List of tracks with clips, notes, chord events
+        density: Compute rhythmic density, onset density and the pitch-class
+            histogram (reads clip notes; without it only the chord events of
+            chord tracks are read)
+
+    Returns:
+        ProjectAnalysis with detected key/mode, harmonic rhythm, etc.
+    """
+    return merge_clip_summaries(
+        project,
+        (
+            (
+                track.role,
+                clip.length_bars,
+                summarize_clip(clip, notes=density, chords=track.role == "chords"),
+            )
+            for track in tracks
+            for clip in track.clips
+        ),
+        density=density,
     )
 
 
@@ -105,10 +211,12 @@ def infer_key_from_chords(
     """
     if not chord_events:
         return None
+    return _infer_key(chord_events[0].roman_numeral, default_key, default_mode)
+
 
+def _infer_key(first_roman: str, default_key: str, default_mode: str) -> tuple[str, str] | None:
     # Simple heuristic: look at first chord
-    first_chord = chord_events[0]
-    roman = first_chord.roman_numeral.upper()
+    roman = first_roman.upper()
 
     # If starts on I, likely major (ionian)
     # If starts on i or vi, likely minor (aeolian)
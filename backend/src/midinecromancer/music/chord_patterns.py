@@ -5,12 +5,16 @@ to note events, used by:
 - Arrangement playback plan builder
 - Chord audition in modal
 - MIDI export
+
+render_clip_chord_events() renders a whole clip (or progression) at once and
+gives the same notes as render_chord_event_to_notes() per event.
 """
 
-import hashlib
 import random
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
+from midinecromancer.music.seeds import child_rng, legacy_seed
 from midinecromancer.music.theory import PPQ, get_chord_notes, roman_to_degree
 
 if TYPE_CHECKING:
@@ -18,10 +22,8 @@ if TYPE_CHECKING:
 
 
 def deterministic_seed(base_seed: int, chord_id: str, param: str) -> int:
-    """Generate deterministic seed for a chord parameter."""
-    hash_input = f"{base_seed}:{chord_id}:{param}".encode()
-    hash_bytes = hashlib.blake2b(hash_input, digest_size=8).digest()
-    return int.from_bytes(hash_bytes, byteorder="big")
+    """Generate deterministic seed for a chord parameter (the legacy seed scheme)."""
+    return legacy_seed(base_seed, chord_id, param)
 
 
 def apply_velocity_curve(
@@ -74,6 +76,7 @@ def render_chord_event_to_notes(
     Args:
         chord_event: ChordEvent model with pattern fields
         project_context: Dict with tonic, mode, bpm, time_signature_num, time_signature_den
+            and optionally seed_scheme (see seeds.py, default "legacy")
         seed: Base seed for determinism
 
     Returns:
@@ -118,16 +121,12 @@ def render_chord_event_to_notes(
     strum_ticks = int(strum_beats * ticks_per_beat)
     humanize_ticks = int(humanize_beats * ticks_per_beat)
 
-    # Generate deterministic seeds
-    strum_seed = deterministic_seed(seed, str(chord_event.id), "strum")
-    humanize_seed = deterministic_seed(seed, str(chord_event.id), "humanize")
-    velocity_seed = deterministic_seed(seed, str(chord_event.id), "velocity")
-    pattern_seed = deterministic_seed(seed, str(chord_event.id), "pattern")
-
-    rng_strum = random.Random(strum_seed)
-    rng_humanize = random.Random(humanize_seed)
-    rng_velocity = random.Random(velocity_seed)
-    rng_pattern = random.Random(pattern_seed)
+    # Deterministic random streams per parameter
+    seed_scheme = project_context.get("seed_scheme", "legacy")
+    chord_id = str(chord_event.id)
+    rng_strum = child_rng(seed_scheme, seed, chord_id, "strum")
+    rng_humanize = child_rng(seed_scheme, seed, chord_id, "humanize")
+    rng_velocity = child_rng(seed_scheme, seed, chord_id, "velocity")
 
     pattern_type = chord_event.pattern_type or "block"
     notes = []
@@ -238,8 +237,8 @@ def render_chord_event_to_notes(
         base_velocity = int(100 * intensity * accent)
         velocity = apply_velocity_curve(base_velocity, note_idx, len(voicing_pitches), chord_event.velocity_curve or "flat")
 
-        # Apply velocity jitter
-        if chord_event.velocity_jitter > 0:
+        # Apply velocity jitter (unset on unsaved events)
+        if (chord_event.velocity_jitter or 0) > 0:
             jitter = rng_velocity.randint(-chord_event.velocity_jitter, chord_event.velocity_jitter)
             velocity += jitter
 
@@ -257,3 +256,179 @@ def render_chord_event_to_notes(
 
     return notes
 
+
+# Comp steps when a chord event has no comp_pattern
+DEFAULT_COMP_STEPS = [1, 0, 1, 0, 1, 0, 1, 0]
+
+
+def render_clip_chord_events(
+    chord_events: Iterable["ChordEvent"],
+    project_context: dict,
+    seed: int,
+) -> list[dict]:
+    """Render many chord events (a clip or progression) to note events.
+
+    Gives the same notes, in the same order, as render_chord_event_to_notes()
+    per event, without redoing per-event work that repeats across a clip:
+    voicings are cached per (roman numeral, voicing, inversion), the note
+    start pattern (offsets and accents) is built once per distinct pattern
+    and voicing, and an event's random streams are only seeded for the
+    parameters it actually randomizes.
+
+    Args:
+        chord_events: Chord events in render order (e.g. a clip's chord_events)
+        project_context: As for render_chord_event_to_notes()
+        seed: Base seed for determinism
+
+    Returns:
+        List of note dicts: {pitch, start_tick, duration_tick, velocity}
+    """
+    from midinecromancer.services.chord_render import voice_roman
+
+    tonic = project_context["tonic"]
+    mode = project_context["mode"]
+    seed_scheme = project_context.get("seed_scheme", "legacy")
+
+    templates: dict[tuple, list[tuple[int, int, float]]] = {}
+    notes = []
+    for chord_event in chord_events:
+        voicing_pitches = voice_roman(
+            tonic,
+            mode,
+            chord_event.roman_numeral,
+            chord_event.voicing or "root",
+            chord_event.inversion or 0,
+        )
+        if not voicing_pitches:
+            continue
+
+        base_start_tick = chord_event.start_tick
+        duration_ticks = int(chord_event.duration_tick)
+        end_tick = base_start_tick + duration_ticks
+        chord_id = str(chord_event.id)
+
+        pattern = _pattern_key(chord_event, voicing_pitches, duration_ticks)
+        if pattern[0] == "strum" and pattern[3] == "random":
+            # Random strum order is drawn per event
+            rng_strum = child_rng(seed_scheme, seed, chord_id, "strum")
+            note_starts = _note_starts(pattern, rng_strum)
+        else:
+            note_starts = templates.get(pattern)
+            if note_starts is None:
+                note_starts = templates[pattern] = _note_starts(pattern)
+
+        humanize_beats = float(chord_event.humanize_beats)
+        humanize_ticks = int(humanize_beats * PPQ)
+        rng_humanize = (
+            child_rng(seed_scheme, seed, chord_id, "humanize") if humanize_beats > 0 else None
+        )
+        velocity_jitter = chord_event.velocity_jitter or 0
+        rng_velocity = (
+            child_rng(seed_scheme, seed, chord_id, "velocity") if velocity_jitter > 0 else None
+        )
+        intensity = float(chord_event.intensity)
+        velocity_curve = chord_event.velocity_curve or "flat"
+        gated_duration = int(duration_ticks * float(chord_event.duration_gate))
+        voice_count = len(voicing_pitches)
+
+        for note_idx, offset, accent in note_starts:
+            note_start = base_start_tick + offset
+            if rng_humanize is not None:
+                note_start += rng_humanize.randint(-humanize_ticks, humanize_ticks)
+                note_start = max(base_start_tick, min(end_tick, note_start))
+
+            velocity = apply_velocity_curve(
+                int(100 * intensity * accent), note_idx, voice_count, velocity_curve
+            )
+            if rng_velocity is not None:
+                velocity += rng_velocity.randint(-velocity_jitter, velocity_jitter)
+
+            notes.append({
+                "pitch": voicing_pitches[note_idx],
+                "start_tick": note_start,
+                "duration_tick": gated_duration,
+                "velocity": max(1, min(127, velocity)),
+            })
+
+    return notes
+
+
+def _pattern_key(
+    chord_event: "ChordEvent", voicing_pitches: tuple[int, ...], duration_ticks: int
+) -> tuple:
+    """Everything that decides a chord event's note starts, as a hashable key."""
+    pattern_type = chord_event.pattern_type or "block"
+    if pattern_type == "strum":
+        strum_ticks = int(float(chord_event.strum_beats) * PPQ)
+        strum_spread = float(chord_event.strum_spread or 1.0)
+        direction = chord_event.strum_direction or "down"
+        return ("strum", voicing_pitches, int(strum_ticks * strum_spread), direction)
+    if pattern_type == "comp":
+        comp_pattern = chord_event.comp_pattern or {}
+        steps = comp_pattern.get("steps", DEFAULT_COMP_STEPS)
+        return (
+            "comp",
+            len(voicing_pitches),
+            duration_ticks,
+            comp_pattern.get("grid", "1/8"),
+            tuple(steps),
+            tuple(comp_pattern.get("accent", [1.0] * len(steps))),
+            comp_pattern.get("swing", 0.0),
+            chord_event.retrigger or False,
+        )
+    # Block, arp or unknown
+    return ("block", len(voicing_pitches))
+
+
+def _note_starts(
+    pattern: tuple, rng_strum: random.Random | None = None
+) -> list[tuple[int, int, float]]:
+    """(note index, offset from the chord start, accent) per note of a pattern key."""
+    if pattern[0] == "strum":
+        _, voicing_pitches, strum_ticks, direction = pattern
+        note_indices = list(range(len(voicing_pitches)))
+        if direction == "up":
+            note_indices.reverse()
+        elif direction == "alternate":
+            sorted_pitches = sorted(enumerate(voicing_pitches), key=lambda x: x[1])
+            low_indices = [i for i, _ in sorted_pitches[: len(sorted_pitches) // 2]]
+            high_indices = [i for i, _ in sorted_pitches[len(sorted_pitches) // 2 :]]
+            note_indices = []
+            for i in range(max(len(low_indices), len(high_indices))):
+                if i < len(low_indices):
+                    note_indices.append(low_indices[i])
+                if i < len(high_indices):
+                    note_indices.append(high_indices[-(i + 1)])
+        elif direction == "random":
+            rng_strum.shuffle(note_indices)
+
+        last = len(note_indices) - 1
+        if last > 0 and strum_ticks > 0:
+            return [
+                (note_idx, int(i / last * strum_ticks), 1.0)
+                for i, note_idx in enumerate(note_indices)
+            ]
+        return [(note_idx, 0, 1.0) for note_idx in note_indices]
+
+    if pattern[0] == "comp":
+        _, voice_count, duration_ticks, grid, steps, accents, swing, retrigger = pattern
+        grid_denominator = int(grid.split("/")[1]) if "/" in grid else 4
+        ticks_per_step = int(PPQ * 4 / grid_denominator)
+        swing_offset = int(swing * ticks_per_step / 2) if swing > 0 else 0
+
+        note_starts = []
+        for step_idx, step_on in enumerate(steps):
+            if not step_on:
+                continue
+            offset = step_idx * ticks_per_step
+            if step_idx % 2 == 1:
+                offset += swing_offset
+            if offset < duration_ticks:
+                accent = accents[step_idx] if step_idx < len(accents) else 1.0
+                note_starts.extend((note_idx, offset, accent) for note_idx in range(voice_count))
+                if not retrigger:
+                    # Only the first hit sounds
+                    break
+        return note_starts
+
+    return [(note_idx, 0, 1.0) for note_idx in range(pattern[1])]
@@ -0,0 +1,290 @@
+"""Beam search over diatonic chord progressions.
+
+A progression is a sequence of scale degrees (1-7), one per harmonic-rhythm
+slot. Every degree transition and every (slot, degree) choice is scored from
+tables built once per search, so expanding a state is a table lookup rather
+than a re-scoring of the whole progression. Locked bars are hard constraints:
+a locked slot only ever expands to its locked chord, so no search effort is
+spent on progressions that would be thrown away.
+"""
+
+import heapq
+import random
+import time
+from dataclasses import dataclass
+
+from midinecromancer.music.progression import _degree_to_roman, _roman_to_chord_name
+from midinecromancer.music.theory import Mode, roman_to_degree
+
+DEGREES = range(1, 8)
+
+# Slot length in bars per harmonic rhythm ("custom" falls back to one per bar)
+HARMONIC_RHYTHM_BARS: dict[str, float] = {
+    "1chord/bar": 1,
+    "2chords/bar": 0.5,
+    "slow": 2,
+}
+
+# Root motion in scale steps ((next - prev) % 7) -> base transition score
+ROOT_MOTION_SCORES: dict[int, float] = {
+    0: -0.6,  # repetition
+    1: 0.4,  # step up
+    2: 0.5,  # third up
+    3: 1.0,  # fourth up / fifth down (V -> I)
+    4: 0.6,  # fifth up
+    5: 0.5,  # third down
+    6: 0.3,  # step down
+}
+
+# Per-style preference for each degree (index 0 unused)
+STYLE_DEGREE_WEIGHTS: dict[str, list[float]] = {
+    "pop": [0.0, 0.8, 0.1, -0.1, 0.7, 0.7, 0.6, -0.6],
+    "rap_minor": [0.0, 0.9, -0.4, 0.2, 0.5, 0.2, 0.7, 0.6],
+    "jazzy": [0.0, 0.6, 0.7, 0.3, 0.4, 0.7, 0.5, 0.1],
+    "modal": [0.0, 0.9, 0.4, 0.3, 0.4, -0.3, 0.3, 0.6],
+    "circle_fifths": [0.0, 0.6, 0.4, 0.3, 0.4, 0.6, 0.4, 0.1],
+}
+
+# Score of the first chord by degree (tonic, or vi as in progression.py's start_on)
+START_SCORES: dict[int, float] = {1: 2.0, 6: 0.8}
+
+# Degrees with dominant function, favored as tension rises
+DOMINANT_DEGREES = (5, 7)
+# Less common degrees, favored as complexity rises
+COLOR_DEGREES = (2, 3, 7)
+
+
+@dataclass
+class ChordSearchResult:
+    """Best progressions found by search_progressions."""
+
+    # (score, degrees) per candidate, best first
+    candidates: list[tuple[float, tuple[int, ...]]]
+    slots: list[tuple[float, float]]
+    romans: list[dict[int, str]]
+    explored: int = 0
+    elapsed_ms: float = 0.0
+    budget_exceeded: bool = False
+
+
+def chord_slots(bars: int, harmonic_rhythm: str = "1chord/bar") -> list[tuple[float, float]]:
+    """Split bars into (start_bar, length_bars) slots for one chord each."""
+    slot_bars = HARMONIC_RHYTHM_BARS.get(harmonic_rhythm, 1)
+    slots = []
+    start = 0
+    while start < bars:
+        length = min(slot_bars, bars - start)
+        slots.append((start, length))
+        start += length
+    return slots
+
+
+def parse_locks(locks: dict | None, slots: list[tuple[float, float]]) -> dict[int, str]:
+    """Map lock bar indices to the slots sounding on those downbeats.
+
+    Lock keys are bar indices relative to the generated range (ints, or
+    numeric strings as they arrive from JSON); values are roman numerals.
+    Keys that are not bar indices or fall outside the range are ignored.
+
+    Returns:
+        Dict of slot index -> locked roman numeral
+    """
+    slot_locks: dict[int, str] = {}
+    for key, roman in (locks or {}).items():
+        try:
+            bar = int(key)
+        except (TypeError, ValueError):
+            continue
+        for index, (start, length) in enumerate(slots):
+            if start <= bar < start + length:
+                slot_locks[index] = str(roman)
+                break
+    return slot_locks
+
+
+def transition_table(progression_style: str, tension: float) -> list[list[float]]:
+    """Score for moving from degree prev to degree next, as table[prev][next].
+
+    Row 0 scores the first chord (no previous chord).
+    """
+    table = [[0.0] * 8 for _ in range(8)]
+    for next_degree in DEGREES:
+        table[0][next_degree] = START_SCORES.get(next_degree, 0.0)
+        for prev in DEGREES:
+            score = ROOT_MOTION_SCORES[(next_degree - prev) % 7]
+            if progression_style == "circle_fifths" and (next_degree - prev) % 7 == 3:
+                score += 0.8
+            if progression_style == "jazzy" and (prev, next_degree) in ((2, 5), (6, 2)):
+                score += 0.8
+            if prev in DOMINANT_DEGREES:
+                # Tension wants dominants resolved to the tonic
+                score += tension * (0.8 if next_degree == 1 else -0.2)
+            table[prev][next_degree] = score
+    return table
+
+
+def slot_table(
+    slots: list[tuple[float, float]],
+    progression_style: str,
+    tension: float,
+    complexity: float,
+    cadence_ending: bool,
+    seed: int,
+) -> list[list[float]]:
+    """Score for choosing each degree in each slot, as table[slot][degree].
+
+    A small seeded jitter makes different seeds prefer different (equally
+    idiomatic) progressions.
+    """
+    rng = random.Random(seed)
+    weights = STYLE_DEGREE_WEIGHTS.get(progression_style, STYLE_DEGREE_WEIGHTS["pop"])
+    table = []
+    for _ in slots:
+        row = [0.0] * 8
+        for degree in DEGREES:
+            score = weights[degree] + rng.uniform(0.0, 0.6)
+            if degree in DOMINANT_DEGREES:
+                score += tension * 0.5
+            if degree in COLOR_DEGREES:
+                score += complexity * 0.5
+            row[degree] = score
+        table.append(row)
+    if cadence_ending and slots:
+        table[-1][1] += 2.0
+        if len(slots) >= 2:
+            table[-2][5] += 1.2
+    return table
+
+
+def search_progressions(
+    bars: int,
+    mode: Mode,
+    seed: int,
+    locks: dict | None = None,
+    harmonic_rhythm: str = "1chord/bar",
+    progression_style: str = "pop",
+    tension: float = 0.5,
+    complexity: float = 0.5,
+    cadence_ending: bool = True,
+    num_candidates: int = 5,
+    beam_width: int = 256,
+    time_budget_ms: float | None = None,
+) -> ChordSearchResult:
+    """Find the best-scoring progressions with a beam search.
+
+    Each step keeps the beam_width best partial progressions. If the time
+    budget runs out before the last slot, the beam narrows to num_candidates
+    for the remaining slots, so a result always comes back (a slightly
+    greedier one).
+
+    Args:
+        bars: Number of bars
+        mode: Mode (roman numerals follow progression.py)
+        seed: Seed for the slot jitter
+        locks: Bar index -> required roman numeral (hard constraints)
+        harmonic_rhythm: "1chord/bar", "2chords/bar" or "slow"
+        progression_style: Key of STYLE_DEGREE_WEIGHTS
+        tension: Tension level (0-1)
+        complexity: Complexity level (0-1)
+        cadence_ending: Favor ending on V -> I
+        num_candidates: Number of progressions to return
+        beam_width: Partial progressions kept per step
+        time_budget_ms: Search time limit (None for no limit)
+
+    Returns:
+        ChordSearchResult with up to num_candidates distinct progressions
+    """
+    start = time.perf_counter()
+    slots = chord_slots(bars, harmonic_rhythm)
+    slot_locks = parse_locks(locks, slots)
+    transitions = transition_table(progression_style, tension)
+    choices = slot_table(slots, progression_style, tension, complexity, cadence_ending, seed)
+
+    romans = []
+    allowed = []
+    for index in range(len(slots)):
+        if index in slot_locks:
+            degree = roman_to_degree(slot_locks[index])
+            romans.append({degree: slot_locks[index]})
+            allowed.append((degree,))
+        else:
+            romans.append({degree: _degree_to_roman(degree, mode) for degree in DEGREES})
+            allowed.append(tuple(DEGREES))
+
+    width = max(beam_width, num_candidates)
+    beam: list[tuple[float, tuple[int, ...]]] = [(0.0, ())]
+    explored = 0
+    budget_exceeded = False
+    for index, degrees in enumerate(allowed):
+        # Scores of every allowed next degree after each previous degree
+        step = [
+            [(transitions[prev][degree] + choices[index][degree], degree) for degree in degrees]
+            for prev in range(8)
+        ]
+        expanded = [
+            (score + step_score, path + (degree,))
+            for score, path in beam
+            for step_score, degree in step[path[-1] if path else 0]
+        ]
+        explored += len(expanded)
+        beam = heapq.nlargest(width, expanded, key=lambda state: state[0])
+        if (
+            not budget_exceeded
+            and time_budget_ms is not None
+            and (time.perf_counter() - start) * 1000 > time_budget_ms
+        ):
+            budget_exceeded = True
+            width = num_candidates
+
+    return ChordSearchResult(
+        candidates=_distinct(beam, num_candidates, min_distance=max(1, len(slots) // 8)),
+        slots=slots,
+        romans=romans,
+        explored=explored,
+        elapsed_ms=(time.perf_counter() - start) * 1000,
+        budget_exceeded=budget_exceeded,
+    )
+
+
+def progression_from_degrees(
+    result: ChordSearchResult, degrees: tuple[int, ...], tonic: str, mode: Mode
+) -> list[dict]:
+    """Build chord dicts (roman_numeral, chord_name, start_bar, length_bars)."""
+    progression = []
+    for (start_bar, length_bars), romans, degree in zip(
+        result.slots, result.romans, degrees, strict=True
+    ):
+        roman = romans[degree]
+        progression.append(
+            {
+                "roman_numeral": roman,
+                "chord_name": _roman_to_chord_name(roman, tonic, mode),
+                "start_bar": start_bar,
+                "length_bars": length_bars,
+            }
+        )
+    return progression
+
+
+def _distinct(
+    beam: list[tuple[float, tuple[int, ...]]], count: int, min_distance: int
+) -> list[tuple[float, tuple[int, ...]]]:
+    """Pick the best count states that differ in at least min_distance slots.
+
+    Falls back to the next best states if the beam is not diverse enough.
+    """
+    picked: list[tuple[float, tuple[int, ...]]] = []
+    rest = []
+    for state in beam:
+        if len(picked) == count:
+            break
+        if all(
+            sum(a != b for a, b in zip(state[1], other[1], strict=True)) >= min_distance
+            for other in picked
+        ):
+            picked.append(state)
+        else:
+            rest.append(state)
+    picked.extend(rest[: count - len(picked)])
+    picked.sort(key=lambda state: state[0], reverse=True)
+    return picked
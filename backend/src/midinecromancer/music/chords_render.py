@@ -59,7 +59,8 @@ def voice_chord(
         voicing_low: Lowest allowed MIDI pitch
         voicing_high: Highest allowed MIDI pitch
         previous_voicing: Previous chord voicing for smooth voice leading
-        inversion_policy: "root", "smooth", or "drop2"
+        inversion_policy: "root", "smooth", or "drop2" ("optimal" voices whole
+            progressions, see music/voice_leading.py)
 
     Returns:
         List of MIDI pitches within range
@@ -140,7 +141,8 @@ def render_chord_progression_to_notes(
             - pattern: Optional pattern dict for rhythm_pattern
             - voicing_low_midi: Lowest MIDI pitch
             - voicing_high_midi: Highest MIDI pitch
-            - inversion_policy: "root", "smooth", "drop2"
+            - inversion_policy: "root", "smooth", "drop2", or "optimal" (least
+              total movement over the whole progression)
         seed: Random seed for determinism
         timing_ctx: Context dict with:
             - tonic: Key tonic
@@ -176,28 +178,36 @@ def render_chord_progression_to_notes(
 
     subdivision_ticks = parse_subdivision(subdivision)
 
-    previous_voicing = None
-
+    # Get chord tones
+    chords_tones = []
     for chord in chords:
-        start_tick = chord["start_tick"] + offset_ticks
-        duration_tick = chord["duration_tick"]
-        gate_duration = int(duration_tick * gate_pct / 100)
-
-        # Get chord tones
         roman = chord["roman_numeral"]
         degree = roman_to_degree(roman)
         quality = "7th" if "7" in roman else "triad"
-        chord_tones = get_chord_notes(tonic, mode, degree, quality, octave=4)
-
-        # Voice chord
-        voiced = voice_chord(
-            chord_tones,
-            voicing_low,
-            voicing_high,
-            previous_voicing,
-            inversion_policy,
-        )
-        previous_voicing = voiced
+        chords_tones.append(get_chord_notes(tonic, mode, degree, quality, octave=4))
+
+    # Voice chords
+    if inversion_policy == "optimal":
+        from midinecromancer.music.voice_leading import voice_progression
+
+        voicings = voice_progression(chords_tones, voicing_low, voicing_high)
+    else:
+        voicings = []
+        previous_voicing = None
+        for chord_tones in chords_tones:
+            previous_voicing = voice_chord(
+                chord_tones,
+                voicing_low,
+                voicing_high,
+                previous_voicing,
+                inversion_policy,
+            )
+            voicings.append(previous_voicing)
+
+    for chord, voiced in zip(chords, voicings, strict=True):
+        start_tick = chord["start_tick"] + offset_ticks
+        duration_tick = chord["duration_tick"]
+        gate_duration = int(duration_tick * gate_pct / 100)
 
         if not voiced:
             continue
@@ -0,0 +1,283 @@
+"""Counter-based drum engine ("fast" mode of generate_drum_pattern_v2).
+
+The compat engine in drums.py hashes an f-string with blake2b and seeds a new
+Mersenne Twister for every bar, role and (for kicks) step. Seeding dominates
+its run time. This engine instead reads every random draw for one
+(seed, bar, role) from a single SHAKE-128 digest: draw i is a pure function of
+(seed, bar, role, i) and does not depend on earlier draws, so a bar's kick,
+snare and hat hits depend only on (seed, bar) and the pattern parameters, not
+on how many bars are generated.
+
+Draws are 16-bit integers and are compared against probabilities scaled to
+2**16, so the inner loops do integer arithmetic only. Hits are collected
+column-wise for all bars and only turned into event dicts (with pitches from
+the DrumMap) at the end. The musical rules are the same as the compat
+engine, but the random numbers differ, so patterns differ from the compat
+output for the same seed.
+"""
+
+import hashlib
+import sys
+from array import array
+from typing import TYPE_CHECKING
+
+from midinecromancer.music.theory import PPQ
+
+if TYPE_CHECKING:
+    from midinecromancer.music.drums import DrumMap
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+# Draws are uniform integers in [0, UNIT)
+UNIT = 1 << 16
+
+# Stream identifiers; changing these changes every fast-mode pattern
+ROLE_STREAMS = {
+    "kick": 1,
+    "snare": 2,
+    "hats": 3,
+    "ghost": 4,
+    "fill": 5,
+}
+
+# Stream layout: four lanes per step (hit, shift/select, direction, velocity),
+# then per-bar draws
+LANES = 4
+STEPS = 16
+BAR_DRAWS = STEPS * LANES  # pause, roll or fill decision
+BAR_DRAWS_2 = BAR_DRAWS + 1  # roll start or fill length
+STREAM_LENGTH = BAR_DRAWS + 4
+
+_HIT, _SHIFT, _DIRECTION, _VELOCITY = range(LANES)
+
+_KICK_STYLE_STEPS = {
+    "boom_bap": [0, 6, 8, 14],
+    "trap": [0, 8, 12],
+    "drill": [0, 4, 8, 12],
+    "lofi": [0, 8],
+    "minimal": [0],
+}
+
+
+def bar_stream(seed: int, bar: int, role: str) -> array:
+    """Get the random draws for one (seed, bar, role).
+
+    Args:
+        seed: Pattern seed (any int)
+        bar: Bar index
+        role: Key of ROLE_STREAMS
+
+    Returns:
+        STREAM_LENGTH unsigned 16-bit draws
+    """
+    message = f"{seed}:{bar}:{ROLE_STREAMS[role]}".encode()
+    draws = array("H")
+    draws.frombytes(hashlib.shake_128(message).digest(STREAM_LENGTH * 2))
+    if _BIG_ENDIAN:
+        draws.byteswap()
+    return draws
+
+
+def _threshold(probability: float) -> float:
+    """Scale a probability so that `draw < _threshold(p)` happens with probability p."""
+    return probability * UNIT
+
+
+class DrumHits:
+    """Column-wise hit buffer shared by all roles."""
+
+    __slots__ = ("start_tick", "velocity", "duration_tick", "role")
+
+    def __init__(self):
+        self.start_tick: list[int] = []
+        self.velocity: list[int] = []
+        self.duration_tick: list[int] = []
+        self.role: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.start_tick)
+
+    def add(self, start_tick: int, velocity: int, duration_tick: int, role: str) -> None:
+        self.start_tick.append(start_tick)
+        self.velocity.append(velocity)
+        self.duration_tick.append(duration_tick)
+        self.role.append(role)
+
+    def to_events(self, drum_map: "DrumMap") -> list[dict]:
+        """Map roles to pitches and build events sorted by start tick."""
+        pitches = {
+            "kick": drum_map.get_note("kick"),
+            "snare": drum_map.get_note("snare"),
+            "ghost": drum_map.get_note("snare"),
+            "closed_hat": drum_map.get_note("closed_hat"),
+        }
+        order = sorted(range(len(self.start_tick)), key=self.start_tick.__getitem__)
+        return [
+            {
+                "pitch": pitches[self.role[i]],
+                "velocity": self.velocity[i],
+                "start_tick": self.start_tick[i],
+                "duration_tick": self.duration_tick[i],
+                "role": self.role[i],
+            }
+            for i in order
+        ]
+
+
+def _kick(hits, bars, ticks_per_bar, style, seed, density, pause_probability, pause_scope):
+    step_ticks = ticks_per_bar // 4
+    duration = step_ticks // 2
+    base_steps = _KICK_STYLE_STEPS.get(style, [0, 8])
+    hit_below = _threshold(density)
+    pause_below = _threshold(pause_probability) if pause_scope in ("kick", "all") else 0
+    shift_below = _threshold(0.2)
+    for bar in range(bars):
+        draws = bar_stream(seed, bar, "kick")
+        if draws[BAR_DRAWS] < pause_below:
+            continue
+        bar_tick = bar * ticks_per_bar
+        for step in base_steps:
+            lane = step * LANES
+            if draws[lane + _HIT] >= hit_below:
+                continue
+            # Sometimes shift ±1 step
+            if draws[lane + _SHIFT] < shift_below:
+                step += -1 if draws[lane + _DIRECTION] < UNIT // 2 else 1
+                step = max(0, min(15, step))
+            # Strong beats louder
+            velocity_draw = draws[lane + _VELOCITY]
+            if step % 4 == 0:
+                velocity = 110 + ((velocity_draw * 17) >> 16)
+            else:
+                velocity = 90 + ((velocity_draw * 20) >> 16)
+            hits.add(bar_tick + step * step_ticks, velocity, duration, "kick")
+
+
+def _snare(hits, bars, ticks_per_bar, seed, density, pause_probability):
+    step_ticks = ticks_per_bar // 4
+    duration = step_ticks // 2
+    hit_below = _threshold(density)
+    pause_below = _threshold(pause_probability)
+    snare_steps = []
+    for bar in range(bars):
+        draws = bar_stream(seed, bar, "snare")
+        if draws[BAR_DRAWS] < pause_below:
+            continue
+        bar_tick = bar * ticks_per_bar
+        for step in (4, 12):
+            lane = step * LANES
+            if draws[lane + _HIT] >= hit_below:
+                continue
+            velocity = 100 + ((draws[lane + _VELOCITY] * 20) >> 16)
+            hits.add(bar_tick + step * step_ticks, velocity, duration, "snare")
+            snare_steps.append(step)
+    return snare_steps
+
+
+def _hats(hits, bars, ticks_per_bar, seed, mode, density, swing, roll_probability):
+    step_ticks = ticks_per_bar // 4
+    duration = step_ticks // 2
+    swing_offset = int(swing * step_ticks * 0.5) if swing != 0.0 else 0
+    hit_below = _threshold(density)
+    roll_below = _threshold(roll_probability)
+    for bar in range(bars):
+        draws = bar_stream(seed, bar, "hats")
+        if mode == "straight_8":
+            steps = list(range(0, 16, 2))
+        elif mode in ("skip_step", "roll"):
+            steps = [s for s in range(0, 16, 2) if draws[s * LANES + _SHIFT] < hit_below]
+            if mode == "roll" and draws[BAR_DRAWS] < roll_below:
+                roll_start = 8 + ((draws[BAR_DRAWS_2] * 5) >> 16)  # 8-12
+                steps.extend(range(roll_start, roll_start + 4))
+        else:
+            steps = range(16)
+
+        bar_tick = bar * ticks_per_bar
+        # Roll steps can repeat base steps, so draws are keyed by position
+        for index, step in enumerate(steps):
+            lane = index * LANES
+            if draws[lane + _HIT] >= hit_below:
+                continue
+            tick = bar_tick + step * step_ticks
+            if step % 2 == 1:
+                tick += swing_offset
+            velocity = 70 + ((draws[lane + _VELOCITY] * 40) >> 16)
+            hits.add(tick, velocity, duration, "closed_hat")
+
+
+def _ghosts(hits, bars, ticks_per_bar, seed, snare_steps, density):
+    step_ticks = ticks_per_bar // 4
+    duration = step_ticks // 2
+    hit_below = _threshold(density)
+    skip = set(snare_steps)
+    steps = [step for step in range(16) if step not in skip]
+    for bar in range(bars):
+        draws = bar_stream(seed, bar, "ghost")
+        bar_tick = bar * ticks_per_bar
+        for step in steps:
+            lane = step * LANES
+            if draws[lane + _HIT] < hit_below:
+                velocity = 40 + ((draws[lane + _VELOCITY] * 20) >> 16)
+                hits.add(bar_tick + step * step_ticks, velocity, duration, "ghost")
+
+
+def _fill(hits, bar, ticks_per_bar, draws):
+    fill_start_tick = bar * ticks_per_bar + (ticks_per_bar // 2)
+    fill_length_ticks = ticks_per_bar // 2
+    num_hits = 4 + ((draws[BAR_DRAWS_2] * 5) >> 16)  # 4-8 hits
+    for i in range(num_hits):
+        tick = fill_start_tick + int((i / num_hits) * fill_length_ticks)
+        jitter = ((draws[i * LANES + _VELOCITY] * 21) >> 16) - 10  # -10..10
+        if i % 2 == 0:
+            hits.add(tick, 100 + jitter, PPQ // 8, "snare")
+        else:
+            hits.add(tick, 110 + jitter, PPQ // 8, "kick")
+
+
+def generate_drum_pattern_fast(
+    bars: int,
+    ticks_per_bar: int,
+    seed: int,
+    drum_map: "DrumMap",
+    style: str,
+    swing: float,
+    density: float,
+    hat_mode: str,
+    ghost_notes: bool,
+    pause_probability: float,
+    pause_scope: str,
+    fill_probability: float,
+    syncopation: float,
+    ghost_note_probability: float,
+) -> list[dict]:
+    """Generate a drum pattern with counter-based random streams.
+
+    Arguments mirror generate_drum_pattern_v2 (with ticks_per_bar already
+    resolved); see there for their meaning.
+
+    Returns:
+        Drum events sorted by start_tick
+    """
+    hits = DrumHits()
+    _kick(hits, bars, ticks_per_bar, style, seed, density, pause_probability, pause_scope)
+    snare_steps = _snare(hits, bars, ticks_per_bar, seed, density, pause_probability)
+    _hats(hits, bars, ticks_per_bar, seed, hat_mode, density, swing, 0.1)
+
+    if ghost_notes and ghost_note_probability > 0:
+        _ghosts(hits, bars, ticks_per_bar, seed, snare_steps, ghost_note_probability)
+
+    if fill_probability > 0 and bars > 0:
+        draws = bar_stream(seed, bars - 1, "fill")
+        if draws[BAR_DRAWS] < _threshold(fill_probability):
+            _fill(hits, bars - 1, ticks_per_bar, draws)
+
+    # Shift off-beat hits
+    if syncopation > 0:
+        syncopation_offset = int(syncopation * PPQ / 8)
+        beat_ticks = ticks_per_bar / 4
+        start_ticks = hits.start_tick
+        for i, tick in enumerate(start_ticks):
+            if ((tick % ticks_per_bar) / beat_ticks) % 1.0 > 0.1:
+                start_ticks[i] = tick + syncopation_offset
+
+    return hits.to_events(drum_map)
@@ -4,11 +4,10 @@ Pattern-based, swing-aware, variation-controlled drum generation
 for hip-hop, trap, drill, and other producer workflows.
 """
 
-import hashlib
-import random
 from dataclasses import dataclass
 from typing import Literal
 
+from midinecromancer.music.seeds import SeedScheme, child_rng, derive_seed, legacy_seed, make_rng
 from midinecromancer.music.theory import PPQ
 
 
@@ -58,10 +57,8 @@ class GrooveTemplate:
 
 
 def deterministic_seed(base_seed: int, bar_index: int, role: str, param: str) -> int:
-    """Generate deterministic seed for variation."""
-    hash_input = f"{base_seed}:{bar_index}:{role}:{param}".encode()
-    hash_bytes = hashlib.blake2b(hash_input, digest_size=8).digest()
-    return int.from_bytes(hash_bytes, byteorder="big")
+    """Generate deterministic seed for variation (the legacy seed scheme)."""
+    return legacy_seed(base_seed, bar_index, role, param)
 
 
 def apply_swing(
@@ -102,6 +99,7 @@ def generate_kick_pattern(
     density: float = 0.7,
     pause_probability: float = 0.0,
     pause_scope: str = "kick",
+    seed_scheme: SeedScheme = "legacy",
 ) -> list[dict]:
     """Generate kick pattern with style-aware placement.
 
@@ -113,6 +111,7 @@ def generate_kick_pattern(
         density: Hit density (0-1)
         pause_probability: Probability of pausing a bar
         pause_scope: What to pause (kick, all)
+        seed_scheme: Seed scheme for the per-bar streams (see seeds.py)
 
     Returns:
         List of kick events: {pitch, velocity, start_tick, duration_tick, role}
@@ -132,8 +131,7 @@ def generate_kick_pattern(
     base_steps = style_patterns.get(style, [0, 8])  # Default: 1 and 3
 
     for bar in range(bars):
-        bar_seed = deterministic_seed(seed, bar, "kick", "pattern")
-        bar_rng = random.Random(bar_seed)
+        bar_rng = child_rng(seed_scheme, seed, bar, "kick", "pattern")
 
         # Check for pause
         if pause_scope in ("kick", "all") and bar_rng.random() < pause_probability:
@@ -146,8 +144,7 @@ def generate_kick_pattern(
                 continue
 
             # Variation: sometimes shift ±1 step
-            variation_seed = deterministic_seed(seed, bar, "kick", f"variation_{step}")
-            var_rng = random.Random(variation_seed)
+            var_rng = child_rng(seed_scheme, seed, bar, "kick", f"variation_{step}")
             if var_rng.random() < 0.2:  # 20% chance to shift
                 step += var_rng.choice([-1, 1])
                 step = max(0, min(15, step))  # Clamp to 0-15
@@ -180,6 +177,7 @@ def generate_snare_pattern(
     seed: int,
     density: float = 0.8,
     pause_probability: float = 0.0,
+    seed_scheme: SeedScheme = "legacy",
 ) -> list[dict]:
     """Generate snare pattern (typically on 2 and 4)."""
     events = []
@@ -189,8 +187,7 @@ def generate_snare_pattern(
     base_steps = [4, 12]
 
     for bar in range(bars):
-        bar_seed = deterministic_seed(seed, bar, "snare", "pattern")
-        bar_rng = random.Random(bar_seed)
+        bar_rng = child_rng(seed_scheme, seed, bar, "snare", "pattern")
 
         # Check for pause
         if bar_rng.random() < pause_probability:
@@ -228,14 +225,14 @@ def generate_hat_pattern(
     swing: float = 0.0,
     roll_probability: float = 0.1,
     roll_subdivision: str = "1/32",
+    seed_scheme: SeedScheme = "legacy",
 ) -> list[dict]:
     """Generate hi-hat pattern with various modes."""
     events = []
     step_ticks = ticks_per_bar // 4  # 16th note grid
 
     for bar in range(bars):
-        bar_seed = deterministic_seed(seed, bar, "hats", "pattern")
-        bar_rng = random.Random(bar_seed)
+        bar_rng = child_rng(seed_scheme, seed, bar, "hats", "pattern")
 
         if mode == "straight_8":
             # Every 8th note
@@ -298,6 +295,7 @@ def generate_ghost_notes(
     seed: int,
     snare_events: list[dict],
     density: float = 0.3,
+    seed_scheme: SeedScheme = "legacy",
 ) -> list[dict]:
     """Generate ghost notes (quiet snares between main snares)."""
     events = []
@@ -310,8 +308,7 @@ def generate_ghost_notes(
         snare_steps.add(step)
 
     for bar in range(bars):
-        bar_seed = deterministic_seed(seed, bar, "ghost", "pattern")
-        bar_rng = random.Random(bar_seed)
+        bar_rng = child_rng(seed_scheme, seed, bar, "ghost", "pattern")
 
         # Add ghost notes in gaps
         for step in range(16):
@@ -338,7 +335,12 @@ def generate_ghost_notes(
 
 
 def generate_fill_pattern(
-    bar: int, ticks_per_bar: int, style: str, seed: int, drum_map: DrumMap
+    bar: int,
+    ticks_per_bar: int,
+    style: str,
+    seed: int,
+    drum_map: DrumMap,
+    seed_scheme: SeedScheme = "legacy",
 ) -> list[dict]:
     """Generate a fill pattern for the last bar.
 
@@ -348,11 +350,12 @@ def generate_fill_pattern(
         style: Style (boom_bap, trap, drill, lofi, minimal)
         seed: Random seed
         drum_map: Drum note mappings
+        seed_scheme: Seed scheme (see seeds.py)
 
     Returns:
         List of fill events
     """
-    rng = random.Random(seed)
+    rng = make_rng(seed_scheme, seed)
     events = []
 
     # Fill typically happens in last half-bar or last bar
@@ -408,6 +411,8 @@ def generate_drum_pattern_v2(
     syncopation: float = 0.0,
     ghost_note_probability: float = 0.3,
     hat_subdivision: Literal["1/8", "1/16", "1/32"] = "1/16",
+    engine: Literal["compat", "fast"] = "compat",
+    seed_scheme: SeedScheme = "legacy",
 ) -> list[dict]:
     """Generate producer-grade drum pattern.
 
@@ -429,34 +434,75 @@ def generate_drum_pattern_v2(
         syncopation: Syncopation amount (0-1), shifts off-beat hits
         ghost_note_probability: Probability of ghost notes (0-1)
         hat_subdivision: Hi-hat subdivision (1/8, 1/16, 1/32)
+        engine: "compat" reproduces the established patterns exactly; "fast"
+            uses counter-based random streams (see drum_engine.py) and is
+            deterministic but produces different patterns
+        seed_scheme: Seed scheme of the compat engine's per-bar streams
+            (see seeds.py); "legacy" reproduces the established patterns
 
     Returns:
         List of drum events with proper MIDI mapping
+
+    Raises:
+        ValueError: If engine is unknown
     """
     # Calculate timing
     quarter_notes_per_bar = (time_signature_num * 4) / time_signature_den
     ticks_per_bar = int(quarter_notes_per_bar * PPQ)
 
+    if engine == "fast":
+        from midinecromancer.music.drum_engine import generate_drum_pattern_fast
+
+        return generate_drum_pattern_fast(
+            bars=bars,
+            ticks_per_bar=ticks_per_bar,
+            seed=seed,
+            drum_map=drum_map,
+            style=style,
+            swing=swing,
+            density=density,
+            hat_mode=hat_mode,
+            ghost_notes=ghost_notes,
+            pause_probability=pause_probability,
+            pause_scope=pause_scope,
+            fill_probability=fill_probability,
+            syncopation=syncopation,
+            ghost_note_probability=ghost_note_probability,
+        )
+    if engine != "compat":
+        raise ValueError(f"Unknown drum engine: {engine}")
+
     all_events = []
 
     # Generate each role
     kick_events = generate_kick_pattern(
-        bars, ticks_per_bar, style, seed, density, pause_probability, pause_scope
+        bars, ticks_per_bar, style, seed, density, pause_probability, pause_scope, seed_scheme
     )
     snare_events = generate_snare_pattern(
-        bars, ticks_per_bar, style, seed, density, pause_probability
+        bars, ticks_per_bar, style, seed, density, pause_probability, seed_scheme
     )
     hat_events = generate_hat_pattern(
-        bars, ticks_per_bar, style, seed, hat_mode, density, swing, roll_probability=0.1
+        bars,
+        ticks_per_bar,
+        style,
+        seed,
+        hat_mode,
+        density,
+        swing,
+        roll_probability=0.1,
+        seed_scheme=seed_scheme,
     )
 
     # Apply drum map
+    kick_note = drum_map.get_note("kick")
+    snare_note = drum_map.get_note("snare")
+    closed_hat_note = drum_map.get_note("closed_hat")
     for event in kick_events:
-        event["pitch"] = drum_map.get_note("kick")
+        event["pitch"] = kick_note
     for event in snare_events:
-        event["pitch"] = drum_map.get_note("snare")
+        event["pitch"] = snare_note
     for event in hat_events:
-        event["pitch"] = drum_map.get_note("closed_hat")
+        event["pitch"] = closed_hat_note
 
     all_events.extend(kick_events)
     all_events.extend(snare_events)
@@ -465,18 +511,25 @@ def generate_drum_pattern_v2(
     # Add ghost notes if enabled
     if ghost_notes and ghost_note_probability > 0:
         ghost_events = generate_ghost_notes(
-            bars, ticks_per_bar, seed, snare_events, density=ghost_note_probability
+            bars,
+            ticks_per_bar,
+            seed,
+            snare_events,
+            density=ghost_note_probability,
+            seed_scheme=seed_scheme,
         )
         for event in ghost_events:
-            event["pitch"] = drum_map.get_note("snare")
+            event["pitch"] = snare_note
         all_events.extend(ghost_events)
 
     # Add fills if enabled (last bar or last half-bar)
     if fill_probability > 0:
-        fill_seed = deterministic_seed(seed, bars - 1, "fill", "pattern")
-        rng = random.Random(fill_seed)
+        fill_seed = derive_seed(seed_scheme, seed, bars - 1, "fill", "pattern")
+        rng = make_rng(seed_scheme, fill_seed)
         if rng.random() < fill_probability:
-            fill_events = generate_fill_pattern(bars - 1, ticks_per_bar, style, fill_seed, drum_map)
+            fill_events = generate_fill_pattern(
+                bars - 1, ticks_per_bar, style, fill_seed, drum_map, seed_scheme
+            )
             all_events.extend(fill_events)
 
     # Apply syncopation (shift off-beat hits)
@@ -1,8 +1,9 @@
 """Deterministic offset generation for arrangement synchronization."""
 
-import hashlib
 from typing import Literal
 
+from midinecromancer.music.seeds import legacy_seed
+
 
 def deterministic_offset(
     seed: int, object_id: str, kind: Literal["clip", "track", "lane"] = "clip"
@@ -20,14 +21,7 @@ def deterministic_offset(
     Returns:
         Offset in ticks (can be negative)
     """
-    # Create hash input
-    hash_input = f"{seed}:{object_id}:{kind}".encode()
-
-    # Use blake2b for deterministic hashing
-    hash_bytes = hashlib.blake2b(hash_input, digest_size=8).digest()
-
-    # Convert to integer
-    hash_int = int.from_bytes(hash_bytes, byteorder="big")
+    hash_int = legacy_seed(seed, object_id, kind)
 
     # Map to offset range [-120, 120] ticks (1/4 beat at PPQ=480)
     # This gives subtle timing variations without breaking alignment
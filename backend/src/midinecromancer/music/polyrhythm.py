@@ -1,13 +1,17 @@
 """Polyrhythm generation engine with LCM alignment."""
 
 import hashlib
+import json
 import math
 import random
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from fractions import Fraction
 from typing import Literal
 from uuid import UUID
 
+from midinecromancer.music.seeds import legacy_seed
 from midinecromancer.music.theory import PPQ
 
 
@@ -296,13 +300,8 @@ def deterministic_seed(base_seed: int, clip_id: UUID, lane_id: UUID, seed_offset
     Returns:
         Deterministic integer seed
     """
-    # Use blake2b for stable hashing (not affected by Python hash randomization)
-    clip_bytes = str(clip_id).encode()
-    lane_bytes = str(lane_id).encode()
-    combined = f"{base_seed}:{clip_id}:{lane_id}:{seed_offset}".encode()
-
-    hash_obj = hashlib.blake2b(combined, digest_size=8)
-    hash_int = int.from_bytes(hash_obj.digest(), byteorder="big")
+    # Stable hashing (not affected by Python hash randomization)
+    hash_int = legacy_seed(base_seed, clip_id, lane_id, seed_offset)
     # Combine with base seed using XOR
     return base_seed ^ hash_int ^ seed_offset
 
@@ -442,3 +441,177 @@ def render_lanes_to_events(
         event.pop("_lane_id", None)
 
     return all_events
+
+
+# Bump when rendering changes so persisted renders from older code are not reused
+RENDER_CACHE_VERSION = 1
+
+
+def lane_render_key(
+    lanes: list[LaneSpec],
+    clip_length_bars: int,
+    project_bpm: int,
+    time_signature_num: int,
+    time_signature_den: int,
+    base_seed: int,
+) -> str:
+    """Stable content hash of everything render_lanes_to_events output depends on.
+
+    The clip start bar is not part of the key: renders are cached clip-relative
+    and shifted on the way out. BPM only matters for humanized lanes.
+
+    Args:
+        lanes: Lane specifications, in render order
+        clip_length_bars: Length of clip in bars
+        project_bpm: Project BPM
+        time_signature_num: Time signature numerator
+        time_signature_den: Time signature denominator
+        base_seed: Base project seed
+
+    Returns:
+        64-character hex digest
+    """
+    humanized = any(lane.humanize_ms for lane in lanes)
+    payload = [
+        RENDER_CACHE_VERSION,
+        clip_length_bars,
+        project_bpm if humanized else None,
+        time_signature_num,
+        time_signature_den,
+        base_seed,
+        [
+            [
+                str(lane.lane_id),
+                str(lane.clip_id),
+                lane.cycle.steps,
+                lane.cycle.pulses,
+                lane.cycle.cycle_beats,
+                lane.cycle.rotation,
+                lane.cycle.swing,
+                lane.pitch,
+                lane.velocity,
+                lane.mute,
+                lane.solo,
+                lane.order_index,
+                lane.seed_offset,
+                lane.humanize_ms,
+            ]
+            for lane in lanes
+        ],
+    ]
+    encoded = json.dumps(payload, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=32).hexdigest()
+
+
+RenderedEvents = tuple[tuple[int, int, int, int], ...]
+
+
+class LaneRenderCache:
+    """In-process LRU of clip-relative lane renders keyed by lane_render_key().
+
+    Entries are immutable tuples of (pitch, velocity, start_tick, duration_tick).
+    Keys are content hashes, so edited lanes or profiles never hit stale
+    entries; invalidate_clip() just frees them early.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, RenderedEvents] = OrderedDict()
+        self._clip_keys: dict[UUID, set[str]] = {}
+        self._key_clip: dict[str, UUID] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> RenderedEvents | None:
+        """Look up a render, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, events: RenderedEvents, clip_id: UUID | None = None) -> None:
+        """Store a render, evicting the least recently used entries over maxsize."""
+        with self._lock:
+            self._entries[key] = events
+            self._entries.move_to_end(key)
+            if clip_id is not None:
+                self._clip_keys.setdefault(clip_id, set()).add(key)
+                self._key_clip[key] = clip_id
+            while len(self._entries) > self.maxsize:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+                self.evictions += 1
+
+    def invalidate_clip(self, clip_id: UUID) -> int:
+        """Drop every render stored for a clip.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = self._clip_keys.pop(clip_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+                self._key_clip.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._clip_keys.clear()
+            self._key_clip.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def _forget(self, key: str) -> None:
+        clip_id = self._key_clip.pop(key, None)
+        if clip_id is not None:
+            keys = self._clip_keys.get(clip_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._clip_keys[clip_id]
+
+
+lane_render_cache = LaneRenderCache()
+
+
+def freeze_events(events: list[dict], tick_offset: int = 0) -> RenderedEvents:
+    """Convert rendered events to a cache entry, adding tick_offset to start ticks."""
+    return tuple(
+        (e["pitch"], e["velocity"], e["start_tick"] + tick_offset, e["duration_tick"])
+        for e in events
+    )
+
+
+def thaw_events(entry: RenderedEvents, tick_offset: int = 0) -> list[dict]:
+    """Convert a cache entry back to fresh event dicts, adding tick_offset to start ticks."""
+    return [
+        {
+            "pitch": pitch,
+            "velocity": velocity,
+            "start_tick": start_tick + tick_offset,
+            "duration_tick": duration_tick,
+        }
+        for pitch, velocity, start_tick, duration_tick in entry
+    ]
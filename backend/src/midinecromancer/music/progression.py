@@ -8,6 +8,7 @@ from midinecromancer.music.theory import (
     Mode,
     get_chord_notes,
     get_relative_key,
+    roman_to_chord_name,
     roman_to_degree,
 )
 
@@ -138,46 +139,8 @@ def _degree_to_roman(degree: int, mode: Mode) -> str:
 
 
 def _roman_to_chord_name(roman: str, tonic: str, mode: Mode) -> str:
-    """Convert roman numeral to chord name (e.g., "Am", "G7")."""
-    degree = roman_to_degree(roman)
-    scale = [60 + i for i in range(12)]  # Simplified - would use actual scale
-    # For now, return a simple mapping
-    # In a full implementation, this would compute the actual chord name
-    tonic_pc_map = {
-        "C": 0,
-        "C#": 1,
-        "D": 2,
-        "D#": 3,
-        "E": 4,
-        "F": 5,
-        "F#": 6,
-        "G": 7,
-        "G#": 8,
-        "A": 9,
-        "A#": 10,
-        "B": 11,
-        "Bb": 10,
-        "Eb": 3,
-        "Ab": 8,
-        "Db": 1,
-        "Gb": 6,
-    }
-
-    tonic_pc = tonic_pc_map.get(tonic, 0)
-    intervals = [0, 2, 4, 5, 7, 9, 11] if mode == "ionian" else [0, 2, 3, 5, 7, 8, 10]
-    root_pc = (tonic_pc + intervals[degree - 1]) % 12
-
-    pc_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-    root_name = pc_names[root_pc]
-
-    # Determine quality
-    if mode == "ionian":
-        qualities = {1: "", 2: "m", 3: "m", 4: "", 5: "", 6: "m", 7: "dim"}
-    else:
-        qualities = {1: "m", 2: "dim", 3: "", 4: "m", 5: "m", 6: "", 7: ""}
+    """Convert roman numeral to chord name (e.g., "Am", "G7").
 
-    quality = qualities.get(degree, "")
-    if "7" in roman:
-        quality += "7"
-
-    return root_name + quality
+    Non-ionian modes are named as aeolian (natural minor).
+    """
+    return roman_to_chord_name(roman, tonic, "ionian" if mode == "ionian" else "aeolian")
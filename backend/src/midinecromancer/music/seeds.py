@@ -0,0 +1,198 @@
+"""Deterministic seed derivation shared by the generators.
+
+Every generator derives child seeds from a base seed and a few keys (bar
+index, role, chord id, ...) and draws from one random.Random per child. Two
+schemes are supported:
+
+- "legacy": the key parts are joined into a string and hashed with blake2b,
+  and every child gets a freshly seeded Mersenne Twister. Seeding a Mersenne
+  Twister costs far more than a handful of draws, so for the many small
+  per-bar and per-step streams seeding dominates. legacy_seed() reproduces
+  the seeds every module has always used, bit for bit, so stored projects
+  regenerate identically.
+- "tree": the seed and its key path are packed as 64-bit integers (strings
+  and other keys through a cached hash) and hashed once. Children draw from
+  a SeedStream, which serves its first draws straight from that hash and
+  only seeds a Mersenne Twister if it needs more. Deterministic, but
+  different numbers than "legacy".
+"""
+
+import hashlib
+import random
+import sys
+from array import array
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import chain
+from typing import Literal
+from uuid import UUID
+
+SeedScheme = Literal["legacy", "tree"]
+SEED_SCHEMES: tuple[SeedScheme, ...] = ("legacy", "tree")
+
+MASK64 = (1 << 64) - 1
+
+_BIG_ENDIAN = sys.byteorder == "big"
+# 32 random bits -> float in [0.0, 1.0)
+_FLOAT_SCALE = 1.0 / (1 << 32)
+
+
+def hash_key(text: str, signed: bool = False) -> int:
+    """Hash a string to 64 bits with blake2b (the legacy derivation).
+
+    Args:
+        text: String to hash
+        signed: Interpret the digest as a signed integer
+
+    Returns:
+        Big-endian integer of the 8-byte digest
+    """
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="big", signed=signed)
+
+
+def legacy_seed(*parts: object, sep: str = ":", signed: bool = False) -> int:
+    """Legacy seed: the parts joined with sep, hashed with blake2b.
+
+    Args:
+        parts: Key parts, formatted with str()
+        sep: Separator between parts
+        signed: Interpret the digest as a signed integer
+
+    Returns:
+        Derived seed
+    """
+    return hash_key(sep.join(map(str, parts)), signed)
+
+
+@lru_cache(maxsize=4096)
+def key_id(key: str) -> int:
+    """64-bit id of a string key (cached: keys are mostly a few role names)."""
+    return hash_key(key)
+
+
+def _key_int(key: object) -> int:
+    if type(key) is int:
+        return key & MASK64
+    if isinstance(key, UUID):
+        return (key.int ^ (key.int >> 64)) & MASK64
+    return key_id(str(key))
+
+
+def key_path(seed: int, *keys: object) -> bytes:
+    """Pack a seed and its key path as little-endian 64-bit words.
+
+    Integer keys are used as they are (two's complement, low 64 bits); UUIDs
+    are folded to 64 bits; anything else is keyed by key_id(str(key)).
+    """
+    words = array("Q", [seed & MASK64, *map(_key_int, keys)])
+    if _BIG_ENDIAN:
+        words.byteswap()
+    return words.tobytes()
+
+
+def derive(seed: int, *keys: object) -> int:
+    """Tree seed of a key path below seed.
+
+    One blake2b over the packed path, however many keys there are.
+    derive(seed, a, b) and derive(seed, b, a) differ.
+
+    Args:
+        seed: Base seed (any int)
+        keys: Path of keys below seed
+
+    Returns:
+        Non-negative 63-bit seed (fits a BIGINT column)
+    """
+    digest = hashlib.blake2b(key_path(seed, *keys), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="little") >> 1
+
+
+class SeedStream(random.Random):
+    """random.Random whose first draws come straight from a hash of its key path.
+
+    Seeding a Mersenne Twister costs as much as a couple of hundred draws, and
+    most child streams only draw a handful of numbers. A SeedStream hashes
+    its packed key path once (SHAKE-128, as drum_engine.py does) and serves
+    the first FIRST_DRAWS draws from the digest as 32-bit floats in
+    [0.0, 1.0). Only a stream that draws more than that seeds a Mersenne
+    Twister (from the digest) for the rest, so long streams still get C-speed
+    draws.
+
+    All the usual methods (randint, choice, shuffle, uniform, gauss, ...)
+    work, built on random(); getrandbits() and randbytes() take 32 bits per
+    draw from the same stream. getstate(), setstate() and seed() do not work.
+    """
+
+    # Covers a bar of per-step draws for every drum role
+    FIRST_DRAWS = 32
+    gauss_next = None
+    # Defining getrandbits() would switch randint(), choice(), ... over to it;
+    # keep them on random() so tree streams draw the numbers they always have
+    _randbelow = random.Random._randbelow_without_getrandbits
+
+    def __init__(self, seed: int, *keys: object) -> None:
+        digest = hashlib.shake_128(key_path(seed, *keys)).digest(4 * self.FIRST_DRAWS)
+        words = array("I", digest)
+        if _BIG_ENDIAN:
+            words.byteswap()
+        # The twister is only seeded once the first draws are used up
+        twister_draws = chain.from_iterable(map(_twister_draws, (digest,)))
+        self._draws = chain([word * _FLOAT_SCALE for word in words], twister_draws)
+        # Shadows the method below, so a draw is a single C call
+        self.random = self._draws.__next__
+
+    def seed(self, a: object = None, version: int = 2) -> None:
+        """Reseeding is not supported; streams are fixed by their key path."""
+        raise TypeError("SeedStream cannot be reseeded")
+
+    def random(self) -> float:
+        """Next float in [0.0, 1.0)."""
+        return next(self._draws)
+
+    def getrandbits(self, k: int) -> int:
+        """Integer of k random bits, the top 32 bits of one draw at a time."""
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        words = -(-k // 32)
+        value = 0
+        for _ in range(words):
+            value = (value << 32) | int(self.random() * 4294967296.0)
+        return value >> (32 * words - k)
+
+
+def _twister_draws(digest: bytes) -> Iterator[float]:
+    return iter(random.Random(int.from_bytes(digest, "little")).random, None)
+
+
+def derive_seed(scheme: SeedScheme, seed: int, *keys: object) -> int:
+    """Child seed of a key path: legacy_seed() (":"-joined) or derive()."""
+    if scheme == "tree":
+        return derive(seed, *keys)
+    return legacy_seed(seed, *keys)
+
+
+def make_rng(scheme: SeedScheme, seed: int) -> random.Random:
+    """Random stream for a seed: a Mersenne Twister ("legacy") or a SeedStream ("tree")."""
+    if scheme == "tree":
+        return SeedStream(seed)
+    return random.Random(seed)
+
+
+def child_rng(scheme: SeedScheme, seed: int, *keys: object) -> random.Random:
+    """Random stream for a key path below seed.
+
+    "legacy" seeds a Mersenne Twister with derive_seed(); "tree" streams
+    straight from the path.
+
+    Args:
+        scheme: Seed scheme
+        seed: Base seed
+        keys: Path of keys below seed
+
+    Returns:
+        Random stream for the child
+    """
+    if scheme == "tree":
+        return SeedStream(seed, *keys)
+    return random.Random(legacy_seed(seed, *keys))
@@ -1,30 +1,44 @@
-"""Suggestion generation engine for theory-aware musical suggestions."""
+"""Suggestion generation engine for theory-aware musical suggestions.
+
+Each kind of suggestion (harmony, rhythm, melody) has a fixed list of
+candidates. A candidate has its own deterministic seed and a declared score,
+and may decline to suggest anything. Suggestions are built lazily:
+iter_suggestions() yields one kind's suggestions in candidate order (so
+suggestion_at() builds only up to the requested index), and
+iter_ranked_suggestions() yields several kinds by descending score, building
+one score tier at a time so a limited run stops early.
+"""
 
-import hashlib
 import math
 import random
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
-from typing import Literal
+from itertools import islice
+from typing import Literal, NamedTuple
 from uuid import UUID
 
 from midinecromancer.music.analysis import ProjectAnalysis
 from midinecromancer.music.progression import generate_chord_progression
+from midinecromancer.music.seeds import legacy_seed
 from midinecromancer.music.theory import (
     CIRCLE_OF_FIFTHS,
-    MODE_INTERVALS,
     get_chord_notes,
     get_scale_degrees,
     parse_tonic,
+    roman_to_chord_name,
     roman_to_degree,
 )
 from midinecromancer.music.theory import PPQ
 
 
+SuggestionKind = Literal["harmony", "rhythm", "melody"]
+
+
 @dataclass
 class Suggestion:
     """A musical suggestion with preview and commit plan."""
 
-    kind: Literal["harmony", "rhythm", "melody"]
+    kind: SuggestionKind
     title: str
     explanation: str
     score: float
@@ -57,57 +71,90 @@ def deterministic_suggestion_seed(base_seed: int, project_id: UUID, kind: str, i
     Returns:
         Deterministic integer seed
     """
-    combined = f"{base_seed}:{project_id}:{kind}:{index}".encode()
-    hash_obj = hashlib.blake2b(combined, digest_size=8)
-    hash_int = int.from_bytes(hash_obj.digest(), byteorder="big")
-    return base_seed ^ hash_int ^ index
+    return base_seed ^ legacy_seed(base_seed, project_id, kind, index) ^ index
+
+
+SUGGESTION_KINDS: tuple[SuggestionKind, ...] = ("harmony", "rhythm", "melody")
+
+
+@dataclass(frozen=True)
+class SuggestionContext:
+    """Project state and parameters the suggestion candidates read."""
+
+    analysis: ProjectAnalysis
+    project_id: UUID
+    project_seed: int
+    bars: int
+    time_signature_num: int
+    time_signature_den: int
+    bpm: int
+    chord_events: Sequence = ()
+    lanes: list | None = None
+    complexity: float = 0.5
+    tension: float = 0.5
+    density: float = 0.5
+
+    @classmethod
+    def from_params(cls, params: dict | None = None, **values) -> "SuggestionContext":
+        """Context with complexity/tension/density taken from a params dict."""
+        params = params or {}
+        return cls(
+            **values,
+            complexity=params.get("complexity", 0.5),
+            tension=params.get("tension", 0.5),
+            density=params.get("density", 0.5),
+        )
 
+    @property
+    def ticks_per_bar(self) -> int:
+        quarter_notes_per_bar = (self.time_signature_num * 4) / self.time_signature_den
+        return int(quarter_notes_per_bar * PPQ)
 
-def generate_harmony_suggestions(
-    analysis: ProjectAnalysis,
-    project_id: UUID,
-    project_seed: int,
-    bars: int,
-    time_signature_num: int,
-    time_signature_den: int,
-    bpm: int,
-    chord_events: list,
-    complexity: float = 0.5,
-    tension: float = 0.5,
-) -> list[Suggestion]:
-    """Generate harmony suggestions.
+    def rng(self, kind: str, index: int) -> random.Random:
+        """Random generator of a candidate (seeded by kind and candidate index)."""
+        return random.Random(
+            deterministic_suggestion_seed(self.project_seed, self.project_id, kind, index)
+        )
 
-    Args:
-        analysis: Project analysis
-        project_id: Project UUID
-        project_seed: Base seed
-        bars: Number of bars
-        time_signature_num: Time signature numerator
-        time_signature_den: Time signature denominator
-        bpm: BPM
-        chord_events: Existing chord events
-        complexity: Complexity parameter (0.0-1.0)
-        tension: Tension parameter (0.0-1.0)
 
-    Returns:
-        List of harmony suggestions
-    """
-    suggestions = []
-    tonic = analysis.detected_key or "C"
-    mode = analysis.detected_mode or "ionian"
+class Candidate(NamedTuple):
+    """One possible suggestion of a kind, with the score it is made with."""
+
+    kind: SuggestionKind
+    score: float
+    build: Callable[[SuggestionContext, float], Suggestion | None]
+
+    def __call__(self, context: SuggestionContext) -> Suggestion | None:
+        return self.build(context, self.score)
+
+
+CANDIDATES: dict[str, list[Candidate]] = {kind: [] for kind in SUGGESTION_KINDS}
+
+
+def candidate(kind: SuggestionKind, score: float):
+    """Register the decorated function as the next candidate of a kind."""
+
+    def register(build: Callable[[SuggestionContext, float], Suggestion | None]):
+        CANDIDATES[kind].append(Candidate(kind, score, build))
+        return build
 
-    # Calculate timing
-    quarter_notes_per_bar = (time_signature_num * 4) / time_signature_den
-    ticks_per_bar = int(quarter_notes_per_bar * PPQ)
+    return register
+
+
+@candidate("harmony", 0.8)
+def _next_chord(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Next chord (circle-of-fifths motion)."""
+    rng = context.rng("harmony", 0)
+    tonic = context.analysis.detected_key or "C"
+    mode = context.analysis.detected_mode or "ionian"
+    ticks_per_bar = context.ticks_per_bar
 
     # Get current chord progression
-    current_chords = [ce.roman_numeral for ce in sorted(chord_events, key=lambda x: x.start_tick)]
+    current_chords = [
+        ce.roman_numeral for ce in sorted(context.chord_events, key=lambda x: x.start_tick)
+    ]
     last_chord = current_chords[-1] if current_chords else "I"
 
-    # Suggestion 1: Next chord (circle-of-fifths motion)
-    seed1 = deterministic_suggestion_seed(project_seed, project_id, "harmony", 0)
-    rng1 = random.Random(seed1)
-
     next_chord_options = []
     last_degree = roman_to_degree(last_chord)
 
@@ -119,17 +166,60 @@ def generate_harmony_suggestions(
     subdominant_degree = ((last_degree - 3) % 7) + 1
     next_chord_options.append(("IV", subdominant_degree, "Subdominant motion provides stability"))
 
-    if rng1.random() < 0.7:
-        chosen = rng1.choice(next_chord_options)
-        roman, degree, reason = chosen
-        chord_notes = get_chord_notes(tonic, mode, degree, "triad", 4)
+    if rng.random() >= 0.7:
+        return None
+    roman, degree, reason = rng.choice(next_chord_options)
+    chord_notes = get_chord_notes(tonic, mode, degree, "triad", 4)
+
+    start_bar = context.bars  # Append after current bars
+    start_tick = start_bar * ticks_per_bar
+    preview_events = [
+        {
+            "pitch": note,
+            "velocity": 100,
+            "start_tick": start_tick,
+            "duration_tick": ticks_per_bar,
+            "channel": 0,
+        }
+        for note in chord_notes
+    ]
+
+    return Suggestion(
+        kind="harmony",
+        title=f"Next Chord: {roman}",
+        explanation=f"{reason}. Adds {roman} chord after current progression.",
+        score=score,
+        preview_events=preview_events,
+        commit_plan={
+            "action": "create_chord_event",
+            "track_role": "chords",
+            "start_bar": start_bar,
+            "length_bars": 1,
+            "roman_numeral": roman,
+            "chord_name": _roman_to_chord_name(roman, tonic, mode),
+        },
+    )
 
-        preview_events = []
-        start_bar = bars  # Append after current bars
-        start_tick = start_bar * ticks_per_bar
 
+@candidate("harmony", 0.9)
+def _cadence_ending(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Cadence ending on the last two bars."""
+    rng = context.rng("harmony", 1)
+    if rng.random() >= 0.6:
+        return None
+    tonic = context.analysis.detected_key or "C"
+    mode = context.analysis.detected_mode or "ionian"
+    ticks_per_bar = context.ticks_per_bar
+    bars = context.bars
+
+    cadence = ["V", "I"] if mode == "ionian" else ["V", "i"]
+    cadence_notes = []
+    for i, roman in enumerate(cadence):
+        degree = roman_to_degree(roman)
+        chord_notes = get_chord_notes(tonic, mode, degree, "triad", 4)
+        start_tick = (bars - 2 + i) * ticks_per_bar
         for note in chord_notes:
-            preview_events.append(
+            cadence_notes.append(
                 {
                     "pitch": note,
                     "velocity": 100,
@@ -139,115 +229,305 @@ def generate_harmony_suggestions(
                 }
             )
 
-        suggestions.append(
-            Suggestion(
-                kind="harmony",
-                title=f"Next Chord: {roman}",
-                explanation=f"{reason}. Adds {roman} chord after current progression.",
-                score=0.8,
-                preview_events=preview_events,
-                commit_plan={
-                    "action": "create_chord_event",
-                    "track_role": "chords",
-                    "start_bar": start_bar,
+    return Suggestion(
+        kind="harmony",
+        title="Cadence Ending",
+        explanation=f"Classic {cadence[0]} → {cadence[1]} cadence provides strong resolution.",
+        score=score,
+        preview_events=cadence_notes,
+        commit_plan={
+            "action": "create_chord_events",
+            "track_role": "chords",
+            "events": [
+                {
+                    "start_bar": bars - 2,
                     "length_bars": 1,
-                    "roman_numeral": roman,
-                    "chord_name": _roman_to_chord_name(roman, tonic, mode),
+                    "roman_numeral": cadence[0],
+                    "chord_name": _roman_to_chord_name(cadence[0], tonic, mode),
                 },
-            )
-        )
-
-    # Suggestion 2: Cadence ending
-    seed2 = deterministic_suggestion_seed(project_seed, project_id, "harmony", 1)
-    rng2 = random.Random(seed2)
-
-    if rng2.random() < 0.6:
-        cadence = ["V", "I"] if mode == "ionian" else ["V", "i"]
-        cadence_notes = []
-        for i, roman in enumerate(cadence):
-            degree = roman_to_degree(roman)
-            chord_notes = get_chord_notes(tonic, mode, degree, "triad", 4)
-            start_tick = (bars - 2 + i) * ticks_per_bar
-            for note in chord_notes:
-                cadence_notes.append(
-                    {
-                        "pitch": note,
-                        "velocity": 100,
-                        "start_tick": start_tick,
-                        "duration_tick": ticks_per_bar,
-                        "channel": 0,
-                    }
-                )
-
-        suggestions.append(
-            Suggestion(
-                kind="harmony",
-                title="Cadence Ending",
-                explanation=f"Classic {cadence[0]} → {cadence[1]} cadence provides strong resolution.",
-                score=0.9,
-                preview_events=cadence_notes,
-                commit_plan={
-                    "action": "create_chord_events",
-                    "track_role": "chords",
-                    "events": [
-                        {
-                            "start_bar": bars - 2,
-                            "length_bars": 1,
-                            "roman_numeral": cadence[0],
-                            "chord_name": _roman_to_chord_name(cadence[0], tonic, mode),
-                        },
-                        {
-                            "start_bar": bars - 1,
-                            "length_bars": 1,
-                            "roman_numeral": cadence[1],
-                            "chord_name": _roman_to_chord_name(cadence[1], tonic, mode),
-                        },
-                    ],
+                {
+                    "start_bar": bars - 1,
+                    "length_bars": 1,
+                    "roman_numeral": cadence[1],
+                    "chord_name": _roman_to_chord_name(cadence[1], tonic, mode),
                 },
+            ],
+        },
+    )
+
+
+@candidate("harmony", 0.7)
+def _borrowed_chord(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Borrowed chord (modal interchange) in major keys with some tension."""
+    tonic = context.analysis.detected_key or "C"
+    mode = context.analysis.detected_mode or "ionian"
+    if mode != "ionian" or context.tension <= 0.4:
+        return None
+    rng = context.rng("harmony", 2)
+    if rng.random() >= 0.5:
+        return None
+
+    # Borrow iv from minor
+    borrowed_notes = get_chord_notes(tonic, "aeolian", 4, "triad", 4)
+    start_tick = (context.bars // 2) * context.ticks_per_bar
+    preview_events = [
+        {
+            "pitch": note,
+            "velocity": 90,
+            "start_tick": start_tick,
+            "duration_tick": context.ticks_per_bar,
+            "channel": 0,
+        }
+        for note in borrowed_notes
+    ]
+
+    return Suggestion(
+        kind="harmony",
+        title="Borrowed Chord: iv",
+        explanation="Modal interchange adds color by borrowing iv from parallel minor.",
+        score=score,
+        preview_events=preview_events,
+        commit_plan={
+            "action": "create_chord_event",
+            "track_role": "chords",
+            "start_bar": context.bars // 2,
+            "length_bars": 1,
+            "roman_numeral": "iv",
+            "chord_name": _roman_to_chord_name("iv", tonic, "aeolian"),
+        },
+    )
+
+
+@candidate("rhythm", 0.75)
+def _ghost_notes(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Subtle ghost notes on off-beats."""
+    rng = context.rng("rhythm", 0)
+    if rng.random() >= 0.7:
+        return None
+    ticks_per_bar = context.ticks_per_bar
+
+    preview_events = []
+    for bar in range(context.bars):
+        for offset in [ticks_per_bar // 4, 3 * ticks_per_bar // 4]:
+            tick = bar * ticks_per_bar + offset
+            preview_events.append(
+                {
+                    "pitch": 42,  # Hi-hat
+                    "velocity": 40,  # Quiet
+                    "start_tick": tick,
+                    "duration_tick": PPQ // 8,
+                    "channel": 9,
+                }
             )
+
+    return Suggestion(
+        kind="rhythm",
+        title="Add Ghost Notes",
+        explanation="Subtle off-beat accents add groove and texture without overwhelming.",
+        score=score,
+        preview_events=preview_events,
+        commit_plan={
+            "action": "append_notes",
+            "track_role": "drums",
+            "clip_start_bar": 0,
+            "notes": preview_events,
+        },
+    )
+
+
+@candidate("rhythm", 0.7)
+def _rotate_lane(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Rotate one of the existing polyrhythm lanes."""
+    if not context.lanes:
+        return None
+    rng = context.rng("rhythm", 1)
+    if rng.random() >= 0.6:
+        return None
+
+    lane = rng.choice(context.lanes)
+    new_rotation = (lane.get("rotation", 0) + 1) % lane.get("steps", 8)
+    return Suggestion(
+        kind="rhythm",
+        title=f"Rotate Lane: {lane.get('name', 'Lane')}",
+        explanation="Rotating pattern by 1 step shifts the feel while maintaining the same rhythm.",
+        score=score,
+        preview_events=[],  # Would need to re-render lane
+        commit_plan={
+            "action": "update_lane_rotation",
+            "lane_id": lane.get("id"),
+            "rotation": new_rotation,
+        },
+    )
+
+
+@candidate("melody", 0.8)
+def _arpeggiate_chord(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Arpeggiate the tones of an existing chord."""
+    rng = context.rng("melody", 0)
+    if not context.chord_events or rng.random() >= 0.7:
+        return None
+    tonic = context.analysis.detected_key or "C"
+    mode = context.analysis.detected_mode or "ionian"
+
+    chord = rng.choice(context.chord_events)
+    degree = roman_to_degree(chord.roman_numeral)
+    chord_notes = get_chord_notes(tonic, mode, degree, "triad", 5)
+
+    start_tick = chord.start_tick
+    step_ticks = chord.duration_tick // len(chord_notes)
+    preview_events = [
+        {
+            "pitch": note,
+            "velocity": 80,
+            "start_tick": start_tick + i * step_ticks,
+            "duration_tick": step_ticks // 2,
+            "channel": 2,
+        }
+        for i, note in enumerate(chord_notes)
+    ]
+
+    return Suggestion(
+        kind="melody",
+        title="Arpeggiate Chord Tones",
+        explanation=f"Arpeggiating {chord.chord_name} highlights the harmonic structure.",
+        score=score,
+        preview_events=preview_events,
+        commit_plan={
+            "action": "create_notes",
+            "track_role": "melody",
+            "clip_start_bar": 0,
+            "notes": preview_events,
+        },
+    )
+
+
+@candidate("melody", 0.75)
+def _approach_note(context: SuggestionContext, score: float) -> Suggestion | None:
+    """Half-step approach into a scale tone."""
+    rng = context.rng("melody", 1)
+    if rng.random() >= 0.6:
+        return None
+    tonic = context.analysis.detected_key or "C"
+    mode = context.analysis.detected_mode or "ionian"
+    scale = get_scale_degrees(tonic, mode, 5)
+    ticks_per_bar = context.ticks_per_bar
+
+    target_note = rng.choice(scale)
+    approach_note = target_note - 1  # Half step below
+    preview_events = [
+        {
+            "pitch": approach_note,
+            "velocity": 70,
+            "start_tick": ticks_per_bar,
+            "duration_tick": PPQ // 4,
+            "channel": 2,
+        },
+        {
+            "pitch": target_note,
+            "velocity": 90,
+            "start_tick": ticks_per_bar + PPQ // 4,
+            "duration_tick": PPQ // 2,
+            "channel": 2,
+        },
+    ]
+
+    return Suggestion(
+        kind="melody",
+        title="Approach Note",
+        explanation="Approach notes create smooth melodic motion and add interest.",
+        score=score,
+        preview_events=preview_events,
+        commit_plan={
+            "action": "create_notes",
+            "track_role": "melody",
+            "clip_start_bar": 0,
+            "notes": preview_events,
+        },
+    )
+
+
+def iter_suggestions(context: SuggestionContext, kind: SuggestionKind) -> Iterator[Suggestion]:
+    """Suggestions of one kind in candidate order, built as they are consumed.
+
+    Raises:
+        KeyError: If kind is not one of SUGGESTION_KINDS
+    """
+    for option in CANDIDATES[kind]:
+        suggestion = option(context)
+        if suggestion is not None:
+            yield suggestion
+
+
+def suggestion_at(
+    context: SuggestionContext, kind: SuggestionKind, index: int
+) -> Suggestion | None:
+    """The index-th suggestion of a kind, None if there are fewer.
+
+    Only the candidates up to that suggestion are built.
+    """
+    return next(islice(iter_suggestions(context, kind), index, None), None)
+
+
+def iter_ranked_suggestions(
+    context: SuggestionContext, kinds: Iterable[SuggestionKind] = SUGGESTION_KINDS
+) -> Iterator[Suggestion]:
+    """Suggestions of several kinds by descending score, then title.
+
+    Candidates are built one score tier at a time, so stopping after the
+    first few suggestions leaves lower-scored candidates unbuilt. Repeated
+    kinds are only listed once.
+    """
+    options = [option for kind in dict.fromkeys(kinds) for option in CANDIDATES[kind]]
+    for score in sorted({option.score for option in options}, reverse=True):
+        tier = [option(context) for option in options if option.score == score]
+        yield from sorted(
+            (suggestion for suggestion in tier if suggestion is not None),
+            key=lambda suggestion: suggestion.title,
         )
 
-    # Suggestion 3: Borrowed chord (modal interchange)
-    if mode == "ionian" and tension > 0.4:
-        seed3 = deterministic_suggestion_seed(project_seed, project_id, "harmony", 2)
-        rng3 = random.Random(seed3)
-
-        if rng3.random() < 0.5:
-            # Borrow iv from minor
-            borrowed_notes = get_chord_notes(tonic, "aeolian", 4, "triad", 4)
-            start_tick = (bars // 2) * ticks_per_bar
-
-            preview_events = []
-            for note in borrowed_notes:
-                preview_events.append(
-                    {
-                        "pitch": note,
-                        "velocity": 90,
-                        "start_tick": start_tick,
-                        "duration_tick": ticks_per_bar,
-                        "channel": 0,
-                    }
-                )
-
-            suggestions.append(
-                Suggestion(
-                    kind="harmony",
-                    title="Borrowed Chord: iv",
-                    explanation="Modal interchange adds color by borrowing iv from parallel minor.",
-                    score=0.7,
-                    preview_events=preview_events,
-                    commit_plan={
-                        "action": "create_chord_event",
-                        "track_role": "chords",
-                        "start_bar": bars // 2,
-                        "length_bars": 1,
-                        "roman_numeral": "iv",
-                        "chord_name": _roman_to_chord_name("iv", tonic, "aeolian"),
-                    },
-                )
-            )
 
-    return suggestions
+def generate_harmony_suggestions(
+    analysis: ProjectAnalysis,
+    project_id: UUID,
+    project_seed: int,
+    bars: int,
+    time_signature_num: int,
+    time_signature_den: int,
+    bpm: int,
+    chord_events: list,
+    complexity: float = 0.5,
+    tension: float = 0.5,
+) -> list[Suggestion]:
+    """Generate harmony suggestions.
+
+    Args:
+        analysis: Project analysis
+        project_id: Project UUID
+        project_seed: Base seed
+        bars: Number of bars
+        time_signature_num: Time signature numerator
+        time_signature_den: Time signature denominator
+        bpm: BPM
+        chord_events: Existing chord events
+        complexity: Complexity parameter (0.0-1.0)
+        tension: Tension parameter (0.0-1.0)
+
+    Returns:
+        List of harmony suggestions
+    """
+    context = SuggestionContext(
+        analysis,
+        project_id,
+        project_seed,
+        bars,
+        time_signature_num,
+        time_signature_den,
+        bpm,
+        chord_events=chord_events,
+        complexity=complexity,
+        tension=tension,
+    )
+    return list(iter_suggestions(context, "harmony"))
 
 
 def generate_rhythm_suggestions(
@@ -277,71 +557,18 @@ def generate_rhythm_suggestions(
     Returns:
         List of rhythm suggestions
     """
-    suggestions = []
-    quarter_notes_per_bar = (time_signature_num * 4) / time_signature_den
-    ticks_per_bar = int(quarter_notes_per_bar * PPQ)
-
-    # Suggestion 1: Add ghost notes
-    seed1 = deterministic_suggestion_seed(project_seed, project_id, "rhythm", 0)
-    rng1 = random.Random(seed1)
-
-    if rng1.random() < 0.7:
-        # Add subtle ghost notes on off-beats
-        preview_events = []
-        for bar in range(bars):
-            for offset in [ticks_per_bar // 4, 3 * ticks_per_bar // 4]:
-                tick = bar * ticks_per_bar + offset
-                preview_events.append(
-                    {
-                        "pitch": 42,  # Hi-hat
-                        "velocity": 40,  # Quiet
-                        "start_tick": tick,
-                        "duration_tick": PPQ // 8,
-                        "channel": 9,
-                    }
-                )
-
-        suggestions.append(
-            Suggestion(
-                kind="rhythm",
-                title="Add Ghost Notes",
-                explanation="Subtle off-beat accents add groove and texture without overwhelming.",
-                score=0.75,
-                preview_events=preview_events,
-                commit_plan={
-                    "action": "append_notes",
-                    "track_role": "drums",
-                    "clip_start_bar": 0,
-                    "notes": preview_events,
-                },
-            )
-        )
-
-    # Suggestion 2: Rotate polyrhythm lane
-    if lanes:
-        seed2 = deterministic_suggestion_seed(project_seed, project_id, "rhythm", 1)
-        rng2 = random.Random(seed2)
-
-        if rng2.random() < 0.6:
-            lane = rng2.choice(lanes)
-            new_rotation = (lane.get("rotation", 0) + 1) % lane.get("steps", 8)
-
-            suggestions.append(
-                Suggestion(
-                    kind="rhythm",
-                    title=f"Rotate Lane: {lane.get('name', 'Lane')}",
-                    explanation=f"Rotating pattern by 1 step shifts the feel while maintaining the same rhythm.",
-                    score=0.7,
-                    preview_events=[],  # Would need to re-render lane
-                    commit_plan={
-                        "action": "update_lane_rotation",
-                        "lane_id": lane.get("id"),
-                        "rotation": new_rotation,
-                    },
-                )
-            )
-
-    return suggestions
+    context = SuggestionContext(
+        analysis,
+        project_id,
+        project_seed,
+        bars,
+        time_signature_num,
+        time_signature_den,
+        bpm,
+        lanes=lanes,
+        density=density,
+    )
+    return list(iter_suggestions(context, "rhythm"))
 
 
 def generate_melody_suggestions(
@@ -371,96 +598,18 @@ def generate_melody_suggestions(
     Returns:
         List of melody suggestions
     """
-    suggestions = []
-    tonic = analysis.detected_key or "C"
-    mode = analysis.detected_mode or "ionian"
-
-    quarter_notes_per_bar = (time_signature_num * 4) / time_signature_den
-    ticks_per_bar = int(quarter_notes_per_bar * PPQ)
-    scale = get_scale_degrees(tonic, mode, 5)
-
-    # Suggestion 1: Arpeggiate chord tones
-    seed1 = deterministic_suggestion_seed(project_seed, project_id, "melody", 0)
-    rng1 = random.Random(seed1)
-
-    if chord_events and rng1.random() < 0.7:
-        chord = rng1.choice(chord_events)
-        degree = roman_to_degree(chord.roman_numeral)
-        chord_notes = get_chord_notes(tonic, mode, degree, "triad", 5)
-
-        preview_events = []
-        start_tick = chord.start_tick
-        step_ticks = chord.duration_tick // len(chord_notes)
-
-        for i, note in enumerate(chord_notes):
-            preview_events.append(
-                {
-                    "pitch": note,
-                    "velocity": 80,
-                    "start_tick": start_tick + i * step_ticks,
-                    "duration_tick": step_ticks // 2,
-                    "channel": 2,
-                }
-            )
-
-        suggestions.append(
-            Suggestion(
-                kind="melody",
-                title="Arpeggiate Chord Tones",
-                explanation=f"Arpeggiating {chord.chord_name} highlights the harmonic structure.",
-                score=0.8,
-                preview_events=preview_events,
-                commit_plan={
-                    "action": "create_notes",
-                    "track_role": "melody",
-                    "clip_start_bar": 0,
-                    "notes": preview_events,
-                },
-            )
-        )
-
-    # Suggestion 2: Approach notes
-    seed2 = deterministic_suggestion_seed(project_seed, project_id, "melody", 1)
-    rng2 = random.Random(seed2)
-
-    if rng2.random() < 0.6:
-        target_note = rng2.choice(scale)
-        approach_note = target_note - 1  # Half step below
-
-        preview_events = [
-            {
-                "pitch": approach_note,
-                "velocity": 70,
-                "start_tick": ticks_per_bar,
-                "duration_tick": PPQ // 4,
-                "channel": 2,
-            },
-            {
-                "pitch": target_note,
-                "velocity": 90,
-                "start_tick": ticks_per_bar + PPQ // 4,
-                "duration_tick": PPQ // 2,
-                "channel": 2,
-            },
-        ]
-
-        suggestions.append(
-            Suggestion(
-                kind="melody",
-                title="Approach Note",
-                explanation="Approach notes create smooth melodic motion and add interest.",
-                score=0.75,
-                preview_events=preview_events,
-                commit_plan={
-                    "action": "create_notes",
-                    "track_role": "melody",
-                    "clip_start_bar": 0,
-                    "notes": preview_events,
-                },
-            )
-        )
-
-    return suggestions
+    context = SuggestionContext(
+        analysis,
+        project_id,
+        project_seed,
+        bars,
+        time_signature_num,
+        time_signature_den,
+        bpm,
+        chord_events=chord_events,
+        complexity=complexity,
+    )
+    return list(iter_suggestions(context, "melody"))
 
 
 def generate_all_suggestions(
@@ -492,97 +641,23 @@ def generate_all_suggestions(
     Returns:
         Combined list of all suggestions, sorted by score
     """
-    params = params or {}
-    complexity = params.get("complexity", 0.5)
-    tension = params.get("tension", 0.5)
-    density = params.get("density", 0.5)
-
-    all_suggestions = []
-
-    # Generate by kind
-    all_suggestions.extend(
-        generate_harmony_suggestions(
-            analysis,
-            project_id,
-            project_seed,
-            bars,
-            time_signature_num,
-            time_signature_den,
-            bpm,
-            chord_events,
-            complexity,
-            tension,
-        )
+    context = SuggestionContext.from_params(
+        params,
+        analysis=analysis,
+        project_id=project_id,
+        project_seed=project_seed,
+        bars=bars,
+        time_signature_num=time_signature_num,
+        time_signature_den=time_signature_den,
+        bpm=bpm,
+        chord_events=chord_events,
+        lanes=lanes,
     )
-    all_suggestions.extend(
-        generate_rhythm_suggestions(
-            analysis,
-            project_id,
-            project_seed,
-            bars,
-            time_signature_num,
-            time_signature_den,
-            bpm,
-            lanes,
-            density,
-        )
-    )
-    all_suggestions.extend(
-        generate_melody_suggestions(
-            analysis,
-            project_id,
-            project_seed,
-            bars,
-            time_signature_num,
-            time_signature_den,
-            bpm,
-            chord_events,
-            complexity,
-        )
-    )
-
-    # Sort by score (descending), then by title
-    all_suggestions.sort(key=lambda s: (-s.score, s.title))
-
-    return all_suggestions
+    return list(iter_ranked_suggestions(context))
 
 
 def _roman_to_chord_name(roman: str, tonic: str, mode: str) -> str:
-    """Convert roman numeral to chord name."""
-    degree = roman_to_degree(roman)
-    tonic_pc_map = {
-        "C": 0,
-        "C#": 1,
-        "D": 2,
-        "D#": 3,
-        "E": 4,
-        "F": 5,
-        "F#": 6,
-        "G": 7,
-        "G#": 8,
-        "A": 9,
-        "A#": 10,
-        "B": 11,
-        "Bb": 10,
-        "Eb": 3,
-        "Ab": 8,
-        "Db": 1,
-        "Gb": 6,
-    }
-    tonic_pc = tonic_pc_map.get(tonic, 0)
-    intervals = MODE_INTERVALS.get(mode, MODE_INTERVALS["ionian"])
-    root_pc = (tonic_pc + intervals[degree - 1]) % 12
-
-    pc_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-    root_name = pc_names[root_pc]
-
-    if mode == "ionian":
-        qualities = {1: "", 2: "m", 3: "m", 4: "", 5: "", 6: "m", 7: "dim"}
-    else:
-        qualities = {1: "m", 2: "dim", 3: "", 4: "m", 5: "m", 6: "", 7: ""}
-
-    quality = qualities.get(degree, "")
-    if "7" in roman:
-        quality += "7"
-
-    return root_name + quality
+    """Convert roman numeral to chord name (minor qualities outside ionian)."""
+    return roman_to_chord_name(
+        roman, tonic, mode, quality_mode="ionian" if mode == "ionian" else "aeolian"
+    )
@@ -1,5 +1,13 @@
-"""Music theory utilities: pitch classes, keys, modes, scales."""
+"""Music theory utilities: pitch classes, keys, modes, scales.
 
+Scales, chord tones, chord names, tonic spellings and roman numerals are
+precomputed into TheoryTables when this module is imported; the public
+functions look results up there and only compute inputs outside the tables
+(unusual spellings, octaves outside 0-10).
+"""
+
+import time
+from dataclasses import dataclass
 from enum import IntEnum
 from typing import Literal
 
@@ -76,6 +84,11 @@ ROMAN_TO_DEGREE: dict[str, int] = {
 
 def parse_tonic(tonic: str) -> int:
     """Parse tonic string (e.g., 'C', 'F#', 'Bb') to pitch class."""
+    tonic_pc = TABLES.tonic_pcs.get(tonic)
+    return tonic_pc if tonic_pc is not None else _parse_tonic(tonic)
+
+
+def _parse_tonic(tonic: str) -> int:
     tonic_upper = tonic.upper()
     if tonic_upper == "CB":
         return PitchClass.B
@@ -117,10 +130,14 @@ def get_scale_degrees(tonic: str, mode: Mode, octave: int = 4) -> list[int]:
         List of MIDI note numbers for scale degrees 1-7
     """
     tonic_pc = parse_tonic(tonic)
-    intervals = MODE_INTERVALS[mode]
-    base_midi = 12 * octave + tonic_pc
+    if octave not in TABLE_OCTAVES:
+        return _scale_degrees(tonic_pc, mode, octave)
+    return list(TABLES.scales[tonic_pc][MODE_INDEX[mode]][octave])
 
-    return [base_midi + interval for interval in intervals]
+
+def _scale_degrees(tonic_pc: int, mode: Mode, octave: int) -> list[int]:
+    base_midi = 12 * octave + tonic_pc
+    return [base_midi + interval for interval in MODE_INTERVALS[mode]]
 
 
 def pitch_class_to_midi(pitch_class: int, octave: int = 4) -> int:
@@ -145,6 +162,11 @@ def roman_to_degree(roman: str) -> int:
     Returns:
         Scale degree (1-7)
     """
+    degree = TABLES.roman_degrees.get(roman)
+    return degree if degree is not None else _roman_to_degree(roman)
+
+
+def _roman_to_degree(roman: str) -> int:
     # Strip quality suffixes (7, m, M, etc.)
     base = roman.rstrip("7mMdimaugsus")
     return ROMAN_TO_DEGREE.get(base, 1)
@@ -165,7 +187,15 @@ def get_chord_notes(
     Returns:
         List of MIDI note numbers
     """
-    scale = get_scale_degrees(tonic, mode, octave)
+    tonic_pc = parse_tonic(tonic)
+    if octave not in TABLE_OCTAVES:
+        return _chord_notes(_scale_degrees(tonic_pc, mode, octave), degree, quality)
+    quality_index = 0 if quality == "triad" else 1 if quality == "7th" else 2
+    by_quality = TABLES.chord_tones[tonic_pc][MODE_INDEX[mode]][(degree - 1) % 7]
+    return list(by_quality[quality_index][octave])
+
+
+def _chord_notes(scale: list[int], degree: int, quality: str) -> list[int]:
     degree_idx = (degree - 1) % 7
 
     if quality == "triad":
@@ -187,6 +217,27 @@ def get_chord_notes(
     return [scale[degree_idx]]
 
 
+def roman_to_chord_name(roman: str, tonic: str, mode: str, quality_mode: str | None = None) -> str:
+    """Convert roman numeral to chord name (e.g., "vi" in C ionian -> "Am").
+
+    Args:
+        roman: Roman numeral (a "7" anywhere adds a 7th)
+        tonic: Key tonic (spellings outside CHORD_NAME_TONICS name from C)
+        mode: Mode for the root (unknown modes use ionian)
+        quality_mode: Triad qualities to use, "ionian" or "aeolian" (default:
+            aeolian for aeolian keys, ionian otherwise)
+
+    Returns:
+        Chord name
+    """
+    if quality_mode is None:
+        quality_mode = "aeolian" if mode == "aeolian" else "ionian"
+    names = TABLES.chord_names[CHORD_NAME_TONICS.get(tonic, 0)][MODE_INDEX.get(mode, 0)]
+    return names[roman_to_degree(roman) - 1][
+        (2 if quality_mode == "aeolian" else 0) + ("7" in roman)
+    ]
+
+
 def get_relative_key(tonic: str, mode: Mode) -> tuple[str, Mode]:
     """Get relative major/minor key.
 
@@ -211,3 +262,126 @@ def get_relative_key(tonic: str, mode: Mode) -> tuple[str, Mode]:
         return (tonic_names[relative_tonic_pc], "ionian")
 
     return (tonic, mode)
+
+
+# Tonic spellings understood by chord naming (anything else names from C)
+CHORD_NAME_TONICS: dict[str, int] = {
+    "C": 0,
+    "C#": 1,
+    "D": 2,
+    "D#": 3,
+    "E": 4,
+    "F": 5,
+    "F#": 6,
+    "G": 7,
+    "G#": 8,
+    "A": 9,
+    "A#": 10,
+    "B": 11,
+    "Bb": 10,
+    "Eb": 3,
+    "Ab": 8,
+    "Db": 1,
+    "Gb": 6,
+}
+
+PITCH_CLASS_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+# Chord name suffix per scale degree, for major (ionian) and minor (aeolian) keys
+CHORD_QUALITY_SUFFIXES: dict[str, list[str]] = {
+    "ionian": ["", "m", "m", "", "", "m", "dim"],
+    "aeolian": ["m", "dim", "", "m", "m", "", ""],
+}
+
+MODES: tuple[Mode, ...] = tuple(MODE_INTERVALS)
+MODE_INDEX: dict[str, int] = {mode: index for index, mode in enumerate(MODES)}
+
+# Octaves covered by the scale and chord tables (MIDI 0-131)
+TABLE_OCTAVES = range(11)
+
+# Chord qualities in the chord tone table; anything else is a single note
+CHORD_QUALITIES = ("triad", "7th", "note")
+
+_TONIC_SPELLINGS = [
+    letter + accidental
+    for letter in "CDEFGABcdefgab"
+    for accidental in ("", "#", "b", "B", "sharp", "flat", "SHARP", "FLAT")
+]
+_ROMAN_SUFFIXES = ("", "7", "m", "m7", "M7", "maj7", "dim", "dim7", "aug", "sus2", "sus4", "°")
+
+
+@dataclass(frozen=True)
+class TheoryTables:
+    """Lookup tables for the theory functions, built once at import.
+
+    scales[tonic_pc][mode_index][octave] and
+    chord_tones[tonic_pc][mode_index][degree - 1][quality_index][octave] hold
+    MIDI notes; chord_names[tonic_pc][mode_index][degree - 1] holds the names
+    with major and minor qualities, each without and with a 7th.
+    """
+
+    tonic_pcs: dict[str, int]
+    roman_degrees: dict[str, int]
+    scales: tuple[tuple[tuple[tuple[int, ...], ...], ...], ...]
+    chord_tones: tuple
+    chord_names: tuple[tuple[tuple[tuple[str, str, str, str], ...], ...], ...]
+    build_ms: float
+
+    @classmethod
+    def build(cls) -> "TheoryTables":
+        """Compute every table entry with the reference implementations."""
+        start = time.perf_counter()
+        scales = tuple(
+            tuple(
+                tuple(tuple(_scale_degrees(tonic_pc, mode, octave)) for octave in TABLE_OCTAVES)
+                for mode in MODES
+            )
+            for tonic_pc in range(12)
+        )
+        chord_tones = tuple(
+            tuple(
+                tuple(
+                    tuple(
+                        tuple(
+                            tuple(_chord_notes(list(scale), degree, quality))
+                            for scale in mode_scales
+                        )
+                        for quality in CHORD_QUALITIES
+                    )
+                    for degree in range(1, 8)
+                )
+                for mode_scales in tonic_scales
+            )
+            for tonic_scales in scales
+        )
+        chord_names = tuple(
+            tuple(
+                tuple(
+                    tuple(
+                        PITCH_CLASS_NAMES[(tonic_pc + MODE_INTERVALS[mode][degree - 1]) % 12]
+                        + CHORD_QUALITY_SUFFIXES[quality_mode][degree - 1]
+                        + seventh
+                        for quality_mode in ("ionian", "aeolian")
+                        for seventh in ("", "7")
+                    )
+                    for degree in range(1, 8)
+                )
+                for mode in MODES
+            )
+            for tonic_pc in range(12)
+        )
+        return cls(
+            tonic_pcs={spelling: _parse_tonic(spelling) for spelling in _TONIC_SPELLINGS},
+            roman_degrees={
+                roman + suffix: _roman_to_degree(roman + suffix)
+                for roman in ROMAN_TO_DEGREE
+                for suffix in _ROMAN_SUFFIXES
+            },
+            scales=scales,
+            chord_tones=chord_tones,
+            chord_names=chord_names,
+            build_ms=(time.perf_counter() - start) * 1000,
+        )
+
+
+TABLES = TheoryTables.build()
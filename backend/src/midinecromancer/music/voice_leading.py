@@ -0,0 +1,119 @@
+"""Progression-level voice leading.
+
+voice_chord() voices each chord greedily against the one before it. Here every
+chord's candidate voicings are enumerated once (cached by pitch-class set and
+range) and a Viterbi pass picks the sequence with the least total movement
+over the whole progression. Movement is measured as in voice_chord(): each
+note's distance to the nearest note of the previous voicing.
+"""
+
+from functools import lru_cache
+from itertools import product
+from operator import add
+
+from midinecromancer.music.chords_render import voice_chord
+
+# Widest allowed voicing (lowest to highest note), in semitones
+MAX_SPAN = 24
+
+
+@lru_cache(maxsize=1024)
+def candidate_voicings(
+    pitch_classes: tuple[int, ...], voicing_low: int, voicing_high: int
+) -> tuple[tuple[int, ...], ...]:
+    """Every voicing of pitch_classes with one note per class within range.
+
+    Args:
+        pitch_classes: Sorted pitch classes (0-11)
+        voicing_low: Lowest allowed MIDI pitch
+        voicing_high: Highest allowed MIDI pitch
+
+    Returns:
+        Sorted voicings, empty if some class has no pitch in range
+    """
+    if not pitch_classes:
+        return ()
+    placements = [
+        range(pc + 12 * ((voicing_low - pc + 11) // 12), voicing_high + 1, 12)
+        for pc in pitch_classes
+    ]
+    voicings = {
+        tuple(sorted(pitches))
+        for pitches in product(*placements)
+        if max(pitches) - min(pitches) <= MAX_SPAN
+    }
+    return tuple(sorted(voicings))
+
+
+@lru_cache(maxsize=4096)
+def movement_costs(
+    previous: tuple[tuple[int, ...], ...], current: tuple[tuple[int, ...], ...]
+) -> tuple[tuple[int, ...], ...]:
+    """Movement to each current voicing from each previous one, as costs[cur][prev]."""
+    return tuple(
+        tuple(sum(min(abs(p - q) for q in prev) for p in cur) for prev in previous)
+        for cur in current
+    )
+
+
+def voice_progression(
+    chords_tones: list[list[int]], voicing_low: int, voicing_high: int
+) -> list[list[int]]:
+    """Voice a whole progression with minimal total movement.
+
+    The first chord is scored by distance from the middle of the range, as in
+    voice_chord(). Chords that cannot be fully voiced in range (or have no
+    tones) fall back to voice_chord() and restart the search after them.
+
+    Args:
+        chords_tones: Chord tones per chord (MIDI pitches, any octave)
+        voicing_low: Lowest allowed MIDI pitch
+        voicing_high: Highest allowed MIDI pitch
+
+    Returns:
+        One voicing (sorted MIDI pitches) per chord
+    """
+    voicings: list[list[int]] = []
+    run: list[tuple[tuple[int, ...], ...]] = []
+    for chord_tones in chords_tones:
+        candidates = candidate_voicings(
+            tuple(sorted({p % 12 for p in chord_tones})), voicing_low, voicing_high
+        )
+        if candidates:
+            run.append(candidates)
+            continue
+        voicings.extend(_viterbi(run, voicing_low, voicing_high))
+        run = []
+        previous = voicings[-1] if voicings else None
+        voicings.append(voice_chord(chord_tones, voicing_low, voicing_high, previous))
+    voicings.extend(_viterbi(run, voicing_low, voicing_high))
+    return voicings
+
+
+def _viterbi(
+    run: list[tuple[tuple[int, ...], ...]], voicing_low: int, voicing_high: int
+) -> list[list[int]]:
+    """Cheapest path through consecutive chords' candidate voicings."""
+    if not run:
+        return []
+    mid = (voicing_low + voicing_high) // 2
+    costs = [sum(abs(p - mid) for p in voicing) for voicing in run[0]]
+    back_pointers = []
+    for previous, current in zip(run, run[1:], strict=False):
+        step_costs = []
+        pointers = []
+        for moves in movement_costs(previous, current):
+            totals = list(map(add, costs, moves))
+            best = min(totals)
+            step_costs.append(best)
+            pointers.append(totals.index(best))
+        costs = step_costs
+        back_pointers.append(pointers)
+
+    index = min(range(len(costs)), key=costs.__getitem__)
+    path = [index]
+    for pointers in reversed(back_pointers):
+        index = pointers[index]
+        path.append(index)
+    path.reverse()
+    return [list(candidates[i]) for candidates, i in zip(run, path, strict=True)]
@@ -67,6 +67,10 @@ class ClipInArrangement(BaseModel):
     start_offset_ticks: int
     intensity: float = 1.0
     params: dict = {}
+    revision: int = 0
+    # False when the response is windowed and the clip lies outside the window
+    # (notes and chord_events are then empty)
+    in_window: bool = True
     notes: list[NoteInArrangement]
     chord_events: list[ChordEventInArrangement]
 
@@ -86,6 +90,8 @@ class TrackInArrangement(BaseModel):
     is_soloed: bool
     start_offset_ticks: int
     clips: list[ClipInArrangement]
+    # Delta responses only: ids of all current clips (clips holds only changed ones)
+    clip_ids: list[UUID] | None = None
 
     class Config:
         from_attributes = True
@@ -103,4 +109,40 @@ class ArrangementResponse(BaseModel):
     key_tonic: str
     mode: str
     seed: int
+    revision: int = 0
+    # Set when only clips changed after this revision are included
+    since_revision: int | None = None
+    # Set when the response is paged by bar window
+    from_bar: int | None = None
+    to_bar: int | None = None
+    next_cursor: str | None = None
     tracks: list[TrackInArrangement]
+
+
+class ClipEventsInWindow(BaseModel):
+    """A clip's notes sounding in a bar window."""
+
+    id: UUID
+    track_id: UUID
+    start_bar: int
+    length_bars: int
+    is_muted: bool
+    is_soloed: bool
+    start_offset_ticks: int
+    revision: int = 0
+    # Absolute tick of the clip's tick 0 (clip start plus clip and track offsets)
+    base_tick: int
+    # Clip-relative ticks, by start tick
+    notes: list[NoteInArrangement]
+
+
+class EventsWindowResponse(BaseModel):
+    """Notes of a project sounding in the bars [from_bar, to_bar)."""
+
+    project_id: UUID
+    revision: int = 0
+    from_bar: int
+    to_bar: int
+    from_tick: int
+    to_tick: int
+    clips: list[ClipEventsInWindow]
@@ -48,7 +48,7 @@ class ClipChordSettingsCreate(BaseModel):
     pattern: dict | None = None
     voicing_low_midi: int = 48
     voicing_high_midi: int = 72
-    inversion_policy: str = "smooth"
+    inversion_policy: str = "smooth"  # "root" | "smooth" | "drop2" | "optimal"
 
 
 class ClipChordSettingsUpdate(BaseModel):
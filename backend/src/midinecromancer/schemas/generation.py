@@ -19,3 +19,5 @@ class GenerationResponse(BaseModel):
     success: bool
     message: str
     generation_run_id: str | None = None
+    # Per-part compute/write milliseconds of the run
+    timings: dict[str, Any] | None = None
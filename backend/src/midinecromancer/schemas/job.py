@@ -0,0 +1,69 @@
+"""Background job schemas."""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from midinecromancer.schemas.suggestion import SuggestionKind
+
+
+class JobCreate(BaseModel):
+    """Job submission schema."""
+
+    kind: str = Field(..., pattern="^(generate_full|export_zip|suggestions)$")
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class GenerateFullJobParams(BaseModel):
+    """Parameters of a generate_full job (as for /generate/full)."""
+
+    seed: int | None = None
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class ExportZipJobParams(BaseModel):
+    """Parameters of an export_zip job (as for /export/zip)."""
+
+    split_by: str = Field(default="track", pattern="^(track|clip)$")
+
+
+class SuggestionsJobParams(BaseModel):
+    """Parameters of a suggestions job (as for /suggestions/run)."""
+
+    seed: int | None = None
+    params: dict[str, Any] = Field(default_factory=dict)
+    kinds: list[SuggestionKind] | None = None
+    limit: int | None = Field(default=None, ge=1)
+
+
+JOB_PARAMS: dict[str, type[BaseModel]] = {
+    "generate_full": GenerateFullJobParams,
+    "export_zip": ExportZipJobParams,
+    "suggestions": SuggestionsJobParams,
+}
+
+
+class JobResponse(BaseModel):
+    """Job response schema."""
+
+    id: UUID
+    project_id: UUID
+    kind: str
+    status: str
+    params: dict[str, Any]
+    project_revision: int
+    # tracks_done/tracks_total, bars_done/bars_total as reported so far
+    progress: dict[str, Any]
+    result: dict[str, Any] | None = None
+    # Set when GET /jobs/{id}/result downloads a file
+    result_media_type: str | None = None
+    result_filename: str | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -5,6 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from midinecromancer.music.seeds import SeedScheme
+
 
 class ProjectCreate(BaseModel):
     """Project creation schema."""
@@ -17,6 +19,7 @@ class ProjectCreate(BaseModel):
     key_tonic: str = Field(default="C", max_length=10)
     mode: str = Field(default="ionian", max_length=20)
     seed: int = Field(default=0)
+    seed_scheme: SeedScheme = "legacy"
 
 
 class ProjectUpdate(BaseModel):
@@ -30,6 +33,7 @@ class ProjectUpdate(BaseModel):
     key_tonic: str | None = Field(None, max_length=10)
     mode: str | None = Field(None, max_length=20)
     seed: int | None = None
+    seed_scheme: SeedScheme | None = None
 
 
 class ProjectResponse(BaseModel):
@@ -44,6 +48,8 @@ class ProjectResponse(BaseModel):
     key_tonic: str
     mode: str
     seed: int
+    seed_scheme: SeedScheme = "legacy"
+    revision: int = 0
     created_at: datetime
     updated_at: datetime
 
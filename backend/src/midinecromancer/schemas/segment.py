@@ -109,3 +109,33 @@ class SegmentGenerateResponse(BaseModel):
     chords_by_clip: dict[str, list[dict]] = Field(default_factory=dict)
     lanes_by_clip: dict[str, list[dict]] = Field(default_factory=dict)
     preview: bool = False
+
+
+class SegmentPreviewBatchRequest(BaseModel):
+    """Request to preview one segment request for several seeds."""
+
+    project_id: UUID
+    start_bar: int = Field(..., ge=0)
+    length_bars: int = Field(..., ge=1)
+    bpm: int | None = None  # Optional; default from project
+    seeds: list[int] = Field(..., min_length=1, max_length=64)
+    kinds: list[SegmentKind] = Field(..., min_length=1)
+    models: dict[SegmentKind, BeatsModel | ChordsModel | BassModel | MelodyModel] = Field(
+        default_factory=dict
+    )
+
+
+class SegmentPreviewVariant(BaseModel):
+    """Preview for one seed; event lists are indices into event_lists."""
+
+    seed: int
+    clips: list[dict] = Field(default_factory=list)
+    events_by_clip: dict[str, int] = Field(default_factory=dict)
+    chords_by_clip: dict[str, int] = Field(default_factory=dict)
+
+
+class SegmentPreviewBatchResponse(BaseModel):
+    """Previews for several seeds with identical event lists stored once."""
+
+    variants: list[SegmentPreviewVariant]
+    event_lists: list[list[dict]] = Field(default_factory=list)
@@ -2,10 +2,13 @@
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+SuggestionKind = Literal["harmony", "rhythm", "melody"]
+
 
 class SuggestionRunCreate(BaseModel):
     """Suggestion run creation schema."""
@@ -13,6 +16,9 @@ class SuggestionRunCreate(BaseModel):
     project_id: UUID
     seed: int | None = None
     params: dict = Field(default_factory=dict)
+    # Kinds to generate (all if unset) and how many of the best to keep
+    kinds: list[SuggestionKind] | None = None
+    limit: int | None = Field(default=None, ge=1)
 
 
 class SuggestionParams(BaseModel):
@@ -91,6 +97,8 @@ class PreviewRequest(BaseModel):
     kind: str = Field(..., pattern="^(harmony|rhythm|melody)$")
     seed: int | None = None
     params: dict = Field(default_factory=dict)
+    # Which suggestion of the kind (0 is the first)
+    index: int = Field(default=0, ge=0)
 
 
 class PreviewResponse(BaseModel):
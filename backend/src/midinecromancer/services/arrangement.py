@@ -1,14 +1,94 @@
-"""Arrangement service for unified arrangement view model."""
+"""Arrangement service for unified arrangement view model.
 
+Long projects can be paged by bar window: clip metadata is always returned
+for the whole project, while clip bodies (notes, chord events, lanes) are
+only loaded for clips overlapping [from_bar, to_bar) (see
+services/snapshot.py), and each page's next_cursor resumes with the
+following window of the same size.
+"""
+
+import base64
+import binascii
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.project import Project
 from midinecromancer.models.track import Track
+from midinecromancer.services.snapshot import Needs, load_project_snapshot
+
+BarWindow = tuple[int, int]
+
+# Clip bodies summarized by the panel
+PANEL_NEEDS = Needs.CHORD_EVENTS | Needs.LANES | Needs.CHORD_SETTINGS
+
+
+class WindowError(ValueError):
+    """Invalid bar window or cursor."""
+
+
+def encode_cursor(window: BarWindow) -> str:
+    """Opaque cursor for a bar window."""
+    return base64.urlsafe_b64encode(f"{window[0]}:{window[1]}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> BarWindow:
+    """Bar window of a cursor from encode_cursor().
+
+    Raises:
+        WindowError: If the cursor is malformed
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        from_bar, to_bar = (int(part) for part in text.split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise WindowError("Invalid cursor") from e
+    if not 0 <= from_bar < to_bar:
+        raise WindowError("Invalid cursor")
+    return from_bar, to_bar
+
+
+def resolve_window(
+    from_bar: int | None, to_bar: int | None, cursor: str | None, end_bar: int
+) -> BarWindow | None:
+    """The requested bar window, or None for the whole project.
+
+    A cursor stands alone; otherwise a missing from_bar means bar 0 and a
+    missing to_bar the end of the project.
+
+    Raises:
+        WindowError: If the cursor is malformed, is combined with bars, or the
+            window is empty
+    """
+    if cursor is not None:
+        if from_bar is not None or to_bar is not None:
+            raise WindowError("Pass either a cursor or from_bar/to_bar, not both")
+        return decode_cursor(cursor)
+    if from_bar is None and to_bar is None:
+        return None
+    window = (from_bar or 0, to_bar if to_bar is not None else max(end_bar, (from_bar or 0) + 1))
+    if window[1] <= window[0]:
+        raise WindowError("to_bar must be greater than from_bar")
+    return window
+
+
+def next_cursor(window: BarWindow | None, end_bar: int) -> str | None:
+    """Cursor of the next window of the same size, None after the last page."""
+    if window is None or window[1] >= end_bar:
+        return None
+    return encode_cursor((window[1], 2 * window[1] - window[0]))
+
+
+async def project_end_bar(session: AsyncSession, project: Project) -> int:
+    """Bar after the project's end (its length, or its last clip if later)."""
+    result = await session.execute(
+        select(func.max(Clip.start_bar + Clip.length_bars))
+        .join(Track, Track.id == Clip.track_id)
+        .where(Track.project_id == project.id)
+    )
+    return max(project.bars, result.scalar() or 0)
 
 
 class ArrangementService:
@@ -17,13 +97,27 @@ class ArrangementService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_project_arrangement(self, project_id: UUID) -> dict:
+    async def get_project_arrangement(
+        self,
+        project_id: UUID,
+        from_bar: int | None = None,
+        to_bar: int | None = None,
+        cursor: str | None = None,
+    ) -> dict:
         """Get unified arrangement view model for a project.
 
         Returns a structure optimized for the Arrangement panel:
         - Project timing info
         - Track lanes (beats/chords/bass/melody) with ordered segments
         - Each segment includes minimal info for card rendering
+
+        With a bar window (from_bar/to_bar or a cursor), every segment is
+        still listed, but chord and lane summaries are only computed for
+        segments overlapping the window (marked "in_window").
+
+        Raises:
+            ValueError: If the project does not exist
+            WindowError: If the window or cursor is invalid
         """
         # Load project
         result = await self.session.execute(select(Project).where(Project.id == project_id))
@@ -31,18 +125,12 @@ class ArrangementService:
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
-        # Load tracks with clips in a single query (eager load)
-        result = await self.session.execute(
-            select(Track)
-            .where(Track.project_id == project_id)
-            .options(
-                selectinload(Track.clips).selectinload(Clip.chord_events),
-                selectinload(Track.clips).selectinload(Clip.polyrhythm_lanes),
-                selectinload(Track.clips).selectinload(Clip.chord_settings),
-            )
-            .order_by(Track.created_at)
-        )
-        tracks = list(result.scalars().all())
+        end_bar = await project_end_bar(self.session, project)
+        window = resolve_window(from_bar, to_bar, cursor, end_bar)
+
+        # Bodies only for clips in the window
+        snapshot = await load_project_snapshot(self.session, project, PANEL_NEEDS, window=window)
+        tracks = snapshot.tracks
 
         # Define track order: Beats, Chords, Bass, Melody (then others)
         role_order = {"drums": 0, "chords": 1, "bass": 2, "melody": 3}
@@ -53,12 +141,9 @@ class ArrangementService:
         # Build lanes (one per track role)
         lanes = []
         for track in sorted_tracks:
-            # Sort clips by start_bar then created_at
-            sorted_clips = sorted(track.clips, key=lambda c: (c.start_bar, c.created_at))
-
             # Build segments (one per clip)
             segments = []
-            for clip in sorted_clips:
+            for clip in track.clips:
                 # Compute card payload
                 segment = {
                     "id": str(clip.id),
@@ -73,6 +158,12 @@ class ArrangementService:
                     "params": getattr(clip, "params", {}),
                 }
 
+                if window is not None:
+                    segment["in_window"] = clip.has_body
+                if not clip.has_body:
+                    segments.append(segment)
+                    continue
+
                 # Add kind-specific info
                 if track.role == "chords":
                     # Chord events summary
@@ -124,5 +215,8 @@ class ArrangementService:
             "bars": project.bars,
             "time_signature_num": project.time_signature_num,
             "time_signature_den": project.time_signature_den,
+            "from_bar": window[0] if window else None,
+            "to_bar": window[1] if window else None,
+            "next_cursor": next_cursor(window, end_bar),
             "lanes": lanes,
         }
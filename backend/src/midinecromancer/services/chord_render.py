@@ -1,9 +1,10 @@
 """Service for rendering chord events to notes with expressive parameters."""
 
-import hashlib
-import random
+from collections.abc import Iterable
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
+from midinecromancer.music.seeds import child_rng, legacy_seed
 from midinecromancer.music.theory import PPQ, get_chord_notes, roman_to_degree
 
 if TYPE_CHECKING:
@@ -11,10 +12,8 @@ if TYPE_CHECKING:
 
 
 def deterministic_seed(base_seed: int, chord_id: str, param: str) -> int:
-    """Generate deterministic seed for a chord parameter."""
-    hash_input = f"{base_seed}:{chord_id}:{param}".encode()
-    hash_bytes = hashlib.blake2b(hash_input, digest_size=8).digest()
-    return int.from_bytes(hash_bytes, byteorder="big")
+    """Generate deterministic seed for a chord parameter (the legacy seed scheme)."""
+    return legacy_seed(base_seed, chord_id, param)
 
 
 def render_chord_event_to_notes(
@@ -24,9 +23,13 @@ def render_chord_event_to_notes(
 ) -> list[dict]:
     """Render a single chord event to note events with expressive parameters.
 
+    To render many events (a whole clip) use render_chord_events_to_notes(),
+    which gives the same notes.
+
     Args:
         chord_event: ChordEvent model with expressive fields
         project_context: Dict with tonic, mode, bpm, time_signature_num, time_signature_den
+            and optionally seed_scheme (see seeds.py, default "legacy")
         seed: Base seed for determinism
 
     Returns:
@@ -76,15 +79,13 @@ def render_chord_event_to_notes(
     strum_ticks = int(strum_beats * ticks_per_beat)
     humanize_ticks = int(humanize_beats * ticks_per_beat)
 
-    # Generate deterministic seeds for each parameter
-    strum_seed = deterministic_seed(seed, str(chord_event.id), "strum")
-    humanize_seed = deterministic_seed(seed, str(chord_event.id), "humanize")
-    velocity_seed = deterministic_seed(seed, str(chord_event.id), "velocity")
-
+    # Deterministic random streams per parameter
+    seed_scheme = project_context.get("seed_scheme", "legacy")
+    chord_id = str(chord_event.id)
     notes = []
-    rng_strum = random.Random(strum_seed)
-    rng_humanize = random.Random(humanize_seed)
-    rng_velocity = random.Random(velocity_seed)
+    rng_strum = child_rng(seed_scheme, seed, chord_id, "strum")
+    rng_humanize = child_rng(seed_scheme, seed, chord_id, "humanize")
+    rng_velocity = child_rng(seed_scheme, seed, chord_id, "velocity")
 
     # Determine strum order (deterministic)
     strum_order = list(range(len(voicing_pitches)))
@@ -129,6 +130,94 @@ def render_chord_event_to_notes(
     return notes
 
 
+def render_chord_events_to_notes(
+    chord_events: Iterable["ChordEvent"],
+    project_context: dict,
+    seed: int,
+) -> list[dict]:
+    """Render a clip's chord events to notes in one pass.
+
+    Gives the same notes, in the same order, as render_chord_event_to_notes()
+    per event. Voicings are cached per (roman numeral, voicing, inversion),
+    and an event's random streams are only seeded for the parameters it
+    actually randomizes (strum order, humanize, velocity jitter).
+
+    Args:
+        chord_events: Chord events in render order (e.g. a clip's chord_events)
+        project_context: As for render_chord_event_to_notes()
+        seed: Base seed for determinism
+
+    Returns:
+        List of note dicts: {pitch, start_tick, duration_tick, velocity}
+    """
+    tonic = project_context["tonic"]
+    mode = project_context["mode"]
+    bpm = project_context["bpm"]
+    seed_scheme = project_context.get("seed_scheme", "legacy")
+
+    notes = []
+    for chord_event in chord_events:
+        voicing_pitches = voice_roman(
+            tonic, mode, chord_event.roman_numeral, chord_event.voicing, chord_event.inversion
+        )
+        base_start_tick = chord_event.start_tick
+        duration_ticks = int(chord_event.duration_tick)
+        end_tick = base_start_tick + duration_ticks
+        strum_beats, humanize_beats = _expressive_beats(chord_event, bpm)
+        strum_ticks = int(strum_beats * PPQ)
+        humanize_ticks = int(humanize_beats * PPQ)
+        chord_id = str(chord_event.id)
+
+        strum_order = list(range(len(voicing_pitches)))
+        if strum_beats > 0:
+            child_rng(seed_scheme, seed, chord_id, "strum").shuffle(strum_order)
+        rng_humanize = (
+            child_rng(seed_scheme, seed, chord_id, "humanize") if humanize_beats > 0 else None
+        )
+        velocity_jitter = chord_event.velocity_jitter
+        rng_velocity = (
+            child_rng(seed_scheme, seed, chord_id, "velocity") if velocity_jitter > 0 else None
+        )
+        base_velocity = int(100 * float(chord_event.intensity))
+        last = len(strum_order) - 1
+
+        for i, pitch_idx in enumerate(strum_order):
+            if last > 0 and strum_beats > 0:
+                note_start = base_start_tick + int(i / last * strum_ticks)
+            else:
+                note_start = base_start_tick
+            if rng_humanize is not None:
+                note_start += rng_humanize.randint(-humanize_ticks, humanize_ticks)
+                note_start = max(base_start_tick, min(end_tick, note_start))
+
+            velocity = base_velocity
+            if rng_velocity is not None:
+                velocity += rng_velocity.randint(-velocity_jitter, velocity_jitter)
+
+            notes.append({
+                "pitch": voicing_pitches[pitch_idx],
+                "start_tick": note_start,
+                "duration_tick": duration_ticks,
+                "velocity": max(1, min(127, velocity)),
+            })
+
+    return notes
+
+
+def _expressive_beats(chord_event: "ChordEvent", bpm: float) -> tuple[float, float]:
+    """Strum and humanize amounts in beats, falling back to the deprecated ms fields."""
+    beats = []
+    for field in ("strum", "humanize"):
+        value = getattr(chord_event, f"{field}_beats", None)
+        if value is not None:
+            beats.append(float(value))
+        else:
+            ms = getattr(chord_event, f"{field}_ms")
+            beats.append((ms / 1000.0) * (bpm / 60.0) if ms > 0 else 0.0)
+    strum_beats, humanize_beats = beats
+    return strum_beats, humanize_beats
+
+
 def apply_voicing(
     chord_tones: list[int],
     voicing: str,
@@ -202,3 +291,34 @@ def apply_voicing(
     octave = (min_octave + max_octave) // 2
     return [p + octave * 12 for p in pitch_classes if voicing_low <= p + octave * 12 <= voicing_high]
 
+
+@lru_cache(maxsize=1024)
+def voice_roman(
+    tonic: str,
+    mode: str,
+    roman: str,
+    voicing: str,
+    inversion: int,
+    voicing_low: int = 48,
+    voicing_high: int = 72,
+) -> tuple[int, ...]:
+    """Voiced pitches of a roman numeral chord (cached).
+
+    The chord tones (a 7th chord if the numeral contains "7", else a triad)
+    with apply_voicing() applied, as the chord renderers compute them.
+
+    Args:
+        tonic: Key tonic (e.g. "C")
+        mode: Mode name
+        roman: Roman numeral (e.g. "vi", "V7")
+        voicing: Voicing preset
+        inversion: Inversion number
+        voicing_low: Lowest allowed MIDI pitch
+        voicing_high: Highest allowed MIDI pitch
+
+    Returns:
+        Voiced MIDI pitches
+    """
+    quality = "7th" if "7" in roman else "triad"
+    chord_tones = get_chord_notes(tonic, mode, roman_to_degree(roman), quality, octave=4)
+    return tuple(apply_voicing(chord_tones, voicing, inversion, voicing_low, voicing_high))
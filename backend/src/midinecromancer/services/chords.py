@@ -9,7 +9,6 @@ from sqlalchemy.orm import selectinload
 from midinecromancer.music.chords_render import NoteEvent, render_chord_progression_to_notes
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.clip import Clip
-from midinecromancer.models.note import Note
 from midinecromancer.models.project import Project
 from midinecromancer.models.track import Track
 from midinecromancer.schemas.chord_projections import (
@@ -19,6 +18,7 @@ from midinecromancer.schemas.chord_projections import (
     ChordPreviewResponse,
     NoteEventResponse,
 )
+from midinecromancer.services.note_store import clear_clip_notes, write_clip_notes
 
 
 class ChordService:
@@ -28,7 +28,11 @@ class ChordService:
         self.session = session
 
     async def preview_chords(self, request: ChordPreviewRequest) -> ChordPreviewResponse:
-        """Preview chord rendering without committing."""
+        """Preview chord rendering without committing.
+
+        settings["inversion_policy"] = "optimal" voices the whole progression at
+        once for the least total movement (music/voice_leading.py).
+        """
         # Get project
         result = await self.session.execute(select(Project).where(Project.id == request.project_id))
         project = result.scalar_one_or_none()
@@ -169,23 +173,10 @@ class ChordService:
 
         # Clear existing notes in clip (if commit_key matches, skip)
         # For now, always clear and recreate
-        existing_notes = [n for n in clip.notes]
-        for note in existing_notes:
-            await self.session.delete(note)
+        await clear_clip_notes(self.session, clip)
 
         # Create new notes
-        notes_created = 0
-        for event in note_events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event.pitch,
-                velocity=event.velocity,
-                start_tick=event.start_tick,
-                duration_tick=event.duration_tick,
-                probability=1.0,
-            )
-            self.session.add(note)
-            notes_created += 1
+        notes_created = await write_clip_notes(self.session, clip, note_events)
 
         await self.session.commit()
 
@@ -0,0 +1,188 @@
+"""Per-clip analysis summaries, persisted and recomputed only when clips change.
+
+Suggestion runs and previews analyze a project by merging one
+music.analysis.ClipSummary per clip (merge_clip_summaries()), in one pass
+over the clips. Summaries are stored in clip_analyses together with the clip
+revision they were computed at. Every change to a clip, its notes or its
+chord events stamps that clip with a new revision (db/revisions.py), so
+chord event edits, regenerate commits, duplicates and deletes leave every
+other clip's summary valid: only the touched clips are recomputed, from
+their bodies loaded in one query per kind, and written back.
+
+Summaries are written in their own transaction, as the persistent lane render
+cache is, so read-only callers need not commit; they are not written while
+the caller's session holds uncommitted changes, whose revisions are not
+final yet. A failed write is logged and otherwise ignored: the summaries are
+only a cache, and are recomputed next time.
+"""
+
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from midinecromancer.db.base import AsyncSessionLocal
+from midinecromancer.db.revisions import has_pending_changes
+from midinecromancer.models.clip_analysis import ClipAnalysis
+from midinecromancer.music.analysis import (
+    ClipSummary,
+    ProjectAnalysis,
+    merge_clip_summaries,
+    summarize_clip,
+)
+from midinecromancer.services.snapshot import (
+    ClipSnapshot,
+    Needs,
+    ProjectSnapshot,
+    load_clip_bodies,
+)
+
+# Bump when summarize_clip() changes, so stored summaries are recomputed
+SUMMARY_VERSION = 1
+
+# Rows per upsert; each row takes 8 bind parameters and asyncpg allows 32767
+WRITE_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+# Counters since startup (recomputed = stale or missing summaries)
+summary_stats = {"reused": 0, "recomputed": 0, "writes": 0}
+
+
+def _summary_from_row(row) -> ClipSummary:
+    return ClipSummary(
+        note_count=row.note_count,
+        onset_count=row.onset_count,
+        pitch_class_histogram=tuple(row.pitch_class_histogram),
+        chord_functions=tuple(row.chord_functions),
+    )
+
+
+async def load_clip_summaries(
+    session: AsyncSession, clips: Iterable[ClipSnapshot]
+) -> dict[UUID, ClipSummary]:
+    """Summaries of clips, recomputing only stale or missing ones.
+
+    Args:
+        session: Database session
+        clips: Clip snapshots (their revision decides staleness; no bodies needed)
+
+    Returns:
+        Summary by clip id
+    """
+    clips = list(clips)
+    if not clips:
+        return {}
+    result = await session.execute(
+        select(ClipAnalysis.__table__).where(ClipAnalysis.clip_id.in_([clip.id for clip in clips]))
+    )
+    stored = {row.clip_id: row for row in result}
+
+    summaries: dict[UUID, ClipSummary] = {}
+    stale = []
+    for clip in clips:
+        row = stored.get(clip.id)
+        if (
+            row is not None
+            and row.clip_revision == clip.revision
+            and row.summary_version == SUMMARY_VERSION
+        ):
+            summaries[clip.id] = _summary_from_row(row)
+        else:
+            stale.append(clip)
+    summary_stats["reused"] += len(summaries)
+    if not stale:
+        return summaries
+
+    recomputed = {
+        clip.id: (clip.revision, summarize_clip(clip))
+        for clip in await load_clip_bodies(session, stale, Needs.NOTES | Needs.CHORD_EVENTS)
+    }
+    summary_stats["recomputed"] += len(recomputed)
+    summaries.update((clip_id, summary) for clip_id, (_, summary) in recomputed.items())
+    if not has_pending_changes(session):
+        await _persist_summaries(recomputed)
+    return summaries
+
+
+async def _persist_summaries(summaries: dict[UUID, tuple[int, ClipSummary]]) -> None:
+    rows = [
+        {
+            "clip_id": clip_id,
+            "clip_revision": revision,
+            "summary_version": SUMMARY_VERSION,
+            "note_count": summary.note_count,
+            "onset_count": summary.onset_count,
+            "pitch_class_histogram": list(summary.pitch_class_histogram),
+            "chord_functions": list(summary.chord_functions),
+        }
+        for clip_id, (revision, summary) in summaries.items()
+    ]
+    async with AsyncSessionLocal() as cache_session:
+        for start in range(0, len(rows), WRITE_BATCH_SIZE):
+            batch = rows[start : start + WRITE_BATCH_SIZE]
+            try:
+                await cache_session.execute(_upsert_summaries(batch))
+                await cache_session.commit()
+            except IntegrityError:
+                # A clip was deleted concurrently; its summary is not worth keeping
+                await cache_session.rollback()
+                continue
+            except SQLAlchemyError:
+                logger.warning(
+                    "Could not store %d clip summaries", len(rows) - start, exc_info=True
+                )
+                return
+            summary_stats["writes"] += len(batch)
+
+
+def _upsert_summaries(rows: list[dict]):
+    statement = insert(ClipAnalysis).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=["clip_id"],
+        set_={
+            name: statement.excluded[name]
+            for name in (
+                "clip_revision",
+                "summary_version",
+                "note_count",
+                "onset_count",
+                "pitch_class_histogram",
+                "chord_functions",
+                "updated_at",
+            )
+        },
+    )
+
+
+async def analyze_project_snapshot(
+    session: AsyncSession, snapshot: ProjectSnapshot, *, density: bool = True
+) -> ProjectAnalysis:
+    """Analyze a project from its clips' (cached) summaries.
+
+    Same result as music.analysis.analyze_project() on the fully loaded
+    project, without loading the bodies of clips whose summary is current.
+
+    Args:
+        session: Database session
+        snapshot: Project snapshot (no bodies needed)
+        density: Include rhythmic density, onset density and the pitch-class
+            histogram
+
+    Returns:
+        ProjectAnalysis
+    """
+    summaries = await load_clip_summaries(session, snapshot.iter_clips())
+    return merge_clip_summaries(
+        snapshot,
+        (
+            (track.role, clip.length_bars, summaries[clip.id])
+            for track in snapshot.tracks
+            for clip in track.clips
+        ),
+        density=density,
+    )
@@ -0,0 +1,278 @@
+"""Windowed note queries: the notes sounding in a tick range.
+
+A note sounds in [from_tick, to_tick) if it starts before to_tick and ends
+after from_tick, so notes that start before the window but are still held
+when it opens are included. Zero-length notes count as one tick long.
+
+Row-stored clips are filtered in SQL (ix_notes_clip_start bounds the scan by
+start tick). Packed clips keep their notes in one blob the database cannot
+look into, so each gets a ClipEventIndex: an implicit interval tree over the
+notes sorted by start, each node augmented with the latest end in its
+subtree (the layout of Heng Li's cgranges). Indexes are cached per clip and
+rebuilt when the clip's revision changes.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from midinecromancer.config import settings
+from midinecromancer.models.clip import Clip
+from midinecromancer.models.clip_note_block import ClipNoteBlock
+from midinecromancer.models.note import Note
+from midinecromancer.models.track import Track
+from midinecromancer.music.ticks import ticks_per_bar
+from midinecromancer.services.note_store import unpack_block
+from midinecromancer.services.snapshot import ClipSnapshot
+
+if TYPE_CHECKING:
+    from midinecromancer.models.project import Project
+
+# Subtrees up to this level are scanned linearly
+_SCAN_LEVEL = 3
+
+
+class ClipEventIndex:
+    """Interval index over one clip's notes (clip-relative ticks).
+
+    overlapping() takes O(log n + k) for k results. Notes keep their objects
+    (Note rows or PackedNoteRow views) and come back sorted by start tick,
+    ties in storage order.
+    """
+
+    __slots__ = ("notes", "starts", "ends", "max_ends", "root_level")
+
+    def __init__(self, notes: Iterable[Any]):
+        self.notes = sorted(notes, key=attrgetter("start_tick"))
+        self.starts = array("q", [note.start_tick for note in self.notes])
+        self.ends = array(
+            "q", [note.start_tick + max(note.duration_tick, 1) for note in self.notes]
+        )
+        self.max_ends = array("q", self.ends)
+        self.root_level = self._augment()
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    def _augment(self) -> int:
+        """Store each node's subtree end maximum; returns the root's level.
+
+        Node i sits at the level given by its trailing one bits; a node at
+        level k has children i - 2**(k-1) and i + 2**(k-1). Children past the
+        end of the array take the maximum of the last real subtree.
+        """
+        n = len(self.ends)
+        if n == 0:
+            return -1
+        ends, max_ends = self.ends, self.max_ends
+        last_i = n - 1 - (n - 1) % 2
+        last = ends[last_i]
+        level = 1
+        while 1 << level <= n:
+            half = 1 << (level - 1)
+            for i in range((half << 1) - 1, n, half << 2):
+                right = max_ends[i + half] if i + half < n else last
+                max_ends[i] = max(ends[i], max_ends[i - half], right)
+            last_i = last_i - half if last_i >> level & 1 else last_i + half
+            if last_i < n and max_ends[last_i] > last:
+                last = max_ends[last_i]
+            level += 1
+        return level - 1
+
+    def overlapping(self, from_tick: int, to_tick: int) -> list:
+        """Notes sounding in [from_tick, to_tick), by start tick."""
+        n = len(self.notes)
+        if n == 0 or from_tick >= to_tick:
+            return []
+        starts, ends, max_ends = self.starts, self.ends, self.max_ends
+        hits = []
+        # (node, level, left subtree done)
+        stack = [((1 << self.root_level) - 1, self.root_level, False)]
+        while stack:
+            node, level, left_done = stack.pop()
+            if level <= _SCAN_LEVEL:
+                first = node >> level << level
+                for i in range(first, min(first + (1 << (level + 1)) - 1, n)):
+                    if starts[i] >= to_tick:
+                        break
+                    if ends[i] > from_tick:
+                        hits.append(i)
+            elif not left_done:
+                stack.append((node, level, True))
+                left = node - (1 << (level - 1))
+                if left >= n or max_ends[left] > from_tick:
+                    stack.append((left, level - 1, False))
+            elif node < n and starts[node] < to_tick:
+                if ends[node] > from_tick:
+                    hits.append(node)
+                stack.append((node + (1 << (level - 1)), level - 1, False))
+        notes = self.notes
+        return [notes[i] for i in hits]
+
+
+class EventIndexCache:
+    """In-process LRU of ClipEventIndex by clip id, tagged with the clip revision.
+
+    An index built at an older revision is never served; it is rebuilt and
+    replaces the stale entry.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[UUID, tuple[int, ClipEventIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, clip: Clip) -> ClipEventIndex:
+        """Index of a (committed) clip's notes, built on a miss.
+
+        Packed clips are indexed from their block alone (clip.notes is not
+        touched, so it need not be loaded).
+        """
+        index = self.lookup(clip.id, clip.revision)
+        if index is None:
+            block = clip.note_block
+            index = ClipEventIndex(unpack_block(block).rows(clip.id) if block else clip.notes)
+            self.store(clip.id, clip.revision, index)
+        return index
+
+    def lookup(self, clip_id: UUID, revision: int) -> ClipEventIndex | None:
+        """Cached index of a clip at a revision, None on a miss."""
+        with self._lock:
+            entry = self._entries.get(clip_id)
+            if entry is not None and entry[0] == revision:
+                self._entries.move_to_end(clip_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def store(self, clip_id: UUID, revision: int, index: ClipEventIndex) -> None:
+        """Cache a clip's index built at a revision."""
+        with self._lock:
+            self._entries[clip_id] = (revision, index)
+            self._entries.move_to_end(clip_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+event_index_cache = EventIndexCache(settings.event_index_cache_size)
+
+
+async def window_notes(
+    session: AsyncSession, project: "Project", from_bar: int, to_bar: int
+) -> list[tuple[ClipSnapshot, int, list]]:
+    """Notes of every clip sounding in the bars [from_bar, to_bar).
+
+    Clips are selected by their tick 0 (clip and track offsets included):
+    notes never start before it, so a clip starting at or after the window
+    end has none in it. Every earlier clip is a candidate, since a note may
+    be held past the clip's end; notes are then matched exactly against the
+    window, shifted into each clip's ticks. Packed blocks are only read for
+    clips whose index is not cached at their revision; a packed clip's note
+    rows (notes added after the block was written) are merged in, as
+    note_store.get_clip_notes() does.
+
+    Args:
+        session: Database session
+        project: Project to query
+        from_bar: First bar of the window
+        to_bar: Bar after the window
+
+    Returns:
+        (clip, absolute tick of the clip's tick 0, notes by start tick) per
+        clip with notes in the window, ordered by track then clip start
+    """
+    bar_ticks = ticks_per_bar(project.time_signature_num, project.time_signature_den)
+    from_tick = from_bar * bar_ticks
+    to_tick = to_bar * bar_ticks
+    clip_base = Clip.start_bar * bar_ticks + Clip.start_offset_ticks + Track.start_offset_ticks
+
+    result = await session.execute(
+        select(
+            Clip.__table__,
+            clip_base.label("base_tick"),
+            ClipNoteBlock.clip_id.is_not(None).label("packed"),
+        )
+        .join(Track, Track.id == Clip.track_id)
+        .outerjoin(ClipNoteBlock, ClipNoteBlock.clip_id == Clip.id)
+        .where(Track.project_id == project.id, clip_base < to_tick)
+        .order_by(Track.created_at, Clip.start_bar)
+    )
+    clips = [(ClipSnapshot.from_row(row), row.base_tick, row.packed) for row in result]
+
+    notes_by_clip: dict[UUID, list] = {}
+    if clips:
+        # Packed clips too: notes added to a packed clip later are stored as rows.
+        # Per clip, an index range scan on (clip_id, start_tick < window end)
+        result = await session.execute(
+            select(Note)
+            .join(Clip, Clip.id == Note.clip_id)
+            .join(Track, Track.id == Clip.track_id)
+            .where(
+                Note.clip_id.in_([clip.id for clip, _, _ in clips]),
+                Note.start_tick < to_tick - clip_base,
+                Note.start_tick + func.greatest(Note.duration_tick, 1) > from_tick - clip_base,
+            )
+            .order_by(Note.clip_id, Note.start_tick)
+        )
+        for note in result.scalars():
+            notes_by_clip.setdefault(note.clip_id, []).append(note)
+
+    indexes = {
+        clip.id: event_index_cache.lookup(clip.id, clip.revision)
+        for clip, _, packed in clips
+        if packed
+    }
+    missing = [clip_id for clip_id, index in indexes.items() if index is None]
+    if missing:
+        result = await session.execute(
+            select(ClipNoteBlock.__table__).where(ClipNoteBlock.clip_id.in_(missing))
+        )
+        blocks = {block.clip_id: block for block in result}
+        for clip, _, packed in clips:
+            if packed and indexes[clip.id] is None:
+                index = ClipEventIndex(unpack_block(blocks[clip.id]).rows(clip.id))
+                event_index_cache.store(clip.id, clip.revision, index)
+                indexes[clip.id] = index
+
+    for clip, base, packed in clips:
+        if packed:
+            hits = indexes[clip.id].overlapping(from_tick - base, to_tick - base)
+            rows = notes_by_clip.get(clip.id)
+            notes_by_clip[clip.id] = (
+                sorted(hits + rows, key=attrgetter("start_tick")) if rows else hits
+            )
+
+    return [
+        (clip, base, notes_by_clip[clip.id])
+        for clip, base, _ in clips
+        if notes_by_clip.get(clip.id)
+    ]
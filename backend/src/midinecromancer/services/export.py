@@ -0,0 +1,38 @@
+"""Loading projects for MIDI export."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from midinecromancer.models.project import Project
+from midinecromancer.services.polyrhythm import render_project_lanes
+from midinecromancer.services.snapshot import Needs, TrackSnapshot, load_project_snapshot
+
+EXPORT_NEEDS = Needs.NOTES | Needs.CHORD_EVENTS
+
+
+async def load_export_tracks(session: AsyncSession, project: Project) -> list[TrackSnapshot]:
+    """Load a project's tracks with everything the MIDI encoders read.
+
+    Polyrhythm lanes are rendered and appended to their clips' notes (in the
+    snapshot only; nothing is added to the session).
+
+    Args:
+        session: Database session
+        project: Project to export
+
+    Returns:
+        Track snapshots with clips, notes and chord events
+    """
+    snapshot = await load_project_snapshot(session, project, EXPORT_NEEDS)
+    lane_notes = await render_project_lanes(session, snapshot, snapshot.iter_clips())
+    if not lane_notes:
+        return list(snapshot.tracks)
+    tracks = []
+    for track in snapshot.tracks:
+        clips = tuple(
+            clip.replace(notes=clip.notes + tuple(lane_notes[clip.id]))
+            if clip.id in lane_notes
+            else clip
+            for clip in track.clips
+        )
+        tracks.append(track.replace(clips=clips))
+    return tracks
@@ -1,11 +1,16 @@
 """Generation service for creating musical content."""
 
+import asyncio
+import time
 import uuid
+from collections.abc import Callable
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from midinecromancer.db.bulk import bulk_insert_chord_events
+from midinecromancer.db.revisions import mark_tracks_changed
 from midinecromancer.music import (
     generate_bassline,
     generate_chord_progression,
@@ -17,13 +22,97 @@ from midinecromancer.music.theory import PPQ
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.generation_run import GenerationRun
-from midinecromancer.models.note import Note
 from midinecromancer.models.project import Project
 from midinecromancer.models.track import Track
+from midinecromancer.services.generation_pool import run_part
+from midinecromancer.services.note_store import write_clip_notes
+
+
+def _drum_args(project: Project, seed: int, params: dict, drum_map: DrumMap) -> dict:
+    return {
+        "bars": project.bars,
+        "time_signature_num": project.time_signature_num,
+        "time_signature_den": project.time_signature_den,
+        "seed": seed,
+        "drum_map": drum_map,
+        "style": params.get("style", "boom_bap"),
+        "swing": params.get("swing", 0.0),
+        "density": params.get("density", 0.7),
+        "hat_mode": params.get("hat_mode", "straight_16"),
+        "ghost_notes": params.get("ghost_notes", True),
+        "pause_probability": params.get("pause_probability", 0.0),
+        "pause_scope": params.get("pause_scope", "kick"),
+        "variation_intensity": params.get("variation_intensity", 0.3),
+        "engine": params.get("engine", "compat"),
+        "seed_scheme": project.seed_scheme,
+    }
+
+
+def _chord_args(project: Project, seed: int, params: dict) -> dict:
+    return {
+        "tonic": project.key_tonic,
+        "mode": project.mode,
+        "bars": project.bars,
+        "seed": seed,
+        "start_on": params.get("start_on", "I"),
+        "prefer_circle_motion": params.get("prefer_circle_motion", True),
+        "cadence_ending": params.get("cadence_ending", True),
+    }
+
+
+def _bass_args(project: Project, seed: int, params: dict, progression: list[dict]) -> dict:
+    return {
+        "tonic": project.key_tonic,
+        "mode": project.mode,
+        "bars": project.bars,
+        "time_signature_num": project.time_signature_num,
+        "time_signature_den": project.time_signature_den,
+        "chord_progression": progression,
+        "seed": seed,
+        "octave": params.get("octave", 3),
+        "syncopation": params.get("syncopation", 0.3),
+    }
+
+
+def _melody_args(project: Project, seed: int, params: dict) -> dict:
+    return {
+        "tonic": project.key_tonic,
+        "mode": project.mode,
+        "bars": project.bars,
+        "time_signature_num": project.time_signature_num,
+        "time_signature_den": project.time_signature_den,
+        "seed": seed,
+        "octave": params.get("octave", 5),
+        "stepwise_bias": params.get("stepwise_bias", 0.7),
+        "leap_probability": params.get("leap_probability", 0.2),
+    }
+
+
+def _bass_progression(progression: list[dict]) -> list[dict]:
+    """The chord fields the bassline follows, as read back from chord clips."""
+    return [
+        {
+            "roman_numeral": chord["roman_numeral"],
+            "start_bar": chord["start_bar"],
+            "length_bars": chord["length_bars"],
+        }
+        for chord in progression
+    ]
+
+
+def _ms(value: float) -> float:
+    return round(value, 3)
 
 
 class GenerationService:
-    """Service for generating musical content."""
+    """Service for generating musical content.
+
+    Part generators run through services/generation_pool.py (in worker
+    processes if configured); all database writes stay on this session.
+    """
+
+    # Parts in generation (and write) order
+    PARTS = ("drums", "chords", "bass", "melody")
 
     def __init__(self, session: AsyncSession):
         """Initialize service with database session."""
@@ -34,23 +123,76 @@ class GenerationService:
         project_id: UUID,
         seed: int | None = None,
         params: dict | None = None,
+        progress: Callable[..., None] | None = None,
     ) -> GenerationRun:
-        """Generate full arrangement (drums, chords, bass, melody)."""
+        """Generate full arrangement (drums, chords, bass, melody).
+
+        Drums, chords and melody are computed concurrently, bass as soon as the
+        chords are ready; parts are then written in that order and committed
+        together. The events are the same as generating each part on its own.
+
+        progress, if given, is called after each part is written with
+        tracks_done, tracks_total, bars_done and bars_total keywords (bars of
+        the written parts).
+        """
+        total_start = time.perf_counter()
         project = await self.session.get(Project, project_id)
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
         actual_seed = seed if seed is not None else project.seed
         params = params or {}
+        part_params = {kind: params.get(kind, {}) or {} for kind in self.PARTS}
 
         # Create or get tracks
-        tracks = await self._ensure_tracks(project_id)
+        await self._ensure_tracks(project_id)
+        drum_map = await self._drum_map(part_params["drums"])
 
-        # Generate each part
-        await self.generate_drums(project_id, actual_seed, params.get("drums", {}))
-        await self.generate_chords(project_id, actual_seed, params.get("chords", {}))
-        await self.generate_bass(project_id, actual_seed, params.get("bass", {}))
-        await self.generate_melody(project_id, actual_seed, params.get("melody", {}))
+        async def chords_then_bass():
+            chords = await run_part(
+                generate_chord_progression,
+                **_chord_args(project, actual_seed, part_params["chords"]),
+            )
+            bass = await run_part(
+                generate_bassline,
+                **_bass_args(
+                    project, actual_seed, part_params["bass"], _bass_progression(chords[0])
+                ),
+            )
+            return chords, bass
+
+        drums, (chords, bass), melody = await asyncio.gather(
+            run_part(
+                generate_drum_pattern_v2,
+                **_drum_args(project, actual_seed, part_params["drums"], drum_map),
+            ),
+            chords_then_bass(),
+            run_part(generate_melody, **_melody_args(project, actual_seed, part_params["melody"])),
+        )
+
+        # Write each part and record its run
+        timings: dict = {}
+        parts = zip(self.PARTS, (drums, chords, bass, melody), strict=True)
+        for done, (kind, (result, compute_ms)) in enumerate(parts, start=1):
+            write_ms = await self._write_part(project, kind, result, part_params[kind])
+            if progress is not None:
+                progress(
+                    tracks_done=done,
+                    tracks_total=len(self.PARTS),
+                    bars_done=done * project.bars,
+                    bars_total=len(self.PARTS) * project.bars,
+                )
+            timings[kind] = {"compute_ms": _ms(compute_ms), "write_ms": _ms(write_ms)}
+            self.session.add(
+                GenerationRun(
+                    project_id=project_id,
+                    kind=kind,
+                    seed_used=actual_seed,
+                    params=part_params[kind],
+                    timings=timings[kind],
+                )
+            )
+        timings["total_ms"] = _ms((time.perf_counter() - total_start) * 1000)
 
         # Record generation run
         run = GenerationRun(
@@ -58,6 +200,7 @@ class GenerationService:
             kind="full",
             seed_used=actual_seed,
             params=params,
+            timings=timings,
         )
         self.session.add(run)
         await self.session.commit()
@@ -78,88 +221,11 @@ class GenerationService:
         actual_seed = seed if seed is not None else project.seed
         params = params or {}
 
-        # Get or create drums track
-        track = await self._get_or_create_track(project_id, "drums", 9)  # Channel 9 = drums
-
-        # Clear existing clips
-        await self._clear_track_clips(track.id)
-
-        # Get drum map profile if specified
-        drum_map = DrumMap()  # Default GM mapping
-        if params.get("drum_map_profile_id"):
-            from midinecromancer.models.drum_map_profile import DrumMapProfile
-
-            profile = await self.session.get(DrumMapProfile, params["drum_map_profile_id"])
-            if profile:
-                drum_map = DrumMap(
-                    kick_note=profile.kick_note,
-                    snare_note=profile.snare_note,
-                    clap_note=profile.clap_note,
-                    closed_hat_note=profile.closed_hat_note,
-                    open_hat_note=profile.open_hat_note,
-                    rim_note=profile.rim_note,
-                    perc_notes=profile.perc_notes,
-                )
-
-        # Generate pattern using new engine
-        events = generate_drum_pattern_v2(
-            bars=project.bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            seed=actual_seed,
-            drum_map=drum_map,
-            style=params.get("style", "boom_bap"),
-            swing=params.get("swing", 0.0),
-            density=params.get("density", 0.7),
-            hat_mode=params.get("hat_mode", "straight_16"),
-            ghost_notes=params.get("ghost_notes", True),
-            pause_probability=params.get("pause_probability", 0.0),
-            pause_scope=params.get("pause_scope", "kick"),
-            variation_intensity=params.get("variation_intensity", 0.3),
-        )
-
-        # Create clip and notes
-        clip = Clip(
-            track_id=track.id,
-            start_bar=0,
-            length_bars=project.bars,
-            drum_map_profile_id=params.get("drum_map_profile_id"),
-        )
-        # Store drum params in clip.params
-        clip.params = {
-            "style": params.get("style", "boom_bap"),
-            "swing": params.get("swing", 0.0),
-            "density": params.get("density", 0.7),
-            "hat_mode": params.get("hat_mode", "straight_16"),
-            "ghost_notes": params.get("ghost_notes", True),
-            "pause_probability": params.get("pause_probability", 0.0),
-            "variation_intensity": params.get("variation_intensity", 0.3),
-        }
-        self.session.add(clip)
-        await self.session.flush()
-
-        for event in events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event["pitch"],
-                velocity=event["velocity"],
-                start_tick=event["start_tick"],
-                duration_tick=event["duration_tick"],
-                probability=1.0,
-            )
-            self.session.add(note)
-
-        # Record generation run
-        run = GenerationRun(
-            project_id=project_id,
-            kind="drums",
-            seed_used=actual_seed,
-            params=params,
+        drum_map = await self._drum_map(params)
+        events, compute_ms = await run_part(
+            generate_drum_pattern_v2, **_drum_args(project, actual_seed, params, drum_map)
         )
-        self.session.add(run)
-        await self.session.commit()
-        await self.session.refresh(run)
-        return run
+        return await self._record_part(project, "drums", actual_seed, params, events, compute_ms)
 
     async def generate_chords(
         self,
@@ -175,70 +241,12 @@ class GenerationService:
         actual_seed = seed if seed is not None else project.seed
         params = params or {}
 
-        # Get or create chords track
-        track = await self._get_or_create_track(project_id, "chords", 0)
-
-        # Clear existing clips
-        await self._clear_track_clips(track.id)
-
-        # Generate progression
-        progression = generate_chord_progression(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=project.bars,
-            seed=actual_seed,
-            start_on=params.get("start_on", "I"),
-            prefer_circle_motion=params.get("prefer_circle_motion", True),
-            cadence_ending=params.get("cadence_ending", True),
+        progression, compute_ms = await run_part(
+            generate_chord_progression, **_chord_args(project, actual_seed, params)
         )
-
-        # Calculate ticks per bar
-        quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
-        ticks_per_bar = int(quarter_notes_per_bar * PPQ)
-
-        # Create clips and chord events
-        for chord in progression:
-            clip = Clip(
-                track_id=track.id,
-                start_bar=chord["start_bar"],
-                length_bars=chord["length_bars"],
-            )
-            self.session.add(clip)
-            await self.session.flush()
-
-            duration_beats = (
-                chord["length_bars"] * (project.time_signature_num * 4) / project.time_signature_den
-            )
-            chord_event = ChordEvent(
-                clip_id=clip.id,
-                start_tick=0,
-                duration_tick=chord["length_bars"] * ticks_per_bar,
-                duration_beats=duration_beats,
-                roman_numeral=chord["roman_numeral"],
-                chord_name=chord["chord_name"],
-                intensity=0.85,
-                voicing="root",
-                inversion=0,
-                strum_ms=0,
-                humanize_ms=0,
-                velocity_jitter=0,
-                timing_jitter_ms=0,
-                is_enabled=True,
-                is_locked=False,
-            )
-            self.session.add(chord_event)
-
-        # Record generation run
-        run = GenerationRun(
-            project_id=project_id,
-            kind="chords",
-            seed_used=actual_seed,
-            params=params,
+        return await self._record_part(
+            project, "chords", actual_seed, params, progression, compute_ms
         )
-        self.session.add(run)
-        await self.session.commit()
-        await self.session.refresh(run)
-        return run
 
     async def generate_bass(
         self,
@@ -266,7 +274,6 @@ class GenerationService:
         chord_clips = list(result.scalars().all())
 
         progression = []
-        ticks_per_bar = int(((project.time_signature_num * 4) / project.time_signature_den) * 480)
         for clip in chord_clips:
             chord_events = await self.session.execute(
                 select(ChordEvent).where(ChordEvent.clip_id == clip.id)
@@ -280,51 +287,10 @@ class GenerationService:
                     }
                 )
 
-        # Get or create bass track
-        track = await self._get_or_create_track(project_id, "bass", 1)
-
-        # Clear existing clips
-        await self._clear_track_clips(track.id)
-
-        # Generate bassline
-        events = generate_bassline(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=project.bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            chord_progression=progression,
-            seed=actual_seed,
-            octave=params.get("octave", 3),
-            syncopation=params.get("syncopation", 0.3),
+        events, compute_ms = await run_part(
+            generate_bassline, **_bass_args(project, actual_seed, params, progression)
         )
-
-        # Create clip and notes
-        clip = Clip(track_id=track.id, start_bar=0, length_bars=project.bars)
-        self.session.add(clip)
-        await self.session.flush()
-
-        for event in events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event["pitch"],
-                velocity=event["velocity"],
-                start_tick=event["start_tick"],
-                duration_tick=event["duration_tick"],
-            )
-            self.session.add(note)
-
-        # Record generation run
-        run = GenerationRun(
-            project_id=project_id,
-            kind="bass",
-            seed_used=actual_seed,
-            params=params,
-        )
-        self.session.add(run)
-        await self.session.commit()
-        await self.session.refresh(run)
-        return run
+        return await self._record_part(project, "bass", actual_seed, params, events, compute_ms)
 
     async def generate_melody(
         self,
@@ -340,52 +306,167 @@ class GenerationService:
         actual_seed = seed if seed is not None else project.seed
         params = params or {}
 
-        # Get or create melody track
-        track = await self._get_or_create_track(project_id, "melody", 2)
-
-        # Clear existing clips
-        await self._clear_track_clips(track.id)
-
-        # Generate melody
-        events = generate_melody(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=project.bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            seed=actual_seed,
-            octave=params.get("octave", 5),
-            stepwise_bias=params.get("stepwise_bias", 0.7),
-            leap_probability=params.get("leap_probability", 0.2),
+        events, compute_ms = await run_part(
+            generate_melody, **_melody_args(project, actual_seed, params)
         )
+        return await self._record_part(project, "melody", actual_seed, params, events, compute_ms)
 
-        # Create clip and notes
-        clip = Clip(track_id=track.id, start_bar=0, length_bars=project.bars)
-        self.session.add(clip)
-        await self.session.flush()
-
-        for event in events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event["pitch"],
-                velocity=event["velocity"],
-                start_tick=event["start_tick"],
-                duration_tick=event["duration_tick"],
-            )
-            self.session.add(note)
+    async def _record_part(
+        self,
+        project: Project,
+        kind: str,
+        seed: int,
+        params: dict,
+        result: list[dict],
+        compute_ms: float,
+    ) -> GenerationRun:
+        """Write one generated part, record its run and commit."""
+        write_ms = await self._write_part(project, kind, result, params)
 
         # Record generation run
         run = GenerationRun(
-            project_id=project_id,
-            kind="melody",
-            seed_used=actual_seed,
+            project_id=project.id,
+            kind=kind,
+            seed_used=seed,
             params=params,
+            timings={"compute_ms": _ms(compute_ms), "write_ms": _ms(write_ms)},
         )
         self.session.add(run)
         await self.session.commit()
         await self.session.refresh(run)
         return run
 
+    async def _write_part(
+        self, project: Project, kind: str, result: list[dict], params: dict
+    ) -> float:
+        """Replace a part's clips with generated content.
+
+        Returns:
+            Milliseconds spent writing
+        """
+        start = time.perf_counter()
+        if kind == "drums":
+            await self._write_drums(project, result, params)
+        elif kind == "chords":
+            await self._write_chords(project, result)
+        else:
+            await self._write_notes_part(project, kind, result)
+        return (time.perf_counter() - start) * 1000
+
+    async def _drum_map(self, params: dict) -> DrumMap:
+        """Get the drum map for drum params (default GM mapping)."""
+        drum_map = DrumMap()  # Default GM mapping
+        if params.get("drum_map_profile_id"):
+            from midinecromancer.models.drum_map_profile import DrumMapProfile
+
+            profile = await self.session.get(DrumMapProfile, params["drum_map_profile_id"])
+            if profile:
+                drum_map = DrumMap(
+                    kick_note=profile.kick_note,
+                    snare_note=profile.snare_note,
+                    clap_note=profile.clap_note,
+                    closed_hat_note=profile.closed_hat_note,
+                    open_hat_note=profile.open_hat_note,
+                    rim_note=profile.rim_note,
+                    perc_notes=profile.perc_notes,
+                )
+        return drum_map
+
+    async def _write_drums(self, project: Project, events: list[dict], params: dict) -> None:
+        # Get or create drums track
+        track = await self._get_or_create_track(project.id, "drums", 9)  # Channel 9 = drums
+
+        # Clear existing clips
+        await self._clear_track_clips(track.id)
+
+        # Create clip and notes
+        clip = Clip(
+            track_id=track.id,
+            start_bar=0,
+            length_bars=project.bars,
+            drum_map_profile_id=params.get("drum_map_profile_id"),
+        )
+        # Store drum params in clip.params
+        clip.params = {
+            "style": params.get("style", "boom_bap"),
+            "swing": params.get("swing", 0.0),
+            "density": params.get("density", 0.7),
+            "hat_mode": params.get("hat_mode", "straight_16"),
+            "ghost_notes": params.get("ghost_notes", True),
+            "pause_probability": params.get("pause_probability", 0.0),
+            "variation_intensity": params.get("variation_intensity", 0.3),
+            "engine": params.get("engine", "compat"),
+        }
+        self.session.add(clip)
+        await self.session.flush()
+
+        await write_clip_notes(self.session, clip, events)
+
+    async def _write_chords(self, project: Project, progression: list[dict]) -> None:
+        # Get or create chords track
+        track = await self._get_or_create_track(project.id, "chords", 0)
+
+        # Clear existing clips
+        await self._clear_track_clips(track.id)
+
+        # Calculate ticks per bar
+        quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
+        ticks_per_bar = int(quarter_notes_per_bar * PPQ)
+
+        # Create clips and chord events
+        clips = [
+            Clip(
+                track_id=track.id,
+                start_bar=chord["start_bar"],
+                length_bars=chord["length_bars"],
+            )
+            for chord in progression
+        ]
+        self.session.add_all(clips)
+        await self.session.flush()
+
+        await bulk_insert_chord_events(
+            self.session,
+            [
+                {
+                    "clip_id": clip.id,
+                    "start_tick": 0,
+                    "duration_tick": chord["length_bars"] * ticks_per_bar,
+                    "duration_beats": (
+                        chord["length_bars"]
+                        * (project.time_signature_num * 4)
+                        / project.time_signature_den
+                    ),
+                    "roman_numeral": chord["roman_numeral"],
+                    "chord_name": chord["chord_name"],
+                    "intensity": 0.85,
+                    "voicing": "root",
+                    "inversion": 0,
+                    "strum_ms": 0,
+                    "humanize_ms": 0,
+                    "velocity_jitter": 0,
+                    "timing_jitter_ms": 0,
+                    "is_enabled": True,
+                    "is_locked": False,
+                }
+                for clip, chord in zip(clips, progression, strict=True)
+            ],
+        )
+
+    async def _write_notes_part(self, project: Project, role: str, events: list[dict]) -> None:
+        # Get or create the bass/melody track
+        track = await self._get_or_create_track(project.id, role, {"bass": 1, "melody": 2}[role])
+
+        # Clear existing clips
+        await self._clear_track_clips(track.id)
+
+        # Create clip and notes
+        clip = Clip(track_id=track.id, start_bar=0, length_bars=project.bars)
+        self.session.add(clip)
+        await self.session.flush()
+
+        await write_clip_notes(self.session, clip, events)
+
     async def _ensure_tracks(self, project_id: UUID) -> list[Track]:
         """Ensure all required tracks exist."""
         roles = ["drums", "chords", "bass", "melody"]
@@ -429,8 +510,7 @@ class GenerationService:
 
     async def _clear_track_clips(self, track_id: UUID) -> None:
         """Clear all clips and notes for a track."""
-        result = await self.session.execute(select(Clip).where(Clip.track_id == track_id))
-        clips = list(result.scalars().all())
-        for clip in clips:
-            await self.session.delete(clip)
-        await self.session.flush()
+        # Notes, chord events, lanes and note blocks go with the clips via
+        # ON DELETE CASCADE, so nothing needs to be loaded
+        await self.session.execute(delete(Clip).where(Clip.track_id == track_id))
+        mark_tracks_changed(self.session, [track_id])
@@ -0,0 +1,126 @@
+"""Process pool for the CPU-bound part generators.
+
+The generators in music/ are pure functions of their arguments (every random
+draw comes from the seed they are given), so running them in worker processes
+gives exactly the events an in-process call would. Only the computation goes
+to the pool: callers keep database writes on their own session, in the same
+order as before.
+
+ZIP export also encodes its per-part MIDI files in the pool (run_pooled()).
+
+With settings.generation_workers = 0 (the default) parts run inline in the
+request process, one after another.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from midinecromancer.config import settings
+from midinecromancer.metrics import record_generator
+from midinecromancer.music import generate_bassline, generate_chord_progression
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def generation_executor() -> ProcessPoolExecutor | None:
+    """Get the shared pool, creating it on first use.
+
+    Workers are spawned rather than forked, so they never inherit the event
+    loop or open database connections of the server process.
+
+    Returns:
+        The pool, or None if settings.generation_workers is 0
+    """
+    global _executor
+    if settings.generation_workers <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.generation_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _ready(_: int) -> bool:
+    return True
+
+
+async def start_generation_executor() -> None:
+    """Spawn the pool's workers before the first request needs them.
+
+    Each spawned worker imports the generators once; doing that at startup keeps
+    it out of the first generation request. No-op without a pool.
+    """
+    executor = generation_executor()
+    if executor is not None:
+        workers = range(settings.generation_workers)
+        await asyncio.to_thread(lambda: list(executor.map(_ready, workers)))
+
+
+def shutdown_generation_executor() -> None:
+    """Stop the pool's worker processes (if started)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def timed_call(func: Callable[..., Any], kwargs: dict[str, Any]) -> tuple[Any, float]:
+    """Call func(**kwargs) and measure it.
+
+    Returns:
+        (result, elapsed milliseconds)
+    """
+    start = time.perf_counter()
+    result = func(**kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def run_part(func: Callable[..., Any], /, **kwargs: Any) -> tuple[Any, float]:
+    """Run one part generator, in the pool if there is one.
+
+    func and kwargs must be picklable (module-level functions, plain data).
+
+    Returns:
+        (result, compute milliseconds measured where it ran, also added to the
+        request metrics)
+    """
+    executor = generation_executor()
+    if executor is None:
+        result, compute_ms = timed_call(func, kwargs)
+    else:
+        loop = asyncio.get_running_loop()
+        result, compute_ms = await loop.run_in_executor(executor, timed_call, func, kwargs)
+    record_generator(compute_ms)
+    return result, compute_ms
+
+
+async def run_pooled(func: Callable[..., Any], /, *args: Any) -> Any:
+    """Run func(*args) in the pool if there is one, inline otherwise.
+
+    For CPU-bound work other than part generation (not counted as generator
+    time); func and args must be picklable.
+    """
+    executor = generation_executor()
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def bassline_over_progression(progression: dict[str, Any], bassline: dict[str, Any]) -> list[dict]:
+    """Generate a chord progression, then a bassline following it.
+
+    Args:
+        progression: generate_chord_progression() arguments
+        bassline: generate_bassline() arguments except chord_progression
+
+    Returns:
+        Bass events
+    """
+    chord_progression = generate_chord_progression(**progression)
+    return generate_bassline(chord_progression=chord_progression, **bassline)
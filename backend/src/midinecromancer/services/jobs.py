@@ -0,0 +1,293 @@
+"""Background jobs for heavy operations.
+
+Full generation, ZIP exports and suggestion runs can take seconds on long
+projects. Submitted as jobs, they run in this process's event loop after the
+request has returned: POST returns the job, GET /jobs/{id} reports its
+progress, and the result is downloaded once it has succeeded.
+
+At most settings.job_workers jobs run at once per process (the rest wait
+queued), each on its own session, so heavy work holds a bounded number of
+pool connections and cheap UI requests keep the rest. CPU-bound generation
+still goes through services/generation_pool.py (worker processes if
+configured) and ZIP encoding runs in a thread, keeping the event loop free.
+
+A job's dedupe_key hashes its kind, params and the project revision at
+submission: an identical request while such a job is queued or running gets
+that job instead of a new one.
+
+Progress is a dict of counts (tracks_done, tracks_total, bars_done,
+bars_total) reported by the handler; it is live in the process running the
+job and written to the jobs table every PROGRESS_INTERVAL seconds.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from contextvars import Context
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from midinecromancer.config import settings
+from midinecromancer.db.base import AsyncSessionLocal
+from midinecromancer.models.job import Job
+from midinecromancer.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = ("queued", "running")
+
+# Seconds between progress writes of a running job
+PROGRESS_INTERVAL = 1.0
+
+
+@dataclass
+class JobResult:
+    """What a job handler produced."""
+
+    # JSON description of the result (ids of created runs, sizes, ...)
+    result: dict[str, Any]
+    # Downloadable file, if any
+    data: bytes | None = None
+    media_type: str | None = None
+    filename: str | None = None
+
+
+class JobContext:
+    """A running job as seen by its handler."""
+
+    def __init__(self, job_id: UUID, project_id: UUID, params: dict[str, Any]):
+        self.job_id = job_id
+        self.project_id = project_id
+        self.params = params
+        self.progress: dict[str, int] = {}
+
+    def report(self, **counts: int) -> None:
+        """Update progress counts (safe to call from a worker thread)."""
+        self.progress = {**self.progress, **counts}
+
+
+JobHandler = Callable[[AsyncSession, JobContext], Awaitable[JobResult]]
+
+JOB_KINDS: dict[str, JobHandler] = {}
+
+
+def job_kind(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a handler for a job kind."""
+
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_KINDS[kind] = handler
+        return handler
+
+    return register
+
+
+def dedupe_key(kind: str, project_id: UUID, revision: int, params: dict[str, Any]) -> str:
+    """Key shared by identical requests against the same project revision."""
+    payload = json.dumps(
+        [kind, str(project_id), revision, params], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class JobRunner:
+    """Runs submitted jobs as asyncio tasks, at most `workers` at a time."""
+
+    def __init__(
+        self,
+        workers: int,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ):
+        self.workers = max(workers, 1)
+        self.session_factory = session_factory
+        self._slots = asyncio.Semaphore(self.workers)
+        self._submit_lock = asyncio.Lock()
+        self._tasks: dict[UUID, asyncio.Task] = {}
+        self._contexts: dict[UUID, JobContext] = {}
+
+    async def submit(
+        self, session: AsyncSession, project: Project, kind: str, params: dict[str, Any]
+    ) -> tuple[Job, bool]:
+        """Queue a job, or join an identical one that is still in flight.
+
+        Args:
+            session: Database session (committed)
+            project: Project the job works on
+            kind: Registered job kind
+            params: Validated, JSON-compatible job parameters
+
+        Returns:
+            (job, True if it was created by this call)
+
+        Raises:
+            ValueError: If the kind is unknown
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        key = dedupe_key(kind, project.id, project.revision, params)
+        async with self._submit_lock:
+            stale_before = datetime.utcnow() - timedelta(seconds=settings.job_stale_seconds)
+            result = await session.execute(
+                select(Job)
+                .where(
+                    Job.dedupe_key == key,
+                    Job.status.in_(IN_FLIGHT),
+                    Job.created_at >= stale_before,
+                )
+                .order_by(Job.created_at.desc())
+                .limit(1)
+            )
+            job = result.scalar_one_or_none()
+            if job is not None:
+                return job, False
+            job = Job(
+                project_id=project.id,
+                kind=kind,
+                status="queued",
+                params=params,
+                project_revision=project.revision,
+                dedupe_key=key,
+                progress={},
+            )
+            session.add(job)
+            await session.commit()
+        context = JobContext(job.id, project.id, params)
+        self._contexts[job.id] = context
+        # A fresh context keeps the job's queries out of the submitting request's metrics
+        task = asyncio.create_task(self._run(job.id, kind, context), context=Context())
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._forget(job.id))
+        return job, True
+
+    def progress(self, job_id: UUID) -> dict[str, int] | None:
+        """Live progress of a job running in this process, else None."""
+        context = self._contexts.get(job_id)
+        return dict(context.progress) if context is not None else None
+
+    async def shutdown(self) -> None:
+        """Cancel running and queued jobs (they are marked failed)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget(self, job_id: UUID) -> None:
+        self._tasks.pop(job_id, None)
+        self._contexts.pop(job_id, None)
+
+    async def _run(self, job_id: UUID, kind: str, context: JobContext) -> None:
+        try:
+            async with self._slots:
+                await self._update(job_id, status="running", started_at=datetime.utcnow())
+                writer = asyncio.create_task(self._write_progress(job_id, context))
+                try:
+                    async with self.session_factory() as session:
+                        outcome = await JOB_KINDS[kind](session, context)
+                finally:
+                    writer.cancel()
+        except asyncio.CancelledError:
+            await self._update(
+                job_id,
+                status="failed",
+                error="Interrupted",
+                progress=context.progress,
+                finished_at=datetime.utcnow(),
+            )
+            raise
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, kind)
+            await self._update(
+                job_id,
+                status="failed",
+                error=str(e) or type(e).__name__,
+                progress=context.progress,
+                finished_at=datetime.utcnow(),
+            )
+        else:
+            await self._update(
+                job_id,
+                status="succeeded",
+                progress=context.progress,
+                result=outcome.result,
+                result_data=outcome.data,
+                result_media_type=outcome.media_type,
+                result_filename=outcome.filename,
+                finished_at=datetime.utcnow(),
+            )
+
+    async def _write_progress(self, job_id: UUID, context: JobContext) -> None:
+        written = None
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            progress = context.progress
+            if progress != written:
+                await self._update(job_id, progress=progress)
+                written = progress
+
+    async def _update(self, job_id: UUID, **values: Any) -> None:
+        async with self.session_factory() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(**values))
+            await session.commit()
+
+
+job_runner = JobRunner(settings.job_workers)
+
+
+@job_kind("generate_full")
+async def run_generate_full(session: AsyncSession, context: JobContext) -> JobResult:
+    """GenerationService.generate_full(); params: seed, params."""
+    from midinecromancer.services.generation import GenerationService
+
+    run = await GenerationService(session).generate_full(
+        context.project_id,
+        context.params.get("seed"),
+        context.params.get("params"),
+        progress=context.report,
+    )
+    return JobResult({"generation_run_id": str(run.id), "timings": run.timings})
+
+
+@job_kind("export_zip")
+async def run_export_zip(session: AsyncSession, context: JobContext) -> JobResult:
+    """ZIP of per-part MIDI files; params: split_by."""
+    from midinecromancer.midi.export_zip import export_project_to_zip, generate_zip_filename
+    from midinecromancer.services.export import load_export_tracks
+
+    project = await session.get(Project, context.project_id)
+    if not project:
+        raise ValueError(f"Project {context.project_id} not found")
+    tracks = await load_export_tracks(session, project)
+    data = await asyncio.to_thread(
+        export_project_to_zip,
+        project,
+        tracks,
+        context.params.get("split_by", "track"),
+        context.report,
+    )
+    return JobResult(
+        {"project_revision": project.revision, "size": len(data)},
+        data=data,
+        media_type="application/zip",
+        filename=generate_zip_filename(project.name),
+    )
+
+
+@job_kind("suggestions")
+async def run_suggestions(session: AsyncSession, context: JobContext) -> JobResult:
+    """SuggestionService.create_run_and_suggestions(); params: seed, params, kinds, limit."""
+    from midinecromancer.services.suggestions import SuggestionService
+
+    run = await SuggestionService(session).create_run_and_suggestions(
+        project_id=context.project_id,
+        seed=context.params.get("seed"),
+        params=context.params.get("params"),
+        kinds=context.params.get("kinds"),
+        limit=context.params.get("limit"),
+    )
+    return JobResult({"suggestion_run_id": str(run.id)})
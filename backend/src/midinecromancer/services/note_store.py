@@ -0,0 +1,323 @@
+"""Clip note storage: row form (Note) and packed form (ClipNoteBlock).
+
+A packed block stores a clip's notes as five contiguous little-endian arrays in
+one blob, in this order:
+
+    pitch          uint8   x count
+    velocity       uint8   x count
+    start_tick     int32   x count
+    duration_tick  int32   x count
+    probability    float64 x count
+
+Readers should go through get_clip_notes() / iter_clip_note_tuples(), which
+accept either storage form and hand back objects with the same attributes as
+Note rows.
+"""
+
+import sys
+import uuid
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from midinecromancer.config import settings
+from midinecromancer.db.bulk import bulk_insert_notes, note_rows
+from midinecromancer.db.revisions import mark_clips_changed
+from midinecromancer.models.clip_note_block import ClipNoteBlock
+from midinecromancer.models.note import Note
+
+if TYPE_CHECKING:
+    from midinecromancer.models.clip import Clip
+
+PACKED_FORMAT_VERSION = 1
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class PackedNoteRow:
+    """Read-only row view of one packed note, attribute-compatible with Note.
+
+    The id is derived from the clip id and the note's index so it is stable
+    across reads of the same block.
+    """
+
+    __slots__ = (
+        "id",
+        "clip_id",
+        "pitch",
+        "velocity",
+        "start_tick",
+        "duration_tick",
+        "probability",
+    )
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        clip_id: uuid.UUID,
+        pitch: int,
+        velocity: int,
+        start_tick: int,
+        duration_tick: int,
+        probability: float,
+    ):
+        self.id = id
+        self.clip_id = clip_id
+        self.pitch = pitch
+        self.velocity = velocity
+        self.start_tick = start_tick
+        self.duration_tick = duration_tick
+        self.probability = probability
+
+
+class PackedNotes:
+    """Columnar note arrays for a single clip."""
+
+    __slots__ = ("pitch", "velocity", "start_tick", "duration_tick", "probability")
+
+    def __init__(
+        self,
+        pitch: array | None = None,
+        velocity: array | None = None,
+        start_tick: array | None = None,
+        duration_tick: array | None = None,
+        probability: array | None = None,
+    ):
+        self.pitch = pitch if pitch is not None else array("B")
+        self.velocity = velocity if velocity is not None else array("B")
+        self.start_tick = start_tick if start_tick is not None else array("i")
+        self.duration_tick = duration_tick if duration_tick is not None else array("i")
+        self.probability = probability if probability is not None else array("d")
+
+    def __len__(self) -> int:
+        return len(self.pitch)
+
+    @classmethod
+    def from_events(cls, events: Iterable[Any], tick_offset: int = 0) -> "PackedNotes":
+        """Pack note dicts or Note-like objects.
+
+        Args:
+            events: Dicts with pitch/velocity/start_tick/duration_tick (and
+                optional probability) keys, or objects with those attributes
+            tick_offset: Added to every start_tick (e.g. to make ticks clip-relative)
+
+        Returns:
+            PackedNotes in input order
+
+        Raises:
+            ValueError: If pitch or velocity is outside 0..127
+        """
+        packed = cls()
+        for event in events:
+            if isinstance(event, dict):
+                pitch = event["pitch"]
+                velocity = event["velocity"]
+                start_tick = event["start_tick"]
+                duration_tick = event["duration_tick"]
+                probability = event.get("probability", 1.0)
+            else:
+                pitch = event.pitch
+                velocity = event.velocity
+                start_tick = event.start_tick
+                duration_tick = event.duration_tick
+                probability = event.probability
+            if not (0 <= pitch <= 127 and 0 <= velocity <= 127):
+                raise ValueError(f"Note out of range: pitch={pitch}, velocity={velocity}")
+            packed.pitch.append(pitch)
+            packed.velocity.append(velocity)
+            packed.start_tick.append(start_tick + tick_offset)
+            packed.duration_tick.append(duration_tick)
+            packed.probability.append(1.0 if probability is None else probability)
+        return packed
+
+    @classmethod
+    def from_bytes(cls, data: bytes, count: int) -> "PackedNotes":
+        """Decode a block blob.
+
+        Args:
+            data: Blob from ClipNoteBlock.data
+            count: ClipNoteBlock.note_count
+
+        Returns:
+            PackedNotes
+
+        Raises:
+            ValueError: If the blob size does not match the count
+        """
+        columns = []
+        offset = 0
+        for typecode in ("B", "B", "i", "i", "d"):
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(data[offset : offset + size])
+            if len(column) != count:
+                raise ValueError("Packed note block is truncated")
+            if _BIG_ENDIAN:
+                column.byteswap()
+            columns.append(column)
+            offset += size
+        if offset != len(data):
+            raise ValueError("Packed note block has trailing data")
+        return cls(*columns)
+
+    def to_bytes(self) -> bytes:
+        """Encode as a block blob."""
+        columns = (self.pitch, self.velocity, self.start_tick, self.duration_tick, self.probability)
+        if _BIG_ENDIAN:
+            swapped = []
+            for column in columns:
+                column = array(column.typecode, column)
+                column.byteswap()
+                swapped.append(column)
+            columns = tuple(swapped)
+        return b"".join(column.tobytes() for column in columns)
+
+    def rows(self, clip_id: uuid.UUID) -> list[PackedNoteRow]:
+        """Expand to Note-compatible row views.
+
+        Args:
+            clip_id: Owning clip id (also the namespace for the derived note ids)
+
+        Returns:
+            One PackedNoteRow per note, in storage order
+        """
+        return [
+            PackedNoteRow(
+                uuid.uuid5(clip_id, str(index)),
+                clip_id,
+                pitch,
+                velocity,
+                start_tick,
+                duration_tick,
+                probability,
+            )
+            for index, (pitch, velocity, start_tick, duration_tick, probability) in enumerate(
+                zip(
+                    self.pitch,
+                    self.velocity,
+                    self.start_tick,
+                    self.duration_tick,
+                    self.probability,
+                    strict=True,
+                )
+            )
+        ]
+
+
+def unpack_block(block: ClipNoteBlock) -> PackedNotes:
+    """Decode a ClipNoteBlock.
+
+    Raises:
+        ValueError: If the block uses an unknown format version
+    """
+    if block.format_version != PACKED_FORMAT_VERSION:
+        raise ValueError(f"Unsupported packed note format: {block.format_version}")
+    return PackedNotes.from_bytes(block.data, block.note_count)
+
+
+def get_clip_notes(clip: "Clip") -> list:
+    """Get a clip's notes regardless of storage form.
+
+    Args:
+        clip: Clip with notes (and, for ORM clips, note_block) loaded
+
+    Returns:
+        Note rows, or PackedNoteRow views when the clip has a packed block
+    """
+    block = getattr(clip, "note_block", None)
+    if block is not None:
+        # Lane notes rendered for export are appended to clip.notes
+        return unpack_block(block).rows(clip.id) + list(clip.notes)
+    return clip.notes
+
+
+def iter_clip_note_tuples(clip: "Clip") -> Iterator[tuple[int, int, int, int]]:
+    """Iterate (start_tick, duration_tick, pitch, velocity) without building rows.
+
+    Args:
+        clip: Clip with notes (and, for ORM clips, note_block) loaded
+
+    Yields:
+        One tuple per note, clip-relative ticks
+    """
+    block = getattr(clip, "note_block", None)
+    if block is not None:
+        packed = unpack_block(block)
+        yield from zip(
+            packed.start_tick, packed.duration_tick, packed.pitch, packed.velocity, strict=True
+        )
+        # Lane notes rendered for export are appended to clip.notes
+        for note in clip.notes:
+            yield note.start_tick, note.duration_tick, note.pitch, note.velocity
+        return
+    for note in clip.notes:
+        yield note.start_tick, note.duration_tick, note.pitch, note.velocity
+
+
+def count_clip_notes(clip: "Clip") -> int:
+    """Count a clip's notes without unpacking a block."""
+    block = getattr(clip, "note_block", None)
+    if block is not None:
+        return block.note_count
+    return len(clip.notes)
+
+
+def use_packed_storage() -> bool:
+    """Whether new clip notes should be written as a packed block."""
+    return settings.note_storage == "packed"
+
+
+async def write_clip_notes(
+    session: AsyncSession,
+    clip: "Clip",
+    events: Iterable[Any],
+    tick_offset: int = 0,
+    packed: bool | None = None,
+) -> int:
+    """Store notes for a clip in row or packed form.
+
+    The clip must already be flushed (it needs an id). Rows are bulk inserted
+    (see db/bulk.py). Existing notes are not cleared; use clear_clip_notes()
+    first when replacing.
+
+    Args:
+        session: Database session
+        clip: Target clip
+        events: Note dicts or Note-like objects
+        tick_offset: Added to every start_tick
+        packed: Force a storage form; defaults to settings.note_storage
+
+    Returns:
+        Number of notes written
+    """
+    if packed is None:
+        packed = use_packed_storage()
+
+    if packed:
+        notes = PackedNotes.from_events(events, tick_offset)
+        clip.note_block = ClipNoteBlock(
+            clip_id=clip.id,
+            format_version=PACKED_FORMAT_VERSION,
+            note_count=len(notes),
+            data=notes.to_bytes(),
+        )
+        return len(notes)
+
+    return await bulk_insert_notes(session, note_rows(clip.id, events, tick_offset))
+
+
+async def clear_clip_notes(session: AsyncSession, clip: "Clip") -> None:
+    """Delete a clip's notes in both storage forms.
+
+    Args:
+        session: Database session
+        clip: Clip whose notes to delete
+    """
+    await session.execute(delete(Note).where(Note.clip_id == clip.id))
+    mark_clips_changed(session, [clip.id])
+    # Orphaning the block deletes it on flush (a replacement block written in
+    # the same flush becomes an UPDATE of the same row)
+    clip.note_block = None
@@ -0,0 +1,213 @@
+"""Compact note payloads and Accept-header negotiation.
+
+JSON responses carry every note as an object with the same key names. Clients
+that ask for one of the compact media types get the same document with each
+note list replaced by parallel arrays (one per field):
+
+    {"pitch": [36, 42], "velocity": [110, 80], "start_tick": [0, 240], ...}
+
+The column document is encoded as JSON (always available) or msgpack (when
+the optional msgpack package is installed). Notes go straight from ORM rows or
+event dicts into the columns without building a Pydantic model per note.
+"""
+
+import json
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from midinecromancer.metrics import serializing
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+JSON = "application/json"
+COLUMNS_JSON = "application/vnd.midinecromancer.columns+json"
+MSGPACK = "application/x-msgpack"
+
+NOTE_FIELDS = ("id", "pitch", "velocity", "start_tick", "duration_tick", "probability")
+
+
+def msgpack_available() -> bool:
+    """Whether msgpack responses can be produced."""
+    return msgpack is not None
+
+
+def supported_media_types() -> tuple[str, ...]:
+    """Media types that can be negotiated, in order of server preference."""
+    if msgpack_available():
+        return (MSGPACK, COLUMNS_JSON, JSON)
+    return (COLUMNS_JSON, JSON)
+
+
+def negotiate(accept: str | None) -> str:
+    """Pick the response media type for an Accept header.
+
+    Wildcards and unknown or unavailable types fall back to JSON, so existing
+    clients are unaffected. Among explicitly listed types the highest q-value
+    wins; ties go to the first one listed.
+
+    Args:
+        accept: Accept header value (may be None)
+
+    Returns:
+        One of JSON, COLUMNS_JSON or MSGPACK
+    """
+    if not accept:
+        return JSON
+    supported = supported_media_types()
+    best, best_q = JSON, 0.0
+    for part in accept.split(","):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        media_type = media_type.lower()
+        if media_type not in supported:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def note_columns(notes: Iterable[Any]) -> dict[str, list]:
+    """Turn Note-like objects into parallel arrays.
+
+    Args:
+        notes: Note rows (or PackedNoteRow views), already in output order
+
+    Returns:
+        One list per NOTE_FIELDS entry; ids are strings
+    """
+    ids, pitch, velocity, start_tick, duration_tick, probability = [], [], [], [], [], []
+    for note in notes:
+        ids.append(str(note.id))
+        pitch.append(note.pitch)
+        velocity.append(note.velocity)
+        start_tick.append(note.start_tick)
+        duration_tick.append(note.duration_tick)
+        probability.append(note.probability)
+    return {
+        "id": ids,
+        "pitch": pitch,
+        "velocity": velocity,
+        "start_tick": start_tick,
+        "duration_tick": duration_tick,
+        "probability": probability,
+    }
+
+
+def event_columns(events: Iterable[Mapping[str, Any]]) -> dict[str, list]:
+    """Turn event dicts into parallel arrays.
+
+    Columns are the union of the events' keys in first-seen order; events
+    missing a key get None in that column.
+
+    Args:
+        events: Event dicts (pitch, velocity, start_tick, ...)
+
+    Returns:
+        Column name -> values, all of equal length
+    """
+    columns: dict[str, list] = {}
+    for count, event in enumerate(events, start=1):
+        for key, value in event.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * (count - 1)
+            column.append(value)
+        for column in columns.values():
+            if len(column) < count:
+                column.append(None)
+    return columns
+
+
+def columns_to_events(columns: Mapping[str, list]) -> list[dict]:
+    """Inverse of event_columns (None values are dropped)."""
+    names = list(columns)
+    rows = zip(*(columns[name] for name in names), strict=True)
+    return [
+        {name: value for name, value in zip(names, row, strict=True) if value is not None}
+        for row in rows
+    ]
+
+
+def with_event_columns(document: Mapping[str, Any], keys: Iterable[str]) -> dict:
+    """Make a response dict JSON-compatible with its event lists as columns.
+
+    Args:
+        document: Response dict (e.g. a regenerate result)
+        keys: Keys holding lists of event dicts
+
+    Returns:
+        New dict; event lists go through event_columns(), everything else
+        through jsonable_encoder()
+    """
+    keys = set(keys)
+    encoded = jsonable_encoder({key: value for key, value in document.items() if key not in keys})
+    for key in keys & document.keys():
+        encoded[key] = event_columns(document[key])
+    return encoded
+
+
+class EventListPool:
+    """Collects event lists, storing identical lists once.
+
+    Variants generated from different seeds often come out the same (e.g. a
+    pattern that ignores the variation amount); callers reference lists by
+    index instead of repeating them.
+    """
+
+    def __init__(self):
+        self.lists: list[list[dict]] = []
+        self._index: dict[str, int] = {}
+
+    def add(self, events: list[dict]) -> int:
+        """Add an event list.
+
+        Returns:
+            Index of the list (or of an identical one added before) in self.lists
+        """
+        key = json.dumps(events, sort_keys=True, separators=(",", ":"), default=str)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.lists)
+            self.lists.append(events)
+        return index
+
+
+def encode(document: Any, media_type: str) -> bytes:
+    """Encode a JSON-compatible document for a negotiated media type.
+
+    Raises:
+        ValueError: If media_type is not supported here
+    """
+    if media_type == MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        with serializing():
+            return msgpack.packb(document, use_bin_type=True)
+    if media_type in (JSON, COLUMNS_JSON):
+        with serializing():
+            return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode()
+    raise ValueError(f"Unsupported media type: {media_type}")
+
+
+def payload_response(
+    document: Any, media_type: str, headers: Mapping[str, str] | None = None
+) -> Response:
+    """Build a response for an encoded document (varies on Accept)."""
+    response = Response(content=encode(document, media_type), media_type=media_type)
+    if headers:
+        response.headers.update(headers)
+    response.headers["Vary"] = "Accept"
+    return response
@@ -1,147 +1,345 @@
 """Service for polyrhythm lane operations."""
 
+import uuid
+from collections.abc import Iterable
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from midinecromancer.config import settings
+from midinecromancer.db.base import AsyncSessionLocal
 from midinecromancer.music.polyrhythm import (
     CycleSpec,
     LaneSpec,
+    RenderedEvents,
+    freeze_events,
+    lane_render_cache,
+    lane_render_key,
     render_lanes_to_events,
+    thaw_events,
 )
+from midinecromancer.music.theory import PPQ
 from midinecromancer.models.clip import Clip
 from midinecromancer.models.clip_polyrhythm_lane import ClipPolyrhythmLane
-from midinecromancer.models.note import Note
 from midinecromancer.models.polyrhythm_profile import PolyrhythmProfile
+from midinecromancer.models.polyrhythm_render import PolyrhythmRender
 from midinecromancer.models.project import Project
+from midinecromancer.services.note_store import PackedNotes
+from midinecromancer.services.snapshot import LaneSnapshot, NoteSnapshot, ProfileSnapshot
 
+lane_render_cache.maxsize = settings.polyrhythm_render_cache_size
 
-async def render_clip_lanes_to_notes(
+# Counters for the persistent tier (the in-process tier counts its own)
+persistent_render_stats = {"hits": 0, "misses": 0, "writes": 0}
+
+
+def legacy_lane_id(clip_id: UUID) -> UUID:
+    """Stable id of the virtual lane rendered for a legacy single-profile clip."""
+    return uuid.uuid5(clip_id, "legacy-lane")
+
+
+def lane_spec_from_lane(lane: ClipPolyrhythmLane, clip_id: UUID) -> LaneSpec:
+    """Build a LaneSpec from a lane with its profile loaded."""
+    profile = lane.polyrhythm_profile
+    cycle = CycleSpec(
+        steps=profile.steps,
+        pulses=profile.pulses,
+        cycle_beats=float(profile.cycle_beats),
+        rotation=profile.rotation,
+        swing=float(profile.swing) if profile.swing is not None else None,
+    )
+    return LaneSpec(
+        cycle=cycle,
+        lane_id=lane.id,
+        clip_id=clip_id,
+        pitch=lane.pitch,
+        velocity=lane.velocity,
+        mute=lane.mute,
+        solo=lane.solo,
+        order_index=lane.order_index,
+        seed_offset=lane.seed_offset,
+        humanize_ms=profile.humanize_ms,
+    )
+
+
+async def render_clip_lane_events(
     clip: Clip,
     project: Project,
     session: AsyncSession,
-) -> list[Note]:
-    """Render polyrhythm lanes for a clip to Note objects.
+    lane_specs: list[LaneSpec],
+) -> list[dict]:
+    """Render lane specs for a clip through the render cache.
 
-    This is used for MIDI export and ensures lanes are converted to notes
-    that can be stored/exported.
+    Lookup order is the in-process LRU, then (if enabled) the polyrhythm_renders
+    table, then a fresh render. Persisted renders are written in their own
+    transaction so the caller's session is left untouched.
+
+    Args:
+        clip: Clip the lanes belong to
+        project: Project for timing/BPM/seed
+        session: Database session (used for persistent cache reads)
+        lane_specs: Lanes to render
+
+    Returns:
+        Events with absolute tick positions, as render_lanes_to_events() returns
+    """
+    quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
+    clip_start_tick = clip.start_bar * int(quarter_notes_per_bar * PPQ)
+
+    key = lane_render_key(
+        lane_specs,
+        clip.length_bars,
+        project.bpm,
+        project.time_signature_num,
+        project.time_signature_den,
+        project.seed,
+    )
+    entry = lane_render_cache.get(key)
+    if entry is not None:
+        return thaw_events(entry, clip_start_tick)
+
+    if settings.polyrhythm_render_cache_persist:
+        row = await session.get(PolyrhythmRender, key)
+        if row is not None:
+            persistent_render_stats["hits"] += 1
+            notes = PackedNotes.from_bytes(row.data, row.note_count)
+            entry = tuple(
+                zip(notes.pitch, notes.velocity, notes.start_tick, notes.duration_tick, strict=True)
+            )
+            lane_render_cache.put(key, entry, clip_id=clip.id)
+            return thaw_events(entry, clip_start_tick)
+        persistent_render_stats["misses"] += 1
+
+    events = render_lanes_to_events(
+        lanes=lane_specs,
+        clip_start_bar=0,
+        clip_length_bars=clip.length_bars,
+        project_bpm=project.bpm,
+        time_signature_num=project.time_signature_num,
+        time_signature_den=project.time_signature_den,
+        base_seed=project.seed,
+    )
+    entry = freeze_events(events)
+    lane_render_cache.put(key, entry, clip_id=clip.id)
+    if settings.polyrhythm_render_cache_persist:
+        await _persist_render(key, clip.id, entry)
+    return thaw_events(entry, clip_start_tick)
+
+
+async def _persist_render(key: str, clip_id: UUID, entry: RenderedEvents) -> None:
+    notes = PackedNotes.from_events(
+        {"pitch": p, "velocity": v, "start_tick": s, "duration_tick": d} for p, v, s, d in entry
+    )
+    async with AsyncSessionLocal() as cache_session:
+        try:
+            await cache_session.execute(
+                insert(PolyrhythmRender)
+                .values(key=key, clip_id=clip_id, note_count=len(notes), data=notes.to_bytes())
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+            await cache_session.commit()
+        except IntegrityError:
+            # Clip deleted concurrently; nothing worth caching
+            await cache_session.rollback()
+            return
+    persistent_render_stats["writes"] += 1
+
+
+async def invalidate_clip_renders(session: AsyncSession, clip_ids: list[UUID]) -> None:
+    """Drop cached renders for clips whose lanes changed.
+
+    Persisted rows are deleted in the caller's transaction.
+
+    Args:
+        session: Database session
+        clip_ids: Affected clips
+    """
+    for clip_id in clip_ids:
+        lane_render_cache.invalidate_clip(clip_id)
+    if clip_ids and settings.polyrhythm_render_cache_persist:
+        await session.execute(
+            delete(PolyrhythmRender).where(PolyrhythmRender.clip_id.in_(clip_ids))
+        )
+
+
+async def invalidate_profile_renders(session: AsyncSession, profile_id: UUID) -> None:
+    """Drop cached renders for every clip using a polyrhythm profile.
+
+    Args:
+        session: Database session
+        profile_id: Changed or deleted profile
+    """
+    result = await session.execute(
+        select(Clip.id)
+        .outerjoin(ClipPolyrhythmLane, ClipPolyrhythmLane.clip_id == Clip.id)
+        .where(
+            or_(
+                Clip.polyrhythm_profile_id == profile_id,
+                ClipPolyrhythmLane.polyrhythm_profile_id == profile_id,
+            )
+        )
+        .distinct()
+    )
+    await invalidate_clip_renders(session, list(result.scalars().all()))
+
+
+def render_cache_stats() -> dict:
+    """Hit/miss counters of both cache tiers."""
+    return {"memory": lane_render_cache.stats(), "persistent": dict(persistent_render_stats)}
+
+
+async def load_clip_lanes(
+    session: AsyncSession, clips: Iterable[Any], *, legacy: bool = True
+) -> dict[UUID, list[LaneSnapshot]]:
+    """Lanes of polyrhythm clips with their profiles, in two queries.
+
+    polyrhythm_multi clips get their lanes. Legacy polyrhythm clips get their
+    lanes if they have any (from migration), else a virtual lane playing the
+    clip's profile (see legacy_lane_id()). Lanes are in order_index order;
+    lanes whose profile is gone are skipped.
 
     Args:
-        clip: Clip with lanes
-        project: Project for timing/BPM
         session: Database session
+        clips: Clips (ORM objects or snapshots) of any grid mode
+        legacy: Include virtual lanes of legacy single-profile clips
 
     Returns:
-        List of Note objects (not yet persisted)
+        Lanes with polyrhythm_profile set, by clip id (clips without lanes
+        are left out)
     """
-    # Check if clip has lanes
-    if clip.grid_mode == "polyrhythm_multi" and clip.polyrhythm_lanes:
-        lanes_data = clip.polyrhythm_lanes
-    elif clip.grid_mode == "polyrhythm" and clip.polyrhythm_profile_id:
-        # Legacy mode: check if lanes exist (from migration), otherwise use profile
+    clips = [
+        clip
+        for clip in clips
+        if clip.grid_mode == "polyrhythm_multi"
+        or (clip.grid_mode == "polyrhythm" and clip.polyrhythm_profile_id)
+    ]
+    if not clips:
+        return {}
+
+    result = await session.execute(
+        select(ClipPolyrhythmLane.__table__)
+        .where(ClipPolyrhythmLane.clip_id.in_([clip.id for clip in clips]))
+        .order_by(ClipPolyrhythmLane.order_index)
+    )
+    lane_rows: dict[UUID, list] = {}
+    for row in result:
+        lane_rows.setdefault(row.clip_id, []).append(row)
+
+    legacy_clips = [
+        clip
+        for clip in clips
+        if legacy and clip.grid_mode == "polyrhythm" and clip.id not in lane_rows
+    ]
+    profile_ids = {row.polyrhythm_profile_id for rows in lane_rows.values() for row in rows}
+    profile_ids.update(clip.polyrhythm_profile_id for clip in legacy_clips)
+    profiles: dict[UUID, ProfileSnapshot] = {}
+    if profile_ids:
         result = await session.execute(
-            select(ClipPolyrhythmLane).where(ClipPolyrhythmLane.clip_id == clip.id)
+            select(PolyrhythmProfile.__table__).where(PolyrhythmProfile.id.in_(profile_ids))
         )
-        existing_lanes = list(result.scalars().all())
-        if existing_lanes:
-            lanes_data = existing_lanes
-        else:
-            # True legacy: use profile directly
-            profile = await session.get(PolyrhythmProfile, clip.polyrhythm_profile_id)
-            if profile:
-                import uuid
-
-                virtual_lane = ClipPolyrhythmLane(
-                    id=uuid.uuid4(),
+        profiles = {row.id: ProfileSnapshot(**row._mapping) for row in result}
+
+    lanes: dict[UUID, list[LaneSnapshot]] = {}
+    for clip_id, rows in lane_rows.items():
+        clip_lanes = [
+            LaneSnapshot(**row._mapping, polyrhythm_profile=profiles[row.polyrhythm_profile_id])
+            for row in rows
+            if row.polyrhythm_profile_id in profiles
+        ]
+        if clip_lanes:
+            lanes[clip_id] = clip_lanes
+    for clip in legacy_clips:
+        profile = profiles.get(clip.polyrhythm_profile_id)
+        if profile is not None:
+            lanes[clip.id] = [
+                LaneSnapshot(
+                    id=legacy_lane_id(clip.id),
                     clip_id=clip.id,
                     polyrhythm_profile_id=profile.id,
                     lane_name="Legacy Lane",
+                    instrument_role=None,
                     pitch=60,
                     velocity=100,
                     mute=False,
                     solo=False,
                     order_index=0,
                     seed_offset=0,
+                    created_at=None,
+                    polyrhythm_profile=profile,
                 )
-                virtual_lane.polyrhythm_profile = profile
-                lanes_data = [virtual_lane]
-            else:
-                return []
-    else:
-        return []
-
-    # Convert to LaneSpec
-    lane_specs = []
-    for lane in lanes_data:
-        if not hasattr(lane, "polyrhythm_profile") or not lane.polyrhythm_profile:
-            profile = await session.get(PolyrhythmProfile, lane.polyrhythm_profile_id)
-            if not profile:
-                continue
-            lane.polyrhythm_profile = profile
-
-        profile = lane.polyrhythm_profile
-        cycle = CycleSpec(
-            steps=profile.steps,
-            pulses=profile.pulses,
-            cycle_beats=float(profile.cycle_beats),
-            rotation=profile.rotation,
-            swing=float(profile.swing) if profile.swing is not None else None,
-        )
+            ]
+    return lanes
 
-        lane_spec = LaneSpec(
-            cycle=cycle,
-            lane_id=lane.id,
-            clip_id=clip.id,
-            pitch=lane.pitch,
-            velocity=lane.velocity,
-            mute=lane.mute,
-            solo=lane.solo,
-            order_index=lane.order_index,
-            seed_offset=lane.seed_offset,
-            humanize_ms=profile.humanize_ms,
-        )
-        lane_specs.append(lane_spec)
 
-    if not lane_specs:
-        return []
+async def render_project_lanes(
+    session: AsyncSession, project: Any, clips: Iterable[Any]
+) -> dict[UUID, list[NoteSnapshot]]:
+    """Render the polyrhythm lanes of many clips to note snapshots.
 
-    # Render events
-    events = render_lanes_to_events(
-        lanes=lane_specs,
-        clip_start_bar=clip.start_bar,
-        clip_length_bars=clip.length_bars,
-        project_bpm=project.bpm,
-        time_signature_num=project.time_signature_num,
-        time_signature_den=project.time_signature_den,
-        base_seed=project.seed,
-    )
+    Lanes and profiles of every clip are resolved with load_clip_lanes() (two
+    queries whatever the number of clips), then each clip is rendered through
+    the render cache. Used by MIDI and ZIP export.
 
-    # Convert to Note objects
-    # Note: events from render_lanes_to_events have absolute tick positions
-    # We need to convert to relative ticks within the clip
-    notes = []
-    quarter_notes_per_bar = (project.time_signature_num * 4) / project.time_signature_den
-    ticks_per_bar = int(quarter_notes_per_bar * 480)  # PPQ
-    clip_start_tick = clip.start_bar * ticks_per_bar
-
-    for event in events:
-        # Events have absolute tick positions, convert to relative
-        absolute_tick = event["start_tick"]
-        relative_tick = absolute_tick - clip_start_tick
-
-        # Note: Offsets are applied during export/playback, not here
-        # This keeps the stored notes clean and allows offset changes without regeneration
-
-        note = Note(
-            clip_id=clip.id,
-            pitch=event["pitch"],
-            velocity=event["velocity"],
-            start_tick=relative_tick,
-            duration_tick=event["duration_tick"],
-            probability=1.0,
-        )
-        notes.append(note)
+    Args:
+        session: Database session
+        project: Project (or snapshot) for timing/BPM/seed
+        clips: Clips of any grid mode; only polyrhythm clips produce notes
+
+    Returns:
+        Note snapshots (clip-relative ticks, no id: not persisted) by clip id
+    """
+    clips = list(clips)
+    lanes_by_clip = await load_clip_lanes(session, clips)
+    ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
+
+    notes_by_clip: dict[UUID, list[NoteSnapshot]] = {}
+    for clip in clips:
+        lanes = lanes_by_clip.get(clip.id)
+        if not lanes:
+            continue
+        lane_specs = [lane_spec_from_lane(lane, clip.id) for lane in lanes]
+        events = await render_clip_lane_events(clip, project, session, lane_specs)
+
+        # Events have absolute tick positions; notes are relative to the clip.
+        # Offsets are applied during export/playback, not here, so offset
+        # changes need no re-render.
+        clip_start_tick = clip.start_bar * ticks_per_bar
+        notes_by_clip[clip.id] = [
+            NoteSnapshot(
+                id=None,
+                clip_id=clip.id,
+                pitch=event["pitch"],
+                velocity=event["velocity"],
+                start_tick=event["start_tick"] - clip_start_tick,
+                duration_tick=event["duration_tick"],
+                probability=1.0,
+                created_at=None,
+            )
+            for event in events
+        ]
+    return notes_by_clip
+
+
+async def render_clip_lanes_to_notes(
+    clip: Clip,
+    project: Project,
+    session: AsyncSession,
+) -> list[NoteSnapshot]:
+    """Render polyrhythm lanes for a clip to note snapshots.
 
-    return notes
+    Single-clip form of render_project_lanes().
+
+    Args:
+        clip: Clip with lanes
+        project: Project for timing/BPM
+        session: Database session
+
+    Returns:
+        Note snapshots (not persisted)
+    """
+    notes_by_clip = await render_project_lanes(session, project, [clip])
+    return notes_by_clip.get(clip.id, [])
@@ -0,0 +1,216 @@
+"""Single-flight coalescing and caching of preview computations.
+
+Previews (clip regenerate, segment batches, chord renders, polyrhythm lanes)
+are deterministic given the project state and the request, so identical
+requests can share one computation. Keys hash the endpoint, the project
+revision (which every arrangement change bumps, see db/revisions.py) and the
+normalized request including its seed.
+
+Concurrent requests for a key that is being computed await that computation
+instead of starting their own; finished results are kept in a bounded LRU
+for settings.preview_cache_ttl seconds. Failures are passed to every waiting
+request and never cached. Cached results are shared between responses, so
+callers must not mutate them.
+
+A computation may outlive the request that started it and serves other
+requests, so it never uses a request's session: it is handed a session of
+its own, and reads everything else from plain data (ids, request models,
+snapshots) captured by the caller.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from typing import Any, TypeVar
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from midinecromancer.config import settings
+from midinecromancer.db.base import AsyncSessionLocal
+from midinecromancer.models.clip import Clip
+from midinecromancer.models.project import Project
+from midinecromancer.models.track import Track
+
+T = TypeVar("T")
+
+
+def preview_key(endpoint: str, revision: int | None, params: Any) -> str:
+    """Canonical key of a preview request.
+
+    Args:
+        endpoint: Preview name
+        revision: Project revision the preview reads (None if params already
+            identify everything it reads)
+        params: JSON-compatible request (dict keys in any order)
+
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps(
+        [endpoint, revision, params], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PreviewCache:
+    """TTL/LRU result cache with single-flight computation per key.
+
+    Args:
+        maxsize: Results kept (0 disables caching and coalescing)
+        ttl: Seconds a result is kept
+        clock: Monotonic time source
+        session_factory: Opens the session each computation runs in
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = AsyncSessionLocal,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.session_factory = session_factory
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, endpoint: str, outcome: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                endpoint, {"requests": 0, "hits": 0, "coalesced": 0, "computed": 0, "errors": 0}
+            )
+            counters["requests"] += 1
+            counters[outcome] += 1
+
+    async def get_or_compute(
+        self, endpoint: str, key: str, compute: Callable[[AsyncSession], Awaitable[T]]
+    ) -> T:
+        """Cached result for key, joining or starting its computation on a miss.
+
+        The computation runs as its own task, in a session of its own, so a
+        cancelled or finished request neither cancels it nor closes its
+        session under the others waiting on it.
+
+        Args:
+            endpoint: Preview name (for the counters)
+            key: preview_key() of the request
+            compute: Coroutine function producing the result from a session;
+                it must not capture the request's session or ORM objects
+
+        Returns:
+            The (shared) result
+        """
+        if self.maxsize <= 0:
+            self._count(endpoint, "computed")
+            return await self._run(compute)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                cached = True
+            else:
+                cached = False
+                if entry is not None:
+                    del self._entries[key]
+        if cached:
+            self._count(endpoint, "hits")
+            return entry[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count(endpoint, "coalesced")
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._run(compute))
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._count(endpoint, "errors")
+            raise
+        self._count(endpoint, "computed")
+        return result
+
+    async def _run(self, compute: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with self.session_factory() as session:
+            return await compute(session)
+
+    def _finish(self, key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, future.result())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop cached results and reset counters (in-flight work continues)."""
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters per endpoint and overall.
+
+        coalescing_ratio is the share of requests that joined another
+        request's computation; hit_ratio the share served from the cache.
+        """
+        with self._lock:
+            endpoints = {name: dict(counters) for name, counters in self._counters.items()}
+            size = len(self._entries)
+        total = {"requests": 0, "hits": 0, "coalesced": 0, "computed": 0, "errors": 0}
+        for counters in endpoints.values():
+            for name, value in counters.items():
+                total[name] += value
+        requests = total["requests"] or 1
+        return {
+            **total,
+            "coalescing_ratio": total["coalesced"] / requests,
+            "hit_ratio": total["hits"] / requests,
+            "in_flight": len(self._inflight),
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "endpoints": endpoints,
+        }
+
+
+preview_cache = PreviewCache(settings.preview_cache_size, settings.preview_cache_ttl)
+
+
+async def project_revision(session: AsyncSession, project_id: UUID) -> int | None:
+    """Current revision of a project, None if it does not exist."""
+    result = await session.execute(select(Project.revision).where(Project.id == project_id))
+    return result.scalar_one_or_none()
+
+
+async def clip_project_revision(session: AsyncSession, clip_id: UUID) -> int | None:
+    """Current revision of a clip's project, None if the clip does not exist."""
+    result = await session.execute(
+        select(Project.revision)
+        .join(Track, Track.project_id == Project.id)
+        .join(Clip, Clip.track_id == Track.id)
+        .where(Clip.id == clip_id)
+    )
+    return result.scalar_one_or_none()
@@ -1,28 +1,37 @@
 """Service for regenerating clip content with preview support."""
 
-import hashlib
+import asyncio
+from collections.abc import Callable
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from midinecromancer.music import generate_bassline, generate_chord_progression, generate_melody
+from midinecromancer.music import generate_chord_progression, generate_melody
 from midinecromancer.music.drums import DrumMap, generate_drum_pattern_v2
+from midinecromancer.music.seeds import SeedScheme, derive, legacy_seed
 from midinecromancer.music.theory import PPQ
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.clip import Clip
-from midinecromancer.models.note import Note
 from midinecromancer.models.project import Project
 from midinecromancer.models.track import Track
+from midinecromancer.services.generation_pool import bassline_over_progression, run_part
+from midinecromancer.services.note_store import clear_clip_notes, write_clip_notes
+from midinecromancer.services.payloads import EventListPool
 
 
 def deterministic_seed_for_regenerate(
-    project_id: UUID, clip_id: UUID, kind: str, base_seed: int, variation: float
+    project_id: UUID,
+    clip_id: UUID,
+    kind: str,
+    base_seed: int,
+    variation: float,
+    seed_scheme: SeedScheme = "legacy",
 ) -> int:
     """Generate deterministic seed for regeneration."""
-    seed_str = f"{project_id}_{clip_id}_{kind}_{base_seed}_{variation}"
-    hash_bytes = hashlib.blake2b(seed_str.encode(), digest_size=8).digest()
-    return int.from_bytes(hash_bytes, byteorder="big", signed=True)
+    if seed_scheme == "tree":
+        return derive(base_seed, project_id, clip_id, kind, variation)
+    return legacy_seed(project_id, clip_id, kind, base_seed, variation, sep="_", signed=True)
 
 
 class RegenerateService:
@@ -54,7 +63,86 @@ class RegenerateService:
         Returns:
             Dict with generated events and metadata
         """
-        # Get clip and project context
+        clip, track, project = await self._load_context(clip_id)
+
+        base_seed = seed if seed is not None else project.seed
+        actual_seed = deterministic_seed_for_regenerate(
+            project.id, clip.id, kind, base_seed, variation, project.seed_scheme
+        )
+        params = params or {}
+
+        func, kwargs = self._part_call(clip, project, kind, actual_seed, variation, params)
+        generated, _compute_ms = await run_part(func, **kwargs)
+        return await self._apply(
+            clip, project, track, kind, actual_seed, variation, params, preview, generated
+        )
+
+    async def preview_variants(
+        self,
+        clip_id: UUID,
+        kind: str,
+        seeds: list[int | None],
+        variations: list[float],
+        params: dict | None = None,
+    ) -> dict:
+        """Preview several regenerations of one clip at once.
+
+        Every combination of seed and variation is one variant. The clip
+        context is loaded once, the variants are generated concurrently (in the
+        generation pool if configured) and identical event lists are returned
+        only once.
+
+        Args:
+            clip_id: Clip to regenerate
+            kind: Segment kind (beats, chords, bass, melody)
+            seeds: Base seeds (None uses the project seed)
+            variations: Variation amounts (0-1)
+            params: Type-specific parameters
+
+        Returns:
+            Dict with "variants" (seed, variation, seed_used and an index into
+            "event_lists" per event key) and the deduplicated "event_lists"
+        """
+        clip, track, project = await self._load_context(clip_id)
+        params = params or {}
+
+        combos = []
+        for seed in seeds:
+            base_seed = seed if seed is not None else project.seed
+            for variation in variations:
+                actual_seed = deterministic_seed_for_regenerate(
+                    project.id, clip.id, kind, base_seed, variation, project.seed_scheme
+                )
+                combos.append((base_seed, variation, actual_seed))
+
+        calls = [
+            self._part_call(clip, project, kind, actual_seed, variation, params)
+            for _, variation, actual_seed in combos
+        ]
+        results = await asyncio.gather(*(run_part(func, **kwargs) for func, kwargs in calls))
+
+        pool = EventListPool()
+        variants = []
+        for combo, (generated, _compute_ms) in zip(combos, results, strict=True):
+            base_seed, variation, actual_seed = combo
+            preview = await self._apply(
+                clip, project, track, kind, actual_seed, variation, params, True, generated
+            )
+            variant = {"seed": base_seed, "variation": variation, "seed_used": actual_seed}
+            for key in ("events", "chord_events", "note_events"):
+                if key in preview:
+                    variant[key] = pool.add(preview[key])
+            variants.append(variant)
+
+        return {
+            "kind": kind,
+            "clip_id": str(clip.id),
+            "variants": variants,
+            "event_lists": pool.lists,
+        }
+
+    async def _load_context(self, clip_id: UUID) -> tuple[Clip, Track, Project]:
+        """Get a clip with its track and project."""
         clip = await self.session.get(Clip, clip_id)
         if not clip:
             raise ValueError(f"Clip {clip_id} not found")
@@ -66,36 +154,117 @@ class RegenerateService:
         project = await self.session.get(Project, track.project_id)
         if not project:
             raise ValueError(f"Project {track.project_id} not found")
+        return clip, track, project
 
-        base_seed = seed if seed is not None else project.seed
-        actual_seed = deterministic_seed_for_regenerate(
-            project.id, clip.id, kind, base_seed, variation
-        )
-        params = params or {}
+    def _part_call(
+        self, clip: Clip, project: Project, kind: str, seed: int, variation: float, params: dict
+    ) -> tuple[Callable[..., list[dict]], dict]:
+        """Get the pure generator call for regenerating a clip.
 
-        ticks_per_bar = int(
-            (project.time_signature_num * 4) / project.time_signature_den * PPQ
-        )
+        Returns:
+            (generator, keyword arguments) for run_part()
 
+        Raises:
+            ValueError: If kind is unknown
+        """
+        timing = {
+            "bars": clip.length_bars,
+            "time_signature_num": project.time_signature_num,
+            "time_signature_den": project.time_signature_den,
+            "seed": seed,
+        }
         if kind == "beats" or kind == "drums":
-            return await self._regenerate_beats(
-                clip, project, track, actual_seed, variation, params, preview, ticks_per_bar
-            )
+            style_map = {
+                "gm_hiphop": "boom_bap",
+                "gm_trap": "trap",
+                "gm_boom_bap": "boom_bap",
+                "gm_blank": "minimal",
+            }
+            hat_mode_map = {
+                "straight": "straight_16",
+                "syncopated": "skip_step",
+                "euclidean": "straight_8",
+                "polyrhythm": "roll",
+            }
+            return generate_drum_pattern_v2, {
+                **timing,
+                "drum_map": DrumMap(),
+                "style": style_map.get(params.get("kit", "gm_hiphop"), "boom_bap"),
+                "swing": params.get("swing", 0.0),
+                "density": params.get("density", 0.7),
+                "hat_mode": hat_mode_map.get(params.get("pattern", "straight"), "straight_16"),
+                "ghost_notes": params.get("ghost_notes", True),
+                "pause_probability": params.get("pause_probability", 0.0),
+                "pause_scope": "kick",
+                "variation_intensity": variation,
+                "engine": params.get("engine", "compat"),
+                "seed_scheme": project.seed_scheme,
+            }
         elif kind == "chords":
-            return await self._regenerate_chords(
-                clip, project, track, actual_seed, variation, params, preview, ticks_per_bar
-            )
+            return generate_chord_progression, {
+                "tonic": params.get("key", project.key_tonic),
+                "mode": params.get("mode", project.mode),
+                "bars": clip.length_bars,
+                "seed": seed,
+                "start_on": "I",
+                "prefer_circle_motion": params.get("progression_style") == "circle_fifths",
+                "cadence_ending": params.get("cadence_strength", 0.7) > 0.5,
+            }
         elif kind == "bass":
-            return await self._regenerate_bass(
-                clip, project, track, actual_seed, variation, params, preview, ticks_per_bar
-            )
+            # Get chord progression for bass to follow
+            return bassline_over_progression, {
+                "progression": {
+                    "tonic": project.key_tonic,
+                    "mode": project.mode,
+                    "bars": clip.length_bars,
+                    "seed": seed,
+                },
+                "bassline": {
+                    **timing,
+                    "tonic": project.key_tonic,
+                    "mode": project.mode,
+                    "octave": params.get("octave", 2),
+                    "syncopation": params.get("rhythmic_density", 0.6),
+                },
+            }
         elif kind == "melody":
-            return await self._regenerate_melody(
-                clip, project, track, actual_seed, variation, params, preview, ticks_per_bar
-            )
+            octave_map = {"narrow": 5, "medium": 5, "wide": 6}
+            return generate_melody, {
+                **timing,
+                "tonic": project.key_tonic,
+                "mode": project.mode,
+                "octave": octave_map.get(params.get("range", "medium"), 5),
+                "stepwise_bias": 1.0 - params.get("leapiness", 0.3),
+                "leap_probability": params.get("leapiness", 0.3),
+            }
         else:
             raise ValueError(f"Unknown kind: {kind}")
 
+    async def _apply(
+        self,
+        clip: Clip,
+        project: Project,
+        track: Track,
+        kind: str,
+        seed: int,
+        variation: float,
+        params: dict,
+        preview: bool,
+        generated: list[dict],
+    ) -> dict:
+        """Shape generated content into a result (and write it unless previewing)."""
+        ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
+        regenerate = {
+            "beats": self._regenerate_beats,
+            "drums": self._regenerate_beats,
+            "chords": self._regenerate_chords,
+            "bass": self._regenerate_bass,
+            "melody": self._regenerate_melody,
+        }[kind]
+        return await regenerate(
+            clip, project, track, seed, variation, params, preview, ticks_per_bar, generated
+        )
+
     async def _regenerate_beats(
         self,
         clip: Clip,
@@ -106,41 +275,9 @@ class RegenerateService:
         params: dict,
         preview: bool,
         ticks_per_bar: int,
+        events: list[dict],
     ) -> dict:
         """Regenerate beats/drums."""
-        style_map = {
-            "gm_hiphop": "boom_bap",
-            "gm_trap": "trap",
-            "gm_boom_bap": "boom_bap",
-            "gm_blank": "minimal",
-        }
-        style = style_map.get(params.get("kit", "gm_hiphop"), "boom_bap")
-
-        hat_mode_map = {
-            "straight": "straight_16",
-            "syncopated": "skip_step",
-            "euclidean": "straight_8",
-            "polyrhythm": "roll",
-        }
-        hat_mode = hat_mode_map.get(params.get("pattern", "straight"), "straight_16")
-
-        drum_map = DrumMap()
-        events = generate_drum_pattern_v2(
-            bars=clip.length_bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            seed=seed,
-            drum_map=drum_map,
-            style=style,
-            swing=params.get("swing", 0.0),
-            density=params.get("density", 0.7),
-            hat_mode=hat_mode,
-            ghost_notes=params.get("ghost_notes", True),
-            pause_probability=params.get("pause_probability", 0.0),
-            pause_scope="kick",
-            variation_intensity=variation,
-        )
-
         # Adjust start_tick to clip start
         for event in events:
             event["start_tick"] += clip.start_bar * ticks_per_bar
@@ -153,24 +290,12 @@ class RegenerateService:
             }
 
         # Clear existing notes
-        result = await self.session.execute(
-            select(Note).where(Note.clip_id == clip.id)
-        )
-        existing_notes = result.scalars().all()
-        for note in existing_notes:
-            await self.session.delete(note)
+        await clear_clip_notes(self.session, clip)
 
         # Create new notes (relative to clip start)
-        for event in events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event["pitch"],
-                velocity=event["velocity"],
-                start_tick=event["start_tick"] - clip.start_bar * ticks_per_bar,
-                duration_tick=event["duration_tick"],
-                probability=1.0,
-            )
-            self.session.add(note)
+        await write_clip_notes(
+            self.session, clip, events, tick_offset=-clip.start_bar * ticks_per_bar
+        )
 
         await self.session.flush()
         return {
@@ -189,23 +314,15 @@ class RegenerateService:
         params: dict,
         preview: bool,
         ticks_per_bar: int,
+        progression: list[dict],
     ) -> dict:
         """Regenerate chords."""
         key = params.get("key", project.key_tonic)
         mode = params.get("mode", project.mode)
 
-        progression = generate_chord_progression(
-            tonic=key,
-            mode=mode,
-            bars=clip.length_bars,
-            seed=seed,
-            start_on="I",
-            prefer_circle_motion=params.get("progression_style") == "circle_fifths",
-            cadence_ending=params.get("cadence_strength", 0.7) > 0.5,
-        )
-
         chord_events = []
         note_events = []
+        pending_chords = []
 
         if not preview:
             # Clear existing chord events and notes
@@ -216,12 +333,7 @@ class RegenerateService:
             for chord in existing_chords:
                 await self.session.delete(chord)
 
-            result = await self.session.execute(
-                select(Note).where(Note.clip_id == clip.id)
-            )
-            existing_notes = result.scalars().all()
-            for note in existing_notes:
-                await self.session.delete(note)
+            await clear_clip_notes(self.session, clip)
 
         for chord in progression:
             duration_beats = (
@@ -265,40 +377,33 @@ class RegenerateService:
                     is_locked=chord_event_data["is_locked"],
                 )
                 self.session.add(chord_event)
-                await self.session.flush()
-
-                # Render to notes
-                from midinecromancer.services.chord_render import render_chord_event_to_notes
-
-                project_context = {
-                    "tonic": key,
-                    "mode": mode,
-                    "bpm": project.bpm,
-                    "time_signature_num": project.time_signature_num,
-                    "time_signature_den": project.time_signature_den,
-                }
-                rendered_notes = render_chord_event_to_notes(
-                    chord_event, project_context, seed
-                )
-
-                for note_data in rendered_notes:
-                    note = Note(
-                        clip_id=clip.id,
-                        pitch=note_data["pitch"],
-                        velocity=note_data["velocity"],
-                        start_tick=note_data["start_tick"],
-                        duration_tick=note_data["duration_tick"],
-                        probability=1.0,
-                    )
-                    self.session.add(note)
-                    note_events.append(note_data)
-
-                chord_events.append({
-                    "id": str(chord_event.id),
-                    **chord_event_data,
-                })
+                pending_chords.append((chord_event, chord_event_data))
 
         if not preview:
+            # One flush assigns ids and column defaults to every chord event
+            await self.session.flush()
+
+            # Render chords to notes for playback
+            from midinecromancer.services.chord_render import render_chord_events_to_notes
+
+            project_context = {
+                "tonic": key,
+                "mode": mode,
+                "bpm": project.bpm,
+                "time_signature_num": project.time_signature_num,
+                "time_signature_den": project.time_signature_den,
+                "seed_scheme": project.seed_scheme,
+            }
+            note_events.extend(
+                render_chord_events_to_notes(
+                    [chord_event for chord_event, _ in pending_chords], project_context, seed
+                )
+            )
+            for chord_event, chord_event_data in pending_chords:
+                chord_events.append({"id": str(chord_event.id), **chord_event_data})
+
+            # Persist all rendered notes in one batch
+            await write_clip_notes(self.session, clip, note_events)
             await self.session.flush()
 
         return {
@@ -318,28 +423,9 @@ class RegenerateService:
         params: dict,
         preview: bool,
         ticks_per_bar: int,
+        events: list[dict],
     ) -> dict:
         """Regenerate bass."""
-        # Get chord progression for bass to follow
-        chord_progression = generate_chord_progression(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=clip.length_bars,
-            seed=seed,
-        )
-
-        events = generate_bassline(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=clip.length_bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            chord_progression=chord_progression,
-            seed=seed,
-            octave=params.get("octave", 2),
-            syncopation=params.get("rhythmic_density", 0.6),
-        )
-
         # Adjust start_tick and velocity
         for event in events:
             event["start_tick"] += clip.start_bar * ticks_per_bar
@@ -353,24 +439,12 @@ class RegenerateService:
             }
 
         # Clear existing notes
-        result = await self.session.execute(
-            select(Note).where(Note.clip_id == clip.id)
-        )
-        existing_notes = result.scalars().all()
-        for note in existing_notes:
-            await self.session.delete(note)
+        await clear_clip_notes(self.session, clip)
 
         # Create new notes
-        for event in events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event["pitch"],
-                velocity=event["velocity"],
-                start_tick=event["start_tick"] - clip.start_bar * ticks_per_bar,
-                duration_tick=event["duration_tick"],
-                probability=1.0,
-            )
-            self.session.add(note)
+        await write_clip_notes(
+            self.session, clip, events, tick_offset=-clip.start_bar * ticks_per_bar
+        )
 
         await self.session.flush()
         return {
@@ -389,25 +463,9 @@ class RegenerateService:
         params: dict,
         preview: bool,
         ticks_per_bar: int,
+        events: list[dict],
     ) -> dict:
         """Regenerate melody."""
-        octave_map = {"narrow": 5, "medium": 5, "wide": 6}
-        octave = octave_map.get(params.get("range", "medium"), 5)
-
-        stepwise_bias = 1.0 - params.get("leapiness", 0.3)
-
-        events = generate_melody(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=clip.length_bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            seed=seed,
-            octave=octave,
-            stepwise_bias=stepwise_bias,
-            leap_probability=params.get("leapiness", 0.3),
-        )
-
         # Adjust start_tick and velocity
         for event in events:
             event["start_tick"] += clip.start_bar * ticks_per_bar
@@ -421,24 +479,12 @@ class RegenerateService:
             }
 
         # Clear existing notes
-        result = await self.session.execute(
-            select(Note).where(Note.clip_id == clip.id)
-        )
-        existing_notes = result.scalars().all()
-        for note in existing_notes:
-            await self.session.delete(note)
+        await clear_clip_notes(self.session, clip)
 
         # Create new notes
-        for event in events:
-            note = Note(
-                clip_id=clip.id,
-                pitch=event["pitch"],
-                velocity=event["velocity"],
-                start_tick=event["start_tick"] - clip.start_bar * ticks_per_bar,
-                duration_tick=event["duration_tick"],
-                probability=1.0,
-            )
-            self.session.add(note)
+        await write_clip_notes(
+            self.session, clip, events, tick_offset=-clip.start_bar * ticks_per_bar
+        )
 
         await self.session.flush()
         return {
@@ -446,4 +492,3 @@ class RegenerateService:
             "events": events,
             "clip_id": str(clip.id),
         }
-
@@ -1,18 +1,19 @@
 """Segment generation service for creating clips with configurable models."""
 
-import hashlib
+import asyncio
 import random
+from collections.abc import Callable
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from midinecromancer.music import generate_bassline, generate_chord_progression, generate_melody
+from midinecromancer.music import generate_chord_progression, generate_melody
 from midinecromancer.music.drums import DrumMap, generate_drum_pattern_v2
+from midinecromancer.music.seeds import SeedScheme, derive, legacy_seed
 from midinecromancer.music.theory import PPQ
 from midinecromancer.models.chord_event import ChordEvent
 from midinecromancer.models.clip import Clip
-from midinecromancer.models.note import Note
 from midinecromancer.models.project import Project
 from midinecromancer.models.track import Track
 from midinecromancer.schemas.segment import (
@@ -23,22 +24,42 @@ from midinecromancer.schemas.segment import (
     SegmentCreateRequest,
     SegmentGenerateResponse,
     SegmentKind,
+    SegmentPreviewBatchRequest,
+    SegmentPreviewBatchResponse,
+    SegmentPreviewVariant,
 )
-
-
-def deterministic_seed(base_seed: int, project_id: UUID, start_bar: int, kind: str) -> int:
+from midinecromancer.services.generation_pool import bassline_over_progression, run_part
+from midinecromancer.services.note_store import write_clip_notes
+from midinecromancer.services.payloads import EventListPool
+
+
+def deterministic_seed(
+    base_seed: int,
+    project_id: UUID,
+    start_bar: int,
+    kind: str,
+    seed_scheme: SeedScheme = "legacy",
+) -> int:
     """Generate deterministic seed for a segment."""
-    seed_str = f"{base_seed}_{project_id}_{start_bar}_{kind}"
-    hash_bytes = hashlib.blake2b(seed_str.encode(), digest_size=8).digest()
-    return int.from_bytes(hash_bytes, byteorder="big", signed=True)
+    if seed_scheme == "tree":
+        return derive(base_seed, project_id, start_bar, kind)
+    return legacy_seed(base_seed, project_id, start_bar, kind, sep="_", signed=True)
 
 
 class SegmentService:
     """Service for generating segments (clips with content)."""
 
+    MODEL_TYPES = {
+        "beats": BeatsModel,
+        "chords": ChordsModel,
+        "bass": BassModel,
+        "melody": MelodyModel,
+    }
+
     def __init__(self, session: AsyncSession):
         """Initialize service with database session."""
         self.session = session
+        self._tracks: dict[tuple[UUID, str], Track] = {}
 
     async def generate_segments(self, request: SegmentCreateRequest) -> SegmentGenerateResponse:
         """Generate segments based on request.
@@ -58,52 +79,17 @@ class SegmentService:
         chords_by_clip: dict[str, list[dict]] = {}
         lanes_by_clip: dict[str, list[dict]] = {}
 
-        for kind in request.kinds:
-            model = request.models.get(kind)
-            segment_seed = deterministic_seed(
-                request.seed, request.project_id, request.start_bar, kind
-            )
+        # Compute every part first (concurrently if a generation pool is
+        # configured), then write them in request order
+        parts = self._part_specs(request, request.seed, project.seed_scheme)
+        results = await self._compute_parts(project, request.length_bars, parts)
 
-            if kind == "beats":
-                clip_data, events = await self._generate_beats(
-                    project,
-                    request.start_bar,
-                    request.length_bars,
-                    segment_seed,
-                    model if isinstance(model, BeatsModel) else BeatsModel(),
-                    request.preview,
-                )
-            elif kind == "chords":
-                clip_data, events, chord_events = await self._generate_chords(
-                    project,
-                    request.start_bar,
-                    request.length_bars,
-                    segment_seed,
-                    model if isinstance(model, ChordsModel) else ChordsModel(),
-                    request.preview,
-                )
+        for part, (generated, _compute_ms) in zip(parts, results, strict=True):
+            clip_data, events, chord_events = await self._apply_part(
+                project, request, part, generated, request.preview
+            )
+            if chord_events is not None:
                 chords_by_clip[clip_data["id"]] = chord_events
-            elif kind == "bass":
-                clip_data, events = await self._generate_bass(
-                    project,
-                    request.start_bar,
-                    request.length_bars,
-                    segment_seed,
-                    model if isinstance(model, BassModel) else BassModel(),
-                    request.preview,
-                )
-            elif kind == "melody":
-                clip_data, events = await self._generate_melody(
-                    project,
-                    request.start_bar,
-                    request.length_bars,
-                    segment_seed,
-                    model if isinstance(model, MelodyModel) else MelodyModel(),
-                    request.preview,
-                )
-            else:
-                continue
-
             clips_data.append(clip_data)
             events_by_clip[clip_data["id"]] = events
 
@@ -115,8 +101,188 @@ class SegmentService:
             preview=request.preview,
         )
 
+    async def preview_variants(
+        self, request: SegmentPreviewBatchRequest
+    ) -> SegmentPreviewBatchResponse:
+        """Preview one segment request for several seeds at once.
+
+        The project and tracks are loaded once, all parts of all seeds are
+        generated concurrently (in the generation pool if configured) and
+        identical event lists are returned only once.
+        """
+        project = await self.session.get(Project, request.project_id)
+        if not project:
+            raise ValueError(f"Project {request.project_id} not found")
+
+        parts_by_seed = [
+            (seed, self._part_specs(request, seed, project.seed_scheme)) for seed in request.seeds
+        ]
+        results = iter(
+            await self._compute_parts(
+                project,
+                request.length_bars,
+                [part for _, parts in parts_by_seed for part in parts],
+            )
+        )
+
+        pool = EventListPool()
+        variants = []
+        for seed, parts in parts_by_seed:
+            variant = SegmentPreviewVariant(seed=seed)
+            for part in parts:
+                generated, _compute_ms = next(results)
+                clip_data, events, chord_events = await self._apply_part(
+                    project, request, part, generated, True
+                )
+                variant.clips.append(clip_data)
+                variant.events_by_clip[clip_data["id"]] = pool.add(events)
+                if chord_events is not None:
+                    variant.chords_by_clip[clip_data["id"]] = pool.add(chord_events)
+            variants.append(variant)
+
+        return SegmentPreviewBatchResponse(variants=variants, event_lists=pool.lists)
+
+    def _part_specs(
+        self,
+        request: SegmentCreateRequest | SegmentPreviewBatchRequest,
+        seed: int,
+        seed_scheme: SeedScheme = "legacy",
+    ) -> list[tuple[SegmentKind, int, BeatsModel | ChordsModel | BassModel | MelodyModel]]:
+        """Get (kind, segment seed, model) for every requested kind."""
+        parts = []
+        for kind in request.kinds:
+            model = request.models.get(kind)
+            segment_seed = deterministic_seed(
+                seed, request.project_id, request.start_bar, kind, seed_scheme
+            )
+            model_type = self.MODEL_TYPES[kind]
+            parts.append(
+                (kind, segment_seed, model if isinstance(model, model_type) else model_type())
+            )
+        return parts
+
+    async def _compute_parts(self, project: Project, length_bars: int, parts: list) -> list:
+        """Run the generators of parts; returns (result, compute ms) per part."""
+        calls = [
+            self._part_call(project, length_bars, kind, segment_seed, model)
+            for kind, segment_seed, model in parts
+        ]
+        return await asyncio.gather(*(run_part(func, **kwargs) for func, kwargs in calls))
+
+    async def _apply_part(
+        self,
+        project: Project,
+        request: SegmentCreateRequest | SegmentPreviewBatchRequest,
+        part: tuple,
+        generated: list[dict],
+        preview: bool,
+    ) -> tuple[dict, list[dict], list[dict] | None]:
+        """Turn one generated part into clip data (writing it unless previewing).
+
+        Returns:
+            (clip data, note events, chord events or None for non-chord kinds)
+        """
+        kind, segment_seed, model = part
+        args = (project, request.start_bar, request.length_bars, segment_seed, model, preview)
+        if kind == "beats":
+            return (*await self._generate_beats(*args, generated), None)
+        if kind == "chords":
+            return await self._generate_chords(*args, generated)
+        if kind == "bass":
+            return (*await self._generate_bass(*args, generated), None)
+        return (*await self._generate_melody(*args, generated), None)
+
+    def _part_call(
+        self,
+        project: Project,
+        length_bars: int,
+        kind: SegmentKind,
+        seed: int,
+        model: BeatsModel | ChordsModel | BassModel | MelodyModel,
+    ) -> tuple[Callable[..., list[dict]], dict]:
+        """Get the pure generator call for one segment part.
+
+        Returns:
+            (generator, keyword arguments) for run_part()
+        """
+        timing = {
+            "bars": length_bars,
+            "time_signature_num": project.time_signature_num,
+            "time_signature_den": project.time_signature_den,
+            "seed": seed,
+        }
+        if kind == "beats":
+            # Map kit to style
+            style_map = {
+                "gm_hiphop": "boom_bap",
+                "gm_trap": "trap",
+                "gm_boom_bap": "boom_bap",
+                "gm_blank": "minimal",
+            }
+            # Map pattern to hat_mode
+            hat_mode_map = {
+                "straight": "straight_16",
+                "syncopated": "skip_step",
+                "euclidean": "straight_8",
+                "polyrhythm": "roll",
+            }
+            return generate_drum_pattern_v2, {
+                **timing,
+                "drum_map": DrumMap(),  # Default GM mapping
+                "style": style_map.get(model.kit, "boom_bap"),
+                "swing": model.swing,
+                "density": model.density,
+                "hat_mode": hat_mode_map.get(model.pattern, "straight_16"),
+                "ghost_notes": model.ghost_notes,
+                "pause_probability": model.mute_probability,
+                "pause_scope": "kick",
+                "variation_intensity": model.kick_variation,
+                "seed_scheme": project.seed_scheme,
+            }
+        if kind == "chords":
+            return generate_chord_progression, {
+                "tonic": model.key,
+                "mode": model.mode,
+                "bars": length_bars,
+                "seed": seed,
+                "start_on": "I",
+                "prefer_circle_motion": model.progression_style == "circle_fifths",
+                "cadence_ending": model.cadence_strength > 0.5,
+            }
+        if kind == "bass":
+            # The bass follows its own progression in the project key
+            return bassline_over_progression, {
+                "progression": {
+                    "tonic": project.key_tonic,
+                    "mode": project.mode,
+                    "bars": length_bars,
+                    "seed": seed,
+                },
+                "bassline": {
+                    **timing,
+                    "tonic": project.key_tonic,
+                    "mode": project.mode,
+                    "octave": model.octave,
+                    "syncopation": model.rhythmic_density,
+                },
+            }
+        # Map range to octave
+        octave_map = {"narrow": 5, "medium": 5, "wide": 6}
+        return generate_melody, {
+            **timing,
+            "tonic": project.key_tonic,
+            "mode": project.mode,
+            "octave": octave_map.get(model.range, 5),
+            # Map leapiness to stepwise_bias
+            "stepwise_bias": 1.0 - model.leapiness,
+            "leap_probability": model.leapiness,
+        }
+
     async def _get_or_create_track(self, project_id: UUID, role: str, midi_channel: int) -> Track:
-        """Get or create a track for a role."""
+        """Get or create a track for a role (looked up once per service)."""
+        track = self._tracks.get((project_id, role))
+        if track is not None:
+            return track
         result = await self.session.execute(
             select(Track).where(Track.project_id == project_id, Track.role == role)
         )
@@ -131,6 +297,7 @@ class SegmentService:
             )
             self.session.add(track)
             await self.session.flush()
+        self._tracks[(project_id, role)] = track
         return track
 
     async def _generate_beats(
@@ -141,45 +308,11 @@ class SegmentService:
         seed: int,
         model: BeatsModel,
         preview: bool,
+        events: list[dict],
     ) -> tuple[dict, list[dict]]:
-        """Generate beats segment."""
+        """Write (or preview) a beats segment from generated drum events."""
         track = await self._get_or_create_track(project.id, "drums", 9)
 
-        # Map kit to style
-        style_map = {
-            "gm_hiphop": "boom_bap",
-            "gm_trap": "trap",
-            "gm_boom_bap": "boom_bap",
-            "gm_blank": "minimal",
-        }
-        style = style_map.get(model.kit, "boom_bap")
-
-        # Map pattern to hat_mode
-        hat_mode_map = {
-            "straight": "straight_16",
-            "syncopated": "skip_step",
-            "euclidean": "straight_8",
-            "polyrhythm": "roll",
-        }
-        hat_mode = hat_mode_map.get(model.pattern, "straight_16")
-
-        drum_map = DrumMap()  # Default GM mapping
-        events = generate_drum_pattern_v2(
-            bars=length_bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            seed=seed,
-            drum_map=drum_map,
-            style=style,
-            swing=model.swing,
-            density=model.density,
-            hat_mode=hat_mode,
-            ghost_notes=model.ghost_notes,
-            pause_probability=model.mute_probability,
-            pause_scope="kick",
-            variation_intensity=model.kick_variation,
-        )
-
         # Adjust start_tick to account for start_bar
         ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
         for event in events:
@@ -210,16 +343,9 @@ class SegmentService:
             self.session.add(clip)
             await self.session.flush()
 
-            for event in events:
-                note = Note(
-                    clip_id=clip.id,
-                    pitch=event["pitch"],
-                    velocity=event["velocity"],
-                    start_tick=event["start_tick"] - start_bar * ticks_per_bar,  # Relative to clip
-                    duration_tick=event["duration_tick"],
-                    probability=1.0,
-                )
-                self.session.add(note)
+            await write_clip_notes(
+                self.session, clip, events, tick_offset=-start_bar * ticks_per_bar
+            )
 
             await self.session.flush()
             clip_data = {
@@ -240,25 +366,16 @@ class SegmentService:
         seed: int,
         model: ChordsModel,
         preview: bool,
+        progression: list[dict],
     ) -> tuple[dict, list[dict], list[dict]]:
-        """Generate chords segment."""
+        """Write (or preview) a chords segment from a generated progression."""
         track = await self._get_or_create_track(project.id, "chords", 0)
 
-        # Generate progression
-        progression = generate_chord_progression(
-            tonic=model.key,
-            mode=model.mode,
-            bars=length_bars,
-            seed=seed,
-            start_on="I",
-            prefer_circle_motion=model.progression_style == "circle_fifths",
-            cadence_ending=model.cadence_strength > 0.5,
-        )
-
         ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
 
         chord_events = []
         note_events = []
+        pending_chords = []
 
         if preview:
             clip_data = {
@@ -330,40 +447,33 @@ class SegmentService:
                     is_locked=chord_event_data["is_locked"],
                 )
                 self.session.add(chord_event)
-                await self.session.flush()
+                pending_chords.append((chord_event, chord_event_data))
+
+        if not preview:
+            # One flush assigns ids and column defaults to every chord event
+            await self.session.flush()
 
-                # Render chord to notes for playback
-                from midinecromancer.services.chord_render import render_chord_event_to_notes
+            # Render chords to notes for playback
+            from midinecromancer.services.chord_render import render_chord_events_to_notes
 
-                project_context = {
-                    "tonic": model.key,
-                    "mode": model.mode,
-                    "bpm": project.bpm,
-                    "time_signature_num": project.time_signature_num,
-                    "time_signature_den": project.time_signature_den,
-                }
-                rendered_notes = render_chord_event_to_notes(chord_event, project_context, seed)
-
-                for note_data in rendered_notes:
-                    note = Note(
-                        clip_id=clip.id,
-                        pitch=note_data["pitch"],
-                        velocity=note_data["velocity"],
-                        start_tick=note_data["start_tick"],
-                        duration_tick=note_data["duration_tick"],
-                        probability=1.0,
-                    )
-                    self.session.add(note)
-                    note_events.append(note_data)
-
-                chord_events.append(
-                    {
-                        "id": str(chord_event.id),
-                        **chord_event_data,
-                    }
+            project_context = {
+                "tonic": model.key,
+                "mode": model.mode,
+                "bpm": project.bpm,
+                "time_signature_num": project.time_signature_num,
+                "time_signature_den": project.time_signature_den,
+                "seed_scheme": project.seed_scheme,
+            }
+            note_events.extend(
+                render_chord_events_to_notes(
+                    [chord_event for chord_event, _ in pending_chords], project_context, seed
                 )
+            )
+            for chord_event, chord_event_data in pending_chords:
+                chord_events.append({"id": str(chord_event.id), **chord_event_data})
 
-        if not preview:
+            # Persist all rendered notes in one batch
+            await write_clip_notes(self.session, clip, note_events)
             await self.session.flush()
             clip_data = {
                 "id": str(clip.id),
@@ -383,32 +493,11 @@ class SegmentService:
         seed: int,
         model: BassModel,
         preview: bool,
+        events: list[dict],
     ) -> tuple[dict, list[dict]]:
-        """Generate bass segment."""
+        """Write (or preview) a bass segment from generated bass events."""
         track = await self._get_or_create_track(project.id, "bass", 1)
 
-        # Get chord progression for bass to follow
-        chord_progression = generate_chord_progression(
-            tonic=project.key_tonic,
-            mode=project.mode,
-            bars=length_bars,
-            seed=seed,
-        )
-
-        from midinecromancer.music.theory import Mode
-
-        events = generate_bassline(
-            tonic=project.key_tonic,
-            mode=project.mode,  # type: ignore[arg-type]
-            bars=length_bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            chord_progression=chord_progression,
-            seed=seed,
-            octave=model.octave,
-            syncopation=model.rhythmic_density,
-        )
-
         # Adjust start_tick
         ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
         for event in events:
@@ -437,16 +526,9 @@ class SegmentService:
             self.session.add(clip)
             await self.session.flush()
 
-            for event in events:
-                note = Note(
-                    clip_id=clip.id,
-                    pitch=event["pitch"],
-                    velocity=event["velocity"],
-                    start_tick=event["start_tick"] - start_bar * ticks_per_bar,
-                    duration_tick=event["duration_tick"],
-                    probability=1.0,
-                )
-                self.session.add(note)
+            await write_clip_notes(
+                self.session, clip, events, tick_offset=-start_bar * ticks_per_bar
+            )
 
             await self.session.flush()
             clip_data = {
@@ -467,31 +549,11 @@ class SegmentService:
         seed: int,
         model: MelodyModel,
         preview: bool,
+        events: list[dict],
     ) -> tuple[dict, list[dict]]:
-        """Generate melody segment."""
+        """Write (or preview) a melody segment from generated melody events."""
         track = await self._get_or_create_track(project.id, "melody", 2)
 
-        # Map range to octave
-        octave_map = {"narrow": 5, "medium": 5, "wide": 6}
-        octave = octave_map.get(model.range, 5)
-
-        # Map leapiness to stepwise_bias
-        stepwise_bias = 1.0 - model.leapiness
-
-        from midinecromancer.music.theory import Mode
-
-        events = generate_melody(
-            tonic=project.key_tonic,
-            mode=project.mode,  # type: ignore[arg-type]
-            bars=length_bars,
-            time_signature_num=project.time_signature_num,
-            time_signature_den=project.time_signature_den,
-            seed=seed,
-            octave=octave,
-            stepwise_bias=stepwise_bias,
-            leap_probability=model.leapiness,
-        )
-
         # Adjust start_tick and velocity
         ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
         for event in events:
@@ -520,16 +582,9 @@ class SegmentService:
             self.session.add(clip)
             await self.session.flush()
 
-            for event in events:
-                note = Note(
-                    clip_id=clip.id,
-                    pitch=event["pitch"],
-                    velocity=event["velocity"],
-                    start_tick=event["start_tick"] - start_bar * ticks_per_bar,
-                    duration_tick=event["duration_tick"],
-                    probability=1.0,
-                )
-                self.session.add(note)
+            await write_clip_notes(
+                self.session, clip, events, tick_offset=-start_bar * ticks_per_bar
+            )
 
             await self.session.flush()
             clip_data = {
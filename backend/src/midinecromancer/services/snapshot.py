@@ -0,0 +1,376 @@
+"""Read-only project snapshots loaded in a few batched queries.
+
+load_project_snapshot() loads a project with its tracks and clips, plus the
+clip bodies the caller declares it needs (Needs flags): one query per kind of
+row, whatever the number of tracks, clips or lanes. Rows are read as plain
+column tuples and copied into __slots__ objects, so nothing goes through ORM
+identity maps or attribute instrumentation, and the snapshot can be handed to
+the pure functions in music/ and midi/ (or to a thread) as is.
+
+Snapshot objects have the attributes of their model's columns plus the
+relationship attributes readers already use (clip.notes, clip.chord_events,
+lane.polyrhythm_profile, ...). Bodies that were not asked for are left unset,
+so reading one raises AttributeError instead of lazy loading.
+
+The snapshot is kept on the session for the rest of the request: asking again
+for the same project, window and revision filter with the same or fewer needs
+returns it without queries. Flushing, committing or rolling back the session
+forgets it, so a snapshot never outlives the session's own writes.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from enum import Flag, auto
+from typing import Any, ClassVar
+from uuid import UUID
+
+from sqlalchemy import and_, event, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from midinecromancer.models.chord_event import ChordEvent
+from midinecromancer.models.clip import Clip
+from midinecromancer.models.clip_chord_settings import ClipChordSettings
+from midinecromancer.models.clip_note_block import ClipNoteBlock
+from midinecromancer.models.clip_polyrhythm_lane import ClipPolyrhythmLane
+from midinecromancer.models.note import Note
+from midinecromancer.models.polyrhythm_profile import PolyrhythmProfile
+from midinecromancer.models.project import Project
+from midinecromancer.models.track import Track
+
+_MEMO_KEY = "project_snapshots"
+
+# Body attributes holding one object (None if the clip has none) rather than a tuple
+_SINGLE = frozenset({"note_block", "polyrhythm_profile", "chord_settings"})
+
+
+class Needs(Flag):
+    """Clip bodies a snapshot loads besides the project, track and clip rows."""
+
+    NONE = 0
+    NOTES = auto()  # note rows and packed note blocks
+    CHORD_EVENTS = auto()
+    LANES = auto()  # polyrhythm lanes, in order_index order
+    PROFILES = auto()  # polyrhythm profiles of the clips and their lanes
+    CHORD_SETTINGS = auto()
+
+
+def _columns(model: type) -> tuple[str, ...]:
+    return tuple(column.key for column in model.__table__.columns)
+
+
+class Snapshot:
+    """Read-only copy of a row; subclasses declare the column slots."""
+
+    __slots__ = ()
+    columns: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(self, **values: Any):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} id={getattr(self, 'id', None)}>"
+
+    @classmethod
+    def from_row(cls, row: Any, **relations: Any):
+        """Copy the column attributes of a row, ORM object or snapshot."""
+        values = {name: getattr(row, name) for name in cls.columns}
+        values.update(relations)
+        return cls(**values)
+
+    def replace(self, **changes: Any):
+        """Copy with some attributes changed."""
+        values = {
+            name: getattr(self, name)
+            for name in type(self).__slots__
+            if name not in changes and hasattr(self, name)
+        }
+        values.update(changes)
+        return type(self)(**values)
+
+
+class NoteSnapshot(Snapshot):
+    columns = _columns(Note)
+    __slots__ = columns
+
+
+class NoteBlockSnapshot(Snapshot):
+    """Packed notes; note_store.unpack_block() reads it like a ClipNoteBlock."""
+
+    columns = _columns(ClipNoteBlock)
+    __slots__ = columns
+
+
+class ChordEventSnapshot(Snapshot):
+    columns = _columns(ChordEvent)
+    __slots__ = columns
+
+
+class ProfileSnapshot(Snapshot):
+    columns = _columns(PolyrhythmProfile)
+    __slots__ = columns
+
+
+class LaneSnapshot(Snapshot):
+    columns = _columns(ClipPolyrhythmLane)
+    __slots__ = (*columns, "polyrhythm_profile")
+
+
+class ChordSettingsSnapshot(Snapshot):
+    columns = _columns(ClipChordSettings)
+    __slots__ = columns
+
+
+class ClipSnapshot(Snapshot):
+    """Clip with the bodies its snapshot was loaded with.
+
+    has_body is False for clips outside the snapshot's window or revision
+    filter; their body attributes are unset.
+    """
+
+    columns = _columns(Clip)
+    __slots__ = (
+        *columns,
+        "has_body",
+        "notes",
+        "note_block",
+        "chord_events",
+        "polyrhythm_lanes",
+        "polyrhythm_profile",
+        "chord_settings",
+    )
+
+
+class TrackSnapshot(Snapshot):
+    columns = _columns(Track)
+    __slots__ = (*columns, "clips")
+
+
+class ProjectSnapshot(Snapshot):
+    """Project with its tracks (by created_at) and their clips (by start bar)."""
+
+    columns = _columns(Project)
+    __slots__ = (*columns, "needs", "tracks")
+
+    def iter_clips(self) -> Iterable[ClipSnapshot]:
+        """Every clip of every track."""
+        for track in self.tracks:
+            yield from track.clips
+
+
+def window_clause(window: tuple[int, int]):
+    """SQL condition: the clip's bars overlap the window (from_bar, to_bar)."""
+    from_bar, to_bar = window
+    return (Clip.start_bar < to_bar) & (Clip.start_bar + Clip.length_bars > from_bar)
+
+
+async def _rows_by_clip(
+    session: AsyncSession, model: type, clip_ids: list[UUID], *order_by: Any
+) -> dict[UUID, list]:
+    result = await session.execute(
+        select(model.__table__).where(model.clip_id.in_(clip_ids)).order_by(*order_by)
+    )
+    rows: dict[UUID, list] = defaultdict(list)
+    for row in result:
+        rows[row.clip_id].append(row)
+    return rows
+
+
+async def load_project_snapshot(
+    session: AsyncSession,
+    project: Project | UUID,
+    needs: Needs = Needs.NONE,
+    *,
+    window: tuple[int, int] | None = None,
+    since_revision: int | None = None,
+) -> ProjectSnapshot | None:
+    """Load (or reuse) a read-only snapshot of a project.
+
+    Every track and clip is included; the needed bodies are only loaded for
+    clips overlapping window (if given) with a revision above since_revision
+    (if given).
+
+    Args:
+        session: Database session (the snapshot is memoized on it)
+        project: Project (its loaded columns are copied) or project id
+        needs: Clip bodies to load
+        window: (from_bar, to_bar) limiting which clips get bodies
+        since_revision: Only clips with a higher revision get bodies
+
+    Returns:
+        The snapshot, or None if the project does not exist
+    """
+    project_id = project if isinstance(project, UUID) else project.id
+    memo = session.info.setdefault(_MEMO_KEY, {})
+    key = (project_id, window, since_revision)
+    cached = memo.get(key)
+    if cached is not None:
+        if needs in cached.needs:
+            return cached
+        # Load the union so the memo keeps serving earlier callers
+        needs |= cached.needs
+
+    if isinstance(project, UUID):
+        result = await session.execute(select(Project.__table__).where(Project.id == project_id))
+        project = result.first()
+        if project is None:
+            return None
+
+    result = await session.execute(
+        select(Track.__table__).where(Track.project_id == project_id).order_by(Track.created_at)
+    )
+    track_rows = result.all()
+    clip_rows = []
+    if track_rows:
+        # Which clips get bodies is decided in SQL, alongside the clip rows
+        body_filter = []
+        if window is not None:
+            body_filter.append(window_clause(window))
+        if since_revision is not None:
+            body_filter.append(Clip.revision > since_revision)
+        result = await session.execute(
+            select(Clip.__table__, and_(true(), *body_filter).label("has_body"))
+            .where(Clip.track_id.in_([row.id for row in track_rows]))
+            .order_by(Clip.start_bar, Clip.created_at)
+        )
+        clip_rows = result.all()
+
+    body_ids = [row.id for row in clip_rows if row.has_body]
+    bodies: dict[str, dict[UUID, Any]] = {}
+    if body_ids:
+        bodies = await _load_bodies(session, needs, body_ids, clip_rows)
+
+    clips_by_track: dict[UUID, list[ClipSnapshot]] = defaultdict(list)
+    for row in clip_rows:
+        clip_values = dict(row._mapping)
+        if row.has_body:
+            for name, by_clip in bodies.items():
+                clip_values[name] = by_clip.get(row.id, None if name in _SINGLE else ())
+        clips_by_track[row.track_id].append(ClipSnapshot(**clip_values))
+
+    snapshot = ProjectSnapshot.from_row(
+        project,
+        needs=needs,
+        tracks=tuple(
+            TrackSnapshot(**row._mapping, clips=tuple(clips_by_track[row.id])) for row in track_rows
+        ),
+    )
+    memo[key] = snapshot
+    return snapshot
+
+
+async def load_clip_bodies(
+    session: AsyncSession, clips: Iterable[ClipSnapshot], needs: Needs
+) -> list[ClipSnapshot]:
+    """Copies of some clips of a snapshot with bodies loaded.
+
+    For callers that only need the bodies of a few clips chosen after
+    loading the snapshot; one query per kind of body, as for the snapshot.
+
+    Args:
+        session: Database session
+        clips: Clips to load bodies for
+        needs: Clip bodies to load
+
+    Returns:
+        The clips, in the same order, with has_body set
+    """
+    clips = list(clips)
+    if not clips:
+        return []
+    bodies = await _load_bodies(session, needs, [clip.id for clip in clips], clips)
+    return [
+        clip.replace(
+            has_body=True,
+            **{
+                name: by_clip.get(clip.id, None if name in _SINGLE else ())
+                for name, by_clip in bodies.items()
+            },
+        )
+        for clip in clips
+    ]
+
+
+async def _load_bodies(
+    session: AsyncSession, needs: Needs, clip_ids: list[UUID], clip_rows: list
+) -> dict[str, dict[UUID, Any]]:
+    """Body attributes of the clips, by attribute name and clip id."""
+    bodies: dict[str, dict[UUID, Any]] = {}
+    if Needs.NOTES in needs:
+        rows = await _rows_by_clip(session, Note, clip_ids)
+        bodies["notes"] = {
+            clip_id: tuple(NoteSnapshot(**row._mapping) for row in clip_notes)
+            for clip_id, clip_notes in rows.items()
+        }
+        rows = await _rows_by_clip(session, ClipNoteBlock, clip_ids)
+        bodies["note_block"] = {
+            clip_id: NoteBlockSnapshot(**blocks[0]._mapping) for clip_id, blocks in rows.items()
+        }
+    if Needs.CHORD_EVENTS in needs:
+        rows = await _rows_by_clip(session, ChordEvent, clip_ids)
+        bodies["chord_events"] = {
+            clip_id: tuple(ChordEventSnapshot(**row._mapping) for row in events)
+            for clip_id, events in rows.items()
+        }
+    if Needs.CHORD_SETTINGS in needs:
+        rows = await _rows_by_clip(session, ClipChordSettings, clip_ids)
+        bodies["chord_settings"] = {
+            clip_id: ChordSettingsSnapshot(**settings[0]._mapping)
+            for clip_id, settings in rows.items()
+        }
+
+    lane_rows: dict[UUID, list] = {}
+    if Needs.LANES in needs:
+        lane_rows = await _rows_by_clip(
+            session, ClipPolyrhythmLane, clip_ids, ClipPolyrhythmLane.order_index
+        )
+    profiles: dict[UUID, ProfileSnapshot] = {}
+    if Needs.PROFILES in needs:
+        wanted = set(clip_ids)
+        profile_ids = {
+            row.polyrhythm_profile_id
+            for row in clip_rows
+            if row.id in wanted and row.polyrhythm_profile_id is not None
+        }
+        profile_ids.update(row.polyrhythm_profile_id for rows in lane_rows.values() for row in rows)
+        if profile_ids:
+            result = await session.execute(
+                select(PolyrhythmProfile.__table__).where(PolyrhythmProfile.id.in_(profile_ids))
+            )
+            profiles = {row.id: ProfileSnapshot(**row._mapping) for row in result}
+        bodies["polyrhythm_profile"] = {
+            row.id: profiles.get(row.polyrhythm_profile_id)
+            for row in clip_rows
+            if row.id in wanted and row.polyrhythm_profile_id is not None
+        }
+    if Needs.LANES in needs:
+        with_profiles = Needs.PROFILES in needs
+        bodies["polyrhythm_lanes"] = {
+            clip_id: tuple(
+                LaneSnapshot(
+                    **row._mapping,
+                    **(
+                        {"polyrhythm_profile": profiles.get(row.polyrhythm_profile_id)}
+                        if with_profiles
+                        else {}
+                    ),
+                )
+                for row in rows
+            )
+            for clip_id, rows in lane_rows.items()
+        }
+    return bodies
+
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_snapshots(session: Session, *args: Any) -> None:
+    session.info.pop(_MEMO_KEY, None)
@@ -1,22 +1,28 @@
 """Service for suggestion operations."""
 
+from collections.abc import Iterable
+from itertools import islice
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from midinecromancer.music.analysis import analyze_project
-from midinecromancer.music.suggest import generate_all_suggestions
-from midinecromancer.models.chord_event import ChordEvent
+from midinecromancer.music.suggest import (
+    SUGGESTION_KINDS,
+    SuggestionContext,
+    SuggestionKind,
+    iter_ranked_suggestions,
+)
 from midinecromancer.models.clip import Clip
-from midinecromancer.models.clip_polyrhythm_lane import ClipPolyrhythmLane
 from midinecromancer.models.note import Note
 from midinecromancer.models.project import Project
 from midinecromancer.models.suggestion import Suggestion
 from midinecromancer.models.suggestion_commit import SuggestionCommit
 from midinecromancer.models.suggestion_run import SuggestionRun
 from midinecromancer.models.track import Track
+from midinecromancer.services.clip_analysis import analyze_project_snapshot
+from midinecromancer.services.polyrhythm import load_clip_lanes
+from midinecromancer.services.snapshot import Needs, load_project_snapshot
 
 
 class SuggestionService:
@@ -31,76 +37,63 @@ class SuggestionService:
         project_id: UUID,
         seed: int | None = None,
         params: dict | None = None,
+        kinds: Iterable[SuggestionKind] | None = None,
+        limit: int | None = None,
     ) -> SuggestionRun:
         """Create a suggestion run and generate suggestions.
 
+        The project is analyzed from per-clip summaries (services/clip_analysis.py),
+        so note bodies are only loaded for clips changed since their summary
+        was stored. Lanes are only loaded when rhythm suggestions are requested.
+
         Args:
             project_id: Project ID
             seed: Optional seed (uses project seed if not provided)
             params: Optional parameters (complexity, tension, density)
+            kinds: Suggestion kinds to generate (default: all)
+            limit: Keep only the best-scored suggestions (default: all)
 
         Returns:
             SuggestionRun with generated suggestions
         """
-        # Get project with tracks
-        result = await self.session.execute(
-            select(Project)
-            .where(Project.id == project_id)
-            .options(
-                selectinload(Project.tracks).selectinload(Track.clips).selectinload(Clip.notes)
-            )
-        )
-        project = result.scalar_one_or_none()
-        if not project:
+        # Each kind once, or its candidates would be built and stored twice
+        kinds = tuple(dict.fromkeys(kinds)) if kinds else SUGGESTION_KINDS
+        rhythm = "rhythm" in kinds
+        snapshot = await load_project_snapshot(self.session, project_id, Needs.CHORD_EVENTS)
+        if snapshot is None:
             raise ValueError(f"Project {project_id} not found")
+        project = snapshot
+        tracks = list(snapshot.tracks)
 
         actual_seed = seed if seed is not None else project.seed
         params = params or {}
 
-        # Get tracks with all data
-        result = await self.session.execute(
-            select(Track)
-            .where(Track.project_id == project_id)
-            .options(
-                selectinload(Track.clips).selectinload(Clip.notes),
-                selectinload(Track.clips).selectinload(Clip.chord_events),
-                selectinload(Track.clips).selectinload(Clip.polyrhythm_lanes),
-            )
-        )
-        tracks = list(result.scalars().all())
-
         # Analyze project
-        analysis = analyze_project(project, tracks)
+        analysis = await analyze_project_snapshot(self.session, snapshot, density=rhythm)
 
         # Collect chord events and lanes
         chord_events = []
-        lanes_data = []
+        drum_clips = []
         for track in tracks:
             if track.role == "chords":
                 for clip in track.clips:
                     chord_events.extend(clip.chord_events)
             if track.role == "drums":
-                for clip in track.clips:
-                    if (
-                        clip.grid_mode in ("polyrhythm", "polyrhythm_multi")
-                        and clip.polyrhythm_lanes
-                    ):
-                        for lane in clip.polyrhythm_lanes:
-                            lanes_data.append(
-                                {
-                                    "id": lane.id,
-                                    "name": lane.lane_name,
-                                    "steps": lane.polyrhythm_profile.steps
-                                    if lane.polyrhythm_profile
-                                    else 8,
-                                    "pulses": lane.polyrhythm_profile.pulses
-                                    if lane.polyrhythm_profile
-                                    else 4,
-                                    "rotation": lane.polyrhythm_profile.rotation
-                                    if lane.polyrhythm_profile
-                                    else 0,
-                                }
-                            )
+                drum_clips.extend(track.clips)
+        lanes_data = []
+        if rhythm:
+            lanes_by_clip = await load_clip_lanes(self.session, drum_clips, legacy=False)
+            lanes_data = [
+                {
+                    "id": str(lane.id),
+                    "name": lane.lane_name,
+                    "steps": lane.polyrhythm_profile.steps,
+                    "pulses": lane.polyrhythm_profile.pulses,
+                    "rotation": lane.polyrhythm_profile.rotation,
+                }
+                for clip in drum_clips
+                for lane in lanes_by_clip.get(clip.id, [])
+            ]
 
         # Build context
         context = {
@@ -110,8 +103,9 @@ class SuggestionService:
             "rhythmic_density": analysis.rhythmic_density,
         }
 
-        # Generate suggestions
-        suggestions_data = generate_all_suggestions(
+        # Generate suggestions, best first, stopping at the limit
+        suggestion_context = SuggestionContext.from_params(
+            params,
             analysis=analysis,
             project_id=project_id,
             project_seed=actual_seed,
@@ -121,8 +115,8 @@ class SuggestionService:
             bpm=project.bpm,
             chord_events=chord_events,
             lanes=lanes_data if lanes_data else None,
-            params=params,
         )
+        suggestions_data = islice(iter_ranked_suggestions(suggestion_context, kinds), limit)
 
         # Create run
         run = SuggestionRun(
@@ -134,9 +128,9 @@ class SuggestionService:
         self.session.add(run)
         await self.session.flush()
 
-        # Create suggestions
-        for sug_data in suggestions_data:
-            suggestion = Suggestion(
+        # Create suggestions (inserted together on commit)
+        self.session.add_all(
+            Suggestion(
                 run_id=run.id,
                 kind=sug_data.kind,
                 title=sug_data.title,
@@ -144,12 +138,41 @@ class SuggestionService:
                 score=sug_data.score,
                 payload_json=sug_data.to_dict()["payload_json"],
             )
-            self.session.add(suggestion)
+            for sug_data in suggestions_data
+        )
 
         await self.session.commit()
         await self.session.refresh(run)
         return run
 
+    async def list_suggestions(
+        self, run_id: UUID, offset: int = 0, limit: int | None = None
+    ) -> list[Suggestion]:
+        """Suggestions of a run, best first (score, then title).
+
+        Args:
+            run_id: Suggestion run ID
+            offset: Suggestions to skip
+            limit: Maximum number of suggestions (default: all)
+
+        Returns:
+            One page of suggestions
+
+        Raises:
+            ValueError: If the run does not exist
+        """
+        run = await self.session.get(SuggestionRun, run_id)
+        if run is None:
+            raise ValueError(f"Suggestion run {run_id} not found")
+        result = await self.session.execute(
+            select(Suggestion)
+            .where(Suggestion.run_id == run_id)
+            .order_by(Suggestion.score.desc(), Suggestion.title, Suggestion.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def commit_suggestion(self, suggestion_id: UUID) -> SuggestionCommit:
         """Commit a suggestion to the project.
 
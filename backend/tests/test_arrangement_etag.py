@@ -0,0 +1,34 @@
+"""Tests for arrangement ETag handling."""
+
+import uuid
+from types import SimpleNamespace
+
+from midinecromancer.api.projects import _etag_matches, arrangement_etag
+from midinecromancer.services import payloads
+
+
+def test_etag_changes_with_revision():
+    project_id = uuid.uuid4()
+    etag = arrangement_etag(SimpleNamespace(id=project_id, revision=3))
+    assert etag == f'"{project_id}.3"'
+    assert etag != arrangement_etag(SimpleNamespace(id=project_id, revision=4))
+
+
+def test_etag_differs_per_encoding():
+    project = SimpleNamespace(id=uuid.uuid4(), revision=3)
+    tags = {
+        arrangement_etag(project, media_type)
+        for media_type in (payloads.JSON, payloads.COLUMNS_JSON, payloads.MSGPACK)
+    }
+    assert len(tags) == 3
+
+
+def test_if_none_match():
+    etag = '"abc.3"'
+    assert _etag_matches('"abc.3"', etag)
+    assert _etag_matches('W/"abc.3"', etag)
+    assert _etag_matches('"abc.2", "abc.3"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"abc.2"', etag)
+    assert not _etag_matches(None, etag)
+    assert not _etag_matches("", etag)
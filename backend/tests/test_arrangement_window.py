@@ -0,0 +1,56 @@
+"""Tests for bar-window paging of the arrangement."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from midinecromancer.api.projects import arrangement_etag
+from midinecromancer.services.arrangement import (
+    WindowError,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    resolve_window,
+)
+
+
+def test_cursor_round_trip():
+    for window in [(0, 1), (16, 32), (480, 512)]:
+        cursor = encode_cursor(window)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == window
+
+
+@pytest.mark.parametrize("cursor", ["", "@@", "bm9wZQ", encode_cursor((8, 8)), "LTE6NA"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(WindowError):
+        decode_cursor(cursor)
+
+
+def test_resolve_window():
+    assert resolve_window(None, None, None, 64) is None
+    assert resolve_window(8, None, None, 64) == (8, 64)
+    assert resolve_window(None, 16, None, 64) == (0, 16)
+    assert resolve_window(70, None, None, 64) == (70, 71)
+    assert resolve_window(None, None, encode_cursor((16, 32)), 64) == (16, 32)
+    with pytest.raises(WindowError):
+        resolve_window(8, 8, None, 64)
+    with pytest.raises(WindowError):
+        resolve_window(0, None, encode_cursor((16, 32)), 64)
+
+
+def test_next_cursor_pages_to_the_end():
+    window = (0, 24)
+    pages = [window]
+    while (cursor := next_cursor(window, 64)) is not None:
+        window = decode_cursor(cursor)
+        pages.append(window)
+    assert pages == [(0, 24), (24, 48), (48, 72)]
+    assert next_cursor(None, 64) is None
+
+
+def test_etag_differs_per_window():
+    project = SimpleNamespace(id=uuid.uuid4(), revision=3)
+    assert arrangement_etag(project, window=(0, 16)) != arrangement_etag(project)
+    assert arrangement_etag(project, window=(0, 16)) != arrangement_etag(project, window=(16, 32))
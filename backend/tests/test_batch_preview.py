@@ -0,0 +1,130 @@
+"""Tests for batch multi-seed previews."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from midinecromancer.models.clip import Clip
+from midinecromancer.models.project import Project
+from midinecromancer.models.track import Track
+from midinecromancer.schemas.segment import SegmentCreateRequest, SegmentPreviewBatchRequest
+from midinecromancer.services.payloads import EventListPool
+from midinecromancer.services.regenerate import RegenerateService
+from midinecromancer.services.segments import SegmentService
+
+PROJECT = SimpleNamespace(
+    id=uuid.uuid4(),
+    seed=11,
+    seed_scheme="legacy",
+    bpm=120,
+    key_tonic="D",
+    mode="dorian",
+    time_signature_num=4,
+    time_signature_den=4,
+)
+TRACK = SimpleNamespace(id=uuid.uuid4(), project_id=PROJECT.id)
+CLIP = SimpleNamespace(id=uuid.uuid4(), track_id=TRACK.id, start_bar=2, length_bars=4)
+
+
+def test_event_list_pool_dedups_identical_lists():
+    pool = EventListPool()
+    first = [{"pitch": 36, "start_tick": 0}, {"pitch": 38, "start_tick": 480}]
+    assert pool.add(first) == 0
+    assert pool.add([{"start_tick": 0, "pitch": 36}, {"start_tick": 480, "pitch": 38}]) == 0
+    assert pool.add([{"pitch": 36, "start_tick": 0}]) == 1
+    assert pool.add([]) == 2
+    assert pool.add(list(first)) == 0
+    assert pool.lists == [first, [{"pitch": 36, "start_tick": 0}], []]
+
+
+def test_event_list_pool_keeps_order_significant():
+    pool = EventListPool()
+    events = [{"pitch": 36}, {"pitch": 38}]
+    assert pool.add(events) != pool.add(events[::-1])
+
+
+def test_preview_batch_request_limits_seeds():
+    base = {"project_id": uuid.uuid4(), "start_bar": 0, "length_bars": 4, "kinds": ["beats"]}
+    assert SegmentPreviewBatchRequest(**base, seeds=[1, 2]).seeds == [1, 2]
+    with pytest.raises(ValidationError):
+        SegmentPreviewBatchRequest(**base, seeds=[])
+    with pytest.raises(ValidationError):
+        SegmentPreviewBatchRequest(**base, seeds=list(range(65)))
+
+
+class FakeSession:
+    """Serves the clip context by model and answers track lookups with TRACK."""
+
+    def __init__(self):
+        self.rows = {Clip: CLIP, Track: TRACK, Project: PROJECT}
+        self.gets = 0
+        self.queries = 0
+
+    async def get(self, model, ident):
+        self.gets += 1
+        return self.rows[model]
+
+    async def execute(self, statement):
+        self.queries += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: TRACK)
+
+
+@pytest.mark.parametrize("kind", ["beats", "chords", "bass", "melody"])
+async def test_regenerate_variants_match_single_previews(kind):
+    session = FakeSession()
+    seeds, variations = [1, 2, 1, None], [0.0, 0.5]
+    batch = await RegenerateService(session).preview_variants(CLIP.id, kind, seeds, variations)
+    # One context load for all eight variants
+    assert session.gets == 3
+    assert len(batch["variants"]) == 8
+    assert any(batch["event_lists"])
+
+    for variant in batch["variants"]:
+        single = await RegenerateService(FakeSession()).regenerate_clip(
+            CLIP.id, kind, seed=variant["seed"], variation=variant["variation"], preview=True
+        )
+        keys = [key for key in ("events", "chord_events", "note_events") if key in single]
+        assert keys and all(key in variant for key in keys)
+        for key in keys:
+            assert batch["event_lists"][variant[key]] == single[key]
+
+    by_combo = {(v["seed"], v["variation"]): v for v in batch["variants"]}
+    assert by_combo[(PROJECT.seed, 0.0)]["seed_used"] != by_combo[(1, 0.0)]["seed_used"]
+    first, repeated = batch["variants"][0], batch["variants"][4]
+    assert (first["seed"], first["variation"]) == (repeated["seed"], repeated["variation"])
+    assert all(first[key] == repeated[key] for key in keys)
+
+
+async def test_segment_variants_match_single_previews():
+    base = {
+        "project_id": PROJECT.id,
+        "start_bar": 4,
+        "length_bars": 2,
+        "kinds": ["beats", "chords", "bass", "melody"],
+    }
+    session = FakeSession()
+    batch = await SegmentService(session).preview_variants(
+        SegmentPreviewBatchRequest(**base, seeds=[3, 8, 3])
+    )
+    # The project once, each track once
+    assert (session.gets, session.queries) == (1, 4)
+    assert any(batch.event_lists)
+
+    for variant in batch.variants:
+        single = await SegmentService(FakeSession()).generate_segments(
+            SegmentCreateRequest(**base, seed=variant.seed, preview=True)
+        )
+        assert variant.clips == single.clips
+        assert {
+            clip_id: batch.event_lists[index] for clip_id, index in variant.events_by_clip.items()
+        } == single.events_by_clip
+        assert {
+            clip_id: batch.event_lists[index] for clip_id, index in variant.chords_by_clip.items()
+        } == single.chords_by_clip
+
+    first, second, repeated = batch.variants
+    assert repeated.events_by_clip == first.events_by_clip
+    assert repeated.chords_by_clip == first.chords_by_clip
+    assert second.events_by_clip != first.events_by_clip
@@ -0,0 +1,50 @@
+"""Tests for bulk note/chord persistence helpers."""
+
+import uuid
+from types import SimpleNamespace
+
+from midinecromancer.db.bulk import note_rows
+
+CLIP_ID = uuid.UUID("00000000-0000-0000-0000-000000000007")
+
+
+def test_note_rows_from_dicts():
+    """Dict events become complete rows with clip-relative ticks."""
+    rows = note_rows(
+        CLIP_ID,
+        [
+            {"pitch": 36, "velocity": 100, "start_tick": 1920, "duration_tick": 120},
+            {
+                "pitch": 42,
+                "velocity": 80,
+                "start_tick": 2400,
+                "duration_tick": 60,
+                "probability": 0.5,
+            },
+        ],
+        tick_offset=-1920,
+    )
+    assert [(r["pitch"], r["start_tick"], r["probability"]) for r in rows] == [
+        (36, 0, 1.0),
+        (42, 480, 0.5),
+    ]
+    assert all(r["clip_id"] == CLIP_ID for r in rows)
+    assert len({r["id"] for r in rows}) == 2
+    assert rows[0]["created_at"] == rows[1]["created_at"]
+
+
+def test_note_rows_from_objects():
+    """Note-like objects (e.g. rendered NoteEvents) default probability to 1.0."""
+    event = SimpleNamespace(pitch=60, velocity=90, start_tick=0, duration_tick=480)
+    (row,) = note_rows(CLIP_ID, [event])
+    assert row["probability"] == 1.0
+    assert set(row) == {
+        "id",
+        "clip_id",
+        "pitch",
+        "velocity",
+        "start_tick",
+        "duration_tick",
+        "probability",
+        "created_at",
+    }
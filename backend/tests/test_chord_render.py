@@ -0,0 +1,144 @@
+"""Tests for batch chord event rendering."""
+
+from decimal import Decimal
+from itertools import product
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from midinecromancer.music.chord_patterns import (
+    render_chord_event_to_notes,
+    render_clip_chord_events,
+)
+from midinecromancer.services import chord_render
+
+ROMANS = ["i", "iv", "V7", "i", "VI", "VII", "iv", "V7"]
+PATTERNS = [
+    {"pattern_type": "block"},
+    {"pattern_type": "strum", "strum_direction": "down", "strum_beats": Decimal("0.25")},
+    {"pattern_type": "strum", "strum_direction": "up", "strum_beats": Decimal("0.5")},
+    {
+        "pattern_type": "strum",
+        "strum_direction": "alternate",
+        "strum_beats": Decimal("0.25"),
+        "strum_spread": Decimal("1.5"),
+    },
+    {"pattern_type": "strum", "strum_direction": "random", "strum_beats": Decimal("0.25")},
+    {"pattern_type": "comp", "comp_pattern": None, "retrigger": True},
+    {
+        "pattern_type": "comp",
+        "comp_pattern": {
+            "grid": "1/16",
+            "steps": [0, 1, 1, 0, 1, 0, 0, 1],
+            "accent": [1.0, 0.7, 1.2],
+            "swing": 0.3,
+        },
+        "retrigger": True,
+    },
+    {"pattern_type": "comp", "comp_pattern": {"steps": [0, 0, 1]}, "retrigger": False},
+    {"pattern_type": "arp"},
+]
+EXPRESSION = [
+    {},
+    {"humanize_beats": Decimal("0.125"), "velocity_jitter": 12, "velocity_curve": "down"},
+    {"intensity": Decimal("1.20"), "velocity_curve": "swell", "duration_gate": Decimal("0.50")},
+    {"voicing": "drop2", "inversion": 1, "velocity_curve": "up", "velocity_jitter": None},
+    {"voicing": "open", "inversion": 2, "humanize_beats": Decimal("1.0")},
+]
+
+
+def chord_event(index: int, roman: str, **fields) -> SimpleNamespace:
+    event = {
+        "id": UUID(int=index + 1),
+        "start_tick": index * 1920,
+        "duration_tick": 1920,
+        "roman_numeral": roman,
+        "intensity": Decimal("0.85"),
+        "voicing": "root",
+        "inversion": 0,
+        "strum_ms": 0,
+        "humanize_ms": 0,
+        "strum_beats": Decimal("0.0"),
+        "humanize_beats": Decimal("0.0"),
+        "pattern_type": "block",
+        "duration_gate": Decimal("0.85"),
+        "velocity_curve": "flat",
+        "velocity_jitter": 0,
+        "comp_pattern": None,
+        "strum_direction": "down",
+        "strum_spread": Decimal("1.0"),
+        "retrigger": False,
+    }
+    event.update(fields)
+    return SimpleNamespace(**event)
+
+
+def clip_events() -> list[SimpleNamespace]:
+    combos = product(PATTERNS, EXPRESSION)
+    return [
+        chord_event(index, ROMANS[index % len(ROMANS)], **pattern, **expression)
+        for index, (pattern, expression) in enumerate(combos)
+    ]
+
+
+def context(seed_scheme: str) -> dict:
+    return {
+        "tonic": "A",
+        "mode": "aeolian",
+        "bpm": 92,
+        "time_signature_num": 4,
+        "time_signature_den": 4,
+        "seed_scheme": seed_scheme,
+    }
+
+
+@pytest.mark.parametrize("seed_scheme", ["legacy", "tree"])
+def test_clip_render_matches_per_event_render(seed_scheme):
+    events = clip_events()
+    project_context = context(seed_scheme)
+    expected = [
+        note
+        for event in events
+        for note in render_chord_event_to_notes(event, project_context, 4242)
+    ]
+    assert expected
+    assert render_clip_chord_events(events, project_context, 4242) == expected
+    # Repeated chords reuse cached voicings and patterns
+    assert render_clip_chord_events(events * 2, project_context, 4242) == expected * 2
+
+
+@pytest.mark.parametrize("seed_scheme", ["legacy", "tree"])
+def test_service_batch_render_matches_per_event_render(seed_scheme):
+    events = [
+        chord_event(
+            index,
+            roman,
+            strum_beats=strum,
+            humanize_beats=humanize,
+            strum_ms=25,
+            humanize_ms=10,
+            velocity_jitter=jitter,
+        )
+        for index, (roman, strum, humanize, jitter) in enumerate(
+            product(
+                ROMANS[:4], [Decimal("0.0"), Decimal("0.25"), None], [Decimal("0.1"), None], [0, 9]
+            )
+        )
+    ]
+    project_context = context(seed_scheme)
+    expected = [
+        note
+        for event in events
+        for note in chord_render.render_chord_event_to_notes(event, project_context, 77)
+    ]
+    assert chord_render.render_chord_events_to_notes(events, project_context, 77) == expected
+
+
+def test_voice_roman():
+    assert chord_render.voice_roman("C", "ionian", "V7", "root", 0) == tuple(
+        chord_render.apply_voicing([67, 71, 74, 77], "root", 0)
+    )
+    assert chord_render.voice_roman("C", "ionian", "I", "drop2", 1) == tuple(
+        chord_render.apply_voicing([60, 64, 67], "drop2", 1)
+    )
@@ -0,0 +1,61 @@
+"""Tests for the beam-search chord progression engine."""
+
+from midinecromancer.music.chord_search import chord_slots, parse_locks, search_progressions
+from midinecromancer.music.chords_generate import generate_progression_candidates
+
+CONTEXT = {"tonic": "C", "mode": "ionian", "bars": 8}
+
+
+def test_chord_slots_follow_harmonic_rhythm():
+    assert chord_slots(4) == [(0, 1), (1, 1), (2, 1), (3, 1)]
+    assert chord_slots(2, "2chords/bar") == [(0, 0.5), (0.5, 0.5), (1.0, 0.5), (1.5, 0.5)]
+    assert chord_slots(5, "slow") == [(0, 2), (2, 2), (4, 1)]
+
+
+def test_parse_locks_accepts_json_keys():
+    slots = chord_slots(8, "slow")
+    assert parse_locks({"3": "IV", 4: "V", "x": "I", "20": "vi"}, slots) == {1: "IV", 2: "V"}
+
+
+def test_locks_are_hard_constraints():
+    locks = {"0": "vi", "3": "iii", "6": "V7"}
+    candidates = generate_progression_candidates(CONTEXT, {}, locks=locks, seed=3)
+    assert len(candidates) == 5
+    for candidate in candidates:
+        romans = [chord["roman_numeral"] for chord in candidate.progression]
+        assert romans[0] == "vi"
+        assert romans[3] == "iii"
+        assert romans[6] == "V7"
+
+
+def test_candidates_are_distinct_and_sorted():
+    candidates = generate_progression_candidates(
+        CONTEXT, {"style": "piano"}, seed=7, num_candidates=8
+    )
+    assert len(candidates) == 8
+    progressions = [tuple(c["roman_numeral"] for c in cand.progression) for cand in candidates]
+    assert len(set(progressions)) == 8
+    scores = [candidate.score for candidate in candidates]
+    assert scores == sorted(scores, reverse=True)
+    chord = candidates[0].progression[0]
+    assert chord["pattern_type"] == "comp"
+    assert chord["start_bar"] == 0
+    assert chord["length_bars"] == 1
+
+
+def test_search_is_deterministic_and_ends_with_cadence():
+    first = search_progressions(bars=16, mode="ionian", seed=11)
+    second = search_progressions(bars=16, mode="ionian", seed=11)
+    assert first.candidates == second.candidates
+    degrees = first.candidates[0][1]
+    assert degrees[-2:] == (5, 1)
+    assert first.explored > 16 * 7
+
+
+def test_time_budget_still_returns_candidates():
+    result = search_progressions(
+        bars=64, mode="aeolian", seed=1, harmonic_rhythm="2chords/bar", time_budget_ms=0.001
+    )
+    assert result.budget_exceeded
+    assert len(result.candidates) == 5
+    assert all(len(degrees) == 128 for _, degrees in result.candidates)
@@ -0,0 +1,211 @@
+"""Tests for per-clip analysis summaries and their cache."""
+
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+import midinecromancer.main  # noqa: F401  (configures the ORM mappers)
+from midinecromancer.music.analysis import (
+    ClipSummary,
+    analyze_project,
+    merge_clip_summaries,
+    summarize_clip,
+)
+from midinecromancer.services import clip_analysis
+from midinecromancer.services.clip_analysis import SUMMARY_VERSION, load_clip_summaries
+from midinecromancer.services.note_store import PACKED_FORMAT_VERSION, PackedNotes
+
+PROJECT = SimpleNamespace(key_tonic="D", mode="dorian", bars=8)
+
+
+def _note(pitch, start_tick):
+    return SimpleNamespace(pitch=pitch, velocity=100, start_tick=start_tick, duration_tick=120)
+
+
+def _chord(roman, start_tick):
+    return SimpleNamespace(roman_numeral=roman, chord_name=roman, start_tick=start_tick)
+
+
+def _clip(notes=(), chord_events=(), **values):
+    clip = SimpleNamespace(id=uuid.uuid4(), revision=1, length_bars=4, note_block=None)
+    vars(clip).update(values, notes=list(notes), chord_events=list(chord_events))
+    return clip
+
+
+def test_summarize_clip():
+    clip = _clip(
+        notes=[_note(60, 0), _note(64, 0), _note(72, 480)],
+        chord_events=[_chord("V", 1920), _chord("I", 0)],
+    )
+    summary = summarize_clip(clip)
+    assert (summary.note_count, summary.onset_count) == (3, 2)
+    assert summary.pitch_class_histogram[0] == 2 and summary.pitch_class_histogram[4] == 1
+    assert [f["roman_numeral"] for f in summary.chord_functions] == ["I", "V"]
+
+    assert summarize_clip(clip, notes=False).note_count == 0
+    assert summarize_clip(clip, chords=False).chord_functions == ()
+
+
+def test_summarize_packed_clip():
+    packed = PackedNotes.from_events(
+        [
+            {"pitch": 36, "velocity": 100, "start_tick": 0, "duration_tick": 60},
+            {"pitch": 38, "velocity": 100, "start_tick": 480, "duration_tick": 60},
+        ]
+    )
+    block = SimpleNamespace(
+        format_version=PACKED_FORMAT_VERSION, note_count=len(packed), data=packed.to_bytes()
+    )
+    summary = summarize_clip(_clip(note_block=block))
+    assert (summary.note_count, summary.onset_count) == (2, 2)
+
+
+def test_merge_clip_summaries():
+    first = ClipSummary(
+        chord_functions=(
+            {"roman_numeral": "vi", "chord_name": "a", "start_tick": 0},
+            {"roman_numeral": "iv", "chord_name": "b", "start_tick": 960},
+        )
+    )
+    second = ClipSummary(
+        chord_functions=({"roman_numeral": "V", "chord_name": "c", "start_tick": 960},)
+    )
+    drums = ClipSummary(note_count=16, onset_count=8, pitch_class_histogram=(16,) + (0,) * 11)
+    bass = ClipSummary(note_count=4, onset_count=4, pitch_class_histogram=(0, 0, 4) + (0,) * 9)
+    analysis = merge_clip_summaries(
+        PROJECT,
+        [
+            ("chords", 4, first),
+            ("chords", 4, second),
+            ("drums", 2, drums),
+            ("drums", 2, drums),
+            ("bass", 4, bass),
+        ],
+    )
+    # First chord of the first chord clip decides the key
+    assert (analysis.detected_key, analysis.detected_mode) == ("D", "dorian")
+    # Equal start ticks keep clip order
+    assert [f["chord_name"] for f in analysis.chord_functions] == ["a", "b", "c"]
+    assert analysis.harmonic_rhythm == 2 / 8
+    assert analysis.rhythmic_density == {"drums": 8.0}
+    assert analysis.onset_density == {"chords": 0.0, "drums": 4.0, "bass": 1.0}
+    assert analysis.pitch_class_histogram[2] == 4 and analysis.pitch_class_histogram[0] == 0
+
+    analysis = merge_clip_summaries(PROJECT, [("drums", 2, drums)], density=False)
+    assert analysis.rhythmic_density == {} and analysis.onset_density == {}
+    assert analysis.pitch_class_histogram == [0] * 12
+
+
+def test_analyze_project_merges_summaries():
+    tracks = [
+        SimpleNamespace(
+            role="chords", clips=[_clip(chord_events=[_chord("I", 0), _chord("IV", 1920)])]
+        ),
+        SimpleNamespace(
+            role="drums", clips=[_clip(notes=[_note(36, t) for t in range(0, 1920, 240)])]
+        ),
+    ]
+    analysis = analyze_project(PROJECT, tracks)
+    assert (analysis.detected_key, analysis.detected_mode) == ("D", "ionian")
+    assert analysis.rhythmic_density == {"drums": 2.0}
+    assert [f["roman_numeral"] for f in analysis.chord_functions] == ["I", "IV"]
+
+
+class FakeSession:
+    """Answers the clip_analyses query with stored rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return iter(self.rows)
+
+
+async def test_only_stale_summaries_are_recomputed(monkeypatch):
+    fresh = _clip(revision=3)
+    edited = _clip(revision=5, chord_events=[_chord("ii", 0)])
+    new = _clip(notes=[_note(60, 0)])
+    stored = [
+        SimpleNamespace(
+            clip_id=clip.id,
+            clip_revision=3,
+            summary_version=SUMMARY_VERSION,
+            note_count=7,
+            onset_count=7,
+            pitch_class_histogram=[7] + [0] * 11,
+            chord_functions=[],
+        )
+        for clip in (fresh, edited)
+    ]
+    loaded, persisted = [], {}
+
+    async def load_clip_bodies(session, clips, needs):
+        loaded.extend(clips)
+        return clips
+
+    async def persist(summaries):
+        persisted.update(summaries)
+
+    monkeypatch.setattr(clip_analysis, "load_clip_bodies", load_clip_bodies)
+    monkeypatch.setattr(clip_analysis, "_persist_summaries", persist)
+    monkeypatch.setattr(clip_analysis, "has_pending_changes", lambda session: False)
+
+    session = FakeSession(stored)
+    summaries = await load_clip_summaries(session, [fresh, edited, new])
+    assert session.queries == 1
+    assert loaded == [edited, new]
+    assert summaries[fresh.id].note_count == 7
+    assert summaries[edited.id].chord_functions[0]["roman_numeral"] == "ii"
+    assert summaries[new.id].note_count == 1
+    assert persisted == {edited.id: (5, summaries[edited.id]), new.id: (1, summaries[new.id])}
+
+
+class FakeCacheSession:
+    """Records upserts, failing on the statements listed in fail."""
+
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.batches = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        # Seven bound values per summary row
+        self.batches.append(len(statement.compile().params) // 7)
+        if len(self.batches) in self.fail:
+            raise self.fail[len(self.batches)]
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+async def test_summaries_are_written_in_batches(monkeypatch):
+    summaries = {uuid.uuid4(): (1, ClipSummary()) for _ in range(5)}
+    monkeypatch.setattr(clip_analysis, "WRITE_BATCH_SIZE", 2)
+
+    cache_session = FakeCacheSession()
+    monkeypatch.setattr(clip_analysis, "AsyncSessionLocal", lambda: cache_session)
+    await clip_analysis._persist_summaries(summaries)
+    assert cache_session.batches == [2, 2, 1] and cache_session.commits == 3
+
+    # A deleted clip only loses its own batch; other errors stop the write quietly
+    cache_session = FakeCacheSession(
+        fail={
+            1: IntegrityError("insert", {}, Exception()),
+            3: OperationalError("", {}, Exception()),
+        }
+    )
+    monkeypatch.setattr(clip_analysis, "AsyncSessionLocal", lambda: cache_session)
+    await clip_analysis._persist_summaries(summaries)
+    assert cache_session.batches == [2, 2, 1] and cache_session.commits == 1
@@ -0,0 +1,41 @@
+"""Tests for database engine configuration."""
+
+from sqlalchemy.pool import NullPool
+
+from midinecromancer.config import Settings
+from midinecromancer.db.base import engine_options
+
+URL = "postgresql+asyncpg://user:pw@localhost:5432/db"
+
+
+def test_queue_pool_options():
+    options = engine_options(
+        Settings(database_url=URL, debug=False, db_pool_size=8, db_max_overflow=2)
+    )
+    assert "poolclass" not in options
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 1800
+    assert options["connect_args"] == {"prepared_statement_cache_size": 500}
+
+
+def test_null_pool_has_no_pool_sizing():
+    options = engine_options(Settings(database_url=URL, db_pool="null"))
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+    assert "max_overflow" not in options
+
+
+def test_statement_cache_disabled_for_pgbouncer():
+    options = engine_options(Settings(database_url=URL, db_pool="null", db_statement_cache_size=0))
+    connect_args = options["connect_args"]
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_non_asyncpg_url_gets_no_driver_args():
+    options = engine_options(Settings(database_url="sqlite+aiosqlite:///:memory:"))
+    assert "connect_args" not in options
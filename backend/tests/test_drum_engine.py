@@ -0,0 +1,130 @@
+"""Tests for the drum engines of generate_drum_pattern_v2."""
+
+import hashlib
+import json
+from collections import Counter
+
+import pytest
+
+from midinecromancer.music.drum_engine import STREAM_LENGTH, UNIT, bar_stream
+from midinecromancer.music.drums import DrumMap, generate_drum_pattern_v2
+
+# sha256 of the sorted-key JSON of 16-bar compat patterns, recorded before the
+# fast engine was added; compat output must never change
+COMPAT_DIGESTS = [
+    (
+        {"seed": 42},
+        "c1513f879bf885cd3b2b2d117e3e30a97e810f19a6217e401c0f1bc6f4d94cd7",
+    ),
+    (
+        {
+            "seed": 7,
+            "style": "trap",
+            "hat_mode": "roll",
+            "swing": 0.5,
+            "pause_probability": 0.2,
+            "pause_scope": "all",
+            "fill_probability": 1.0,
+            "syncopation": 0.5,
+        },
+        "69aec7547d332c8cd34016000ead0c82f58a231b86ec34b6643fabbee417571f",
+    ),
+    (
+        {"seed": 123, "style": "drill", "hat_mode": "skip_step", "density": 0.4},
+        "040e1410b8c0e828ac92d87a09c82443b6ed6f26af138d64457953fb9510a598",
+    ),
+]
+
+
+def _pattern(bars=16, **kwargs):
+    return generate_drum_pattern_v2(
+        bars=bars, time_signature_num=4, time_signature_den=4, drum_map=DrumMap(), **kwargs
+    )
+
+
+@pytest.mark.parametrize("kwargs,digest", COMPAT_DIGESTS)
+def test_compat_output_unchanged(kwargs, digest):
+    """Compat (the default) reproduces the recorded patterns exactly."""
+    events = _pattern(**kwargs)
+    assert events == _pattern(engine="compat", **kwargs)
+    assert hashlib.sha256(json.dumps(events, sort_keys=True).encode()).hexdigest() == digest
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        _pattern(seed=1, engine="numpy")
+
+
+def test_bar_stream():
+    """Draws are pure functions of (seed, bar, role) and roughly uniform."""
+    draws = bar_stream(42, 3, "kick")
+    assert len(draws) == STREAM_LENGTH
+    assert draws == bar_stream(42, 3, "kick")
+    assert draws != bar_stream(42, 4, "kick")
+    assert draws != bar_stream(42, 3, "snare")
+    assert draws != bar_stream(43, 3, "kick")
+    samples = [draw for bar in range(100) for draw in bar_stream(7, bar, "hats")]
+    assert all(0 <= draw < UNIT for draw in samples)
+    assert 0.47 < sum(samples) / len(samples) / UNIT < 0.53
+
+
+@pytest.mark.parametrize("hat_mode", ["straight_8", "straight_16", "skip_step", "roll"])
+def test_fast_determinism(hat_mode):
+    kwargs = {
+        "seed": 12345,
+        "hat_mode": hat_mode,
+        "swing": 0.3,
+        "fill_probability": 0.5,
+        "syncopation": 0.2,
+        "engine": "fast",
+    }
+    assert _pattern(**kwargs) == _pattern(**kwargs)
+    assert _pattern(**kwargs) != _pattern(**{**kwargs, "seed": 12346})
+
+
+def test_fast_bars_independent():
+    """A bar's kick, snare and hat hits do not depend on the pattern length."""
+    short = _pattern(bars=4, seed=99, ghost_notes=False, engine="fast")
+    long = _pattern(bars=32, seed=99, ghost_notes=False, engine="fast")
+
+    def key(event):
+        return tuple(sorted(event.items()))
+
+    remaining = Counter(key(event) for event in long)
+    remaining.subtract(key(event) for event in short)
+    assert min(remaining.values()) >= 0
+
+
+def test_fast_events():
+    """Fast output is sorted, uses DrumMap pitches and stays in velocity ranges."""
+    drum_map = DrumMap(kick_note=35, snare_note=40, closed_hat_note=44)
+    events = generate_drum_pattern_v2(
+        bars=64,
+        time_signature_num=4,
+        time_signature_den=4,
+        seed=5,
+        drum_map=drum_map,
+        ghost_note_probability=0.2,
+        engine="fast",
+    )
+    assert [e["start_tick"] for e in events] == sorted(e["start_tick"] for e in events)
+    expected = {"kick": {35}, "snare": {40}, "ghost": {40}, "closed_hat": {44}}
+    for event in events:
+        assert event["pitch"] in expected[event["role"]]
+        assert event["start_tick"] >= 0
+        assert 0 <= event["velocity"] <= 127
+        if event["role"] == "ghost":
+            assert 40 <= event["velocity"] < 60
+        elif event["role"] == "closed_hat":
+            assert 70 <= event["velocity"] < 110
+
+
+def test_fast_density():
+    """Hit counts track density like the compat engine."""
+    bars = 128
+    for density in (0.3, 0.9):
+        fast = _pattern(bars=bars, seed=3, density=density, ghost_notes=False, engine="fast")
+        hats = sum(1 for event in fast if event["role"] == "closed_hat")
+        assert abs(hats / (bars * 16) - density) < 0.05
+        snares = sum(1 for event in fast if event["role"] == "snare")
+        assert abs(snares / (bars * 2) - density) < 0.1
@@ -0,0 +1,125 @@
+"""Tests for the windowed note index."""
+
+import random
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+import midinecromancer.main  # noqa: F401  (configures the ORM mappers)
+from midinecromancer.services.event_index import ClipEventIndex, EventIndexCache, window_notes
+from midinecromancer.services.note_store import PACKED_FORMAT_VERSION, PackedNotes
+from midinecromancer.services.snapshot import ClipSnapshot
+
+
+def note(start_tick: int, duration_tick: int, pitch: int = 60) -> SimpleNamespace:
+    return SimpleNamespace(
+        start_tick=start_tick, duration_tick=duration_tick, pitch=pitch, velocity=100
+    )
+
+
+def brute_force(notes, from_tick, to_tick):
+    return [
+        n
+        for n in sorted(notes, key=lambda n: n.start_tick)
+        if n.start_tick < to_tick and n.start_tick + max(n.duration_tick, 1) > from_tick
+    ]
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 8, 9, 31, 64, 100, 1000])
+def test_overlapping_matches_brute_force(count):
+    rng = random.Random(count)
+    notes = [
+        note(rng.randrange(0, 20000), rng.choice([0, 60, 240, 480, 1920, 7680]), i % 128)
+        for i in range(count)
+    ]
+    index = ClipEventIndex(notes)
+    assert len(index) == count
+    for _ in range(200):
+        from_tick = rng.randrange(-500, 21000)
+        to_tick = from_tick + rng.randrange(1, 4000)
+        assert index.overlapping(from_tick, to_tick) == brute_force(notes, from_tick, to_tick)
+
+
+def test_overlapping_window_edges():
+    held = note(0, 4000)
+    index = ClipEventIndex([note(3000, 480), held, note(1920, 0), note(1920, 480), note(960, 960)])
+    # Held from before the window
+    assert index.overlapping(2000, 2500) == [held, index.notes[3]]
+    # Ends exactly at the window start, starts exactly at its end
+    assert [n.start_tick for n in index.overlapping(1920, 3000)] == [0, 1920, 1920]
+    assert index.overlapping(500, 500) == []
+    # Sorted by start tick, ties in storage order
+    assert [n.duration_tick for n in index.overlapping(1920, 1921)] == [4000, 0, 480]
+
+
+def test_packed_rows_are_indexed():
+    clip_id = uuid4()
+    packed = PackedNotes.from_events(
+        [
+            {"pitch": 60, "velocity": 90, "start_tick": 960, "duration_tick": 480},
+            {"pitch": 64, "velocity": 90, "start_tick": 0, "duration_tick": 1920},
+        ]
+    )
+    index = ClipEventIndex(packed.rows(clip_id))
+    assert [n.pitch for n in index.overlapping(1000, 1100)] == [64, 60]
+
+
+def test_cache_rebuilds_on_revision_change():
+    cache = EventIndexCache(maxsize=2)
+    clip = SimpleNamespace(id=uuid4(), revision=3, notes=[note(0, 480)], note_block=None)
+    index = cache.get(clip)
+    assert cache.get(clip) is index
+    assert cache.stats()["hits"] == 1
+
+    clip.notes = [note(0, 480), note(480, 480)]
+    clip.revision = 4
+    rebuilt = cache.get(clip)
+    assert rebuilt is not index
+    assert len(rebuilt) == 2
+
+    for _ in range(2):
+        cache.get(SimpleNamespace(id=uuid4(), revision=0, notes=[], note_block=None))
+    assert len(cache) == 2
+    assert cache.get(clip) is not rebuilt
+
+
+class FakeSession:
+    """Answers window_notes()' clip, note row and block queries in turn."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    async def execute(self, statement):
+        return FakeResult(self.results.pop(0))
+
+
+class FakeResult(list):
+    def scalars(self):
+        return self
+
+
+async def test_window_merges_rows_of_packed_clips():
+    clip_id = uuid4()
+    columns = dict.fromkeys(ClipSnapshot.columns, 0)
+    clip = SimpleNamespace(**columns | {"id": clip_id, "revision": 1}, base_tick=0, packed=True)
+    packed = PackedNotes.from_events(
+        [
+            {"pitch": 60, "velocity": 90, "start_tick": 0, "duration_tick": 480},
+            {"pitch": 62, "velocity": 90, "start_tick": 960, "duration_tick": 480},
+        ]
+    )
+    block = SimpleNamespace(
+        clip_id=clip_id,
+        format_version=PACKED_FORMAT_VERSION,
+        note_count=len(packed),
+        data=packed.to_bytes(),
+    )
+    # A note appended to the packed clip is stored as a row
+    row = SimpleNamespace(clip_id=clip_id, **vars(note(480, 240, pitch=70)))
+    project = SimpleNamespace(id=uuid4(), time_signature_num=4, time_signature_den=4)
+
+    session = FakeSession([clip], [row], [block])
+    [(_, _, notes)] = await window_notes(session, project, 0, 1)
+    assert [n.pitch for n in notes] == [60, 70, 62]
+    assert session.results == []
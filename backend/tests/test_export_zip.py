@@ -123,3 +123,45 @@ def test_export_zip_with_offsets(sample_project, sample_tracks):
     # Note: We can't easily verify offset application without parsing MIDI events,
     # but we can verify the export doesn't crash with offsets set
 
+
+async def test_streamed_zip_matches_in_memory_zip():
+    """The streamed archive has the same entries, one chunk per part."""
+    from types import SimpleNamespace
+
+    from midinecromancer.midi.export_zip import iter_project_zip_chunks
+    from midinecromancer.services.snapshot import ClipSnapshot, NoteSnapshot, TrackSnapshot
+
+    def note(pitch, start_tick):
+        values = dict.fromkeys(NoteSnapshot.columns)
+        values.update(pitch=pitch, velocity=100, start_tick=start_tick, duration_tick=240)
+        return NoteSnapshot(**values)
+
+    def clip(start_bar):
+        values = dict.fromkeys(ClipSnapshot.columns)
+        values.update(start_bar=start_bar, length_bars=4, start_offset_ticks=0)
+        notes = tuple(note(36 + start_bar, tick) for tick in range(0, 1920, 480))
+        return ClipSnapshot(**values, has_body=True, notes=notes, note_block=None)
+
+    tracks = []
+    for channel, name in enumerate(["Drums", "Bass/Low"]):
+        values = dict.fromkeys(TrackSnapshot.columns)
+        values.update(name=name, midi_channel=channel, midi_program=0, start_offset_ticks=0)
+        tracks.append(TrackSnapshot(**values, clips=(clip(0), clip(4), clip(8))))
+    project = SimpleNamespace(bars=12, time_signature_num=4, time_signature_den=4)
+
+    for split_by, parts in (("track", 2), ("clip", 6)):
+        expected = zipfile.ZipFile(io.BytesIO(export_project_to_zip(project, tracks, split_by)))
+        progress = []
+        chunks = [
+            chunk
+            async for chunk in iter_project_zip_chunks(
+                project, tracks, split_by, progress=lambda _p=progress, **counts: _p.append(counts)
+            )
+        ]
+        assert len(chunks) == parts + 1
+        streamed = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert streamed.testzip() is None
+        assert streamed.namelist() == expected.namelist()
+        for name in expected.namelist():
+            assert streamed.read(name) == expected.read(name)
+        assert progress[-1]["tracks_done"] == progress[-1]["tracks_total"] == parts
@@ -0,0 +1,76 @@
+"""Tests for pooled part generation."""
+
+import pytest
+
+from midinecromancer.config import settings
+from midinecromancer.music import generate_melody
+from midinecromancer.music.drums import DrumMap, generate_drum_pattern_v2
+from midinecromancer.services import generation_pool
+from midinecromancer.services.generation_pool import (
+    bassline_over_progression,
+    run_part,
+    shutdown_generation_executor,
+    timed_call,
+)
+
+DRUMS = {
+    "bars": 8,
+    "time_signature_num": 4,
+    "time_signature_den": 4,
+    "seed": 1234,
+    "drum_map": DrumMap(kick_note=35),
+    "style": "trap",
+}
+MELODY = {
+    "tonic": "D",
+    "mode": "dorian",
+    "bars": 8,
+    "time_signature_num": 4,
+    "time_signature_den": 4,
+    "seed": 99,
+}
+BASS = {
+    "progression": {"tonic": "C", "mode": "ionian", "bars": 8, "seed": 5},
+    "bassline": {
+        "tonic": "C",
+        "mode": "ionian",
+        "bars": 8,
+        "time_signature_num": 4,
+        "time_signature_den": 4,
+        "seed": 5,
+    },
+}
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    def set_workers(count: int) -> None:
+        monkeypatch.setattr(settings, "generation_workers", count)
+
+    yield set_workers
+    shutdown_generation_executor()
+
+
+def test_timed_call():
+    result, elapsed_ms = timed_call(dict, {"a": 1})
+    assert result == {"a": 1}
+    assert elapsed_ms >= 0
+
+
+async def test_inline_without_workers(workers):
+    workers(0)
+    events, _ = await run_part(generate_melody, **MELODY)
+    assert events == generate_melody(**MELODY)
+    assert generation_pool.generation_executor() is None
+
+
+async def test_pool_matches_inline(workers):
+    workers(2)
+    drums, _ = await run_part(generate_drum_pattern_v2, **DRUMS)
+    melody, _ = await run_part(generate_melody, **MELODY)
+    bass, _ = await run_part(bassline_over_progression, **BASS)
+    assert generation_pool.generation_executor() is not None
+
+    assert drums == generate_drum_pattern_v2(**DRUMS)
+    assert melody == generate_melody(**MELODY)
+    assert bass == bassline_over_progression(**BASS)
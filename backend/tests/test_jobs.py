@@ -0,0 +1,129 @@
+"""Tests for the background job runner."""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+import midinecromancer.main  # noqa: F401  (maps every model, so Job rows can be built)
+from midinecromancer.schemas.job import JOB_PARAMS
+from midinecromancer.services import jobs
+from midinecromancer.services.jobs import JobContext, JobResult, JobRunner, dedupe_key
+
+
+class FakeSession:
+    """Records job row updates; finds no in-flight jobs."""
+
+    def __init__(self, updates: list[dict]):
+        self.updates = updates
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        if statement.is_dml:
+            params = statement.compile().params
+            self.updates.append({k: v for k, v in params.items() if not k.startswith("id_")})
+        return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+    def add(self, job):
+        job.id = uuid4()
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setattr(jobs, "PROGRESS_INTERVAL", 0.001)
+    updates: list[dict] = []
+    runner = JobRunner(2, session_factory=lambda: FakeSession(updates))
+    runner.updates = updates
+    return runner
+
+
+def test_dedupe_key():
+    project_id = uuid4()
+    key = dedupe_key("export_zip", project_id, 3, {"split_by": "clip", "x": [1, 2]})
+    assert key == dedupe_key("export_zip", project_id, 3, {"x": [1, 2], "split_by": "clip"})
+    assert key != dedupe_key("export_zip", project_id, 4, {"split_by": "clip", "x": [1, 2]})
+    assert key != dedupe_key("export_zip", uuid4(), 3, {"split_by": "clip", "x": [1, 2]})
+    assert key != dedupe_key("suggestions", project_id, 3, {"split_by": "clip", "x": [1, 2]})
+    assert len(key) == 64
+
+
+def test_job_params():
+    assert JOB_PARAMS["export_zip"].model_validate({}).model_dump() == {"split_by": "track"}
+    assert JOB_PARAMS["generate_full"].model_validate({"seed": 4}).model_dump() == {
+        "seed": 4,
+        "params": {},
+    }
+    with pytest.raises(ValidationError):
+        JOB_PARAMS["export_zip"].model_validate({"split_by": "bar"})
+
+
+def test_context_report():
+    context = JobContext(uuid4(), uuid4(), {})
+    context.report(tracks_done=1, tracks_total=4)
+    context.report(tracks_done=2)
+    assert context.progress == {"tracks_done": 2, "tracks_total": 4}
+
+
+async def test_runner_bounds_concurrency(runner, monkeypatch):
+    running = peak = 0
+    release = asyncio.Event()
+
+    async def handler(session, context):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        context.report(tracks_done=1, tracks_total=1)
+        await release.wait()
+        running -= 1
+        return JobResult({"ok": True})
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "test", handler)
+    project = SimpleNamespace(id=uuid4(), revision=0)
+    submitted = [
+        await runner.submit(FakeSession(runner.updates), project, "test", {"n": n})
+        for n in range(5)
+    ]
+    assert all(created for _, created in submitted)
+    await asyncio.sleep(0.01)
+    assert peak == 2
+    assert runner.progress(submitted[0][0].id) == {"tracks_done": 1, "tracks_total": 1}
+
+    release.set()
+    await asyncio.gather(*list(runner._tasks.values()))
+    assert peak == 2
+    finished = [update for update in runner.updates if update.get("status") == "succeeded"]
+    assert len(finished) == 5
+    assert finished[0]["result"] == {"ok": True}
+    assert finished[0]["progress"] == {"tracks_done": 1, "tracks_total": 1}
+    assert runner.progress(submitted[0][0].id) is None
+
+
+async def test_runner_records_failures(runner, monkeypatch):
+    async def failing(session, context):
+        raise RuntimeError("no notes")
+
+    async def waiting(session, context):
+        await asyncio.Event().wait()
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "failing", failing)
+    monkeypatch.setitem(jobs.JOB_KINDS, "waiting", waiting)
+    project = SimpleNamespace(id=uuid4(), revision=0)
+    await runner.submit(FakeSession(runner.updates), project, "failing", {})
+    await runner.submit(FakeSession(runner.updates), project, "waiting", {})
+    await asyncio.sleep(0.01)
+    await runner.shutdown()
+
+    errors = [update["error"] for update in runner.updates if update.get("status") == "failed"]
+    assert sorted(errors) == ["Interrupted", "no notes"]
+    with pytest.raises(ValueError):
+        await runner.submit(FakeSession(runner.updates), project, "unknown", {})
@@ -0,0 +1,93 @@
+"""Tests for per-request metrics and the Prometheus surface."""
+
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from midinecromancer import metrics
+from midinecromancer.metrics import (
+    MetricsMiddleware,
+    MetricsRegistry,
+    RequestMetrics,
+    TimedRoute,
+    record_generator,
+    record_query,
+    render_metrics,
+)
+
+
+class Item(BaseModel):
+    values: list[int]
+
+
+def make_app() -> FastAPI:
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/items/{item_id}", response_model=Item)
+    async def get_item(item_id: int) -> Item:
+        record_query(2.0, 10)
+        record_query(3.0, 5)
+        record_generator(4.0)
+        return Item(values=list(range(item_id)))
+
+    @router.get("/sync")
+    def get_sync() -> dict:
+        record_query(1.0, 1)
+        return {"ok": True}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, server_timing=True, exclude=("/metrics",))
+    app.include_router(router, prefix="/api")
+    app.get("/metrics")(render_metrics)
+    return app
+
+
+async def test_request_metrics_and_server_timing(monkeypatch):
+    monkeypatch.setattr(metrics, "registry", MetricsRegistry())
+    async with AsyncClient(transport=ASGITransport(app=make_app()), base_url="http://t") as c:
+        response = await c.get("/api/items/3")
+        assert response.json() == {"values": [0, 1, 2]}
+        timing = response.headers["server-timing"]
+        assert 'db;dur=5.0;desc="2 queries, 15 rows"' in timing
+        assert "gen;dur=4.0" in timing
+        assert "ser;dur=" in timing and "total;dur=" in timing
+
+        assert (await c.get("/api/items/5")).status_code == 200
+        assert (await c.get("/api/sync")).json() == {"ok": True}
+        assert (await c.get("/api/missing")).status_code == 404
+
+        text = (await c.get("/metrics")).text
+
+    labels = 'method="GET",endpoint="test_metrics.get_item"'
+    assert f'http_requests_total{{{labels},status="200"}} 2' in text
+    assert f'db_queries_per_request_bucket{{{labels},le="2"}} 2' in text
+    assert f'db_queries_per_request_bucket{{{labels},le="1"}} 0' in text
+    assert f"db_rows_total{{{labels}}} 30" in text
+    assert f"db_seconds_total{{{labels}}} 0.01" in text
+    assert f"generator_seconds_total{{{labels}}} 0.008" in text
+    assert f"http_request_duration_seconds_count{{{labels}}} 2" in text
+    assert (
+        'http_requests_total{method="GET",endpoint="test_metrics.get_sync",status="200"} 1' in text
+    )
+    assert 'endpoint="<unmatched>",status="404"} 1' in text
+    assert "/metrics" not in text
+
+
+def test_histogram_rendering():
+    registry = MetricsRegistry()
+    for queries in (1, 3, 40):
+        registry.observe("GET", "x.y", 200, 0.02, RequestMetrics(queries=queries))
+    text = registry.render()
+    assert "# TYPE db_queries_per_request histogram" in text
+    assert 'db_queries_per_request_bucket{method="GET",endpoint="x.y",le="2"} 1' in text
+    assert 'db_queries_per_request_bucket{method="GET",endpoint="x.y",le="50"} 3' in text
+    assert 'db_queries_per_request_bucket{method="GET",endpoint="x.y",le="+Inf"} 3' in text
+    assert 'db_queries_per_request_sum{method="GET",endpoint="x.y"} 44' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",endpoint="x.y",le="0.01"} 0' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",endpoint="x.y",le="0.025"} 3' in text
+
+
+def test_recording_outside_requests_is_ignored():
+    record_query(1.0, 1)
+    record_generator(1.0)
+    assert metrics.current_metrics() is None
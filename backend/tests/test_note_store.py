@@ -0,0 +1,118 @@
+"""Tests for packed clip note storage."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from midinecromancer.midi.export import export_project_to_midi
+from midinecromancer.services.note_store import (
+    PACKED_FORMAT_VERSION,
+    PackedNotes,
+    count_clip_notes,
+    get_clip_notes,
+    unpack_block,
+)
+
+CLIP_ID = uuid.UUID("00000000-0000-0000-0000-000000000042")
+
+EVENTS = [
+    {"pitch": 36, "velocity": 100, "start_tick": 0, "duration_tick": 120},
+    {"pitch": 42, "velocity": 70, "start_tick": 240, "duration_tick": 60, "probability": 0.5},
+    {"pitch": 38, "velocity": 127, "start_tick": 480, "duration_tick": 120},
+    {"pitch": 0, "velocity": 0, "start_tick": -15, "duration_tick": 0},
+]
+
+
+def _block(events, tick_offset=0):
+    packed = PackedNotes.from_events(events, tick_offset)
+    return SimpleNamespace(
+        format_version=PACKED_FORMAT_VERSION, note_count=len(packed), data=packed.to_bytes()
+    )
+
+
+def _clip(notes=None, note_block=None):
+    return SimpleNamespace(
+        id=CLIP_ID,
+        start_bar=1,
+        start_offset_ticks=0,
+        is_muted=False,
+        is_soloed=False,
+        notes=notes or [],
+        note_block=note_block,
+    )
+
+
+def test_pack_roundtrip():
+    """Packed blobs decode to the same columns."""
+    block = _block(EVENTS)
+    packed = unpack_block(block)
+    assert list(packed.pitch) == [36, 42, 38, 0]
+    assert list(packed.velocity) == [100, 70, 127, 0]
+    assert list(packed.start_tick) == [0, 240, 480, -15]
+    assert list(packed.duration_tick) == [120, 60, 120, 0]
+    assert list(packed.probability) == [1.0, 0.5, 1.0, 1.0]
+    assert len(block.data) == 4 * (1 + 1 + 4 + 4 + 8)
+
+
+def test_pack_tick_offset():
+    """tick_offset shifts start ticks only."""
+    packed = PackedNotes.from_events(EVENTS[:1], tick_offset=-1920)
+    assert list(packed.start_tick) == [-1920]
+    assert list(packed.duration_tick) == [120]
+
+
+def test_pack_rejects_out_of_range():
+    """Out-of-range pitch/velocity cannot be packed."""
+    with pytest.raises(ValueError):
+        PackedNotes.from_events([{**EVENTS[0], "pitch": 128}])
+
+
+def test_truncated_block_rejected():
+    """Mismatched blob length is detected."""
+    block = _block(EVENTS)
+    block.data = block.data[:-1]
+    with pytest.raises(ValueError):
+        unpack_block(block)
+
+
+def test_row_view_matches_note_attributes():
+    """Row views expose Note attributes with stable ids."""
+    clip = _clip(note_block=_block(EVENTS))
+    rows = get_clip_notes(clip)
+    assert [(r.pitch, r.velocity, r.start_tick, r.duration_tick) for r in rows] == [
+        (e["pitch"], e["velocity"], e["start_tick"], e["duration_tick"]) for e in EVENTS
+    ]
+    assert all(r.clip_id == CLIP_ID for r in rows)
+    assert [r.id for r in rows] == [r.id for r in get_clip_notes(clip)]
+    assert len({r.id for r in rows}) == len(rows)
+    assert count_clip_notes(clip) == len(EVENTS)
+
+
+def test_row_form_passthrough():
+    """Clips without a block return their Note rows unchanged."""
+    notes = [SimpleNamespace(**{**e, "probability": 1.0}) for e in EVENTS]
+    clip = _clip(notes=notes)
+    assert get_clip_notes(clip) is notes
+    assert count_clip_notes(clip) == len(EVENTS)
+
+
+def test_export_identical_for_both_storage_forms():
+    """Packed and row clips export to the same MIDI bytes."""
+    project = SimpleNamespace(time_signature_num=4, time_signature_den=4, bars=4)
+    rows = [SimpleNamespace(**{"probability": 1.0, **e}) for e in EVENTS]
+
+    def track(clip):
+        return SimpleNamespace(
+            name="Drums",
+            midi_channel=9,
+            midi_program=0,
+            start_offset_ticks=0,
+            is_muted=False,
+            is_soloed=False,
+            clips=[clip],
+        )
+
+    row_bytes = export_project_to_midi(project, [track(_clip(notes=rows))])
+    packed_bytes = export_project_to_midi(project, [track(_clip(note_block=_block(EVENTS)))])
+    assert row_bytes == packed_bytes
@@ -0,0 +1,104 @@
+"""Tests for compact note payloads and content negotiation."""
+
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from midinecromancer.services import payloads
+
+
+def test_negotiate_defaults_to_json():
+    assert payloads.negotiate(None) == payloads.JSON
+    assert payloads.negotiate("*/*") == payloads.JSON
+    assert payloads.negotiate("application/json") == payloads.JSON
+    assert payloads.negotiate("text/html, application/xml;q=0.9") == payloads.JSON
+
+
+def test_negotiate_columns_and_q_values():
+    columns = payloads.COLUMNS_JSON
+    assert payloads.negotiate(columns) == columns
+    assert payloads.negotiate(f"application/json;q=0.5, {columns}") == columns
+    assert payloads.negotiate(f"{columns};q=0.2, application/json") == payloads.JSON
+    assert payloads.negotiate(f"{columns};q=0") == payloads.JSON
+
+
+def test_negotiate_msgpack(monkeypatch):
+    accept = f"application/x-msgpack, {payloads.COLUMNS_JSON};q=0.5"
+    monkeypatch.setattr(payloads, "msgpack", object())
+    assert payloads.negotiate(accept) == payloads.MSGPACK
+    # Without msgpack installed the next acceptable type is used
+    monkeypatch.setattr(payloads, "msgpack", None)
+    assert payloads.negotiate(accept) == payloads.COLUMNS_JSON
+    assert payloads.negotiate("application/x-msgpack") == payloads.JSON
+
+
+def test_note_columns():
+    notes = [
+        SimpleNamespace(
+            id=uuid.UUID(int=i),
+            pitch=36 + i,
+            velocity=100,
+            start_tick=i * 120,
+            duration_tick=60,
+            probability=1.0,
+        )
+        for i in range(3)
+    ]
+    columns = payloads.note_columns(notes)
+    assert tuple(columns) == payloads.NOTE_FIELDS
+    assert columns["pitch"] == [36, 37, 38]
+    assert columns["start_tick"] == [0, 120, 240]
+    assert columns["id"][1] == str(uuid.UUID(int=1))
+    assert payloads.note_columns([]) == {field: [] for field in payloads.NOTE_FIELDS}
+
+
+def test_event_columns_round_trip():
+    events = [
+        {"pitch": 36, "velocity": 110, "start_tick": 0, "duration_tick": 60, "role": "kick"},
+        {"pitch": 42, "velocity": 80, "start_tick": 240, "duration_tick": 60},
+        {"pitch": 38, "velocity": 100, "start_tick": 480, "duration_tick": 60, "role": "snare"},
+    ]
+    columns = payloads.event_columns(events)
+    assert columns["role"] == ["kick", None, "snare"]
+    assert {len(column) for column in columns.values()} == {3}
+    assert payloads.columns_to_events(columns) == events
+
+
+def test_event_columns_key_first_seen_late():
+    columns = payloads.event_columns([{"pitch": 1}, {"pitch": 2, "role": "x"}])
+    assert columns == {"pitch": [1, 2], "role": [None, "x"]}
+
+
+def test_with_event_columns():
+    clip_id = uuid.uuid4()
+    result = {
+        "kind": "beats",
+        "clip_id": clip_id,
+        "events": [{"pitch": 36, "start_tick": 0}, {"pitch": 38, "start_tick": 480}],
+    }
+    document = payloads.with_event_columns(result, ("events", "note_events"))
+    assert document == {
+        "kind": "beats",
+        "clip_id": str(clip_id),
+        "events": {"pitch": [36, 38], "start_tick": [0, 480]},
+    }
+
+
+def test_encode_columns_json_is_compact():
+    document = {"notes": payloads.event_columns([{"pitch": 60, "velocity": 100}] * 100)}
+    encoded = payloads.encode(document, payloads.COLUMNS_JSON)
+    assert json.loads(encoded) == document
+    assert encoded.count(b'"pitch"') == 1
+
+
+def test_encode_msgpack_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    document = {"notes": payloads.event_columns([{"pitch": 60, "start_tick": 1 << 20}])}
+    assert msgpack.unpackb(payloads.encode(document, payloads.MSGPACK)) == document
+
+
+def test_encode_rejects_unknown_media_type():
+    with pytest.raises(ValueError):
+        payloads.encode({}, "text/csv")
@@ -0,0 +1,105 @@
+"""Tests for the polyrhythm lane render cache."""
+
+import uuid
+
+import pytest
+
+from midinecromancer.music.polyrhythm import (
+    CycleSpec,
+    LaneRenderCache,
+    LaneSpec,
+    freeze_events,
+    lane_render_key,
+    render_lanes_to_events,
+    thaw_events,
+)
+
+CLIP_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _lanes(humanize_ms=None, pitch=60):
+    return [
+        LaneSpec(
+            cycle=CycleSpec(steps=3, pulses=2, cycle_beats=2.0, swing=0.2),
+            lane_id=uuid.UUID("00000000-0000-0000-0000-00000000000a"),
+            clip_id=CLIP_ID,
+            pitch=pitch,
+            velocity=100,
+            mute=False,
+            solo=False,
+            order_index=0,
+            seed_offset=0,
+            humanize_ms=humanize_ms,
+        ),
+        LaneSpec(
+            cycle=CycleSpec(steps=5, pulses=3, cycle_beats=4.0),
+            lane_id=uuid.UUID("00000000-0000-0000-0000-00000000000b"),
+            clip_id=CLIP_ID,
+            pitch=64,
+            velocity=90,
+            mute=False,
+            solo=False,
+            order_index=1,
+            seed_offset=3,
+            humanize_ms=humanize_ms,
+        ),
+    ]
+
+
+def _render(lanes, start_bar, bpm=120):
+    return render_lanes_to_events(
+        lanes=lanes,
+        clip_start_bar=start_bar,
+        clip_length_bars=4,
+        project_bpm=bpm,
+        time_signature_num=4,
+        time_signature_den=4,
+        base_seed=42,
+    )
+
+
+def test_key_is_stable_and_content_addressed():
+    key = lane_render_key(_lanes(), 4, 120, 4, 4, 42)
+    assert key == lane_render_key(_lanes(), 4, 120, 4, 4, 42)
+    assert len(key) == 64
+    assert key != lane_render_key(_lanes(pitch=61), 4, 120, 4, 4, 42)
+    assert key != lane_render_key(_lanes(), 8, 120, 4, 4, 42)
+    assert key != lane_render_key(_lanes(), 4, 120, 3, 4, 42)
+    assert key != lane_render_key(_lanes(), 4, 120, 4, 4, 43)
+    # BPM only matters when lanes are humanized
+    assert key == lane_render_key(_lanes(), 4, 90, 4, 4, 42)
+    humanized = lane_render_key(_lanes(humanize_ms=10), 4, 120, 4, 4, 42)
+    assert humanized != lane_render_key(_lanes(humanize_ms=10), 4, 90, 4, 4, 42)
+
+
+@pytest.mark.parametrize("humanize_ms", [None, 15])
+@pytest.mark.parametrize("start_bar", [0, 3, 17])
+def test_shifted_render_matches_direct_render(start_bar, humanize_ms):
+    """A bar-0 render shifted to the clip start equals a render at the clip start."""
+    lanes = _lanes(humanize_ms=humanize_ms)
+    entry = freeze_events(_render(lanes, 0))
+    assert thaw_events(entry, start_bar * 1920) == _render(lanes, start_bar)
+
+
+def test_lru_counters_and_eviction():
+    cache = LaneRenderCache(maxsize=2)
+    assert cache.get("a") is None
+    cache.put("a", ((60, 100, 0, 120),), clip_id=CLIP_ID)
+    cache.put("b", (), clip_id=CLIP_ID)
+    assert cache.get("a") == ((60, 100, 0, 120),)
+    # "b" is now least recently used
+    cache.put("c", ())
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 1, "size": 2, "maxsize": 2}
+
+
+def test_invalidate_clip():
+    cache = LaneRenderCache()
+    other_clip = uuid.uuid4()
+    cache.put("a", (), clip_id=CLIP_ID)
+    cache.put("b", (), clip_id=CLIP_ID)
+    cache.put("c", (), clip_id=other_clip)
+    assert cache.invalidate_clip(CLIP_ID) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == ()
+    assert cache.invalidate_clip(CLIP_ID) == 0
@@ -0,0 +1,137 @@
+"""Tests for single-flight preview caching."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from midinecromancer.services.preview_cache import PreviewCache, preview_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Sessions:
+    """Session factory recording the sessions it opened."""
+
+    def __init__(self):
+        self.opened = []
+
+    @asynccontextmanager
+    async def __call__(self):
+        session = SimpleNamespace(closed=False)
+        self.opened.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+
+def make_cache(**kwargs) -> PreviewCache:
+    return PreviewCache(session_factory=Sessions(), **kwargs)
+
+
+def counting(result, delay: float = 0.01):
+    calls = []
+
+    async def compute(session):
+        calls.append(session)
+        await asyncio.sleep(delay)
+        assert not session.closed
+        return result
+
+    return compute, calls
+
+
+def test_preview_key():
+    clip_id = uuid4()
+    key = preview_key("regenerate", 3, {"clip_id": clip_id, "seed": 1, "params": {"a": 1, "b": 2}})
+    assert key == preview_key(
+        "regenerate", 3, {"params": {"b": 2, "a": 1}, "seed": 1, "clip_id": clip_id}
+    )
+    assert key != preview_key("regenerate", 4, {"clip_id": clip_id, "seed": 1})
+    assert key != preview_key("regenerate", 3, {"clip_id": clip_id, "seed": 2})
+    assert key != preview_key("segments", 3, {"clip_id": clip_id, "seed": 1})
+
+
+async def test_concurrent_requests_share_one_computation():
+    cache = make_cache()
+    compute, calls = counting({"events": [1, 2]})
+    results = await asyncio.gather(*(cache.get_or_compute("test", "k", compute) for _ in range(8)))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+    assert await cache.get_or_compute("test", "k", compute) is results[0]
+    stats = cache.stats()
+    assert (stats["requests"], stats["computed"], stats["coalesced"], stats["hits"]) == (9, 1, 7, 1)
+    assert stats["coalescing_ratio"] == pytest.approx(7 / 9)
+    assert stats["endpoints"]["test"]["requests"] == 9
+
+
+async def test_ttl_and_lru():
+    clock = Clock()
+    cache = make_cache(maxsize=2, ttl=10.0, clock=clock)
+    compute, calls = counting("a", delay=0)
+    await cache.get_or_compute("test", "a", compute)
+    clock.now = 9.0
+    await cache.get_or_compute("test", "a", compute)
+    assert len(calls) == 1
+    clock.now = 10.0
+    await cache.get_or_compute("test", "a", compute)
+    assert len(calls) == 2
+
+    for key in ("b", "c"):
+        await cache.get_or_compute("test", key, counting(key, delay=0)[0])
+    assert len(cache) == 2
+    await cache.get_or_compute("test", "a", compute)
+    assert len(calls) == 3
+
+
+async def test_failures_reach_every_waiter_and_are_not_cached():
+    cache = make_cache()
+    attempts = []
+
+    async def failing(session):
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("Clip not found")
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("test", "k", failing) for _ in range(3)), return_exceptions=True
+    )
+    assert len(attempts) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(ValueError):
+        await cache.get_or_compute("test", "k", failing)
+    assert len(attempts) == 2
+    assert cache.stats()["errors"] == 2
+
+
+async def test_cancelled_request_does_not_cancel_waiters():
+    cache = make_cache()
+    compute, calls = counting("done", delay=0.02)
+    first = asyncio.ensure_future(cache.get_or_compute("test", "k", compute))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(cache.get_or_compute("test", "k", compute))
+    await asyncio.sleep(0.005)
+    first.cancel()
+    assert await second == "done"
+    assert len(calls) == 1
+    # The shared computation ran in its own session, closed once it finished
+    assert calls[0] is cache.session_factory.opened[0] and calls[0].closed
+    assert await cache.get_or_compute("test", "k", compute) == "done"
+
+
+async def test_disabled_cache_computes_every_time():
+    cache = make_cache(maxsize=0)
+    compute, calls = counting("x", delay=0)
+    for _ in range(3):
+        await cache.get_or_compute("test", "k", compute)
+    assert len(calls) == 3
@@ -0,0 +1,129 @@
+"""Tests for batched polyrhythm lane rendering."""
+
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import midinecromancer.main  # noqa: F401  (configures the ORM mappers)
+from midinecromancer.services.polyrhythm import (
+    legacy_lane_id,
+    load_clip_lanes,
+    render_clip_lanes_to_notes,
+    render_project_lanes,
+)
+from midinecromancer.services.snapshot import NoteSnapshot
+
+PROJECT = SimpleNamespace(bpm=120, time_signature_num=4, time_signature_den=4, seed=7)
+
+
+class Row(SimpleNamespace):
+    @property
+    def _mapping(self):
+        return vars(self)
+
+
+class FakeSession:
+    """Answers lane and profile queries from lists of rows, counting them."""
+
+    def __init__(self, lanes, profiles):
+        self.tables = {"clip_polyrhythm_lanes": lanes, "polyrhythm_profiles": profiles}
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        (table,) = statement.get_final_froms()
+        return iter(self.tables[table.name])
+
+
+def _profile(steps=8, pulses=3):
+    return Row(
+        id=uuid.uuid4(),
+        name="p",
+        steps=steps,
+        pulses=pulses,
+        rotation=0,
+        cycle_beats=Decimal("4.0"),
+        swing=None,
+        humanize_ms=None,
+        created_at=None,
+        updated_at=None,
+    )
+
+
+def _lane(clip_id, profile, order_index=0):
+    return Row(
+        id=uuid.uuid4(),
+        clip_id=clip_id,
+        polyrhythm_profile_id=profile.id,
+        lane_name=f"Lane {order_index}",
+        instrument_role=None,
+        pitch=36 + order_index,
+        velocity=100,
+        mute=False,
+        solo=False,
+        order_index=order_index,
+        seed_offset=0,
+        created_at=None,
+    )
+
+
+def _clip(start_bar, grid_mode="polyrhythm_multi", profile_id=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        start_bar=start_bar,
+        length_bars=2,
+        grid_mode=grid_mode,
+        polyrhythm_profile_id=profile_id,
+    )
+
+
+def _project(clip_count):
+    profiles = [_profile(8, 3), _profile(5, 2)]
+    clips = [_clip(2 * i) for i in range(clip_count)]
+    lanes = [_lane(clip.id, profile, i) for clip in clips for i, profile in enumerate(profiles)]
+    legacy = _clip(2 * clip_count, "polyrhythm", profiles[0].id)
+    plain = _clip(0, "grid")
+    return [*clips, legacy, plain], lanes, profiles
+
+
+@pytest.mark.parametrize("clip_count", [1, 25])
+async def test_query_count_does_not_grow_with_clips(clip_count):
+    clips, lanes, profiles = _project(clip_count)
+    session = FakeSession(lanes, profiles)
+    notes = await render_project_lanes(session, PROJECT, clips)
+
+    assert session.queries == 2
+    assert set(notes) == {clip.id for clip in clips[:-1]}
+    multi, legacy = clips[0], clips[-2]
+    assert {note.pitch for note in notes[multi.id]} == {36, 37}
+    assert {note.pitch for note in notes[legacy.id]} == {60}
+    for clip in clips[:-1]:
+        assert all(0 <= note.start_tick < 2 * 1920 for note in notes[clip.id])
+        assert all(note.clip_id == clip.id for note in notes[clip.id])
+        # Export only reads them; no ORM instances are built
+        assert all(type(note) is NoteSnapshot for note in notes[clip.id])
+
+
+async def test_single_clip_matches_project_render():
+    clips, lanes, profiles = _project(3)
+    batch = await render_project_lanes(FakeSession(lanes, profiles), PROJECT, clips)
+    single = await render_clip_lanes_to_notes(clips[1], PROJECT, FakeSession(lanes, profiles))
+    key = [(n.pitch, n.start_tick, n.duration_tick, n.velocity) for n in single]
+    assert key == [(n.pitch, n.start_tick, n.duration_tick, n.velocity) for n in batch[clips[1].id]]
+
+
+async def test_legacy_lanes_and_missing_profiles():
+    clips, lanes, profiles = _project(1)
+    legacy = clips[-2]
+    session = FakeSession(lanes, profiles)
+    resolved = await load_clip_lanes(session, clips)
+    assert [lane.id for lane in resolved[legacy.id]] == [legacy_lane_id(legacy.id)]
+    assert [lane.order_index for lane in resolved[clips[0].id]] == [0, 1]
+
+    assert legacy.id not in await load_clip_lanes(session, clips, legacy=False)
+    # Nothing to resolve, no queries
+    session = FakeSession(lanes, profiles)
+    assert await load_clip_lanes(session, [clips[-1]]) == {}
+    assert session.queries == 0
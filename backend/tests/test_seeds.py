@@ -0,0 +1,157 @@
+"""Tests for shared seed derivation."""
+
+import hashlib
+import json
+import random
+from uuid import UUID
+
+import pytest
+
+from midinecromancer.music import chord_patterns, offsets, polyrhythm, suggest
+from midinecromancer.music.chords_generate import deterministic_seed_for_candidate
+from midinecromancer.music.drums import DrumMap, deterministic_seed, generate_drum_pattern_v2
+from midinecromancer.music.seeds import (
+    SeedStream,
+    child_rng,
+    derive,
+    derive_seed,
+    legacy_seed,
+    make_rng,
+)
+from midinecromancer.services import chord_render, regenerate, segments
+
+PROJECT = UUID("5b0c3f4e-8a1d-4c7e-9f2a-0d6e1b7c3a95")
+CLIP = UUID("e2a7c9d1-3b4f-4e8a-a1c6-7f0d2b9e5c38")
+LANE = UUID("0f9e8d7c-6b5a-4948-8372-615049382716")
+DRUMS = {
+    "bars": 8,
+    "time_signature_num": 4,
+    "time_signature_den": 4,
+    "seed": 12345,
+    "drum_map": DrumMap(),
+    "style": "boom_bap",
+    "hat_mode": "roll",
+    "pause_probability": 0.2,
+    "fill_probability": 1.0,
+}
+
+
+def blake(text: str, signed: bool = False) -> int:
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="big", signed=signed)
+
+
+@pytest.mark.parametrize("seed", [0, 7, -3, 2**62])
+def test_legacy_seeds_are_unchanged(seed):
+    assert deterministic_seed(seed, 3, "kick", "variation_4") == blake(f"{seed}:3:kick:variation_4")
+    assert chord_patterns.deterministic_seed(seed, str(CLIP), "strum") == blake(
+        f"{seed}:{CLIP}:strum"
+    )
+    assert chord_render.deterministic_seed(seed, str(CLIP), "velocity") == blake(
+        f"{seed}:{CLIP}:velocity"
+    )
+    assert polyrhythm.deterministic_seed(seed, CLIP, LANE, 2) == (
+        seed ^ blake(f"{seed}:{CLIP}:{LANE}:2") ^ 2
+    )
+    assert offsets.deterministic_offset(seed, str(CLIP), "track") == (
+        blake(f"{seed}:{CLIP}:track") % 241 - 120
+    )
+    assert segments.deterministic_seed(seed, PROJECT, 4, "beats") == blake(
+        f"{seed}_{PROJECT}_4_beats", signed=True
+    )
+    assert regenerate.deterministic_seed_for_regenerate(PROJECT, CLIP, "bass", seed, 0.3) == blake(
+        f"{PROJECT}_{CLIP}_bass_{seed}_0.3", signed=True
+    )
+    assert suggest.deterministic_suggestion_seed(seed, PROJECT, "melody", 1) == (
+        seed ^ blake(f"{seed}:{PROJECT}:melody:1") ^ 1
+    )
+    assert deterministic_seed_for_candidate(PROJECT, 0, seed) == blake(
+        f"{PROJECT}:0:{seed}", signed=True
+    )
+
+
+def test_legacy_drum_pattern_is_unchanged():
+    events = generate_drum_pattern_v2(**DRUMS)
+    digest = hashlib.sha256(json.dumps(events, sort_keys=True).encode()).hexdigest()
+    assert digest == "df8efa337a20c4a64f1132398b7669355daedac0ece972bdcd46f726a88fb62e"
+    assert generate_drum_pattern_v2(**DRUMS, seed_scheme="legacy") == events
+
+
+def test_legacy_child_rng_is_a_seeded_twister():
+    rng = child_rng("legacy", 9, 2, "hats", "pattern")
+    expected = random.Random(legacy_seed(9, 2, "hats", "pattern"))
+    assert [rng.random() for _ in range(5)] == [expected.random() for _ in range(5)]
+    assert derive_seed("legacy", 9, "x") == blake("9:x")
+    assert make_rng("legacy", 9).random() == random.Random(9).random()
+
+
+def test_derive():
+    seed = derive(42, 3, "kick", CLIP)
+    assert seed == derive(42, 3, "kick", CLIP)
+    assert 0 <= seed < 2**63
+    assert seed != derive(42, "kick", 3, CLIP)
+    assert seed != derive(43, 3, "kick", CLIP)
+    assert derive(-1, 0) == derive(2**64 - 1, 0)
+    assert derive_seed("tree", 42, 3) == derive(42, 3)
+    assert derive(1, 0.3) != derive(1, 0.5)
+
+
+def test_seed_stream():
+    draws = [SeedStream(5, 1, "hats").random() for _ in range(3)]
+    assert draws[0] == draws[1] == draws[2]
+
+    stream = SeedStream(5, 1, "hats")
+    values = [stream.random() for _ in range(SeedStream.FIRST_DRAWS * 3)]
+    again = SeedStream(5, 1, "hats")
+    assert [again.random() for _ in range(len(values))] == values
+    assert all(0.0 <= value < 1.0 for value in values)
+    assert len(set(values)) == len(values)
+    assert values[:4] != [SeedStream(5, 1, "kick").random() for _ in range(4)]
+
+    assert 1 <= stream.randint(1, 6) <= 6
+    assert stream.choice("abc") in "abc"
+    assert 2.0 <= stream.uniform(2.0, 3.0) <= 3.0
+    items = list(range(10))
+    stream.shuffle(items)
+    assert sorted(items) == list(range(10))
+    with pytest.raises(TypeError):
+        stream.seed(1)
+
+
+def test_seed_stream_bits():
+    assert SeedStream(1).getrandbits(64) != SeedStream(2).getrandbits(64)
+    assert SeedStream(1).randbytes(8) != bytes(8)
+    assert SeedStream(1).randbytes(8) == SeedStream(1).getrandbits(64).to_bytes(8, "little")
+    # The first draw's 32 bits, then the top 8 bits of the second
+    stream = SeedStream(3)
+    first, second = (int(stream.random() * 2**32) for _ in range(2))
+    assert SeedStream(3).getrandbits(40) == first << 8 | second >> 24
+    assert SeedStream(3).getrandbits(0) == 0
+    bits = SeedStream(4)
+    assert all(0 <= bits.getrandbits(k) < 1 << k for k in range(1, 200, 7))
+    with pytest.raises(ValueError):
+        bits.getrandbits(-1)
+
+
+def test_tree_scheme_streams():
+    assert isinstance(child_rng("tree", 9, 2, "hats"), SeedStream)
+    assert isinstance(make_rng("tree", 9), SeedStream)
+    assert child_rng("tree", 9, 2).random() == SeedStream(9, 2).random()
+
+
+def test_tree_drum_pattern():
+    events = generate_drum_pattern_v2(**DRUMS, seed_scheme="tree")
+    legacy = generate_drum_pattern_v2(**DRUMS)
+    assert events == generate_drum_pattern_v2(**DRUMS, seed_scheme="tree")
+    assert events != legacy
+    assert {event["role"] for event in events} == {event["role"] for event in legacy}
+
+
+def test_tree_service_seeds_fit_bigint():
+    segment_seed = segments.deterministic_seed(2**63 - 1, PROJECT, 4, "beats", "tree")
+    regenerate_seed = regenerate.deterministic_seed_for_regenerate(
+        PROJECT, CLIP, "bass", -5, 0.3, "tree"
+    )
+    for seed in (segment_seed, regenerate_seed):
+        assert 0 <= seed < 2**63
+    assert segment_seed != segments.deterministic_seed(2**63 - 1, PROJECT, 4, "beats")
@@ -0,0 +1,214 @@
+"""Tests for the streaming Standard MIDI File writer."""
+
+import io
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+import mido
+import pytest
+
+from midinecromancer.midi.export import export_project_to_midi, iter_project_midi_chunks
+from midinecromancer.midi.export_zip import export_track_to_midi
+from midinecromancer.midi.smf import SmfTrack, encode_midi_file, encode_vlq, pack_note_events
+from midinecromancer.music.theory import PPQ
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+
+def _note(start_tick, duration_tick, pitch, velocity):
+    return SimpleNamespace(
+        start_tick=start_tick, duration_tick=duration_tick, pitch=pitch, velocity=velocity
+    )
+
+
+def _clip(start_bar, notes, offset=0, muted=False, soloed=False):
+    return SimpleNamespace(
+        start_bar=start_bar,
+        start_offset_ticks=offset,
+        is_muted=muted,
+        is_soloed=soloed,
+        notes=notes,
+    )
+
+
+def _track(name, channel, program, clips, offset=0, muted=False):
+    return SimpleNamespace(
+        name=name,
+        midi_channel=channel,
+        midi_program=program,
+        start_offset_ticks=offset,
+        is_muted=muted,
+        is_soloed=False,
+        clips=clips,
+    )
+
+
+def golden_fixture():
+    """Project exercising ties, overlaps, negative offsets and mute filtering."""
+    project = SimpleNamespace(time_signature_num=4, time_signature_den=4, bars=4)
+    drums = _track(
+        "Drums",
+        9,
+        0,
+        [
+            _clip(
+                0,
+                [
+                    _note(0, 120, 36, 100),
+                    _note(0, 120, 42, 80),
+                    _note(480, 120, 38, 110),
+                    _note(480, 60, 42, 70),
+                    _note(960, 120, 36, 100),
+                    _note(1440, 0, 38, 90),
+                ],
+                offset=-30,
+            ),
+            _clip(1, [_note(0, 240, 49, 127)], muted=True),
+        ],
+        offset=-120,
+    )
+    chords = _track(
+        "Chörds",
+        1,
+        4,
+        [
+            _clip(
+                0,
+                [
+                    _note(0, 1920, 60, 90),
+                    _note(0, 1920, 64, 90),
+                    _note(0, 1920, 67, 90),
+                    _note(1920, 960, 62, 85),
+                    _note(1920, 960, 65, 85),
+                ],
+            ),
+            _clip(1, [_note(0, 1920, 60, 90), _note(960, 480, 72, 100)], offset=15),
+        ],
+    )
+    bass = _track("Bass", 2, 33, [_clip(0, [_note(0, 480, 36, 100)])], muted=True)
+    return project, [drums, chords, bass]
+
+
+def random_fixture(seed):
+    """Random project with dense same-tick collisions."""
+    rng = random.Random(seed)
+    project = SimpleNamespace(
+        time_signature_num=rng.choice([3, 4, 7]), time_signature_den=4, bars=8
+    )
+    tracks = []
+    for t in range(rng.randint(1, 4)):
+        clips = []
+        for bar in range(rng.randint(1, 4)):
+            notes = [
+                _note(
+                    rng.randrange(0, 4) * 240,
+                    rng.choice([0, 1, 120, 240, 480, 960]),
+                    rng.randint(0, 127),
+                    rng.randint(0, 127),
+                )
+                for _ in range(rng.randint(0, 24))
+            ]
+            clips.append(_clip(bar * 2, notes, offset=rng.randint(-120, 120)))
+        tracks.append(
+            _track(f"Track {t}", t, rng.randint(0, 127), clips, offset=rng.randint(-120, 120))
+        )
+    return project, tracks
+
+
+def mido_reference(project, tracks):
+    """Reference encoder: the per-event dict + mido.Message path."""
+    from midinecromancer.services.playback_filter import (
+        filter_clips_for_playback,
+        filter_tracks_for_playback,
+    )
+
+    mid = mido.MidiFile(ticks_per_beat=PPQ)
+    ticks_per_bar = int((project.time_signature_num * 4) / project.time_signature_den * PPQ)
+    for track in filter_tracks_for_playback(tracks):
+        midi_track = mido.MidiTrack()
+        midi_track.name = track.name
+        midi_track.append(
+            mido.Message(
+                "program_change", channel=track.midi_channel, program=track.midi_program, time=0
+            )
+        )
+        note_events = []
+        for clip in filter_clips_for_playback(track.clips):
+            for note in clip.notes:
+                tick = (
+                    clip.start_bar * ticks_per_bar
+                    + note.start_tick
+                    + clip.start_offset_ticks
+                    + track.start_offset_ticks
+                )
+                note_events.append((tick, note.pitch, note.velocity, max(note.duration_tick, 1)))
+        note_events.sort(key=lambda x: x[0])
+        all_events = []
+        for tick, pitch, velocity, duration in note_events:
+            all_events.append((tick, "note_on", pitch, velocity))
+            all_events.append((tick + duration, "note_off", pitch, 0))
+        all_events.sort(key=lambda x: x[0])
+        current_tick = 0
+        for tick, kind, pitch, velocity in all_events:
+            midi_track.append(
+                mido.Message(
+                    kind,
+                    channel=track.midi_channel,
+                    note=pitch,
+                    velocity=velocity,
+                    time=max(tick - current_tick, 0),
+                )
+            )
+            current_tick = tick
+        mid.tracks.append(midi_track)
+    buffer = io.BytesIO()
+    mid.save(file=buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("value", [0, 1, 0x7F, 0x80, 0x3FFF, 0x4000, 0x1FFFFF, 0x0FFFFFFF])
+def test_encode_vlq_matches_mido(value):
+    """VLQ encoding matches mido's variable-length integer encoder."""
+    out = bytearray()
+    encode_vlq(value, out)
+    assert bytes(out) == bytes(mido.midifiles.midifiles.encode_variable_int(value))
+
+
+def test_export_matches_golden_file():
+    """Project export is byte-identical to the recorded mido output."""
+    project, tracks = golden_fixture()
+    golden = (GOLDEN_DIR / "export_project.mid").read_bytes()
+    assert export_project_to_midi(project, tracks) == golden
+
+
+def test_streamed_chunks_match_export():
+    """Streaming chunks concatenate to the same file as the buffered export."""
+    project, tracks = golden_fixture()
+    chunks = list(iter_project_midi_chunks(project, tracks))
+    assert len(chunks) == 1 + 2  # header + two audible tracks
+    assert b"".join(chunks) == export_project_to_midi(project, tracks)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_export_matches_mido_randomized(seed):
+    """Randomized projects encode byte-identically to the mido path."""
+    project, tracks = random_fixture(seed)
+    assert export_project_to_midi(project, tracks) == mido_reference(project, tracks)
+
+
+def test_track_export_matches_mido():
+    """Single-track export is byte-identical to the mido path."""
+    project, tracks = golden_fixture()
+    ticks_per_bar = 4 * PPQ
+    for track in tracks[:2]:
+        expected = mido_reference(project, [track])
+        assert export_track_to_midi(project, track, ticks_per_bar) == expected
+
+
+def test_out_of_range_values_raise():
+    """Invalid MIDI data bytes are rejected like mido does."""
+    with pytest.raises(ValueError):
+        pack_note_events([(0, 10, 128, 100)], channel=0)
+    with pytest.raises(ValueError):
+        encode_midi_file([SmfTrack(name="x", channel=16, program=0, events=[])])
@@ -0,0 +1,91 @@
+"""Tests for read-only project snapshots."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+import midinecromancer.main  # noqa: F401  (configures the ORM mappers)
+from midinecromancer.models.note import Note
+from midinecromancer.models.project import Project
+from midinecromancer.services.note_store import PACKED_FORMAT_VERSION, PackedNotes, get_clip_notes
+from midinecromancer.services.snapshot import (
+    ClipSnapshot,
+    Needs,
+    NoteBlockSnapshot,
+    NoteSnapshot,
+    ProjectSnapshot,
+    TrackSnapshot,
+    load_project_snapshot,
+)
+
+PROJECT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _clip(start_bar: int, **bodies) -> ClipSnapshot:
+    values = dict.fromkeys(ClipSnapshot.columns)
+    values.update(id=uuid.uuid4(), start_bar=start_bar, length_bars=4, revision=1)
+    return ClipSnapshot(**values, has_body=bool(bodies), **bodies)
+
+
+def test_snapshots_are_read_only():
+    note = NoteSnapshot.from_row(
+        Note(pitch=60, velocity=100, start_tick=0, duration_tick=120, probability=1.0)
+    )
+    assert (note.pitch, note.duration_tick) == (60, 120)
+    with pytest.raises(AttributeError):
+        note.pitch = 61
+    with pytest.raises(AttributeError):
+        del note.velocity
+
+
+def test_replace_copies():
+    clip = _clip(0, notes=())
+    extra = NoteSnapshot.from_row(SimpleNamespace(**dict.fromkeys(NoteSnapshot.columns, 1)))
+    changed = clip.replace(notes=clip.notes + (extra,))
+    assert clip.notes == () and changed.notes == (extra,)
+    assert changed.id == clip.id and changed.start_bar == 0
+
+    # Unset bodies stay unset instead of lazy loading
+    bare = _clip(0)
+    assert not hasattr(bare.replace(start_bar=2), "notes")
+
+
+def test_clip_notes_read_from_packed_block():
+    events = [{"pitch": 36, "velocity": 100, "start_tick": 0, "duration_tick": 120}]
+    packed = PackedNotes.from_events(events)
+    values = dict.fromkeys(NoteBlockSnapshot.columns)
+    values.update(
+        format_version=PACKED_FORMAT_VERSION, note_count=len(packed), data=packed.to_bytes()
+    )
+    block = NoteBlockSnapshot(**values)
+    clip = _clip(0, notes=(), note_block=block)
+    assert [note.pitch for note in get_clip_notes(clip)] == [36]
+
+
+def test_project_snapshot_from_orm_row():
+    project = Project(id=PROJECT_ID, name="p", bpm=120, bars=8, seed=3, revision=4)
+    clips = (_clip(0), _clip(4))
+    track = TrackSnapshot(**dict.fromkeys(TrackSnapshot.columns), clips=clips)
+    snapshot = ProjectSnapshot.from_row(project, needs=Needs.NONE, tracks=(track,))
+    assert (snapshot.name, snapshot.bars, snapshot.revision) == ("p", 8, 4)
+    assert list(snapshot.iter_clips()) == list(clips)
+
+
+async def test_memoized_snapshot_serves_smaller_needs():
+    cached = ProjectSnapshot(
+        **dict.fromkeys(ProjectSnapshot.columns),
+        needs=Needs.NOTES | Needs.CHORD_EVENTS,
+        tracks=(),
+    )
+    session = SimpleNamespace(info={"project_snapshots": {(PROJECT_ID, None, None): cached}})
+    assert await load_project_snapshot(session, PROJECT_ID, Needs.NOTES) is cached
+    assert await load_project_snapshot(session, PROJECT_ID) is cached
+
+
+def test_session_events_forget_snapshots():
+    session = Session()
+    session.info["project_snapshots"] = {"key": object()}
+    session.commit()
+    assert "project_snapshots" not in session.info
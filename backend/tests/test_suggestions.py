@@ -2,12 +2,20 @@
 
 import pytest
 import uuid
+from itertools import islice
 
 from midinecromancer.music.analysis import ProjectAnalysis
 from midinecromancer.music.suggest import (
+    CANDIDATES,
+    SUGGESTION_KINDS,
+    Candidate,
+    SuggestionContext,
     deterministic_suggestion_seed,
     generate_all_suggestions,
     generate_harmony_suggestions,
+    iter_ranked_suggestions,
+    iter_suggestions,
+    suggestion_at,
 )
 
 
@@ -153,3 +161,54 @@ def test_commit_plan_format():
             "append_notes",
             "update_lane_rotation",
         ]
+
+
+def _context(seed=12345, **values):
+    return SuggestionContext(
+        analysis=ProjectAnalysis(detected_key="C", detected_mode="ionian"),
+        project_id=uuid.UUID(int=7),
+        project_seed=seed,
+        bars=8,
+        time_signature_num=4,
+        time_signature_den=4,
+        bpm=120,
+        **values,
+    )
+
+
+def test_suggestion_at_matches_full_lists():
+    """suggestion_at() addresses the same suggestions the full generators return."""
+    lanes = [{"id": "lane", "name": "Kick", "steps": 8, "pulses": 3, "rotation": 0}]
+    for seed in range(40):
+        context = _context(seed, lanes=lanes, tension=0.6)
+        for kind in SUGGESTION_KINDS:
+            full = list(iter_suggestions(context, kind))
+            for index, suggestion in enumerate(full):
+                assert suggestion_at(context, kind, index) == suggestion
+            assert suggestion_at(context, kind, len(full)) is None
+
+
+def test_ranked_suggestions_are_lazy(monkeypatch):
+    """Stopping early leaves lower-scored candidates unbuilt."""
+    contexts = [_context(seed) for seed in range(40)]
+    expected = [
+        generate_all_suggestions(
+            context.analysis, context.project_id, context.project_seed, 8, 4, 4, 120, []
+        )
+        for context in contexts
+    ]
+
+    def fail(context, score):
+        raise AssertionError("built")
+
+    fails = Candidate("melody", 0.1, fail)
+    monkeypatch.setitem(CANDIDATES, "melody", [*CANDIDATES["melody"], fails])
+    for context, suggestions in zip(contexts, expected, strict=True):
+        ranked = iter_ranked_suggestions(context)
+        assert list(islice(ranked, len(suggestions))) == suggestions
+
+    harmony = list(iter_ranked_suggestions(_context(), ["harmony"]))
+    assert harmony and {suggestion.kind for suggestion in harmony} == {"harmony"}
+    assert list(iter_ranked_suggestions(_context(), ["harmony", "harmony"])) == harmony
+    with pytest.raises(AssertionError):
+        list(iter_ranked_suggestions(_context(), ["melody"]))
@@ -0,0 +1,48 @@
+"""Tests for the precomputed theory tables."""
+
+import pytest
+
+from midinecromancer.music import theory
+
+
+@pytest.mark.parametrize("tonic", ["C", "F#", "Bb", "eb", "Cb", "Fb", "Dsharp", "G##"])
+def test_parse_tonic_matches_reference(tonic):
+    assert theory.parse_tonic(tonic) == theory._parse_tonic(tonic)
+
+
+@pytest.mark.parametrize("mode", theory.MODES)
+def test_scales_and_chords_match_reference(mode):
+    for tonic in ("C", "F#", "Ab", "b"):
+        tonic_pc = theory._parse_tonic(tonic)
+        for octave in (-1, 0, 4, 10, 11):
+            scale = theory._scale_degrees(tonic_pc, mode, octave)
+            assert theory.get_scale_degrees(tonic, mode, octave) == scale
+            for degree in range(0, 9):
+                for quality in ("triad", "7th", "9th"):
+                    expected = theory._chord_notes(scale, degree, quality)
+                    assert theory.get_chord_notes(tonic, mode, degree, quality, octave) == expected
+
+
+def test_lookups_return_fresh_lists():
+    scale = theory.get_scale_degrees("C", "ionian")
+    scale.append(0)
+    assert theory.get_scale_degrees("C", "ionian") == [48, 50, 52, 53, 55, 57, 59]
+
+
+def test_unknown_mode_still_raises():
+    with pytest.raises(KeyError):
+        theory.get_chord_notes("C", "blues", 1)
+
+
+@pytest.mark.parametrize("roman", ["I", "V7", "viidim", "bVII", "vii°", "IVmaj7", "x"])
+def test_roman_to_degree_matches_reference(roman):
+    assert theory.roman_to_degree(roman) == theory._roman_to_degree(roman)
+
+
+def test_roman_to_chord_name():
+    assert theory.roman_to_chord_name("VI", "C", "ionian") == "Am"
+    assert theory.roman_to_chord_name("V7", "G", "mixolydian") == "D7"
+    assert theory.roman_to_chord_name("III", "A", "aeolian") == "C"
+    assert theory.roman_to_chord_name("IV", "D", "dorian", quality_mode="aeolian") == "Gm"
+    # Unknown spellings name from C, unknown modes use ionian
+    assert theory.roman_to_chord_name("IV", "H", "blues") == "F"
@@ -0,0 +1,63 @@
+"""Tests for progression-level voice leading."""
+
+from itertools import product
+
+from midinecromancer.music.chords_render import render_chord_progression_to_notes
+from midinecromancer.music.voice_leading import candidate_voicings, voice_progression
+
+C_MAJOR = [60, 64, 67]
+F_MAJOR = [65, 69, 72]
+G7 = [67, 71, 74, 77]
+A_MINOR = [69, 72, 76]
+
+
+def total_cost(voicings: list[tuple[int, ...]], low: int, high: int) -> int:
+    mid = (low + high) // 2
+    cost = sum(abs(p - mid) for p in voicings[0])
+    for prev, cur in zip(voicings, voicings[1:], strict=False):
+        cost += sum(min(abs(p - q) for q in prev) for p in cur)
+    return cost
+
+
+def test_candidate_voicings_cover_all_tones_in_range():
+    voicings = candidate_voicings((0, 4, 7), 48, 72)
+    assert (48, 52, 55) in voicings
+    assert (52, 55, 60) in voicings
+    for voicing in voicings:
+        assert sorted(p % 12 for p in voicing) == [0, 4, 7]
+        assert all(48 <= p <= 72 for p in voicing)
+    assert candidate_voicings((0, 4, 7), 60, 62) == ()
+
+
+def test_voice_progression_matches_exhaustive_search():
+    progression = [C_MAJOR, A_MINOR, F_MAJOR, G7, C_MAJOR]
+    low, high = 50, 70
+    result = voice_progression(progression, low, high)
+
+    options = [
+        candidate_voicings(tuple(sorted({p % 12 for p in tones})), low, high)
+        for tones in progression
+    ]
+    best = min(total_cost(list(path), low, high) for path in product(*options))
+    assert total_cost([tuple(v) for v in result], low, high) == best
+
+
+def test_voice_progression_falls_back_when_range_too_small():
+    result = voice_progression([C_MAJOR, [], G7], 60, 64)
+    assert len(result) == 3
+    assert result[1] == []
+    assert all(60 <= p <= 64 for voicing in result for p in voicing)
+
+
+def test_render_with_optimal_policy():
+    chords = [
+        {"start_tick": i * 1920, "duration_tick": 1920, "roman_numeral": roman}
+        for i, roman in enumerate(["I", "vi", "IV", "V7", "I"])
+    ]
+    context = {"tonic": "C", "mode": "ionian", "bpm": 120}
+    events = render_chord_progression_to_notes(chords, {"inversion_policy": "optimal"}, 1, context)
+    by_chord = {}
+    for event in events:
+        by_chord.setdefault(event.start_tick, []).append(event.pitch)
+    assert [len(pitches) for _, pitches in sorted(by_chord.items())] == [3, 3, 3, 4, 3]
+    assert all(48 <= event.pitch <= 72 for event in events)
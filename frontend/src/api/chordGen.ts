@@ -9,6 +9,8 @@ export interface ChordGenRequest {
   seed: number;
   params: ChordGenParams;
   locks?: ChordLockSpec | null;
+  num_candidates?: number;
+  time_budget_ms?: number;
 }
 
 export interface ChordSuggestionPreviewRequest {
@@ -8,6 +8,7 @@ export interface Project {
   key_tonic: string;
   mode: string;
   seed: number;
+  seed_scheme?: 'legacy' | 'tree';
   created_at: string;
   updated_at: string;
 }